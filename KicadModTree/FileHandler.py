@@ -16,6 +16,8 @@
 import sys
 import io
 
+from KicadModTree.util.profiler import instrument
+
 
 class FileHandler(object):
     r"""some basic methods to write footprints, and which is the base class of footprint writer implementations
@@ -73,3 +75,7 @@ class FileHandler(object):
         """
 
         raise NotImplementedError("serialize has to be implemented by child class")
+
+
+instrument(FileHandler, 'writeFile', category='file write',
+           args=lambda self, filename, **kwargs: {'footprint': self.kicad_mod.name, 'filename': filename})
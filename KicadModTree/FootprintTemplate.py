@@ -0,0 +1,370 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Footprint templates for sweeps over pin counts and other parameters
+
+A template records how the nodes of a footprint are created, with parameters which can be expressions of sweep
+variables. Nodes without expressions are serialized once and their output is reused for every instance, only the
+nodes which depend on a variable are created again.
+
+Expressions support ``+ - * / // % **``, negation, ``abs()`` and ``round()`` (so ``roundToBase`` works on them).
+Everything else, like ``min()`` or formatting a name, is done with TemplateCall.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> pins = TemplateVariable('pins')
+>>> template = FootprintTemplate(TemplateCall('PinHeader_1x{:02d}'.format, pins))
+>>> template.append(PadArray, pincount=pins, x_spacing=2.54, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+...                 size=1.7, drill=1, layers=Pad.LAYERS_THT)
+>>> template.append(RectLine, start=[-1.27, -1.27], end=[(pins - 1) * 2.54 + 1.27, 1.27], layer='F.Fab')
+>>> template.append(Text, type='reference', text='REF**', at=[0, -2.5], layer='F.SilkS')
+>>> for n in range(2, 41):
+...     template.writeFile('PinHeader_1x{:02d}.kicad_mod'.format(n), {'pins': n})
+"""
+
+import io
+import operator
+import sys
+
+from KicadModTree.KicadFileHandler import KicadFileHandler
+from KicadModTree.nodes.Footprint import Footprint
+from KicadModTree.nodes.Node import Node
+from KicadModTree.util.kicad_util import SexprSerializer
+
+
+class TemplateExpression(object):
+    r"""Base class of all values which depend on the sweep variables"""
+
+    def evaluate(self, values):
+        r"""Calculate the value
+
+        :param values: dict from variable name to its value
+        """
+        raise NotImplementedError("evaluate has to be implemented by child class")
+
+    def __add__(self, other):
+        return TemplateCall(operator.add, self, other)
+
+    def __radd__(self, other):
+        return TemplateCall(operator.add, other, self)
+
+    def __sub__(self, other):
+        return TemplateCall(operator.sub, self, other)
+
+    def __rsub__(self, other):
+        return TemplateCall(operator.sub, other, self)
+
+    def __mul__(self, other):
+        return TemplateCall(operator.mul, self, other)
+
+    def __rmul__(self, other):
+        return TemplateCall(operator.mul, other, self)
+
+    def __truediv__(self, other):
+        return TemplateCall(operator.truediv, self, other)
+
+    def __rtruediv__(self, other):
+        return TemplateCall(operator.truediv, other, self)
+
+    def __div__(self, other):
+        # Python 2 without "from __future__ import division"
+        return self.__truediv__(other)
+
+    def __rdiv__(self, other):
+        return self.__rtruediv__(other)
+
+    def __floordiv__(self, other):
+        return TemplateCall(operator.floordiv, self, other)
+
+    def __rfloordiv__(self, other):
+        return TemplateCall(operator.floordiv, other, self)
+
+    def __mod__(self, other):
+        return TemplateCall(operator.mod, self, other)
+
+    def __rmod__(self, other):
+        return TemplateCall(operator.mod, other, self)
+
+    def __pow__(self, other):
+        return TemplateCall(operator.pow, self, other)
+
+    def __rpow__(self, other):
+        return TemplateCall(operator.pow, other, self)
+
+    def __neg__(self):
+        return TemplateCall(operator.neg, self)
+
+    def __abs__(self):
+        return TemplateCall(abs, self)
+
+    def __round__(self, ndigits=None):
+        if ndigits is None:
+            return TemplateCall(round, self)
+        return TemplateCall(round, self, ndigits)
+
+
+class TemplateVariable(TemplateExpression):
+    r"""A sweep variable of a template
+
+    :param name: name of the variable, the value is given when the template is instantiated
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> pins = TemplateVariable('pins')
+    >>> evaluateTemplateValue((pins - 1) * 1.25, {'pins': 5})
+    5.0
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, values):
+        try:
+            return values[self.name]
+        except KeyError:
+            raise KeyError("no value given for template variable '{}'".format(self.name))
+
+    def __repr__(self):
+        return "TemplateVariable({!r})".format(self.name)
+
+
+class TemplateCall(TemplateExpression):
+    r"""Call a function with evaluated arguments
+
+    :param function: the function
+    :param args: positional arguments, can contain expressions
+    :param kwargs: keyword arguments, can contain expressions
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> pins = TemplateVariable('pins')
+    >>> name = TemplateCall('Conn_1x{n:02d}'.format, n=pins)
+    >>> largest = TemplateCall(max, pins * 1.25, 5)
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def evaluate(self, values):
+        return self.function(*evaluateTemplateValue(self.args, values),
+                             **evaluateTemplateValue(self.kwargs, values))
+
+
+class _TemplateTarget(object):
+    def __repr__(self):
+        return "TEMPLATE_TARGET"
+
+
+# placeholder of the node a function appends its nodes to, like the kicad_mod argument of addTextFields
+TEMPLATE_TARGET = _TemplateTarget()
+
+
+def containsTemplateExpression(value):
+    r"""Check if a value is an expression or a list, tuple or dict which contains one
+
+    :param value: the value
+    """
+    if isinstance(value, TemplateExpression):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(containsTemplateExpression(v) for v in value)
+    if isinstance(value, dict):
+        return any(containsTemplateExpression(v) for v in value.values())
+    return False
+
+
+def evaluateTemplateValue(value, values):
+    r"""Replace all expressions of a value with their result. Lists, tuples and dicts are evaluated recursively
+
+    :param value: the value
+    :param values: dict from variable name to its value
+    """
+    if isinstance(value, TemplateExpression):
+        return value.evaluate(values)
+    if isinstance(value, list):
+        return [evaluateTemplateValue(v, values) for v in value]
+    if isinstance(value, tuple):
+        return tuple(evaluateTemplateValue(v, values) for v in value)
+    if isinstance(value, dict):
+        return {k: evaluateTemplateValue(v, values) for k, v in value.items()}
+    return value
+
+
+class _TemplateEntry(object):
+    def __init__(self, factory, args, kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+
+        # only arguments with expressions are evaluated per instance
+        self.variable_args = [i for i, a in enumerate(args) if containsTemplateExpression(a)]
+        self.variable_kwargs = [k for k, a in kwargs.items() if containsTemplateExpression(a)]
+        self.invariant = not self.variable_args and not self.variable_kwargs
+        self.groups = None
+
+    def createNodes(self, values):
+        args = list(self.args)
+        for i in self.variable_args:
+            args[i] = evaluateTemplateValue(args[i], values)
+        kwargs = dict(self.kwargs)
+        for key in self.variable_kwargs:
+            kwargs[key] = evaluateTemplateValue(kwargs[key], values)
+
+        uses_target = any(a is TEMPLATE_TARGET for a in args) or any(a is TEMPLATE_TARGET for a in kwargs.values())
+        if uses_target:
+            target = Node()
+            args = [target if a is TEMPLATE_TARGET else a for a in args]
+            kwargs = {k: target if a is TEMPLATE_TARGET else a for k, a in kwargs.items()}
+
+        result = self.factory(*args, **kwargs)
+
+        if uses_target:
+            nodes = list(target.getNormalChilds())
+            for node in nodes:
+                target.remove(node)
+            return nodes
+        if result is None:
+            return []
+        if isinstance(result, Node):
+            return [result]
+        return list(result)
+
+
+class FootprintTemplate(object):
+    r"""Footprint whose nodes are created from expressions of sweep variables
+
+    The footprint attributes can be values or expressions.
+
+    :param name: name of the footprint
+    :param description: description of the footprint
+    :param tags: tags of the footprint
+    :param attribute: attribute of the footprint, like 'smd'
+    :param maskMargin: solder mask margin of the footprint
+    :param pasteMargin: solder paste margin of the footprint
+    :param pasteMarginRatio: solder paste margin ratio of the footprint
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> pins = TemplateVariable('pins')
+    >>> template = FootprintTemplate(TemplateCall('Conn_1x{:02d}'.format, pins), attribute='smd')
+    >>> template.append(RectLine, start=[-1, -1], end=[(pins - 1) * 1.25 + 1, 1], layer='F.Fab')
+    >>> kicad_mod = template.instantiate({'pins': 4})
+    >>> text = template.serialize({'pins': 5})
+    """
+
+    _ATTRIBUTES = ['description', 'tags', 'attribute', 'maskMargin', 'pasteMargin', 'pasteMarginRatio']
+
+    def __init__(self, name, description=None, tags=None, attribute=None,
+                 maskMargin=None, pasteMargin=None, pasteMarginRatio=None):
+        self.name = name
+        self.description = description
+        self.tags = tags
+        self.attribute = attribute
+        self.maskMargin = maskMargin
+        self.pasteMargin = pasteMargin
+        self.pasteMarginRatio = pasteMarginRatio
+
+        self._entries = []
+
+    def append(self, factory, *args, **kwargs):
+        r"""Add nodes to the template
+
+        The factory is called with the evaluated arguments for every instance, unless none of the arguments contains
+        an expression. It can be a node class, or any function which returns a node or a list of nodes. Functions
+        which append their nodes to a given node (like addTextFields) get a container in place of TEMPLATE_TARGET.
+
+        :param factory: node class or function
+        :param args: positional arguments of the factory, can contain expressions
+        :param kwargs: keyword arguments of the factory, can contain expressions
+
+        :Example:
+
+        >>> template.append(Line, start=[x1, y1], end=[x2, y1], layer='F.SilkS', width=0.12)
+        >>> template.append(addTextFields, kicad_mod=TEMPLATE_TARGET, configuration=configuration,
+        ...                 body_edges=body_edge, courtyard={'top': cy1, 'bottom': cy2}, fp_name=name)
+        """
+        self._entries.append(_TemplateEntry(factory, args, kwargs))
+
+    def _createFootprint(self, values):
+        kicad_mod = Footprint(evaluateTemplateValue(self.name, values))
+        for attribute in self._ATTRIBUTES:
+            setattr(kicad_mod, attribute, evaluateTemplateValue(getattr(self, attribute), values))
+        return kicad_mod
+
+    def instantiate(self, values):
+        r"""Create the complete footprint for one set of variable values
+
+        All nodes are created, use serialize or writeFile to profit from the invariant nodes.
+
+        :param values: dict from variable name to its value
+        :return: Footprint
+        """
+        kicad_mod = self._createFootprint(values)
+        for entry in self._entries:
+            kicad_mod.extend(entry.createNodes(values))
+        return kicad_mod
+
+    def serialize(self, values, **kwargs):
+        r"""Get the .kicad_mod representation of one instance
+
+        Invariant nodes are serialized by the first call only.
+
+        :param values: dict from variable name to its value
+        :param kwargs: arguments of KicadFileHandler.serialize, like timestamp
+        :return: content of the .kicad_mod file
+        """
+        file_handler = KicadFileHandler(self._createFootprint(values))
+
+        groups = {}
+        for entry in self._entries:
+            if entry.groups is not None:
+                entry_groups = entry.groups
+            else:
+                nodes = []
+                for node in entry.createNodes(values):
+                    nodes.extend(node.serialize())
+                entry_groups = file_handler._serializeNodeGroups(nodes)
+                if entry.invariant:
+                    entry.groups = entry_groups
+
+            for key, node_sexprs in entry_groups.items():
+                groups.setdefault(key, []).extend(node_sexprs)
+
+        sexpr = file_handler._serializeHeader(kwargs.get('timestamp'))
+        sexpr.extend(file_handler._joinNodeGroups(groups))
+
+        return str(SexprSerializer(sexpr))
+
+    def writeFile(self, filename, values, **kwargs):
+        r"""Write one instance to a .kicad_mod file
+
+        :param filename: path of the output file
+        :param values: dict from variable name to its value
+        :param kwargs: arguments of KicadFileHandler.serialize, like timestamp
+        """
+        output = self.serialize(values, **kwargs)
+
+        # convert to unicode if running python2
+        if sys.version_info[0] == 2:
+            output = output.decode('utf-8')
+
+        with io.open(filename, "w", newline='\n') as f:
+            f.write(output)
@@ -20,6 +20,9 @@ from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
 from KicadModTree.nodes.base.Line import Line
 from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.Node import Node
+from KicadModTree.Vector import Vector2D
+from KicadModTree.util.profiler import instrument
 
 
 DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
@@ -33,6 +36,12 @@ DEFAULT_WIDTH_POLYGON_PAD = 0
 
 DEFAULT_WIDTH = 0.15
 
+# nodes which are written to the file, all other nodes are only containers of them
+_BASE_NODES = {'Arc', 'Circle', 'Line', 'Pad', 'Polygon', 'Text'}
+
+# order of the node groups in the file
+_GROUP_ORDER = ['reference', 'value'] + sorted(_BASE_NODES) + ['Model']
+
 
 def _get_layer_width(layer, width=None):
     if width is not None:
@@ -70,9 +79,15 @@ class KicadFileHandler(FileHandler):
         >>> print(file_handler.serialize())
         """
 
+        sexpr = self._serializeHeader(kwargs.get('timestamp'))
+        sexpr.extend(self._serializeTree())
+
+        return str(SexprSerializer(sexpr))
+
+    def _serializeHeader(self, timestamp=None):
         sexpr = ['module', self.kicad_mod.name,
                  ['layer', 'F.Cu'],
-                 ['tedit', formatTimestamp(kwargs.get('timestamp'))],
+                 ['tedit', formatTimestamp(timestamp)],
                  SexprSerializer.NEW_LINE
                 ]  # NOQA
 
@@ -100,53 +115,44 @@ class KicadFileHandler(FileHandler):
             sexpr.append(['solder_paste_ratio', self.kicad_mod.pasteMarginRatio])
             sexpr.append(SexprSerializer.NEW_LINE)
 
-        sexpr.extend(self._serializeTree())
-
-        return str(SexprSerializer(sexpr))
+        return sexpr
 
     def _serializeTree(self):
-        nodes = self.kicad_mod.serialize()
+        return self._joinNodeGroups(self._serializeNodeGroups(self.kicad_mod.serialize()))
 
-        grouped_nodes = {}
+    def _serializeNodeGroups(self, nodes):
+        '''
+        serialize nodes into the groups of the file: reference and value texts, base nodes by type and 3D models
+        '''
+        groups = {}
 
         for single_node in nodes:
             node_type = single_node.__class__.__name__
 
-            current_nodes = grouped_nodes.get(node_type, [])
-            current_nodes.append(single_node)
-
-            grouped_nodes[node_type] = current_nodes
-
-        sexpr = []
-
-        # serialize initial text nodes
-        if 'Text' in grouped_nodes:
-            reference_nodes = list(filter(lambda node: node.type == 'reference', grouped_nodes['Text']))
-            for node in reference_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
+            if node_type == 'Text' and single_node.type in ('reference', 'value'):
+                key = single_node.type
+            elif node_type == 'BallGrid':
+                groups.setdefault('Pad', []).extend(self._serialize_BallGrid(single_node))
+                continue
+            elif node_type in _BASE_NODES or node_type == 'Model':
+                key = node_type
+            else:
+                continue
 
-            value_nodes = list(filter(lambda node: node.type == 'value', grouped_nodes['Text']))
-            for node in value_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
+            groups.setdefault(key, []).append(self._callSerialize(single_node))
 
-        for key, value in sorted(grouped_nodes.items()):
-            # check if key is a base node, except Model
-            if key not in {'Arc', 'Circle', 'Line', 'Pad', 'Polygon', 'Text'}:
-                continue
+        return groups
 
-            # render base nodes
-            for node in value:
-                sexpr.append(self._callSerialize(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
+    @staticmethod
+    def _joinNodeGroups(groups):
+        '''
+        join the serialized groups in the order of the file, 3D models are at the end
+        '''
+        sexpr = []
 
-        # serialize 3D Models at the end
-        if grouped_nodes.get('Model'):
-            for node in grouped_nodes.get('Model'):
-                sexpr.append(self._serialize_Model(node))
+        for key in _GROUP_ORDER:
+            for node_sexpr in groups.get(key, []):
+                sexpr.append(node_sexpr)
                 sexpr.append(SexprSerializer.NEW_LINE)
 
         return sexpr
@@ -304,6 +310,34 @@ class KicadFileHandler(FileHandler):
 
         return sexpr_primitives
 
+    def _serialize_BallGrid(self, node):
+        # all balls share everything except of number and position
+        prototype = self._serialize_Pad(node.prototype)
+        pad_type, shape = prototype[2:4]
+        rotation = prototype[4][3:]
+        tail = prototype[5:]
+
+        transformed = False
+        parent = node.getParent()
+        while parent is not None:
+            if type(parent).getRealPosition is not Node.getRealPosition:
+                transformed = True
+            parent = parent.getParent()
+
+        pads = []
+        for name, x, y in node.iterBalls():
+            if transformed:
+                position, rotation = node.getRealPosition(Vector2D(x, y), node.prototype.rotation)
+                if not rotation % 360 == 0:
+                    at = ['at', position.x, position.y, rotation]
+                else:
+                    at = ['at', position.x, position.y]
+            else:
+                at = ['at', x, y] + rotation
+            pads.append(['pad', name, pad_type, shape, at] + tail)
+
+        return pads
+
     def _serialize_Pad(self, node):
         sexpr = ['pad', node.number, node.type, node.shape]
 
@@ -373,3 +407,9 @@ class KicadFileHandler(FileHandler):
                 ]  # NOQA
 
         return sexpr
+
+
+instrument(KicadFileHandler, 'serialize', category='serialization',
+           args=lambda self, **kwargs: {'footprint': self.kicad_mod.name})
+instrument(KicadFileHandler, '_serializeTree', category='serialization')
+instrument(SexprSerializer, '__str__', category='serialization')
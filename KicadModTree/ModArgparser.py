@@ -15,13 +15,19 @@
 
 import sys
 import argparse
+import collections
 import csv
+import io
+import multiprocessing
+import traceback
 
-try:
+from KicadModTree.util.config_loader import YAML_AVAILABLE, loadYaml
+from KicadModTree.util.profiler import Profiler, instrument
+from KicadModTree.util.memory_profiler import MemoryProfiler, startFromEnvironment
+from KicadModTree.util.watch import EntryWatcher
+
+if YAML_AVAILABLE:
     import yaml
-    YAML_AVAILABLE = True
-except ImportError:
-    YAML_AVAILABLE = False
 
 
 class ParserException(Exception):
@@ -29,6 +35,46 @@ class ParserException(Exception):
         Exception.__init__(self, *args, **kwargs)
 
 
+# default values of parameters without an explicit default
+_TYPE_DEFAULTS = {bool: False, int: 0, float: 0.0, str: ''}
+
+
+def _compileParameter(name, spec):
+    # (name, converter, required, default) of a parameter, the default of builtin types is converted only once.
+    # Other types get a new default for every footprint, it could be modified by the footprint function
+    converter = spec.get('type', str)
+    default = spec.get('default', _TYPE_DEFAULTS.get(converter))
+    if converter in _TYPE_DEFAULTS:
+        try:
+            default = converter(default)
+        except ValueError as e:
+            default = e
+    return name, converter, spec.get('required', False), default
+
+
+# footprint function of the worker processes, set by the pool initializer
+_worker_function = None
+
+
+def _initWorker(footprint_function):
+    global _worker_function
+    _worker_function = footprint_function
+
+
+def _executeInWorker(parsed_args):
+    # returns the output of the footprint function, and the traceback if it failed
+    from contextlib import redirect_stdout  # not available on Python 2
+
+    output = io.StringIO()
+    error = None
+    with redirect_stdout(output):
+        try:
+            _worker_function(parsed_args)
+        except Exception:
+            error = traceback.format_exc()
+    return output.getvalue(), error
+
+
 class ModArgparser(object):
     r"""A general data loading class, which allows us to specify parts using .yml or .csv files.
 
@@ -59,6 +105,7 @@ class ModArgparser(object):
     def __init__(self, footprint_function):
         self._footprint_function = footprint_function
         self._params = {}
+        self._compiled_params = None
 
     def add_parameter(self, name, **kwargs):
         r"""Add a parameter to the ModArgparser
@@ -90,13 +137,21 @@ class ModArgparser(object):
         """
 
         self._params[name] = kwargs
+        self._compiled_params = None
 
-    def run(self):
+    def run(self, argv=None):
         r"""Execute the ModArgparser and run all tasks defined via the commandline arguments of this script
 
         This method parses the commandline arguments to determine which actions to take. Beside of parsing .yml and .csv
         files, it also allows us to output example files.
 
+        With ``--jobs N`` the footprints are generated by N worker processes. The output of every footprint is
+        printed in the order of the input files, and a failing footprint does not stop the others. ``--only``
+        selects footprints by their name. ``--watch`` keeps the script running after all footprints are generated,
+        and regenerates the footprints whose entries are changed or added in the files.
+
+        :param argv: commandline arguments (default: ``sys.argv``)
+
         >>> from KicadModTree import *
         >>> def footprint_gen(args):
         ...    print("create footprint: {}".format(args['name']))
@@ -111,10 +166,22 @@ class ModArgparser(object):
         parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
         parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
         parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
+        parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of footprints generated in parallel (default: 1)')
+        parser.add_argument('--only', type=str, default=None,
+                            help='comma separated list of the footprint names to generate (default: all)')
+        parser.add_argument('--watch', action='store_true',
+                            help='watch the files and regenerate the footprints of changed entries')
+        parser.add_argument('--profile', type=str, default=None,
+                            help='write the time spent per footprint and phase as Chrome trace to this file')
+        parser.add_argument('--profile_csv', type=str, default=None,
+                            help='write a summary of the time spent per phase as CSV to this file')
+        parser.add_argument('--memory_profile', type=str, default=None,
+                            help='write the memory used per footprint and node type as JSON to this file')
 
         # TODO: allow writing into sub dir
 
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         if args.print_yml:
             self._print_example_yml()
@@ -128,41 +195,86 @@ class ModArgparser(object):
             parser.print_help()
             return
 
-        for filepath in args.files:
+        if not args.memory_profile:
+            # KICADMODTREE_MEMORY_PROFILE profiles the whole script, the report is written at exit
+            startFromEnvironment()
+
+        only = set(args.only.split(',')) if args.only else None
+        if args.memory_profile:
+            failed = self._executeMemoryProfiled(self._iterRows(args.files, only), args.jobs, args.memory_profile)
+        elif args.profile or args.profile_csv:
+            failed = self._executeProfiled(self._iterRows(args.files, only), args.jobs, args.profile,
+                                           args.profile_csv)
+        else:
+            failed = self._executeRows(self._iterRows(args.files, only), args.jobs)
+
+        if args.watch:
+            self._watch(args.files, only)
+        elif failed:
+            print("{} footprints failed".format(failed))
+            sys.exit(1)
+
+    def _loadEntries(self, filepath):
+        # all rows of a file, by footprint name
+        if filepath.endswith('.csv'):
+            rows = self._parse_csv(filepath)
+        else:
+            loadYaml(filepath)  # raises on syntax errors, the watcher then keeps the last valid version
+            rows = self._parse_yml(filepath)
+        return collections.OrderedDict((kwargs.get('name'), kwargs) for kwargs in rows)
+
+    def _watch(self, files, only=None):
+        def regenerate(filepath, entries, names):
+            for name in names:
+                if only is None or name in only:
+                    self._execute_script(**entries[name])
+
+        files = [f for f in files if f.endswith(('.yml', '.yaml', '.csv'))]
+        EntryWatcher(files, regenerate, load=self._loadEntries).run()
+
+    def _iterRows(self, files, only=None):
+        for filepath in files:
             print("use file: {0}".format(filepath))
             if filepath.endswith('.yml') or filepath.endswith('.yaml'):
-                self._parse_and_execute_yml(filepath)
+                rows = self._parse_yml(filepath)
             elif filepath.endswith('.csv'):
-                self._parse_and_execute_csv(filepath)
+                rows = self._parse_csv(filepath)
             else:
                 print("unexpected filetype: {0}".format(filepath))
+                continue
 
-    def _parse_and_execute_yml(self, filepath):
+            for kwargs in rows:
+                if only is None or kwargs.get('name') in only:
+                    yield kwargs
+
+    def _parse_yml(self, filepath):
         if not YAML_AVAILABLE:
             print("pyyaml not available!")
             sys.exit(1)
 
-        with open(filepath, 'r') as stream:
-            try:
-                parsed = yaml.safe_load(stream)  # parse file
+        try:
+            parsed = loadYaml(filepath)  # parse file
+        except yaml.YAMLError as exc:
+            print(exc)
+            return
 
-                if parsed is None:
-                    print("empty file!")
-                    return
+        if parsed is None:
+            print("empty file!")
+            return
 
-                for footprint in parsed:
-                    kwargs = parsed.get(footprint)
+        for footprint in parsed:
+            kwargs = parsed.get(footprint)
 
-                    # name is a reserved key
-                    if 'name' in kwargs:
-                        print("ERROR: name is already used for root name!")
-                        continue
-                    kwargs['name'] = footprint
+            # name is a reserved key
+            if 'name' in kwargs:
+                print("ERROR: name is already used for root name!")
+                continue
+            kwargs['name'] = footprint
 
-                    self._execute_script(**kwargs)  # now we can execute the script
+            yield kwargs
 
-            except yaml.YAMLError as exc:
-                print(exc)
+    def _parse_and_execute_yml(self, filepath):
+        self._executeRows(self._parse_yml(filepath))
 
     def _create_example_data_required(self, **kwargs):
         params = {}
@@ -207,12 +319,12 @@ class ModArgparser(object):
                 'footprint_full': self._create_example_data_full()}
         print(yaml.dump(data, default_flow_style=False))
 
-    def _parse_and_execute_csv(self, filepath):
+    def _parse_csv(self, filepath):
         with open(filepath, 'r') as stream:
             # dialect = csv.Sniffer().sniff(stream.read(1024))  # check which type of formating the csv file likel has
             # stream.seek(0)
 
-            reader = csv.DictReader(stream, dialect=csv.excel)  # parse file
+            reader = csv.DictReader(stream, dialect=csv.excel)  # parse file, one row at a time
 
             for row in reader:
                 # we wan't to remove spaces before and after the fields
@@ -220,7 +332,10 @@ class ModArgparser(object):
                 for k, v in row.items():
                     kwargs[k.strip()] = v.strip()
 
-                self._execute_script(**kwargs)  # now we can execute the script
+                yield kwargs
+
+    def _parse_and_execute_csv(self, filepath):
+        self._executeRows(self._parse_csv(filepath))
 
     def _print_example_csv(self):
         writer = csv.DictWriter(sys.stdout, fieldnames=self._params.keys())
@@ -229,35 +344,125 @@ class ModArgparser(object):
         writer.writerow(self._create_example_data_required(include_name=True))
         writer.writerow(self._create_example_data_full(include_name=True))
 
-    def _execute_script(self, **kwargs):
+    def _parse_args(self, kwargs):
+        if self._compiled_params is None:
+            self._compiled_params = [_compileParameter(k, v) for k, v in self._params.items()]
+
         parsed_args = {}
         error = False
 
-        for k, v in self._params.items():
+        for name, converter, required, default in self._compiled_params:
             try:
-                if kwargs.get(k) not in [None, '']:
-                    parsed_args[k] = v.get('type', str)(kwargs[k])
-                elif v.get('required', False):
-                    raise ParserException("parameter expected: {}".format(k))
+                value = kwargs.get(name)
+                if value is not None and value != '':
+                    parsed_args[name] = converter(value)
+                elif required:
+                    raise ParserException("parameter expected: {}".format(name))
+                elif converter in _TYPE_DEFAULTS:
+                    if isinstance(default, ValueError):
+                        raise default
+                    parsed_args[name] = default
                 else:
-                    type = v.get('type', str)
-                    if type is bool:
-                        parsed_args[k] = type(v.get('default', False))
-                    elif type is int:
-                        parsed_args[k] = type(v.get('default', 0))
-                    elif type is float:
-                        parsed_args[k] = type(v.get('default', 0.0))
-                    elif type is str:
-                        parsed_args[k] = type(v.get('default', ''))
-                    else:
-                        parsed_args[k] = type(v.get('default'))
+                    parsed_args[name] = converter(default)
             except (ValueError, ParserException) as e:
                 error = True
                 print("ERROR: {}".format(e))
 
         print("  - generate {name}.kicad_mod".format(name=kwargs.get('name', '<anon>')))
 
-        if error:
+        return None if error else parsed_args
+
+    def _execute_script(self, **kwargs):
+        parsed_args = self._parse_args(kwargs)
+        if parsed_args is None:
             return
 
         self._footprint_function(parsed_args)
+
+    def _executeProfiled(self, rows, jobs, trace_file, csv_file):
+        if jobs > 1:
+            print("profiling generates the footprints in this process, --jobs is ignored")
+
+        with Profiler() as profiler:
+            failed = self._executeRows(rows)
+
+        if trace_file:
+            profiler.writeChromeTrace(trace_file)
+        if csv_file:
+            profiler.writeCsv(csv_file)
+        return failed
+
+    def _executeMemoryProfiled(self, rows, jobs, report_file):
+        if jobs > 1:
+            print("memory profiling generates the footprints in this process, --jobs is ignored")
+
+        with MemoryProfiler() as profiler:
+            failed = self._executeRows(rows)
+
+        profiler.writeJson(report_file)
+        print(profiler.formatReport())
+        return failed
+
+    def _executeRows(self, rows, jobs=1):
+        r"""Generate the footprints of all rows
+
+        :return: number of footprints whose footprint function raised an exception (only counted with jobs > 1)
+        """
+        if jobs > 1 and sys.version_info < (3, 4):
+            print("generating footprints in parallel needs Python 3.4 or newer, --jobs is ignored")
+            jobs = 1
+
+        if jobs <= 1:
+            for kwargs in rows:
+                self._execute_script(**kwargs)
+            return 0
+
+        from contextlib import redirect_stdout  # not available on Python 2
+
+        def report(messages, name, result):
+            # messages of the parser and output of the footprint function are printed in the order of the rows
+            sys.stdout.write(messages)
+            if result is None:
+                return False
+            output, error = result.get()
+            sys.stdout.write(output)
+            if error is not None:
+                print("ERROR: {} failed\n{}".format(name, error))
+            return error is not None
+
+        # fork keeps footprint functions usable which can not be pickled
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+        failed = 0
+        pending = collections.deque()
+        rows = iter(rows)
+        pool = context.Pool(jobs, initializer=_initWorker, initargs=(self._footprint_function,))
+        try:
+            while True:
+                messages = io.StringIO()
+                with redirect_stdout(messages):
+                    kwargs = next(rows, None)
+                    parsed_args = self._parse_args(kwargs) if kwargs is not None else None
+                if kwargs is None:
+                    pending.append((messages.getvalue(), None, None))
+                    break
+
+                result = pool.apply_async(_executeInWorker, (parsed_args,)) if parsed_args is not None else None
+                pending.append((messages.getvalue(), kwargs.get('name', '<anon>'), result))
+
+                # rows are streamed, only a few footprints per worker are queued at once
+                while len(pending) > 4 * jobs or (pending and (pending[0][2] is None or pending[0][2].ready())):
+                    failed += report(*pending.popleft())
+
+            while pending:
+                failed += report(*pending.popleft())
+        finally:
+            pool.close()
+            pool.join()
+
+        return failed
+
+
+instrument(ModArgparser, '_parse_args', category='parameters')
+instrument(ModArgparser, '_execute_script', lambda self, **kwargs: kwargs.get('name', '<anon>'), category='footprint')
@@ -15,10 +15,20 @@
 # (C) 2018 by Rene Poeschl, github @poeschlr
 
 import warnings
+from bisect import bisect_left
 
 from KicadModTree.Vector import Vector2D
 from KicadModTree.nodes.Node import Node
 
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# maximum number of elements in one block of the distance matrix (numpy path)
+_DISTANCE_BLOCK_SIZE = 1 << 20
+
 
 class PolygonPoints(object):
     r"""Representation of multiple points for creating polygons
@@ -88,25 +98,20 @@ class PolygonPoints(object):
         r""" Find the nearest points for two polygons
 
         Find the two points for both polygons that are nearest to each other.
+        If multiple pairs share the minimum distance, the pair with the lowest
+        index in self (and then in other) is returned.
 
+        Uses a blocked distance matrix if numpy is available, otherwise a
+        sweep over the points of other sorted by their x coordinate.
 
         :param other: the polygon points of the other polygon
         :return: a tuble with the indexes of the two points
                  (pint in self, point in other)
         """
 
-        min_distance = self[0].distance_to(other[0])
-        pi = 0
-        pj = 0
-        for i in range(len(self)):
-            for j in range(len(other)):
-                d = self[i].distance_to(other[j])
-                if d < min_distance:
-                    pi = i
-                    pj = j
-                    min_distance = d
-
-        return (pi, pj)
+        if NUMPY_AVAILABLE:
+            return _findNearestPointsNumpy(self, other)
+        return _findNearestPointsSweep(self, other)
 
     def getPoints(self):
         r""" get the points contained within self
@@ -135,13 +140,22 @@ class PolygonPoints(object):
             "Check resulting polygon carefully.",
             Warning
         )
+        self._bridge(other)
+
+    def _bridge(self, other):
+        r""" Connect other polygon points to self at their nearest points (see cut)
+
+        :param other: the polygon points that are cut from this polygon
+        """
         idx_self, idx_other = self.findNearestPoints(other)
 
-        self.nodes.insert(idx_self+1, self[idx_self])
-        for i in range(len(other)):
-            self.nodes.insert(idx_self+1, other[(i+idx_other) % len(other)])
+        # walk the other polygon backwards from the nearest point (and close it),
+        # then return to the nearest point of this polygon
+        other_len = len(other)
+        bridge = [other[(idx_other - i) % other_len] for i in range(other_len + 1)]
+        bridge.append(self[idx_self])
 
-        self.nodes.insert(idx_self+1, other[idx_other])
+        self.nodes[idx_self+1:idx_self+1] = bridge
 
     def __iter__(self):
         for n in self.nodes:
@@ -152,3 +166,44 @@ class PolygonPoints(object):
 
     def __len__(self):
         return len(self.nodes)
+
+
+def _findNearestPointsNumpy(points, other):
+    a = numpy.array([(p.x, p.y) for p in points], dtype=float)
+    b = numpy.array([(p.x, p.y) for p in other], dtype=float)
+
+    best = None
+    rows = max(1, _DISTANCE_BLOCK_SIZE // max(1, len(b)))
+    for start in range(0, len(a), rows):
+        block = a[start:start+rows]
+        d = ((block[:, numpy.newaxis, :] - b[numpy.newaxis, :, :])**2).sum(axis=2)
+        idx = int(numpy.argmin(d))  # first occurence in row-major order
+        i, j = divmod(idx, len(b))
+        if best is None or d[i, j] < best[0]:
+            best = (d[i, j], start + i, j)
+
+    return (best[1], best[2])
+
+
+def _findNearestPointsSweep(points, other):
+    candidates = sorted((p.x, p.y, j) for j, p in enumerate(other))
+    xs = [c[0] for c in candidates]
+
+    best = None
+    for i, p in enumerate(points):
+        px, py = p.x, p.y
+        pos = bisect_left(xs, px)
+
+        # walk to the right and to the left until the x distance alone exceeds the best distance
+        for step, k in ((1, pos), (-1, pos - 1)):
+            while 0 <= k < len(candidates):
+                cx, cy, j = candidates[k]
+                dx2 = (cx - px)**2
+                if best is not None and dx2 > best[0]:
+                    break
+                d = dx2 + (cy - py)**2
+                if best is None or (d, i, j) < best:
+                    best = (d, i, j)
+                k += step
+
+    return (best[1], best[2])
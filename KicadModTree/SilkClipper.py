@@ -0,0 +1,257 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import collections
+import math
+import warnings
+
+from KicadModTree.Vector import *
+from KicadModTree.geometry.keepout import KeepoutCircle, KeepoutRoundRect, KeepoutIndex, \
+    clipSegment, clipArc, clipCircle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.specialized.BallGrid import BallGrid
+from KicadModTree.KicadFileHandler import _get_layer_width
+
+
+# copper and mask layers of a pad which make it an obstacle for the silkscreen of a side
+_SIDE_LAYERS = {'F.SilkS': {'F.Cu', '*.Cu', 'F.Mask', '*.Mask'},
+                'B.SilkS': {'B.Cu', '*.Cu', 'B.Mask', '*.Mask'}}
+
+
+def _realPosition(node, coordinate):
+    position = node.getRealPosition(coordinate)
+    if isinstance(position, tuple):
+        position = position[0]
+    return Vector2D(position)
+
+
+def _padExtent(pad):
+    # (x_min, x_max, y_min, y_max) of a pad relative to its anchor, without rotation
+    x_min, x_max = -pad.size.x / 2, pad.size.x / 2
+    y_min, y_max = -pad.size.y / 2, pad.size.y / 2
+
+    for p in pad.primitives if pad.shape == Pad.SHAPE_CUSTOM else []:
+        half_width = (p.width or 0) / 2
+        if isinstance(p, (Circle, Arc)):
+            radius = p.radius if isinstance(p, Circle) else p.start_pos.distance_to(p.center_pos)
+            points = [(p.center_pos.x - radius, p.center_pos.y - radius),
+                      (p.center_pos.x + radius, p.center_pos.y + radius)]
+        elif isinstance(p, Line):
+            points = [p.start_pos, p.end_pos]
+        else:
+            points = p.nodes
+        for point in points:
+            x_min, x_max = min(x_min, point[0] - half_width), max(x_max, point[0] + half_width)
+            y_min, y_max = min(y_min, point[1] - half_width), max(y_max, point[1] + half_width)
+
+    return x_min, x_max, y_min, y_max
+
+
+class SilkClipper(object):
+    r"""Post-processing pass which removes silkscreen that is too close to pads
+
+    All lines, arcs and circles on ``F.SilkS`` and ``B.SilkS`` are checked against the copper and solder mask
+    pads of the same side. Parts which are closer than the clearance (measured from the edge of the silk line)
+    are cut away. The pads are collected in a spatial index, so every silk element only is checked against
+    the pads near it.
+
+    Clipped elements are replaced by nodes in footprint coordinates which are added to the footprint itself.
+    Elements created by specialized nodes (like ``RectLine``) cause the whole specialized node to be replaced
+    by its lines, arcs and circles.
+
+    Pads rotated by a multiple of 90 degree keep their exact shape. Other rotations, trapezoid and custom pads
+    use their (rotated) bounding box.
+
+    :param footprint: the finished footprint
+    :param clearance: minimum distance between silkscreen and pads (default: 0.2)
+    :param layers: silkscreen layers to process (default: ``['F.SilkS', 'B.SilkS']``)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+    ...                      at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+    >>> kicad_mod.append(Line(start=[-3, 0.5], end=[3, 0.5], layer='F.SilkS'))
+    >>> SilkClipper(kicad_mod, clearance=0.2).clip()
+    1
+    """
+
+    def __init__(self, footprint, clearance=0.2, layers=None):
+        self.footprint = footprint
+        self.clearance = clearance
+        self.layers = list(layers) if layers is not None else ['F.SilkS', 'B.SilkS']
+
+        self._pads = None
+        self._indices = {}
+
+    def _collectPads(self):
+        self._pads = {layer: [] for layer in self.layers}
+        for node in self.footprint.serialize():
+            if isinstance(node, BallGrid):
+                pads = node.getVirtualChilds()
+            elif isinstance(node, Pad):
+                pads = [node]
+            else:
+                continue
+
+            for pad in pads:
+                position, rotation = pad.getRealPosition(pad.at, pad.rotation)
+                position = Vector2D(position)
+                for layer in self.layers:
+                    if _SIDE_LAYERS.get(layer, set()).intersection(pad.layers):
+                        self._pads[layer].append((pad, position, rotation or 0))
+
+    def _padKeepout(self, pad, position, rotation, distance):
+        x_min, x_max, y_min, y_max = _padExtent(pad)
+
+        if pad.shape == Pad.SHAPE_CIRCLE:
+            return KeepoutCircle(position.x, position.y, pad.size.x / 2 + distance)
+
+        if pad.shape in (Pad.SHAPE_OVAL, Pad.SHAPE_ROUNDRECT):
+            radius = pad.getRoundRadius()
+        else:
+            radius = 0
+
+        phi = math.radians(rotation)
+        if abs(math.sin(2 * phi)) > 1e-9:
+            # arbitrary rotation: bounding box of the rotated pad
+            corners = [(x * math.cos(phi) + y * math.sin(phi), -x * math.sin(phi) + y * math.cos(phi))
+                       for x in (x_min, x_max) for y in (y_min, y_max)]
+            x_min, x_max = min(c[0] for c in corners), max(c[0] for c in corners)
+            y_min, y_max = min(c[1] for c in corners), max(c[1] for c in corners)
+            radius = 0
+        else:
+            # rotation by a multiple of 90 degree (same direction as the Rotation node)
+            cos_phi, sin_phi = int(round(math.cos(phi))), int(round(math.sin(phi)))
+            corners = [(x * cos_phi + y * sin_phi, -x * sin_phi + y * cos_phi)
+                       for x in (x_min, x_max) for y in (y_min, y_max)]
+            x_min, x_max = min(c[0] for c in corners), max(c[0] for c in corners)
+            y_min, y_max = min(c[1] for c in corners), max(c[1] for c in corners)
+
+        return KeepoutRoundRect(position.x + x_min - distance, position.x + x_max + distance,
+                                position.y + y_min - distance, position.y + y_max + distance,
+                                radius=radius + distance)
+
+    def _keepouts(self, layer, width):
+        # the keepouts depend on the line width, as the clearance is measured from the edge of the line
+        key = (layer, width)
+        if key not in self._indices:
+            distance = self.clearance + width / 2
+            self._indices[key] = KeepoutIndex([self._padKeepout(pad, position, rotation, distance)
+                                               for pad, position, rotation in self._pads[layer]])
+        return self._indices[key]
+
+    def _clipNode(self, node):
+        r"""Get the visible parts of a node in footprint coordinates, or None if it is not touched"""
+        width = _get_layer_width(node.layer, node.width)
+        keepouts = self._keepouts(node.layer, width)
+        if not len(keepouts):
+            return None
+
+        if isinstance(node, Line):
+            start, end = _realPosition(node, node.start_pos), _realPosition(node, node.end_pos)
+            pieces = clipSegment(start, end, keepouts)
+            if len(pieces) == 1 and pieces[0] == ((start.x, start.y), (end.x, end.y)):
+                return None
+            return [Line(start=s, end=e, layer=node.layer, width=node.width) for s, e in pieces]
+
+        center = _realPosition(node, node.center_pos)
+        if isinstance(node, Circle):
+            arcs = clipCircle(center, node.radius, keepouts)
+            if len(arcs) == 1 and arcs[0][1] >= 360:
+                return None
+            radius = node.radius
+        else:
+            start = _realPosition(node, node.start_pos)
+            radius = start.distance_to(center)
+            start_angle = math.degrees(math.atan2(start.y - center.y, start.x - center.x))
+            arcs = clipArc(center, radius, start_angle, node.angle, keepouts)
+            if len(arcs) == 1 and abs(arcs[0][1] - node.angle) <= 1e-9:
+                return None
+
+        return [Arc(center=center,
+                    start=[center.x + radius * math.cos(math.radians(a)),
+                           center.y + radius * math.sin(math.radians(a))],
+                    angle=angle, layer=node.layer, width=node.width) for a, angle in arcs]
+
+    def _toFootprintCoordinates(self, node):
+        if isinstance(node, Line):
+            return Line(start=_realPosition(node, node.start_pos), end=_realPosition(node, node.end_pos),
+                        layer=node.layer, width=node.width)
+        if isinstance(node, Circle):
+            return Circle(center=_realPosition(node, node.center_pos), radius=node.radius,
+                          layer=node.layer, width=node.width)
+        return Arc(center=_realPosition(node, node.center_pos), start=_realPosition(node, node.start_pos),
+                   angle=node.angle, layer=node.layer, width=node.width)
+
+    def _owner(self, node):
+        # the topmost node which has to be replaced to remove a virtual child
+        owner = node
+        while owner.getParent() is not None and owner not in owner.getParent().getNormalChilds():
+            owner = owner.getParent()
+        return owner
+
+    def clip(self):
+        r"""Clip all silkscreen elements of the footprint
+
+        :return: number of silkscreen elements which were cut or removed
+        """
+        self._collectPads()
+        self._indices = {}
+
+        # in the order of the footprint, to keep the output deterministic
+        replacements = collections.OrderedDict()
+        for node in self.footprint.serialize():
+            if type(node) in (Line, Arc, Circle) and node.layer in self.layers:
+                pieces = self._clipNode(node)
+                if pieces is not None:
+                    replacements[node] = pieces
+
+        owners = []
+        for node in replacements:
+            owner = self._owner(node)
+            if owner not in owners:
+                owners.append(owner)
+
+        for owner in owners:
+            parent = owner.getParent()
+            if parent is None:
+                continue
+
+            if owner in replacements:
+                new_nodes = replacements[owner]
+            else:
+                children = [n for n in owner.serialize() if n is not owner]
+                if any(type(n) not in (Line, Arc, Circle) and n.getAllChilds() == [] for n in children):
+                    warnings.warn("SilkClipper: {} contains other nodes than lines, arcs and circles, "
+                                  "it is not clipped".format(owner.__class__.__name__))
+                    continue
+                new_nodes = []
+                for n in children:
+                    if n in replacements:
+                        new_nodes += replacements[n]
+                    elif type(n) in (Line, Arc, Circle):
+                        new_nodes.append(self._toFootprintCoordinates(n))
+
+            parent.remove(owner)
+            self.footprint.extend(new_nodes)
+
+        return len(replacements)
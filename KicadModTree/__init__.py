@@ -16,6 +16,9 @@
 from KicadModTree.Vector import *
 from KicadModTree.Point import *  # backwards compatibility
 
+# polygon and keepout geometry
+from KicadModTree.geometry import *
+
 # all different types of nodes
 from KicadModTree.nodes import *
 
@@ -24,3 +27,10 @@ from KicadModTree.KicadFileHandler import KicadFileHandler
 
 # Argparser
 from KicadModTree.ModArgparser import ModArgparser
+
+# Templates for pin count sweeps
+from KicadModTree.FootprintTemplate import FootprintTemplate, TemplateExpression, TemplateVariable, TemplateCall, \
+    TEMPLATE_TARGET, evaluateTemplateValue, containsTemplateExpression
+
+# Post-processing
+from KicadModTree.SilkClipper import SilkClipper
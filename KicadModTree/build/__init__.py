@@ -0,0 +1,26 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import sys
+
+# the build tools use concurrent.futures and subprocess timeouts, they are supported on Python 3.5 and newer
+if sys.version_info < (3, 5):
+    raise ImportError("KicadModTree.build requires Python 3.5 or newer")
+
+from .manifest import ManifestException, Generator, loadManifest, filterGenerators  # NOQA
+from .runner import (GeneratorResult, generatorEnvironment, runGenerator, buildLibrary, formatSummary,  # NOQA
+                     writeSummary)
+from .incremental import STATE_FILE, BuildState, BuildPlan, fileDigest, entryDigests  # NOQA
+from .moddiff import ModuleDiff, parseKicadMod, diffKicadMod, formatDiff  # NOQA
@@ -0,0 +1,144 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Command line interface of kmt-build
+
+Build the whole footprint library, or a part of it, with all generators of a manifest running in parallel::
+
+    kmt-build --manifest scripts/generators.yaml --jobs 16
+    kmt-build --manifest scripts/generators.yaml --only 'Packages/*' --only 'Connector/*'
+    kmt-build --manifest scripts/generators.yaml --incremental
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from .manifest import loadManifest, filterGenerators
+from .runner import GeneratorResult, buildLibrary, formatSummary, writeSummary
+from .incremental import STATE_FILE, BuildState, SKIP
+
+
+def _defaultManifest():
+    # inside a checkout of the repository, the manifest is next to the scripts
+    candidates = ['generators.yaml', os.path.join('scripts', 'generators.yaml')]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return candidates[0]
+
+
+def _incrementalBuild(generators, args, report):
+    # every working directory has its own state file, next to the libraries written into it
+    states = {}
+    for generator in generators:
+        if generator.cwd not in states:
+            states[generator.cwd] = BuildState(generator.cwd)
+
+    plans = {}
+    for generator in generators:
+        plans[generator.name] = states[generator.cwd].plan(generator)
+        if args.verbose:
+            print("[{:>6}] {:<60} {}".format(plans[generator.name].mode, generator.name,
+                                             plans[generator.name].reason))
+
+    record_dir = tempfile.mkdtemp(prefix='kmt-build-')
+    try:
+        options = {}
+        for generator in generators:
+            plan = plans[generator.name]
+            if plan.mode != SKIP and generator.script is not None:
+                options[generator.name] = {'args': plan.args,
+                                           'record': os.path.join(record_dir, '{}.json'.format(len(options)))}
+
+        results = buildLibrary([g for g in generators if plans[g.name].mode != SKIP], os.path.abspath(args.log_dir),
+                               jobs=args.jobs, python=args.python, timeout=args.timeout, callback=report,
+                               options=options)
+
+        for result in results:
+            plan = plans[result.name]
+            state = states[plan.generator.cwd]
+            if not result.success:
+                state.invalidate(plan.generator)
+            elif result.name in options:
+                state.update(plan, options[result.name]['record'])
+        for state in states.values():
+            state.save()
+    finally:
+        shutil.rmtree(record_dir, ignore_errors=True)
+
+    skipped = [GeneratorResult(g.name, 0, 0, None) for g in generators if plans[g.name].mode == SKIP]
+    print("{} generators up to date".format(len(skipped)))
+    order = {g.name: i for i, g in enumerate(generators)}
+    return sorted(results + skipped, key=lambda r: order[r.name])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the footprint generators of a manifest in parallel.')
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='manifest of the generators (default: generators.yaml or scripts/generators.yaml)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of generators running in parallel (default: number of CPUs)')
+    parser.add_argument('--only', type=str, action='append', default=[], metavar='PATTERN',
+                        help='only run generators whose name matches the pattern (can be given multiple times)')
+    parser.add_argument('--log-dir', type=str, default='kmt-build-logs',
+                        help='directory for the log files of the generators (default: kmt-build-logs)')
+    parser.add_argument('--summary', type=str, default=None, help='write the results as json file')
+    parser.add_argument('--timeout', type=float, default=None, help='maximum run time of a single generator (s)')
+    parser.add_argument('--python', type=str, default=None,
+                        help='python interpreter for the generator scripts (default: the current interpreter)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only regenerate footprints whose inputs or outputs changed since the last build, the '
+                             'digests are stored in {} in the working directory of the generators'.format(STATE_FILE))
+    parser.add_argument('--list', action='store_true', help='only list the selected generators')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every finished generator')
+    args = parser.parse_args(argv)
+
+    manifest = args.manifest or _defaultManifest()
+    generators = filterGenerators(loadManifest(manifest), args.only)
+
+    if args.list:
+        for generator in generators:
+            print("{:<60} {}".format(generator.name, ' '.join(generator.commandLine(args.python)[1:])))
+        return 0
+
+    def report(result):
+        if args.verbose or not result.success:
+            state = 'ok' if result.success else 'FAILED'
+            print("[{:>6}] {:<60} {:8.2f} s".format(state, result.name, result.duration))
+            sys.stdout.flush()
+
+    start = time.time()
+    if args.incremental:
+        results = _incrementalBuild(generators, args, report)
+    else:
+        results = buildLibrary(generators, os.path.abspath(args.log_dir), jobs=args.jobs, python=args.python,
+                               timeout=args.timeout, callback=report)
+    duration = time.time() - start
+
+    print(formatSummary(results, duration))
+    if args.summary:
+        writeSummary(results, args.summary, duration)
+
+    return 0 if all(r.success for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
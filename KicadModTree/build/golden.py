@@ -0,0 +1,286 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Golden output of the whole library
+
+Optimizations of KicadModTree must not change a single footprint. ``kmt-golden record`` runs all generators of a
+manifest in a scratch copy of the manifest directory, with a fixed timestamp, and stores a normalized SHA-256 of
+every .kicad_mod file they wrote. ``kmt-golden check`` runs them again and reports every added, removed and changed
+file. If the golden files were kept (``--files``), the changed files are also compared primitive by primitive::
+
+    kmt-golden record --manifest scripts/generators.yaml --golden golden.json --files golden_files
+    kmt-golden check --manifest scripts/generators.yaml --golden golden.json --files golden_files --jobs 8
+
+The check exits with status 1 if any output differs.
+"""
+
+from __future__ import print_function
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from KicadModTree.util.kicad_util import TIMESTAMP_ENVIRONMENT
+from .manifest import loadManifest, filterGenerators
+from .runner import buildLibrary, generatorEnvironment
+from .moddiff import diffKicadMod, formatDiff
+
+FORMAT_VERSION = 1
+
+# owner of footprints which were not written inside the working directory of a generator
+UNKNOWN_GENERATOR = '<unknown>'
+
+_TEDIT = re.compile(r'\(tedit [0-9A-Fa-f]+\)')
+
+
+def normalizeKicadMod(text):
+    r"""Remove everything from a .kicad_mod file which changes without a change of the footprint
+
+    Line endings are converted to LF and the edit timestamp is set to 0.
+    """
+    return _TEDIT.sub('(tedit 0)', text.replace('\r\n', '\n'))
+
+
+def normalizedDigest(path):
+    r"""Get the SHA-256 (hex) of a normalized .kicad_mod file"""
+    with io.open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    return hashlib.sha256(normalizeKicadMod(text).encode('utf-8')).hexdigest()
+
+
+def _copyManifestDirectory(manifest, scratch_dir):
+    # the generators run in a copy of the manifest directory, without the footprints of earlier runs
+    source = os.path.dirname(os.path.abspath(manifest))
+    target = os.path.join(scratch_dir, os.path.basename(source))
+    shutil.copytree(source, target, ignore=shutil.ignore_patterns('*.pretty', '*.kicad_mod', '__pycache__', '.git'))
+    return os.path.join(target, os.path.basename(manifest))
+
+
+def _findOutputs(directory):
+    outputs = []
+    for root, _, files in os.walk(directory):
+        outputs.extend(os.path.realpath(os.path.join(root, f)) for f in files if f.endswith('.kicad_mod'))
+    return sorted(outputs)
+
+
+def _assignOutputs(outputs, generators, records):
+    # files recorded by a generator belong to it, the others to the generator with the deepest working directory
+    owner = {}
+    for generator in generators:
+        record = records.get(generator.name)
+        if record is None or not os.path.isfile(record):
+            continue
+        with open(record) as stream:
+            for path in json.load(stream).get('outputs', []):
+                owner.setdefault(path, generator.name)
+
+    directories = sorted(((os.path.realpath(g.cwd) + os.sep, g.name) for g in generators),
+                         key=lambda d: len(d[0]), reverse=True)
+    assigned = {}
+    for path in outputs:
+        name = owner.get(path)
+        if name is None:
+            name = next((n for d, n in directories if path.startswith(d)), UNKNOWN_GENERATOR)
+        assigned[path] = name
+    return assigned
+
+
+def runGolden(manifest, patterns=None, jobs=None, python=None, timeout=None, files_dir=None, callback=None):
+    r"""Run the generators in a scratch directory and get the digests of their footprints
+
+    :param manifest: path of the manifest file
+    :param patterns: only run generators whose name matches one of these patterns (default: all)
+    :param jobs: number of parallel generators and hashing processes (default: number of CPUs)
+    :param python: python interpreter for scripts (default: the current interpreter)
+    :param timeout: maximum run time of a single generator in seconds
+    :param files_dir: copy the footprints into this directory, with the same relative paths as in the result
+    :param callback: function called with every GeneratorResult as soon as the generator finished
+    :return: dict like it is stored in the golden file
+    """
+    scratch_dir = os.path.realpath(tempfile.mkdtemp(prefix='kmt-golden-'))
+    try:
+        scratch_manifest = _copyManifestDirectory(manifest, scratch_dir)
+        generators = filterGenerators(loadManifest(scratch_manifest), patterns)
+
+        env = generatorEnvironment()
+        env[TIMESTAMP_ENVIRONMENT] = '0'
+        record_dir = os.path.join(scratch_dir, '.records')
+        os.makedirs(record_dir)
+        records = {}
+        options = {}
+        for index, generator in enumerate(generators):
+            options[generator.name] = {}
+            if generator.script is not None:
+                records[generator.name] = os.path.join(record_dir, '{}.json'.format(index))
+                options[generator.name]['record'] = records[generator.name]
+
+        results = buildLibrary(generators, os.path.join(scratch_dir, '.logs'), jobs=jobs, python=python,
+                               timeout=timeout, callback=callback, options=options, env=env)
+
+        outputs = _findOutputs(scratch_dir)
+        assigned = _assignOutputs(outputs, generators, records)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            digests = list(executor.map(normalizedDigest, outputs, chunksize=64))
+
+        golden = {'version': FORMAT_VERSION, 'generators': {}}
+        for result in results:
+            golden['generators'][result.name] = {'success': result.success, 'files': {}}
+        for path, digest in zip(outputs, digests):
+            relative = os.path.relpath(path, scratch_dir).replace(os.sep, '/')
+            entry = golden['generators'].setdefault(assigned[path], {'success': True, 'files': {}})
+            entry['files'][relative] = digest
+            if files_dir is not None:
+                target = os.path.join(files_dir, relative)
+                if not os.path.isdir(os.path.dirname(target)):
+                    os.makedirs(os.path.dirname(target))
+                shutil.copyfile(path, target)
+        return golden
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def compareGolden(golden, current, names=None):
+    r"""Compare the digests of two runs
+
+    :param golden: stored result of runGolden
+    :param current: result of runGolden
+    :param names: only compare these generators (default: all generators of both runs)
+    :return: sorted list of (generator, status, path). status is 'added', 'removed' or 'changed' for files, and
+             'failed' or 'fixed' (path None) if only one of the runs of the generator succeeded
+    """
+    if names is None:
+        names = set(golden['generators']) | set(current['generators'])
+
+    empty = {'success': True, 'files': {}}
+    differences = []
+    for name in names:
+        before = golden['generators'].get(name, empty)
+        after = current['generators'].get(name, empty)
+        if before['success'] != after['success']:
+            differences.append((name, 'fixed' if after['success'] else 'failed', None))
+        for path in set(before['files']) | set(after['files']):
+            if path not in before['files']:
+                differences.append((name, 'added', path))
+            elif path not in after['files']:
+                differences.append((name, 'removed', path))
+            elif before['files'][path] != after['files'][path]:
+                differences.append((name, 'changed', path))
+    return sorted(differences, key=lambda d: (d[0], d[2] or '', d[1]))
+
+
+def _semanticDiff(paths):
+    old_path, new_path = paths
+    try:
+        with io.open(old_path, 'r', encoding='utf-8') as f:
+            old_text = f.read()
+        with io.open(new_path, 'r', encoding='utf-8') as f:
+            new_text = f.read()
+        diff = diffKicadMod(old_text, new_text)
+    except (IOError, OSError, ValueError) as e:
+        return "  could not compare: {}".format(e)
+    return formatDiff(diff) or "  only formatting changed"
+
+
+def semanticDiffs(pairs, jobs=None):
+    r"""Compare many pairs of .kicad_mod files in parallel
+
+    :param pairs: list of (old path, new path)
+    :param jobs: number of processes (default: number of CPUs)
+    :return: list of texts from formatDiff, in the order of the pairs
+    """
+    if not pairs:
+        return []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_semanticDiff, pairs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record or check the golden output of all footprint generators.')
+    parser.add_argument('mode', choices=['record', 'check'],
+                        help='record: store the digests of all footprints, check: compare them with a new run')
+    parser.add_argument('--manifest', type=str, default=os.path.join('scripts', 'generators.yaml'),
+                        help='manifest of the generators (default: scripts/generators.yaml)')
+    parser.add_argument('--golden', type=str, default='golden.json',
+                        help='file with the recorded digests (default: golden.json)')
+    parser.add_argument('--files', type=str, default=None,
+                        help='record: keep the footprints in this directory, check: show the differences to them')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of parallel generators and processes (default: number of CPUs)')
+    parser.add_argument('--only', type=str, action='append', default=[], metavar='PATTERN',
+                        help='only run generators whose name matches the pattern (can be given multiple times)')
+    parser.add_argument('--timeout', type=float, default=None, help='maximum run time of a single generator (s)')
+    parser.add_argument('--python', type=str, default=None,
+                        help='python interpreter for the generator scripts (default: the current interpreter)')
+    args = parser.parse_args(argv)
+
+    def report(result):
+        if not result.success:
+            print("[FAILED] {:<60} (exit code {})".format(result.name, result.returncode))
+            sys.stdout.flush()
+
+    if args.mode == 'record':
+        if args.files is not None and not args.only and os.path.isdir(args.files):
+            shutil.rmtree(args.files)
+        golden = runGolden(args.manifest, args.only, args.jobs, args.python, args.timeout, args.files, report)
+        if args.only and os.path.isfile(args.golden):
+            # only the selected generators are recorded again
+            with open(args.golden) as stream:
+                previous = json.load(stream)
+            previous['generators'].update(golden['generators'])
+            golden = previous
+        with open(args.golden, 'w') as stream:
+            json.dump(golden, stream, indent=1, sort_keys=True)
+        count = sum(len(g['files']) for g in golden['generators'].values())
+        print("recorded {} footprints of {} generators".format(count, len(golden['generators'])))
+        return 0
+
+    with open(args.golden) as stream:
+        golden = json.load(stream)
+    if golden.get('version') != FORMAT_VERSION:
+        print("unsupported golden file version: {}".format(golden.get('version')))
+        return 2
+
+    current_dir = tempfile.mkdtemp(prefix='kmt-golden-current-') if args.files is not None else None
+    try:
+        current = runGolden(args.manifest, args.only, args.jobs, args.python, args.timeout, current_dir, report)
+        names = set(current['generators']) if args.only else None
+        differences = compareGolden(golden, current, names)
+
+        pairs = [(os.path.join(args.files, path), os.path.join(current_dir, path))
+                 for _, status, path in differences if status == 'changed'] if current_dir is not None else []
+        diffs = dict(zip([new for _, new in pairs], semanticDiffs(pairs, args.jobs)))
+
+        for name, status, path in differences:
+            print("{:<8} {:<50} {}".format(status, name, path or ''))
+            if status == 'changed' and current_dir is not None:
+                print(diffs[os.path.join(current_dir, path)])
+    finally:
+        if current_dir is not None:
+            shutil.rmtree(current_dir, ignore_errors=True)
+
+    count = sum(len(g['files']) for g in current['generators'].values())
+    print("{} footprints checked, {} differences".format(count, len(differences)))
+    return 1 if differences else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Incremental library builds based on content hashes
+
+Every generated footprint stores a digest of its inputs: the generator script, the imported tools and KicadModTree
+modules, the configuration files it has read and the yaml entry it was generated from. A generator is skipped when
+no digest changed and all footprints are unchanged on disk.
+
+Generators with a ``select_option`` announce the yaml entry of every footprint (see
+``KicadModTree.util.entry_tracking``). If only the digests of some entries changed, the generator is run for those
+entries alone, which regenerates only their footprints. Footprints which can not be attributed to a single entry
+depend on all yaml files of the generator.
+
+The state is stored in ``kmt_build_state.json`` in the working directory of the generators, next to the ``.pretty``
+libraries, and is checked in together with them. All paths are relative to this directory::
+
+    {"version": 2,
+     "generators": {"Packages/.../ipc_gullwing_generator": {
+         "command": ["ipc_gullwing_generator.py", "size_definitions/qfp.yaml"],
+         "inputs": {"../../../KicadModTree/Vector.py": "0c5f...", ...},
+         "entries": {"size_definitions/qfp.yaml": {"file": "77e1...",
+                                                   "entries": {"LQFP-32_7x7mm_P0.8mm": "a03e...", ...}}},
+         "footprints": {"Package_QFP.pretty/LQFP-32_7x7mm_P0.8mm.kicad_mod": {
+             "entry": ["size_definitions/qfp.yaml", "LQFP-32_7x7mm_P0.8mm"],
+             "inputs": "5b2d...", "output": "9d81..."}, ...}}}}
+"""
+
+import hashlib
+import json
+import os
+
+import yaml
+
+STATE_FILE = 'kmt_build_state.json'
+_STATE_VERSION = 2
+
+SKIP = 'skip'
+FULL = 'full'
+PARTIAL = 'partial'
+
+
+def fileDigest(path):
+    r"""Get the sha256 hex digest of a file
+
+    :param path: path of the file
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for block in iter(lambda: stream.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entryDigests(path, shared_entries=()):
+    r"""Get a digest of every top level entry of a yaml file
+
+    The digest of a shared entry is part of the digest of all other entries, so changing it changes all of them.
+
+    :param path: path of the yaml file
+    :param shared_entries: names of entries used by all other entries
+    :return: dict from entry name to sha256 hex digest, or None if the file is no mapping of entries
+    """
+    with open(path, 'r') as stream:
+        data = yaml.safe_load(stream)
+    if not isinstance(data, dict):
+        return None
+
+    def digest(value, prefix=''):
+        text = prefix + json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    shared = digest([data.get(key) for key in shared_entries])
+    return {str(key): digest(value, shared) for key, value in data.items() if key not in shared_entries}
+
+
+class BuildPlan(object):
+    r"""What has to be done to bring the output of a generator up to date
+
+    :param generator: the Generator
+    :param mode: ``SKIP``, ``FULL`` or ``PARTIAL``
+    :param reason: human readable reason of the decision
+    :param args: arguments of a partial run (None: arguments of the manifest)
+    :param entries: dict from yaml file to the names of the entries rebuilt by a partial run
+    :param footprints: footprints whose digest changed, relative to the working directory
+    """
+
+    def __init__(self, generator, mode, reason, args=None, entries=None, footprints=None):
+        self.generator = generator
+        self.mode = mode
+        self.reason = reason
+        self.args = args
+        self.entries = entries or {}
+        self.footprints = footprints or []
+
+    def __repr__(self):
+        return "BuildPlan({}, {}, {})".format(self.generator.name, self.mode, self.reason)
+
+
+def _textDigest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _entryNames(entries, entry_file):
+    # digests of the entries of a yaml file, by entry name
+    return entries.get(entry_file, {}).get('entries') or {}
+
+
+class BuildState(object):
+    r"""Input digests of the footprints of the generators which run in a directory
+
+    :param directory: working directory of the generators, the state file in it is read if it exists
+
+    :Example:
+
+    >>> from KicadModTree.build import *
+    >>> generators = loadManifest('scripts/generators.yaml')
+    >>> plans = [BuildState(g.cwd).plan(g) for g in generators]
+    """
+
+    def __init__(self, directory):
+        self.base_dir = os.path.realpath(directory)
+        self.path = os.path.join(self.base_dir, STATE_FILE)
+        self.generators = {}
+        self._digests = {}
+
+        if os.path.isfile(self.path):
+            with open(self.path, 'r') as stream:
+                data = json.load(stream)
+            # states of other versions are ignored, which results in a full build
+            if data.get('version') == _STATE_VERSION:
+                self.generators = data.get('generators', {})
+
+    def save(self):
+        r"""Write the state file, if there is a state to store"""
+        if not self.generators and not os.path.isfile(self.path):
+            return
+        with open(self.path, 'w') as stream:
+            json.dump({'version': _STATE_VERSION, 'generators': self.generators}, stream, indent=1, sort_keys=True)
+            stream.write('\n')
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.realpath(path), self.base_dir).replace(os.sep, '/')
+
+    def _absolute(self, path):
+        return os.path.join(self.base_dir, *path.split('/'))
+
+    def _digest(self, path):
+        # many generators share the same modules, every file is only hashed once per build
+        if path not in self._digests:
+            self._digests[path] = fileDigest(path) if os.path.isfile(path) else None
+        return self._digests[path]
+
+    def _changedFile(self, files):
+        for path, digest in sorted(files.items()):
+            if self._digest(self._absolute(path)) != digest:
+                return path
+        return None
+
+    def _command(self, generator):
+        return generator.commandLine('python')[1:]
+
+    def _entries(self, generator):
+        # digests of the yaml files and their entries, by file relative to the state directory
+        entries = {}
+        for entry_file in generator.entryFiles():
+            path = os.path.join(generator.cwd, entry_file)
+            entries[self._relative(path)] = {'file': self._digest(path),
+                                             'entries': entryDigests(path, generator.shared_entries)}
+        return entries
+
+    @staticmethod
+    def _footprintDigest(inputs, entry, entries):
+        # a footprint of a single entry depends on the digest of this entry, all others on the whole yaml files
+        if entry is None:
+            return _textDigest([inputs, sorted((f, e['file']) for f, e in entries.items())])
+        return _textDigest([inputs, entry, _entryNames(entries, entry[0]).get(entry[1])])
+
+    def plan(self, generator):
+        r"""Decide if the generator has to run, and for which entries
+
+        :param generator: the Generator
+        :return: BuildPlan
+        """
+        state = self.generators.get(generator.name)
+        if generator.script is None:
+            return BuildPlan(generator, FULL, 'dependencies of commands are not tracked')
+        if state is None:
+            return BuildPlan(generator, FULL, 'no previous build')
+        if state.get('command') != self._command(generator):
+            return BuildPlan(generator, FULL, 'command line changed')
+
+        changed = self._changedFile(state['inputs'])
+        if changed is not None:
+            return BuildPlan(generator, FULL, 'input changed: {}'.format(changed))
+
+        inputs = _textDigest(state['inputs'])
+        entries = self._entries(generator)
+        stale = []
+        generated = 0
+        for output, footprint in sorted(state['footprints'].items()):
+            entry = footprint['entry']
+            if entry is not None and entry[1] not in _entryNames(entries, entry[0]):
+                continue  # the entry was removed, its footprint is no longer generated
+            generated += 1
+            if (self._digest(self._absolute(output)) != footprint['output'] or
+                    self._footprintDigest(inputs, entry, entries) != footprint['inputs']):
+                stale.append(output)
+
+        # new entries have no footprints yet
+        rebuilt = {}
+        for entry_file in entries:
+            names = set(_entryNames(entries, entry_file)) - set(_entryNames(state['entries'], entry_file))
+            if names:
+                rebuilt[entry_file] = names
+
+        if not stale and not rebuilt:
+            return BuildPlan(generator, SKIP, 'up to date')
+
+        # footprints which depend on whole yaml files can not be rebuilt on their own
+        if len(stale) == generated or any(state['footprints'][o]['entry'] is None for o in stale):
+            removed = [o for o in stale if self._digest(self._absolute(o)) != state['footprints'][o]['output']]
+            reason = 'output changed or removed: {}'.format(removed[0]) if removed else 'yaml files changed'
+            return BuildPlan(generator, FULL, reason, footprints=stale)
+
+        for output in stale:
+            entry_file, name = state['footprints'][output]['entry']
+            rebuilt.setdefault(entry_file, set()).add(name)
+        rebuilt = {f: sorted(names) for f, names in rebuilt.items()}
+
+        names = sorted(set(name for names in rebuilt.values() for name in names))
+        files = set(self._absolute(f) for f in rebuilt)
+        args = [a for a in generator.expandedArgs()
+                if a not in generator.entryFiles() or os.path.realpath(os.path.join(generator.cwd, a)) in files]
+        args += [generator.select_option, ','.join(names)]
+        reason = '{} footprints of changed entries: {}'.format(len(stale), ', '.join(names))
+        return BuildPlan(generator, PARTIAL, reason, args, rebuilt, stale)
+
+    def update(self, plan, record_file):
+        r"""Store the state after a successful run
+
+        :param plan: the BuildPlan which was executed
+        :param record_file: file written by KicadModTree.build.track
+        """
+        generator = plan.generator
+        with open(record_file, 'r') as stream:
+            record = json.load(stream)
+
+        entry_paths = set(os.path.realpath(os.path.join(generator.cwd, f)) for f in generator.entryFiles())
+        for path in record['inputs'] + record['outputs']:
+            self._digests.pop(path, None)
+        inputs = {self._relative(p): self._digest(p) for p in record['inputs'] if p not in entry_paths}
+        entries = self._entries(generator)
+
+        footprints = {}
+        for path in record['outputs']:
+            entry = record['entries'].get(path)
+            if entry is not None:
+                entry = [self._relative(entry[0]), entry[1]]
+                if entry[1] not in _entryNames(entries, entry[0]):
+                    entry = None
+            footprints[self._relative(path)] = {'entry': entry, 'output': self._digest(path),
+                                                'inputs': self._footprintDigest(_textDigest(inputs), entry, entries)}
+
+        state = self.generators.get(generator.name)
+        if plan.mode == PARTIAL and state is not None:
+            # footprints of rebuilt or removed entries which were not written again are no longer generated
+            rebuilt = set((f, name) for f, names in plan.entries.items() for name in names)
+            for output, footprint in list(state['footprints'].items()):
+                entry = footprint['entry']
+                if entry is not None and (tuple(entry) in rebuilt or entry[1] not in _entryNames(entries, entry[0])):
+                    del state['footprints'][output]
+            state['footprints'].update(footprints)
+            state['entries'] = entries
+        else:
+            self.generators[generator.name] = {'command': self._command(generator), 'inputs': inputs,
+                                               'entries': entries, 'footprints': footprints}
+
+    def invalidate(self, generator):
+        r"""Forget the state of a generator, for example after it failed. The next build runs it completely
+
+        :param generator: the Generator
+        """
+        self.generators.pop(generator.name, None)
@@ -0,0 +1,181 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Manifest of the footprint generators of the library
+
+The manifest is a yaml file with a list of generators. Every generator is run in its own working directory,
+because most scripts load their definitions and configuration files relative to it.
+
+.. code-block:: yaml
+
+    generators:
+      - cwd: Packages/Package_Gullwing__QFP_SOIC_SO
+        script: ipc_gullwing_generator.py
+        args: [size_definitions/*.yaml]
+      - cwd: Multicomp
+        command: [bash, create_connectors_multicomp.sh]
+
+Generators which can build a part of their yaml files declare the option which selects the top level entries.
+Incremental builds then only rebuild the changed entries. Entries like a common file header, which are used by all
+other entries, are listed as shared entries:
+
+.. code-block:: yaml
+
+      - cwd: Packages/Package_Gullwing__QFP_SOIC_SO
+        script: ipc_gullwing_generator.py
+        args: [size_definitions/*.yaml]
+        select_option: --only
+        shared_entries: [FileHeader]
+"""
+
+import fnmatch
+import glob
+import os
+import sys
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+
+class ManifestException(Exception):
+    pass
+
+
+def _defaultName(cwd, script, command):
+    program = script if script is not None else command[-1]
+    return cwd.rstrip('/') + '/' + os.path.splitext(os.path.basename(program))[0]
+
+
+class Generator(object):
+    r"""A single footprint generator of the manifest
+
+    :param cwd: absolute working directory of the generator
+    :param script: python script, relative to cwd
+    :param command: command line which is used instead of a script
+    :param args: additional arguments, glob patterns are expanded relative to cwd
+    :param name: unique name (default: cwd/script without extension)
+    :param select_option: option of the script which selects yaml entries, like ``--only`` (takes a comma
+                          separated list of entry names)
+    :param shared_entries: yaml entries used by all other entries of a file
+
+    :Example:
+
+    >>> from KicadModTree.build import Generator
+    >>> gen = Generator('/lib/scripts/Battery', script='BatteryHolder.py', args=['BatteryHolder.yml'])
+    >>> gen.commandLine(python='python3')
+    ['python3', 'BatteryHolder.py', 'BatteryHolder.yml']
+    """
+
+    def __init__(self, cwd, script=None, command=None, args=None, name=None, select_option=None,
+                 shared_entries=None):
+        if (script is None) == (command is None):
+            raise ManifestException("generator in '{}' needs either a script or a command".format(cwd))
+
+        self.cwd = cwd
+        self.script = script
+        self.command = list(command) if command is not None else None
+        self.args = [str(a) for a in args] if args is not None else []
+
+        self.name = name if name is not None else _defaultName(cwd, script, self.command)
+        self.select_option = select_option
+        self.shared_entries = list(shared_entries) if shared_entries is not None else []
+
+    def expandedArgs(self):
+        r"""Get the arguments, with glob patterns replaced by the matching files (sorted)"""
+        result = []
+        for arg in self.args:
+            if glob.has_magic(arg):
+                matches = sorted(glob.glob(os.path.join(self.cwd, arg)))
+                result.extend(os.path.relpath(m, self.cwd) for m in matches)
+            else:
+                result.append(arg)
+        return result
+
+    def entryFiles(self):
+        r"""Get the yaml files of the arguments, whose entries can be selected with the select option"""
+        if self.select_option is None:
+            return []
+        return [a for a in self.expandedArgs() if a.endswith(('.yaml', '.yml')) and
+                os.path.isfile(os.path.join(self.cwd, a))]
+
+    def commandLine(self, python=None, args=None, record=None):
+        r"""Get the command line of the generator
+
+        :param python: python interpreter used for scripts (default: the current interpreter)
+        :param args: arguments used instead of the arguments of the manifest
+        :param record: run the script with ``KicadModTree.build.track`` and record its inputs and outputs in
+                       this file
+        """
+        args = self.expandedArgs() if args is None else list(args)
+        if self.script is None:
+            return self.command + args
+        if record is not None:
+            return [python or sys.executable, '-m', 'KicadModTree.build.track', record, self.script] + args
+        return [python or sys.executable, self.script] + args
+
+    def __repr__(self):
+        return "Generator({})".format(self.name)
+
+
+def loadManifest(path):
+    r"""Load the generators of a manifest file
+
+    Working directories are resolved relative to the directory of the manifest.
+
+    :param path: path of the manifest file
+    :return: list of Generator, in the order of the manifest
+    """
+    if not YAML_AVAILABLE:
+        raise ManifestException("pyyaml is required to load the manifest")
+
+    with open(path, 'r') as stream:
+        data = yaml.safe_load(stream) or {}
+
+    base = os.path.dirname(os.path.abspath(path))
+    generators = []
+    names = set()
+    for entry in data.get('generators', []):
+        if 'cwd' not in entry:
+            raise ManifestException("generator without cwd in '{}': {}".format(path, entry))
+
+        script, command = entry.get('script'), entry.get('command')
+        if (script is None) == (command is None):
+            raise ManifestException("generator in '{}' needs either a script or a command".format(entry['cwd']))
+
+        # default names are relative to the manifest
+        name = entry.get('name') or _defaultName(entry['cwd'], script, command)
+        generator = Generator(os.path.normpath(os.path.join(base, entry['cwd'])), script=script, command=command,
+                              args=entry.get('args'), name=name, select_option=entry.get('select_option'),
+                              shared_entries=entry.get('shared_entries'))
+        if generator.name in names:
+            raise ManifestException("duplicate generator name '{}' in '{}'".format(generator.name, path))
+        names.add(generator.name)
+        generators.append(generator)
+
+    return generators
+
+
+def filterGenerators(generators, patterns):
+    r"""Get the generators whose name matches any of the patterns
+
+    :param generators: list of Generator
+    :param patterns: list of fnmatch patterns (like Packages/*). All generators are returned if empty
+    """
+    if not patterns:
+        return list(generators)
+    return [g for g in generators if any(fnmatch.fnmatch(g.name, p) for p in patterns)]
@@ -0,0 +1,256 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Semantic difference of two .kicad_mod files
+
+Instead of changed lines, the difference is described by primitives: pads are matched by their number, all other
+primitives by type, layer and their attributes. A primitive which only changed its coordinates is reported as moved.
+
+:Example:
+
+>>> from KicadModTree.build.moddiff import diffKicadMod, formatDiff
+>>> print(formatDiff(diffKicadMod(old_text, new_text)))
+  ~ pad 2 smd rect (at 1.27 0) (size 1 1.5) (layers F.Cu F.Mask F.Paste)
+    pad 2 smd rect (at 1.27 0) (size 1.2 1.5) (layers F.Cu F.Mask F.Paste)
+  > pad 1 smd rect (at -1.27 0) (size 1 1.5) (layers F.Cu F.Mask F.Paste): moved by (-0.03 0)
+  - fp_circle F.SilkS (center -2 0) (end -1.9 0) (width 0.12)
+  + fp_text F.Fab user %R (at 0 0) (effects (font (size 1 1) (thickness 0.15)))
+"""
+
+from KicadModTree.util.kicad_util import parseLispString
+
+# attributes of the module itself, all other items are primitives
+_HEADER_ITEMS = {'layer', 'tedit', 'descr', 'tags', 'attr', 'solder_mask_margin', 'solder_paste_margin',
+                 'solder_paste_ratio', 'autoplace_cost90', 'autoplace_cost180', 'clearance', 'zone_connect'}
+
+# attributes which contain the position of a primitive
+_COORDINATES = {'at', 'start', 'end', 'center', 'pts', 'xy', 'mid'}
+
+
+class ModuleDiff(object):
+    r"""Differences between two footprints
+
+    :param added: primitives only in the new footprint
+    :param removed: primitives only in the old footprint
+    :param moved: (old, new) primitives with different coordinates only
+    :param changed: (old, new) pads with the same number but different attributes
+    :param header: (attribute, old, new) of changed module attributes
+    """
+
+    def __init__(self, added=None, removed=None, moved=None, changed=None, header=None):
+        self.added = added or []
+        self.removed = removed or []
+        self.moved = moved or []
+        self.changed = changed or []
+        self.header = header or []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.moved or self.changed or self.header)
+
+    def asDict(self):
+        return {'added': [formatPrimitive(p) for p in self.added],
+                'removed': [formatPrimitive(p) for p in self.removed],
+                'moved': [[formatPrimitive(o), formatPrimitive(n)] for o, n in self.moved],
+                'changed': [[formatPrimitive(o), formatPrimitive(n)] for o, n in self.changed],
+                'header': [list(h) for h in self.header]}
+
+
+def _normalize(value):
+    # numbers are compared by value, so '1.0' and '1' are the same
+    if isinstance(value, list):
+        return tuple(_normalize(v) for v in value)
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _attribute(primitive, name):
+    for item in primitive[1:]:
+        if isinstance(item, tuple) and item and item[0] == name:
+            return item
+    return None
+
+
+def _layer(primitive):
+    layer = _attribute(primitive, 'layer') or _attribute(primitive, 'layers')
+    return ' '.join(str(v) for v in layer[1:]) if layer else ''
+
+
+def _withoutCoordinates(primitive):
+    return tuple(item for item in primitive if not (isinstance(item, tuple) and item and item[0] in _COORDINATES))
+
+
+def _firstPoint(primitive):
+    for item in primitive[1:]:
+        if isinstance(item, tuple) and item and item[0] in _COORDINATES:
+            while isinstance(item[1], tuple):
+                item = item[1]
+            numbers = [v for v in item[1:] if isinstance(v, float)]
+            if len(numbers) >= 2:
+                return numbers[0], numbers[1]
+    return 0.0, 0.0
+
+
+def formatPrimitive(primitive):
+    r"""Get a short text of a parsed primitive, like ``fp_line F.SilkS (start 0 0) (end 1 0) (width 0.12)``"""
+    def text(value):
+        if isinstance(value, tuple):
+            return '(' + ' '.join(text(v) for v in value) + ')'
+        if isinstance(value, float):
+            return '{:g}'.format(value)
+        return str(value)
+
+    if primitive[0] == 'pad':
+        return 'pad {} '.format(text(primitive[1])) + ' '.join(text(v) for v in primitive[2:])
+
+    items = [text(v) for v in primitive[1:] if not (isinstance(v, tuple) and v and v[0] == 'layer')]
+    return ' '.join([primitive[0], _layer(primitive)] + items)
+
+
+def parseKicadMod(text):
+    r"""Split a .kicad_mod file into module attributes and primitives
+
+    :param text: content of the file
+    :return: (name, dict of module attributes, list of primitives as nested tuples)
+    """
+    module = parseLispString(text)
+    if not module or module[0] != 'module':
+        raise ValueError("not a .kicad_mod file")
+
+    header = {}
+    primitives = []
+    for item in module[2:]:
+        if not isinstance(item, list) or not item:
+            continue
+        if item[0] in _HEADER_ITEMS:
+            header[item[0]] = ' '.join(str(v) for v in item[1:])
+        else:
+            primitives.append(_normalize(item))
+    return module[1], header, primitives
+
+
+def _pairMoved(removed, added):
+    # primitives which are equal except of their coordinates are moved, the nearest ones are paired
+    groups = {}
+    for index, primitive in enumerate(added):
+        groups.setdefault(_withoutCoordinates(primitive), []).append(index)
+
+    moved = []
+    still_removed = []
+    paired = set()
+    for primitive in removed:
+        candidates = groups.get(_withoutCoordinates(primitive))
+        if not candidates:
+            still_removed.append(primitive)
+            continue
+        x, y = _firstPoint(primitive)
+        nearest = min(candidates, key=lambda i: (_firstPoint(added[i])[0] - x) ** 2 +
+                                                (_firstPoint(added[i])[1] - y) ** 2)
+        candidates.remove(nearest)
+        paired.add(nearest)
+        moved.append((primitive, added[nearest]))
+
+    return moved, still_removed, [p for i, p in enumerate(added) if i not in paired]
+
+
+def diffKicadMod(old_text, new_text):
+    r"""Get the semantic difference of two .kicad_mod files
+
+    :param old_text: content of the old file
+    :param new_text: content of the new file
+    :return: ModuleDiff
+    """
+    old_name, old_header, old_primitives = parseKicadMod(old_text)
+    new_name, new_header, new_primitives = parseKicadMod(new_text)
+
+    header = []
+    if old_name != new_name:
+        header.append(('name', old_name, new_name))
+    for key in sorted(set(old_header) | set(new_header)):
+        if key != 'tedit' and old_header.get(key) != new_header.get(key):
+            header.append((key, old_header.get(key), new_header.get(key)))
+
+    # pads are identified by their number (and their position in the file, if numbers are used more than once)
+    def padKeys(primitives):
+        keys = {}
+        counts = {}
+        for primitive in primitives:
+            if primitive[0] == 'pad':
+                number = primitive[1]
+                counts[number] = counts.get(number, 0) + 1
+                keys[(number, counts[number])] = primitive
+        return keys
+
+    old_pads = padKeys(old_primitives)
+    new_pads = padKeys(new_primitives)
+
+    diff = ModuleDiff(header=header)
+    unmatched_old = []
+    unmatched_new = []
+    for key in old_pads:
+        if key not in new_pads:
+            unmatched_old.append(old_pads[key])
+        elif old_pads[key] != new_pads[key]:
+            old, new = old_pads[key], new_pads[key]
+            if _withoutCoordinates(old) == _withoutCoordinates(new):
+                diff.moved.append((old, new))
+            else:
+                diff.changed.append((old, new))
+    unmatched_new.extend(new_pads[key] for key in new_pads if key not in old_pads)
+
+    # all other primitives are compared as multiset
+    remaining = {}
+    for primitive in new_primitives:
+        if primitive[0] != 'pad':
+            remaining[primitive] = remaining.get(primitive, 0) + 1
+    for primitive in old_primitives:
+        if primitive[0] == 'pad':
+            continue
+        if remaining.get(primitive):
+            remaining[primitive] -= 1
+        else:
+            unmatched_old.append(primitive)
+    for primitive, count in remaining.items():
+        unmatched_new.extend([primitive] * count)
+
+    moved, diff.removed, diff.added = _pairMoved(unmatched_old, unmatched_new)
+    diff.moved.extend(moved)
+    return diff
+
+
+def formatDiff(diff, indent='  '):
+    r"""Get a text of the differences, one line per primitive
+
+    Lines start with ``+`` (added), ``-`` (removed), ``>`` (moved) or ``~`` (changed attributes).
+
+    :param diff: ModuleDiff
+    :param indent: prefix of every line
+    """
+    lines = []
+    for key, old, new in diff.header:
+        lines.append('{}~ {}: {} -> {}'.format(indent, key, old, new))
+    for old, new in diff.changed:
+        lines.append('{}~ {}'.format(indent, formatPrimitive(old)))
+        lines.append('{}  {}'.format(indent, formatPrimitive(new)))
+    for old, new in diff.moved:
+        old_point, new_point = _firstPoint(old), _firstPoint(new)
+        lines.append('{}> {}: moved by ({:g} {:g})'.format(
+            indent, formatPrimitive(old), new_point[0] - old_point[0], new_point[1] - old_point[1]))
+    for primitive in diff.removed:
+        lines.append('{}- {}'.format(indent, formatPrimitive(primitive)))
+    for primitive in diff.added:
+        lines.append('{}+ {}'.format(indent, formatPrimitive(primitive)))
+    return '\n'.join(lines)
@@ -0,0 +1,181 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Run footprint generators in parallel
+
+Every generator is started as its own process in its working directory. The pool only waits for those
+processes, so the number of parallel generators is limited by the number of jobs and not by the GIL.
+"""
+
+from __future__ import division
+
+import json
+import multiprocessing
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# directory containing the KicadModTree package, added to the PYTHONPATH of the generators
+_REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class GeneratorResult(object):
+    r"""Outcome of a single generator run
+
+    :param name: name of the generator
+    :param returncode: exit code of the process, None if it could not be started or timed out
+    :param duration: run time in seconds
+    :param log_file: file containing stdout and stderr of the generator
+    :param error: description of the failure, if the process could not be started or timed out
+    """
+
+    def __init__(self, name, returncode, duration, log_file, error=None):
+        self.name = name
+        self.returncode = returncode
+        self.duration = duration
+        self.log_file = log_file
+        self.error = error
+
+    @property
+    def success(self):
+        return self.returncode == 0
+
+    def asDict(self):
+        return {'name': self.name, 'success': self.success, 'returncode': self.returncode,
+                'duration': round(self.duration, 3), 'log_file': self.log_file, 'error': self.error}
+
+
+def _logFileName(name):
+    return name.replace('/', '__').replace(os.sep, '__') + '.log'
+
+
+def generatorEnvironment(python_path=None):
+    r"""Get the environment of the generator processes
+
+    The KicadModTree repository is prepended to the PYTHONPATH, so generators also work without their own
+    sys.path modifications.
+    """
+    env = dict(os.environ)
+    paths = [python_path or _REPOSITORY_DIR]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    return env
+
+
+def runGenerator(generator, log_dir, python=None, timeout=None, env=None, args=None, record=None):
+    r"""Run a single generator and capture its output
+
+    :param generator: the Generator to run
+    :param log_dir: directory where the log file is written
+    :param python: python interpreter for scripts (default: the current interpreter)
+    :param timeout: maximum run time in seconds
+    :param env: environment of the process (default: generatorEnvironment())
+    :param args: arguments used instead of the arguments of the manifest
+    :param record: file where the inputs and outputs of the script are recorded (see KicadModTree.build.track)
+    :return: GeneratorResult
+    """
+    log_file = os.path.join(log_dir, _logFileName(generator.name))
+    command = generator.commandLine(python, args, record)
+    start = time.time()
+    returncode = None
+    error = None
+
+    with open(log_file, 'w') as log:
+        log.write("# cwd: {}\n# command: {}\n".format(generator.cwd, ' '.join(command)))
+        log.flush()
+        try:
+            process = subprocess.Popen(command, cwd=generator.cwd, stdout=log, stderr=subprocess.STDOUT,
+                                       env=env if env is not None else generatorEnvironment())
+        except OSError as e:
+            error = "could not start: {}".format(e)
+        else:
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                error = "timeout after {} s".format(timeout)
+
+        if error is not None:
+            log.write("# {}\n".format(error))
+
+    return GeneratorResult(generator.name, returncode, time.time() - start, log_file, error)
+
+
+def buildLibrary(generators, log_dir, jobs=None, python=None, timeout=None, callback=None, options=None, env=None):
+    r"""Run many generators in parallel
+
+    :param generators: list of Generator
+    :param log_dir: directory for the log files, created if it does not exist
+    :param jobs: number of parallel generators (default: number of CPUs)
+    :param python: python interpreter for scripts (default: the current interpreter)
+    :param timeout: maximum run time of a single generator in seconds
+    :param callback: function called with every GeneratorResult as soon as the generator finished
+    :param options: dict from generator name to additional keyword arguments of runGenerator()
+    :param env: environment of the processes (default: generatorEnvironment())
+    :return: list of GeneratorResult, in the order of the generators
+    """
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir)
+
+    jobs = jobs or multiprocessing.cpu_count()
+    if env is None:
+        env = generatorEnvironment()
+
+    def run(generator):
+        result = runGenerator(generator, log_dir, python, timeout, env, **(options or {}).get(generator.name, {}))
+        if callback is not None:
+            callback(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run, generators))
+
+
+def formatSummary(results, duration=None):
+    r"""Get a human readable summary of a build
+
+    :param results: list of GeneratorResult
+    :param duration: wall time of the whole build in seconds
+    """
+    failed = [r for r in results if not r.success]
+    lines = []
+    if failed:
+        lines.append("Failed generators:")
+        for r in failed:
+            reason = r.error or "exit code {}".format(r.returncode)
+            lines.append("  {:<60} {} (log: {})".format(r.name, reason, r.log_file))
+
+    slowest = sorted(results, key=lambda r: r.duration, reverse=True)[:5]
+    if slowest:
+        lines.append("Slowest generators:")
+        for r in slowest:
+            lines.append("  {:<60} {:8.2f} s".format(r.name, r.duration))
+
+    total = "{} generators, {} succeeded, {} failed".format(len(results), len(results) - len(failed), len(failed))
+    if duration is not None:
+        cpu_time = sum(r.duration for r in results)
+        total += ", {:.1f} s wall time ({:.1f} s generator time)".format(duration, cpu_time)
+    lines.append(total)
+    return '\n'.join(lines)
+
+
+def writeSummary(results, path, duration=None):
+    r"""Write the results of a build as json file"""
+    data = {'duration': duration, 'generators': [r.asDict() for r in results]}
+    with open(path, 'w') as stream:
+        json.dump(data, stream, indent=2, sort_keys=True)
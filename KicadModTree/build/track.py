@@ -0,0 +1,130 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Run a generator script and record the files it depends on
+
+Usage: python -m KicadModTree.build.track RECORD_FILE SCRIPT [ARGS...]
+
+The script is run like python SCRIPT ARGS... would do it. Afterwards a json file is written which contains
+all files the script has read (including the python modules it imported) and all files it has written.
+Files of the python installation itself are not recorded. Written files are attributed to the yaml entry announced
+by the script with ``KicadModTree.util.entry_tracking.generatingEntry`` while they were written.
+"""
+
+import builtins
+import io
+import json
+import os
+import runpy
+import sys
+import sysconfig
+
+from KicadModTree.util.entry_tracking import setEntryListener
+
+# files below these directories belong to the python installation, not to the library
+_IGNORED_PREFIXES = tuple(os.path.realpath(p) + os.sep for p in set(
+    [sysconfig.get_paths()[k] for k in ('stdlib', 'platstdlib', 'purelib', 'platlib')] + [sys.prefix, sys.base_prefix]))
+
+# the KicadModTree package is always recorded, even if it is installed. The build tool itself is not an input
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + os.sep
+_BUILD_DIR = os.path.dirname(os.path.realpath(__file__)) + os.sep
+
+
+def _isLibraryFile(path):
+    if path.startswith(_BUILD_DIR):
+        return False
+    return path.startswith(_PACKAGE_DIR) or not path.startswith(_IGNORED_PREFIXES)
+
+
+class _FileTracker(object):
+
+    def __init__(self):
+        self.read = set()
+        self.written = set()
+        self.entries = {}
+        self._entry = None
+        self._open = builtins.open
+
+    def generatingEntry(self, filepath, name):
+        self._entry = (os.path.realpath(filepath), str(name))
+
+    def open(self, file, mode='r', *args, **kwargs):
+        f = self._open(file, mode, *args, **kwargs)
+        if isinstance(file, (str, bytes)) and not isinstance(file, int):
+            path = os.path.realpath(file)
+            if any(m in mode for m in 'wax+'):
+                self.written.add(path)
+                self.entries.setdefault(path, set()).add(self._entry)
+            else:
+                self.read.add(path)
+        return f
+
+    def install(self):
+        builtins.open = self.open
+        io.open = self.open
+        setEntryListener(self.generatingEntry)
+
+    def uninstall(self):
+        builtins.open = self._open
+        io.open = self._open
+        setEntryListener(None)
+
+    def record(self):
+        modules = set()
+        for module in list(sys.modules.values()):
+            path = getattr(module, '__file__', None)
+            if path and path.endswith('.py'):
+                modules.add(os.path.realpath(path))
+
+        inputs = (self.read | modules) - self.written
+        outputs = sorted(p for p in self.written if os.path.isfile(p))
+        # a file written for several entries, or outside of any entry, depends on all of them
+        entries = {}
+        for path in outputs:
+            if len(self.entries[path]) == 1 and None not in self.entries[path]:
+                entries[path] = list(next(iter(self.entries[path])))
+        return {'inputs': sorted(p for p in inputs if os.path.isfile(p) and _isLibraryFile(p)),
+                'outputs': outputs, 'entries': entries}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        sys.stderr.write("usage: python -m KicadModTree.build.track RECORD_FILE SCRIPT [ARGS...]\n")
+        return 2
+
+    record_file, script = argv[0], argv[1]
+
+    # behave like the script was started directly, generators use sys.path[0] to find their tools
+    sys.argv = [script] + argv[2:]
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+
+    tracker = _FileTracker()
+    tracker.read.add(os.path.realpath(script))
+    tracker.install()
+    code = 0
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        tracker.uninstall()
+        with open(record_file, 'w') as stream:
+            json.dump(tracker.record(), stream, indent=1)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
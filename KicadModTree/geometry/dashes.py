@@ -0,0 +1,126 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Dash patterns for lines, arcs and circles
+
+The position of every dash is calculated directly from its number. The visible parts of the whole line
+are calculated once (see ``KicadModTree.geometry.keepout``) and intersected with all dashes in a single
+sweep, so keepouts cut dashes exactly instead of dropping them.
+
+Dash and gap are lengths in mm, measured along the line or arc. The first dash starts at the start point,
+the last dash is shortened to end at the end point.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> dashIntervals(0, 5, 1, 1)
+[[0, 1], [2, 3], [4, 5]]
+>>> dashSegment((0, 0), (5, 0), 1, 1, [KeepoutRect(2.5, 3.5, -1, 1)])
+[((0.0, 0.0), (1.0, 0.0)), ((2.0, 0.0), (2.5, 0.0)), ((4.0, 0.0), (5.0, 0.0))]
+"""
+
+from __future__ import division
+
+import math
+
+from .intervals import intersectIntervals
+from .keepout import _visibleSegmentParams, _visibleArcParams
+
+# remaining line lengths shorter than this (in mm) do not start a new dash
+_MIN_LENGTH = 1e-9
+
+
+def dashIntervals(start, end, dash, gap):
+    r"""Get the dashes of a line along one axis
+
+    :param start: start of the line
+    :param end: end of the line, start <= end
+    :param dash: length of a dash
+    :param gap: length of the gap between two dashes
+    :return: list of [start, end] ranges of the dashes
+    """
+    period = dash + gap
+    if period <= 0:
+        raise ValueError("dash and gap must not both be zero")
+
+    count = int(math.ceil((end - start - _MIN_LENGTH) / period))
+    return [[start + i * period, min(start + i * period + dash, end)] for i in range(max(count, 0))]
+
+
+def dashSegment(start, end, dash, gap, keepouts=None):
+    r"""Get the dashes of a line which are outside of all keepouts
+
+    :param start: start point of the line
+    :param end: end point of the line
+    :param dash: length of a dash
+    :param gap: length of the gap between two dashes
+    :param keepouts: list of keepout areas or a KeepoutIndex
+    :return: list of ((x_start, y_start), (x_end, y_end)) in the direction of the line
+    """
+    x0, y0 = float(start[0]), float(start[1])
+    x1, y1 = float(end[0]), float(end[1])
+    length = math.hypot(x1 - x0, y1 - y0)
+    if length <= _MIN_LENGTH:
+        return []
+
+    dashes = dashIntervals(0., length, dash, gap)
+    if keepouts:
+        visible = [[t0 * length, t1 * length] for t0, t1 in _visibleSegmentParams(x0, y0, x1, y1, keepouts)]
+        dashes = intersectIntervals(dashes, visible)
+
+    dx, dy = (x1 - x0) / length, (y1 - y0) / length
+    return [((x0 + dx * d0, y0 + dy * d0), (x0 + dx * d1, y0 + dy * d1)) for d0, d1 in dashes]
+
+
+def dashArc(center, radius, start_angle, angle, dash, gap, keepouts=None):
+    r"""Get the dashes of an arc which are outside of all keepouts
+
+    :param center: center of the arc
+    :param radius: radius of the arc
+    :param start_angle: angle of the start point (degree)
+    :param angle: angle covered by the arc (degree, can be negative)
+    :param dash: length of a dash
+    :param gap: length of the gap between two dashes
+    :param keepouts: list of keepout areas or a KeepoutIndex
+    :return: list of (start_angle, angle) tuples, in the direction of the arc
+    """
+    if radius <= 0:
+        return []
+
+    direction = 1 if angle >= 0 else -1
+    a0 = math.radians(start_angle)
+    sweep = math.radians(abs(angle))
+
+    # work with angles in radian, dash and gap are converted from the arc length
+    dashes = dashIntervals(0., sweep, dash / radius, gap / radius)
+    if keepouts:
+        visible = _visibleArcParams(float(center[0]), float(center[1]), radius, a0, sweep, direction, keepouts)
+        dashes = intersectIntervals(dashes, visible)
+
+    return [(math.degrees(a0 + direction * s0), direction * math.degrees(s1 - s0)) for s0, s1 in dashes]
+
+
+def dashCircle(center, radius, dash, gap, keepouts=None, start_angle=0):
+    r"""Get the dashes of a circle which are outside of all keepouts
+
+    :param center: center of the circle
+    :param radius: radius of the circle
+    :param dash: length of a dash
+    :param gap: length of the gap between two dashes
+    :param keepouts: list of keepout areas or a KeepoutIndex
+    :param start_angle: angle where the first dash starts (degree)
+    :return: list of (start_angle, angle) tuples
+    """
+    return dashArc(center, radius, start_angle, 360, dash, gap, keepouts)
@@ -0,0 +1,102 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Operations on sorted one dimensional intervals
+
+Used to clip lines against keepouts: every keepout covers a single range of a line, so clipping
+reduces to subtracting sorted intervals, which is done in a single sweep.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> subtractIntervals([[-3, 3]], [(-0.5, 0.5), (1.5, 2.5)])
+[[-3, -0.5], [0.5, 1.5], [2.5, 3]]
+"""
+
+# covered ranges and remaining pieces shorter than this (in mm) are ignored
+_MIN_LENGTH = 1e-9
+
+
+def mergeIntervals(intervals):
+    r"""Merge overlapping intervals
+
+    :param intervals: list of (start, end) tuples, start <= end
+    :return: sorted list of disjoint [start, end] lists
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtractIntervals(lines, intervals):
+    r"""Remove the intervals from the lines
+
+    Both lists are sorted once, afterwards lines and intervals are walked in parallel.
+
+    :param lines: list of [start, end] ranges, start <= end
+    :param intervals: list of (start, end) ranges which are removed from the lines
+    :return: sorted list of the remaining [start, end] ranges
+    """
+    blocked = mergeIntervals(i for i in intervals if i[1] - i[0] > _MIN_LENGTH)
+    result = []
+    first = 0
+    for start, end in sorted(lines):
+        # blocked ranges ending before this line can not touch any of the following lines
+        while first < len(blocked) and blocked[first][1] < start:
+            first += 1
+
+        position = start
+        for i in range(first, len(blocked)):
+            i_start, i_end = blocked[i]
+            if i_start > end:
+                break
+            if i_start > position:
+                result.append([position, i_start])
+            position = max(position, i_end)
+            if position >= end:
+                break
+        if end - position > _MIN_LENGTH:
+            result.append([position, end])
+    return result
+
+
+def intersectIntervals(lines, intervals):
+    r"""Get the parts of the lines which are inside of the intervals
+
+    Both lists are sorted once, afterwards lines and intervals are walked in parallel.
+
+    :param lines: list of [start, end] ranges, start <= end
+    :param intervals: list of (start, end) ranges which are kept
+    :return: sorted list of the remaining [start, end] ranges
+    """
+    kept = mergeIntervals(i for i in intervals if i[1] - i[0] > _MIN_LENGTH)
+    result = []
+    first = 0
+    for start, end in sorted(lines):
+        while first < len(kept) and kept[first][1] < start:
+            first += 1
+
+        for i in range(first, len(kept)):
+            i_start, i_end = kept[i]
+            if i_start > end:
+                break
+            if min(end, i_end) - max(start, i_start) > _MIN_LENGTH:
+                result.append([max(start, i_start), min(end, i_end)])
+    return result
@@ -0,0 +1,584 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Exact clipping of lines, arcs and circles against keepout areas
+
+Keepout areas are convex shapes (``KeepoutRect``, ``KeepoutCircle``, ``KeepoutRoundRect``). Wherever keepouts
+are expected, the legacy list format ``[x_min, x_max, y_min, y_max]`` of the drawing
+tools is accepted as well. For footprints with many pads, collect the keepouts in a ``KeepoutIndex``:
+the clipping functions then only look at the keepouts near the clipped line.
+
+Angles follow the convention of the ``Arc`` node: they are given in degrees, measured like
+``atan2(y, x)`` in the footprint coordinate system and an arc covers the angles from its
+start angle to start angle + angle.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> keepouts = [KeepoutRect(-0.5, 0.5, -0.5, 0.5), KeepoutCircle(2, 0, 0.5)]
+>>> clipSegment((-3, 0), (3, 0), keepouts)
+[((-3.0, 0.0), (-0.5, 0.0)), ((0.5, 0.0), (1.5, 0.0)), ((2.5, 0.0), (3.0, 0.0))]
+>>> clipCircle((0, 0), 1, keepouts)
+"""
+
+from __future__ import division
+
+import math
+
+from .intervals import mergeIntervals, subtractIntervals
+from .spatial_index import SpatialIndex
+
+_INFINITY = float('inf')
+
+# visible parts shorter than this (in mm or degrees) are dropped
+_MIN_LENGTH = 1e-9
+
+# pieces of clipped lines and arcs shorter than this (in mm) are dropped, they are not visible on the silkscreen
+_MIN_FRAGMENT_LENGTH = 0.1
+
+# clipLines() builds a spatial index for keepout lists longer than this
+_INDEX_THRESHOLD = 8
+
+
+class KeepoutRect(object):
+    r"""Axis aligned rectangular keepout area
+
+    :param x_min: left border
+    :param x_max: right border
+    :param y_min: top border
+    :param y_max: bottom border
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> KeepoutRect(-1, 1, -0.5, 0.5)
+    """
+
+    def __init__(self, x_min, x_max, y_min, y_max):
+        self.x_min, self.x_max = min(x_min, x_max), max(x_min, x_max)
+        self.y_min, self.y_max = min(y_min, y_max), max(y_min, y_max)
+
+    def contains(self, x, y):
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
+
+    def hlineInterval(self, y):
+        r"""Part of the horizontal line at y which is covered: (x_start, x_end) or None
+
+        Lines on the border only touch the keepout and are not covered.
+        """
+        if self.y_min < y < self.y_max:
+            return (self.x_min, self.x_max)
+        return None
+
+    def vlineInterval(self, x):
+        r"""Part of the vertical line at x which is covered: (y_start, y_end) or None
+
+        Lines on the border only touch the keepout and are not covered.
+        """
+        if self.x_min < x < self.x_max:
+            return (self.y_min, self.y_max)
+        return None
+
+    def segmentInterval(self, x0, y0, x1, y1):
+        r"""Covered parameter range (t_start, t_end) of the segment p(t) = p0 + t * (p1 - p0), or None
+
+        The result is not limited to 0 <= t <= 1.
+        """
+        # Liang-Barsky
+        t_start, t_end = -_INFINITY, _INFINITY
+        for p, q_min, q_max in ((x1 - x0, self.x_min - x0, self.x_max - x0),
+                                (y1 - y0, self.y_min - y0, self.y_max - y0)):
+            if p == 0:
+                # lines parallel to and on the border only touch the keepout
+                if q_min >= 0 or q_max <= 0:
+                    return None
+                continue
+            ta, tb = q_min / p, q_max / p
+            if ta > tb:
+                ta, tb = tb, ta
+            t_start, t_end = max(t_start, ta), min(t_end, tb)
+            if t_start > t_end:
+                return None
+        return (t_start, t_end)
+
+    def circleCrossings(self, cx, cy, radius):
+        r"""Angles (radians, atan2 convention) where the circle crosses the border"""
+        angles = []
+        for x in (self.x_min, self.x_max):
+            dx = x - cx
+            if abs(dx) <= radius:
+                dy = math.sqrt(radius * radius - dx * dx)
+                for y in (cy - dy, cy + dy):
+                    if self.y_min <= y <= self.y_max:
+                        angles.append(math.atan2(y - cy, dx))
+        for y in (self.y_min, self.y_max):
+            dy = y - cy
+            if abs(dy) <= radius:
+                dx = math.sqrt(radius * radius - dy * dy)
+                for x in (cx - dx, cx + dx):
+                    if self.x_min <= x <= self.x_max:
+                        angles.append(math.atan2(dy, x - cx))
+        return angles
+
+    def boundingBox(self):
+        return (self.x_min, self.x_max, self.y_min, self.y_max)
+
+    def __repr__(self):
+        return "KeepoutRect({}, {}, {}, {})".format(self.x_min, self.x_max, self.y_min, self.y_max)
+
+
+class KeepoutCircle(object):
+    r"""Circular keepout area
+
+    :param x: x coordinate of the center
+    :param y: y coordinate of the center
+    :param radius: radius of the keepout
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> KeepoutCircle(0, 0, 0.8)
+    """
+
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = abs(radius)
+
+    def contains(self, x, y):
+        return (x - self.x)**2 + (y - self.y)**2 <= self.radius**2
+
+    def hlineInterval(self, y):
+        r"""Part of the horizontal line at y which is covered: (x_start, x_end) or None"""
+        dy = y - self.y
+        if abs(dy) > self.radius:
+            return None
+        dx = math.sqrt(self.radius**2 - dy * dy)
+        return (self.x - dx, self.x + dx)
+
+    def vlineInterval(self, x):
+        r"""Part of the vertical line at x which is covered: (y_start, y_end) or None"""
+        dx = x - self.x
+        if abs(dx) > self.radius:
+            return None
+        dy = math.sqrt(self.radius**2 - dx * dx)
+        return (self.y - dy, self.y + dy)
+
+    def segmentInterval(self, x0, y0, x1, y1):
+        r"""Covered parameter range (t_start, t_end) of the segment p(t) = p0 + t * (p1 - p0), or None
+
+        The result is not limited to 0 <= t <= 1.
+        """
+        dx, dy = x1 - x0, y1 - y0
+        fx, fy = x0 - self.x, y0 - self.y
+        a = dx * dx + dy * dy
+        if a == 0:
+            return (-_INFINITY, _INFINITY) if self.contains(x0, y0) else None
+        b = fx * dx + fy * dy
+        c = fx * fx + fy * fy - self.radius**2
+        discriminant = b * b - a * c
+        if discriminant < 0:
+            return None
+        root = math.sqrt(discriminant)
+        return ((-b - root) / a, (-b + root) / a)
+
+    def circleCrossings(self, cx, cy, radius):
+        r"""Angles (radians, atan2 convention) where the circle crosses the border"""
+        dx, dy = self.x - cx, self.y - cy
+        d = math.hypot(dx, dy)
+        if d == 0 or d > radius + self.radius or d < abs(radius - self.radius):
+            return []
+        base = math.atan2(dy, dx)
+        cos_a = (radius * radius + d * d - self.radius * self.radius) / (2 * radius * d)
+        offset = math.acos(max(-1., min(1., cos_a)))
+        return [base - offset, base + offset]
+
+    def boundingBox(self):
+        return (self.x - self.radius, self.x + self.radius, self.y - self.radius, self.y + self.radius)
+
+    def __repr__(self):
+        return "KeepoutCircle({}, {}, {})".format(self.x, self.y, self.radius)
+
+
+class KeepoutRoundRect(object):
+    r"""Axis aligned rectangular keepout area with rounded corners
+
+    Oval pads are represented by a rounded rectangle with a radius of half the smaller side.
+
+    :param x_min: left border
+    :param x_max: right border
+    :param y_min: top border
+    :param y_max: bottom border
+    :param radius: corner radius (limited to half of the smaller side)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> KeepoutRoundRect(-1, 1, -0.5, 0.5, radius=0.5)  # oval
+    """
+
+    def __init__(self, x_min, x_max, y_min, y_max, radius):
+        self.x_min, self.x_max = min(x_min, x_max), max(x_min, x_max)
+        self.y_min, self.y_max = min(y_min, y_max), max(y_min, y_max)
+        self.radius = min(abs(radius), (self.x_max - self.x_min) / 2, (self.y_max - self.y_min) / 2)
+
+        # the shape is this inner rectangle, grown by the radius
+        self._inner = KeepoutRect(self.x_min + self.radius, self.x_max - self.radius,
+                                  self.y_min + self.radius, self.y_max - self.radius)
+        self._corners = [KeepoutCircle(x, y, self.radius)
+                         for x in (self._inner.x_min, self._inner.x_max)
+                         for y in (self._inner.y_min, self._inner.y_max)]
+        self._straight = [KeepoutRect(self.x_min, self.x_max, self._inner.y_min, self._inner.y_max),
+                          KeepoutRect(self._inner.x_min, self._inner.x_max, self.y_min, self.y_max)]
+
+    def contains(self, x, y):
+        dx = max(self._inner.x_min - x, 0, x - self._inner.x_max)
+        dy = max(self._inner.y_min - y, 0, y - self._inner.y_max)
+        return dx * dx + dy * dy <= self.radius * self.radius
+
+    def hlineInterval(self, y):
+        r"""Part of the horizontal line at y which is covered: (x_start, x_end) or None"""
+        dy = max(self._inner.y_min - y, 0, y - self._inner.y_max)
+        if dy > self.radius:
+            return None
+        dx = math.sqrt(self.radius * self.radius - dy * dy)
+        return (self._inner.x_min - dx, self._inner.x_max + dx)
+
+    def vlineInterval(self, x):
+        r"""Part of the vertical line at x which is covered: (y_start, y_end) or None"""
+        dx = max(self._inner.x_min - x, 0, x - self._inner.x_max)
+        if dx > self.radius:
+            return None
+        dy = math.sqrt(self.radius * self.radius - dx * dx)
+        return (self._inner.y_min - dy, self._inner.y_max + dy)
+
+    def segmentInterval(self, x0, y0, x1, y1):
+        r"""Covered parameter range (t_start, t_end) of the segment p(t) = p0 + t * (p1 - p0), or None
+
+        The result is not limited to 0 <= t <= 1.
+        """
+        # the shape is convex, so the covered range spans all parts which are hit
+        t_start, t_end = _INFINITY, -_INFINITY
+        for part in self._straight + self._corners:
+            interval = part.segmentInterval(x0, y0, x1, y1)
+            if interval is not None:
+                t_start, t_end = min(t_start, interval[0]), max(t_end, interval[1])
+        if t_start > t_end:
+            return None
+        return (t_start, t_end)
+
+    def circleCrossings(self, cx, cy, radius):
+        r"""Angles (radians, atan2 convention) where the circle crosses the border"""
+        angles = []
+
+        # straight sides
+        for x in (self.x_min, self.x_max):
+            dx = x - cx
+            if abs(dx) <= radius:
+                dy = math.sqrt(radius * radius - dx * dx)
+                for y in (cy - dy, cy + dy):
+                    if self._inner.y_min <= y <= self._inner.y_max:
+                        angles.append(math.atan2(y - cy, dx))
+        for y in (self.y_min, self.y_max):
+            dy = y - cy
+            if abs(dy) <= radius:
+                dx = math.sqrt(radius * radius - dy * dy)
+                for x in (cx - dx, cx + dx):
+                    if self._inner.x_min <= x <= self._inner.x_max:
+                        angles.append(math.atan2(dy, x - cx))
+
+        # rounded corners, only the crossings outside of the inner rectangle range count
+        for corner in self._corners:
+            sx = -1 if corner.x == self._inner.x_min else 1
+            sy = -1 if corner.y == self._inner.y_min else 1
+            for a in corner.circleCrossings(cx, cy, radius):
+                x, y = cx + radius * math.cos(a), cy + radius * math.sin(a)
+                if (x - corner.x) * sx > 0 and (y - corner.y) * sy > 0:
+                    angles.append(a)
+        return angles
+
+    def boundingBox(self):
+        return (self.x_min, self.x_max, self.y_min, self.y_max)
+
+    def __repr__(self):
+        return "KeepoutRoundRect({}, {}, {}, {}, radius={})".format(
+            self.x_min, self.x_max, self.y_min, self.y_max, self.radius)
+
+
+def toKeepout(keepout):
+    r"""Convert a keepout given as [x_min, x_max, y_min, y_max] into a KeepoutRect
+
+    Keepout shapes are returned unchanged.
+    """
+    if hasattr(keepout, 'segmentInterval'):
+        return keepout
+    return KeepoutRect(keepout[0], keepout[1], keepout[2], keepout[3])
+
+
+class KeepoutIndex(object):
+    r"""Collection of keepout areas with a spatial index
+
+    Can be used everywhere a list of keepouts is expected.
+
+    :param keepouts: initial list of keepouts
+    :param cell_size: grid size of the index in mm (default: size of the first keepout)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> keepouts = KeepoutIndex([KeepoutCircle(x * 2.54, 0, 1) for x in range(40)])
+    >>> clipHorizontalLines([[-2, 100]], 0.9, keepouts)
+    """
+
+    def __init__(self, keepouts=None, cell_size=None):
+        self._index = SpatialIndex(cell_size)
+        if keepouts:
+            self.extend(keepouts)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def append(self, keepout):
+        keepout = toKeepout(keepout)
+        self._index.insert(keepout, keepout.boundingBox())
+
+    def extend(self, keepouts):
+        for keepout in keepouts:
+            self.append(keepout)
+
+    def query(self, x_min, x_max, y_min, y_max):
+        r"""Get the keepouts whose bounding box overlaps the given area"""
+        return self._index.query(x_min, x_max, y_min, y_max)
+
+    def contains(self, x, y):
+        r"""Check if the point is inside any keepout"""
+        return any(ko.contains(x, y) for ko in self.query(x, x, y, y))
+
+
+def _overlapping(keepouts, x_min, x_max, y_min, y_max):
+    if isinstance(keepouts, KeepoutIndex):
+        return keepouts.query(x_min, x_max, y_min, y_max)
+
+    result = []
+    for ko in keepouts:
+        ko = toKeepout(ko)
+        kx0, kx1, ky0, ky1 = ko.boundingBox()
+        if kx0 <= x_max and kx1 >= x_min and ky0 <= y_max and ky1 >= y_min:
+            result.append(ko)
+    return result
+
+
+def _visibleSegmentParams(x0, y0, x1, y1, keepouts):
+    # visible [t_start, t_end] ranges of the line, with t running from 0 (start) to 1 (end)
+    length = math.hypot(x1 - x0, y1 - y0)
+    min_t = _MIN_LENGTH / length if length > 0 else 0
+
+    candidates = _overlapping(keepouts, min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1))
+    blocked = []
+    for ko in candidates:
+        interval = ko.segmentInterval(x0, y0, x1, y1)
+        # lines only touching a keepout are not split
+        if interval is not None and interval[1] - interval[0] > min_t:
+            blocked.append(interval)
+
+    if not blocked:
+        return [[0., 1.]]
+    min_fragment = _MIN_FRAGMENT_LENGTH / length if length > 0 else 0
+    return [[t0, t1] for t0, t1 in subtractIntervals([[0., 1.]], blocked) if t1 - t0 >= min_fragment]
+
+
+def clipSegment(start, end, keepouts):
+    r"""Get the parts of a line which are outside of all keepouts
+
+    Pieces of a clipped line shorter than 0.1 mm are dropped.
+
+    :param start: start point of the line
+    :param end: end point of the line
+    :param keepouts: list of keepout areas
+    :return: list of ((x_start, y_start), (x_end, y_end)) in the direction of the line
+    """
+    x0, y0 = float(start[0]), float(start[1])
+    x1, y1 = float(end[0]), float(end[1])
+
+    visible = _visibleSegmentParams(x0, y0, x1, y1, keepouts)
+    if visible == [[0., 1.]]:
+        return [((x0, y0), (x1, y1))]
+
+    return [((x0 + (x1 - x0) * t0, y0 + (y1 - y0) * t0), (x0 + (x1 - x0) * t1, y0 + (y1 - y0) * t1))
+            for t0, t1 in visible]
+
+
+def clipHorizontalLines(lines, y, keepouts):
+    r"""Get the parts of horizontal lines which are outside of all keepouts
+
+    :param lines: list of [x_start, x_end] ranges of the lines, x_start <= x_end
+    :param y: y position of the lines
+    :param keepouts: list of keepout areas
+    :return: sorted list of [x_start, x_end] ranges
+    """
+    if not lines:
+        return []
+    covered = []
+    for ko in _overlapping(keepouts, min(line[0] for line in lines), max(line[1] for line in lines), y, y):
+        interval = ko.hlineInterval(y)
+        if interval is not None:
+            covered.append(interval)
+    return subtractIntervals(lines, covered)
+
+
+def clipVerticalLines(lines, x, keepouts):
+    r"""Get the parts of vertical lines which are outside of all keepouts
+
+    :param lines: list of [y_start, y_end] ranges of the lines, y_start <= y_end
+    :param x: x position of the lines
+    :param keepouts: list of keepout areas
+    :return: sorted list of [y_start, y_end] ranges
+    """
+    if not lines:
+        return []
+    covered = []
+    for ko in _overlapping(keepouts, x, x, min(line[0] for line in lines), max(line[1] for line in lines)):
+        interval = ko.vlineInterval(x)
+        if interval is not None:
+            covered.append(interval)
+    return subtractIntervals(lines, covered)
+
+
+def clipLines(lines, keepouts):
+    r"""Get the parts of many lines which are outside of all keepouts
+
+    Horizontal and vertical lines on the same position are clipped together.
+
+    :param lines: list of (start, end) points
+    :param keepouts: list of keepout areas or a KeepoutIndex
+    :return: list with the visible ((x_start, y_start), (x_end, y_end)) parts of every line, in the order
+             of the input lines
+    """
+    if not isinstance(keepouts, KeepoutIndex) and len(lines) > 1 and len(keepouts) > _INDEX_THRESHOLD:
+        keepouts = KeepoutIndex(keepouts)
+
+    result = [None] * len(lines)
+    horizontal = {}
+    vertical = {}
+    for i, (start, end) in enumerate(lines):
+        x0, y0 = float(start[0]), float(start[1])
+        x1, y1 = float(end[0]), float(end[1])
+        if y0 == y1 and x0 != x1:
+            horizontal.setdefault(y0, []).append(i)
+        elif x0 == x1 and y0 != y1:
+            vertical.setdefault(x0, []).append(i)
+        else:
+            result[i] = clipSegment((x0, y0), (x1, y1), keepouts)
+
+    for groups, axis, clip in ((horizontal, 0, clipHorizontalLines), (vertical, 1, clipVerticalLines)):
+        for position, group in groups.items():
+            ranges = [sorted((float(lines[i][0][axis]), float(lines[i][1][axis]))) for i in group]
+            visible = clip(mergeIntervals(ranges), position, keepouts)
+            for i, (r_start, r_end) in zip(group, ranges):
+                pieces = [(max(r_start, v_start), min(r_end, v_end)) for v_start, v_end in visible
+                          if v_start < r_end and v_end > r_start]
+                if float(lines[i][0][axis]) > float(lines[i][1][axis]):
+                    pieces = [(p_end, p_start) for p_start, p_end in reversed(pieces)]
+                if axis == 0:
+                    result[i] = [((p_start, position), (p_end, position)) for p_start, p_end in pieces]
+                else:
+                    result[i] = [((position, p_start), (position, p_end)) for p_start, p_end in pieces]
+    return result
+
+
+def _visibleArcParams(cx, cy, radius, a0, sweep, direction, keepouts):
+    # visible [s_start, s_end] ranges of the arc, s is the angle from the start point (radian)
+    candidates = _overlapping(keepouts, cx - radius, cx + radius, cy - radius, cy + radius)
+
+    # split the arc at all crossings with the keepout borders
+    params = [0., sweep]
+    for ko in candidates:
+        for crossing in ko.circleCrossings(cx, cy, radius):
+            s = ((crossing - a0) * direction) % (2 * math.pi)
+            if 0 < s < sweep:
+                params.append(s)
+    params.sort()
+
+    # every piece is either completely inside or outside of a keepout, check its middle
+    result = []
+    for s0, s1 in zip(params, params[1:]):
+        if s1 - s0 <= _MIN_LENGTH:
+            continue
+        mid = a0 + direction * (s0 + s1) / 2
+        mx, my = cx + radius * math.cos(mid), cy + radius * math.sin(mid)
+        if any(ko.contains(mx, my) for ko in candidates):
+            continue
+
+        if result and abs(result[-1][1] - s0) <= _MIN_LENGTH:
+            result[-1][1] = s1
+        else:
+            result.append([s0, s1])
+    return result
+
+
+def _clipArc(center, radius, start_angle, angle, keepouts):
+    # visible (start_angle, angle) pieces of the arc, including short fragments
+    direction = 1 if angle >= 0 else -1
+    a0 = math.radians(start_angle)
+    visible = _visibleArcParams(float(center[0]), float(center[1]), radius, a0, math.radians(abs(angle)),
+                                direction, keepouts)
+
+    return [(math.degrees(a0 + direction * s0), direction * math.degrees(s1 - s0)) for s0, s1 in visible]
+
+
+def _dropFragments(arcs, radius, angle):
+    # pieces of a clipped arc which are too short to be visible, an arc which is not clipped is kept
+    if len(arcs) == 1 and abs(abs(arcs[0][1]) - abs(angle)) <= _MIN_LENGTH:
+        return arcs
+    return [(a, sweep) for a, sweep in arcs if radius * math.radians(abs(sweep)) >= _MIN_FRAGMENT_LENGTH]
+
+
+def clipArc(center, radius, start_angle, angle, keepouts):
+    r"""Get the parts of an arc which are outside of all keepouts
+
+    Pieces of a clipped arc shorter than 0.1 mm are dropped.
+
+    :param center: center of the arc
+    :param radius: radius of the arc
+    :param start_angle: angle of the start point (degree)
+    :param angle: angle covered by the arc (degree, can be negative)
+    :param keepouts: list of keepout areas
+    :return: list of (start_angle, angle) tuples, in the direction of the arc
+    """
+    arcs = _clipArc(center, radius, start_angle, angle, keepouts)
+    return _dropFragments(arcs, radius, angle)
+
+
+def clipCircle(center, radius, keepouts):
+    r"""Get the parts of a circle which are outside of all keepouts
+
+    Pieces of a clipped circle shorter than 0.1 mm are dropped.
+
+    :param center: center of the circle
+    :param radius: radius of the circle
+    :param keepouts: list of keepout areas
+    :return: list of (start_angle, angle) tuples. A single (0, 360) entry represents the whole circle.
+    """
+    arcs = _clipArc(center, radius, 0, 360, keepouts)
+
+    # join the pieces which meet at 0 degree
+    if len(arcs) > 1 and abs(arcs[0][0]) <= _MIN_LENGTH and abs(arcs[-1][0] + arcs[-1][1] - 360) <= _MIN_LENGTH:
+        first = arcs.pop(0)
+        arcs[-1] = (arcs[-1][0], arcs[-1][1] + first[1])
+
+    return _dropFragments(arcs, radius, 360)
@@ -0,0 +1,585 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Boolean operations (union, difference, intersection) and offsetting of polygons
+
+A shape is either a single ring (a list of points) or a list of rings. Single rings are
+always treated as filled polygons, independent of their orientation. For a list of rings,
+the orientation defines the meaning of the ring: counterclockwise rings are filled, clockwise
+rings are holes (the same convention which is used for the results of all operations).
+
+All operations use the positive winding fill rule and return a list of rings. Every ring is
+a list of ``Vector2D`` without repeating the first point. Use ``groupRings`` to assign the
+holes to their outer ring.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> polygonUnion([(0, 0), (2, 0), (2, 2), (0, 2)], [(1, 1), (3, 1), (3, 3), (1, 3)])
+>>> polygonOffset([(0, 0), (2, 0), (2, 2), (0, 2)], 0.25)
+"""
+
+from __future__ import division
+
+import math
+from bisect import bisect_right
+
+from KicadModTree.Vector import Vector2D
+from .tessellation import arcSegmentCount, tessellateArc
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# points closer than this are considered to be the same point (in mm)
+SNAP_TOLERANCE = 1e-7
+
+# distance of the probe points used to classify edges (in mm)
+_PROBE_DISTANCE = 1e-6
+
+# use numpy for winding number queries with at least this many points, when the bands of the
+# index contain on average at least this many edges (otherwise the band index is faster)
+_NUMPY_MIN_POINTS = 256
+_NUMPY_MIN_BAND_OCCUPANCY = 48
+
+
+def ringArea(ring):
+    r"""Signed area of a ring (positive for counterclockwise rings)
+
+    :param ring: list of points
+    """
+    area = 0.
+    n = len(ring)
+    for i in range(n):
+        x0, y0 = ring[i][0], ring[i][1]
+        x1, y1 = ring[(i + 1) % n][0], ring[(i + 1) % n][1]
+        area += x0 * y1 - x1 * y0
+    return area / 2
+
+
+def _toPointList(points):
+    return [(float(p[0]), float(p[1])) for p in points]
+
+
+def _isPoint(value):
+    if isinstance(value, Vector2D):
+        return True
+    if isinstance(value, dict):
+        return True
+    return len(value) == 2 and isinstance(value[0], (int, float))
+
+
+def _toRings(shape):
+    # Polygon nodes and PolygonPoints
+    if hasattr(shape, 'nodes') and not isinstance(shape, (list, tuple)):
+        shape = shape.nodes
+    if hasattr(shape, 'getPoints'):
+        shape = shape.getPoints()
+
+    shape = list(shape)
+    if len(shape) == 0:
+        return []
+
+    if _isPoint(shape[0]):
+        ring = _toPointList(Vector2D(p) if isinstance(p, dict) else p for p in shape)
+        if ringArea(ring) < 0:
+            ring.reverse()
+        return [ring]
+
+    return [_toPointList(Vector2D(p) if isinstance(p, dict) else p for p in ring) for ring in shape]
+
+
+def _ringEdges(rings):
+    edges = []
+    for ring in rings:
+        n = len(ring)
+        for i in range(n):
+            p, q = ring[i], ring[(i + 1) % n]
+            if p != q:
+                edges.append((p[0], p[1], q[0], q[1]))
+    return edges
+
+
+class _BandIndex(object):
+    r"""Directed edges sorted into horizontal bands
+
+    A horizontal ray starting at a point only has to be tested against the edges
+    of the band containing the point.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+
+        if not edges:
+            self.bounds = []
+            self.bands = [[]]
+            self.occupancy = 0
+            return
+
+        y_min = min(min(e[1], e[3]) for e in edges)
+        y_max = max(max(e[1], e[3]) for e in edges)
+        band_count = max(1, min(len(edges) // 2, 4096))
+        height = (y_max - y_min) / band_count or 1.
+
+        self.bounds = [y_min + height * (i + 1) for i in range(band_count - 1)]
+        self.bands = [[] for i in range(band_count)]
+        for e in edges:
+            first = bisect_right(self.bounds, min(e[1], e[3]))
+            last = bisect_right(self.bounds, max(e[1], e[3]))
+            for band in range(first, last + 1):
+                self.bands[band].append(e)
+
+        self.occupancy = sum(len(b) for b in self.bands) / band_count
+
+    def band(self, py):
+        return self.bands[bisect_right(self.bounds, py)]
+
+    @staticmethod
+    def winding(band, px, py):
+        w = 0
+        for x0, y0, x1, y1 in band:
+            if y0 <= py:
+                if y1 > py and (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0) > 0:
+                    w += 1
+            elif y1 <= py and (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0) < 0:
+                w -= 1
+        return w
+
+    def windingsNumpy(self, pts):
+        band_of_point = numpy.searchsorted(numpy.array(self.bounds), pts[:, 1], side='right')
+        result = numpy.zeros(len(pts), dtype=int)
+
+        # evaluate all points of one band against the edges of this band at once
+        for band in numpy.unique(band_of_point):
+            edges = self.bands[band]
+            if not edges:
+                continue
+            idx = numpy.nonzero(band_of_point == band)[0]
+            e = numpy.array(edges, dtype=float)
+            x0, y0, x1, y1 = e[:, 0], e[:, 1], e[:, 2], e[:, 3]
+            px = pts[idx, 0:1]
+            py = pts[idx, 1:2]
+            is_left = (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0)
+            up = (y0 <= py) & (y1 > py) & (is_left > 0)
+            down = (y0 > py) & (y1 <= py) & (is_left < 0)
+            result[idx] = up.sum(axis=1) - down.sum(axis=1)
+
+        return result
+
+
+class _WindingIndex(object):
+    r"""Winding number queries against a fixed set of directed edges
+
+    The edges are indexed in horizontal and in vertical bands (with mirrored coordinates,
+    which negates the winding number). Every query uses the direction with less edges to test.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.horizontal = _BandIndex(edges)
+        self.vertical = _BandIndex([(y0, x0, y1, x1) for x0, y0, x1, y1 in edges])
+
+    def winding(self, px, py):
+        h_band = self.horizontal.band(py)
+        v_band = self.vertical.band(px)
+        if len(h_band) <= len(v_band):
+            return _BandIndex.winding(h_band, px, py)
+        return -_BandIndex.winding(v_band, py, px)
+
+    def windings(self, points):
+        r"""Winding numbers of a list of (x, y) tuples"""
+        if NUMPY_AVAILABLE and len(points) >= _NUMPY_MIN_POINTS and \
+                min(self.horizontal.occupancy, self.vertical.occupancy) >= _NUMPY_MIN_BAND_OCCUPANCY:
+            return self._windingsNumpy(points)
+        return [self.winding(px, py) for px, py in points]
+
+    def _windingsNumpy(self, points):
+        if self.horizontal.occupancy <= self.vertical.occupancy:
+            return self.horizontal.windingsNumpy(numpy.array(points, dtype=float)).tolist()
+        return (-self.vertical.windingsNumpy(numpy.array(points, dtype=float)[:, ::-1])).tolist()
+
+
+def _segmentIntersections(edges):
+    r"""Find all split parameters of all edges
+
+    :return: list with a list of parameters (0..1) for every edge
+    """
+    splits = [[0., 1.] for e in edges]
+
+    # sweep over the edges sorted by their minimum x coordinate
+    order = sorted(range(len(edges)), key=lambda i: min(edges[i][0], edges[i][2]))
+    active = []
+    for i in order:
+        ax0, ay0, ax1, ay1 = edges[i]
+        a_min_x = min(ax0, ax1)
+        a_min_y, a_max_y = min(ay0, ay1), max(ay0, ay1)
+        active = [j for j in active if max(edges[j][0], edges[j][2]) >= a_min_x - SNAP_TOLERANCE]
+
+        for j in active:
+            bx0, by0, bx1, by1 = edges[j]
+            if max(by0, by1) < a_min_y - SNAP_TOLERANCE or min(by0, by1) > a_max_y + SNAP_TOLERANCE:
+                continue
+            _intersectSegments(edges[i], edges[j], splits[i], splits[j])
+
+        active.append(i)
+
+    return splits
+
+
+def _intersectSegments(a, b, a_splits, b_splits):
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    rx, ry = ax1 - ax0, ay1 - ay0
+    sx, sy = bx1 - bx0, by1 - by0
+    r_len = math.hypot(rx, ry)
+    s_len = math.hypot(sx, sy)
+    qx, qy = bx0 - ax0, by0 - ay0
+
+    denom = rx * sy - ry * sx
+    if abs(denom) > 1e-12 * r_len * s_len:
+        t = (qx * sy - qy * sx) / denom
+        u = (qx * ry - qy * rx) / denom
+        t_tol = SNAP_TOLERANCE / r_len
+        u_tol = SNAP_TOLERANCE / s_len
+        if -t_tol <= t <= 1 + t_tol and -u_tol <= u <= 1 + u_tol:
+            a_splits.append(min(1., max(0., t)))
+            b_splits.append(min(1., max(0., u)))
+        return
+
+    # parallel segments, check if they are collinear
+    if abs(qx * ry - qy * rx) > SNAP_TOLERANCE * r_len:
+        return
+
+    # collinear: every endpoint lying on the other segment splits it
+    for px, py in ((bx0, by0), (bx1, by1)):
+        t = ((px - ax0) * rx + (py - ay0) * ry) / (r_len * r_len)
+        if 0 < t < 1:
+            a_splits.append(t)
+    for px, py in ((ax0, ay0), (ax1, ay1)):
+        u = ((px - bx0) * sx + (py - by0) * sy) / (s_len * s_len)
+        if 0 < u < 1:
+            b_splits.append(u)
+
+
+class _PointSnapper(object):
+    def __init__(self):
+        self.points = {}
+
+    def key(self, x, y):
+        key = (int(round(x / SNAP_TOLERANCE)), int(round(y / SNAP_TOLERANCE)))
+        if key not in self.points:
+            self.points[key] = (x, y)
+        return key
+
+
+def _splitEdges(edges):
+    snapper = _PointSnapper()
+    fragments = []
+    seen = set()
+
+    for edge, params in zip(edges, _segmentIntersections(edges)):
+        x0, y0, x1, y1 = edge
+        keys = [snapper.key(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t) for t in sorted(set(params))]
+        for k0, k1 in zip(keys, keys[1:]):
+            if k0 == k1:
+                continue
+            undirected = (k0, k1) if k0 < k1 else (k1, k0)
+            if undirected in seen:
+                continue
+            seen.add(undirected)
+            fragments.append((k0, k1))
+
+    return fragments, snapper.points
+
+
+def _classifyFragments(fragments, points, indices, inside):
+    probes = []
+    for k0, k1 in fragments:
+        (x0, y0), (x1, y1) = points[k0], points[k1]
+        length = math.hypot(x1 - x0, y1 - y0)
+        nx, ny = -(y1 - y0) / length * _PROBE_DISTANCE, (x1 - x0) / length * _PROBE_DISTANCE
+        mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+        probes.append((mx + nx, my + ny))
+        probes.append((mx - nx, my - ny))
+
+    windings = [index.windings(probes) for index in indices]
+
+    directed = []
+    for i, (k0, k1) in enumerate(fragments):
+        left = inside(*[w[2 * i] for w in windings])
+        right = inside(*[w[2 * i + 1] for w in windings])
+        if left and not right:
+            directed.append((k0, k1))
+        elif right and not left:
+            directed.append((k1, k0))
+    return directed
+
+
+def _turnAngle(points, k_prev, k_cur, k_next):
+    (x0, y0), (x1, y1), (x2, y2) = points[k_prev], points[k_cur], points[k_next]
+    angle = math.atan2(y2 - y1, x2 - x1) - math.atan2(y1 - y0, x1 - x0)
+    # normalize into [-pi, pi), a reversal is the least preferred turn
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def _stitchRings(directed, points):
+    outgoing = {}
+    for i, (k0, k1) in enumerate(directed):
+        outgoing.setdefault(k0, []).append(i)
+
+    used = [False] * len(directed)
+    rings = []
+    for first in range(len(directed)):
+        if used[first]:
+            continue
+
+        used[first] = True
+        start = directed[first][0]
+        ring = [start]
+        prev, cur = start, directed[first][1]
+        while cur != start:
+            ring.append(cur)
+            candidates = [i for i in outgoing.get(cur, []) if not used[i]]
+            if not candidates:
+                break
+            if len(candidates) > 1:
+                # keep rings which only touch each other separate: take the sharpest left turn
+                candidates.sort(key=lambda i: -_turnAngle(points, prev, cur, directed[i][1]))
+            used[candidates[0]] = True
+            prev, cur = cur, directed[candidates[0]][1]
+        else:
+            rings.append(ring)
+
+    return rings
+
+
+def _removeCollinearPoints(ring):
+    changed = True
+    while changed and len(ring) > 2:
+        changed = False
+        result = []
+        n = len(ring)
+        for i in range(n):
+            x0, y0 = result[-1] if result else ring[i - 1]
+            x1, y1 = ring[i]
+            x2, y2 = ring[(i + 1) % n]
+            cross = (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1)
+            dot = (x1 - x0) * (x2 - x1) + (y1 - y0) * (y2 - y1)
+            if abs(cross) <= SNAP_TOLERANCE * math.hypot(x2 - x0, y2 - y0) and dot >= 0:
+                changed = True
+                continue
+            result.append((x1, y1))
+        ring = result
+    return ring
+
+
+def _booleanOperation(groups, inside):
+    r"""Run a boolean operation
+
+    :param groups: list of edge lists, one for every operand
+    :param inside: function which gets the winding number of every operand at a point and
+                   decides if the point is part of the result
+    """
+    edges = [e for group in groups for e in group]
+    fragments, points = _splitEdges(edges)
+    indices = [_WindingIndex(group) for group in groups]
+
+    directed = _classifyFragments(fragments, points, indices, inside)
+
+    result = []
+    for ring in _stitchRings(directed, points):
+        ring = _removeCollinearPoints([points[k] for k in ring])
+        if len(ring) >= 3 and abs(ringArea(ring)) > SNAP_TOLERANCE * SNAP_TOLERANCE:
+            result.append([Vector2D(x, y) for x, y in ring])
+    return result
+
+
+def polygonUnion(*shapes):
+    r"""Union of all given shapes
+
+    :param shapes: shapes which are merged
+    :return: list of rings (counterclockwise outlines, clockwise holes)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> polygonUnion([(0, 0), (2, 0), (2, 2), (0, 2)], [(1, 1), (3, 1), (3, 3), (1, 3)])
+    """
+    edges = _ringEdges([ring for shape in shapes for ring in _toRings(shape)])
+    return _booleanOperation([edges], lambda w: w > 0)
+
+
+def polygonDifference(subject, *clips):
+    r"""Remove all clip shapes from the subject
+
+    :param subject: shape from which the clip shapes are removed
+    :param clips: shapes which are removed
+    :return: list of rings (counterclockwise outlines, clockwise holes)
+    """
+    subject_edges = _ringEdges(_toRings(subject))
+    clip_edges = _ringEdges([ring for clip in clips for ring in _toRings(clip)])
+    return _booleanOperation([subject_edges, clip_edges], lambda a, b: a > 0 and b <= 0)
+
+
+def polygonIntersection(subject, *clips):
+    r"""Area which is covered by the subject and all clip shapes
+
+    :param subject: first shape
+    :param clips: other shapes
+    :return: list of rings (counterclockwise outlines, clockwise holes)
+    """
+    groups = [_ringEdges(_toRings(subject))] + [_ringEdges(_toRings(clip)) for clip in clips]
+    return _booleanOperation(groups, lambda *w: all(v > 0 for v in w))
+
+
+def _offsetRing(ring, delta, join_type, miter_limit, arc_tolerance):
+    # remove duplicated points, they do not have a defined normal
+    points = [p for i, p in enumerate(ring) if p != ring[i - 1]]
+    n = len(points)
+    if n < 3:
+        return []
+
+    normals = []
+    for i in range(n):
+        (x0, y0), (x1, y1) = points[i], points[(i + 1) % n]
+        length = math.hypot(x1 - x0, y1 - y0)
+        # right hand side of the edge is outside for counterclockwise outlines and clockwise holes
+        normals.append(((y1 - y0) / length, -(x1 - x0) / length))
+
+    result = []
+    for i in range(n):
+        px, py = points[i]
+        n1x, n1y = normals[i - 1]
+        n2x, n2y = normals[i]
+        start = (px + n1x * delta, py + n1y * delta)
+        end = (px + n2x * delta, py + n2y * delta)
+
+        # positive for corners where the offset curve has to be extended by a join
+        sin_a = (n1x * n2y - n1y * n2x) * (1 if delta > 0 else -1)
+        cos_a = n1x * n2x + n1y * n2y
+
+        if sin_a >= -1e-12 and cos_a > 1 - 1e-12:
+            # straight continuation
+            result.append(end)
+            continue
+
+        if sin_a < 0:
+            # concave corner, the resulting loop is removed by the union
+            result.extend([start, (px, py), end])
+            continue
+
+        if join_type == 'round':
+            # the radius is negative for negative offsets, which mirrors the normals
+            a1 = math.degrees(math.atan2(n1y, n1x))
+            angle = math.degrees(math.atan2(n1x * n2y - n1y * n2x, cos_a))
+            result.extend(tessellateArc((px, py), delta, a1, angle, arc_tolerance,
+                                        count=arcSegmentCount(abs(delta), angle, arc_tolerance)))
+        elif join_type == 'miter' and 1 + cos_a > 2 / (miter_limit * miter_limit):
+            factor = delta / (1 + cos_a)
+            result.append((px + (n1x + n2x) * factor, py + (n1y + n2y) * factor))
+        else:
+            # square (bevel) join
+            result.extend([start, end])
+
+    return result
+
+
+def _offsetEdges(shape, delta, join_type, miter_limit, arc_tolerance):
+    if join_type not in ['miter', 'round', 'square']:
+        raise ValueError("join_type has to be 'miter', 'round' or 'square', got '{}'".format(join_type))
+
+    rings = _toRings(shape)
+    if delta == 0:
+        return _ringEdges(rings)
+    return _ringEdges([_offsetRing(r, delta, join_type, miter_limit, arc_tolerance) for r in rings])
+
+
+def polygonOffset(shape, delta, join_type='miter', miter_limit=2.0, arc_tolerance=0.005):
+    r"""Grow (positive delta) or shrink (negative delta) a shape
+
+    :param shape: the shape to offset
+    :param delta: offset distance
+    :param join_type: how convex corners are connected ('miter', 'round' or 'square')
+    :param miter_limit: maximum distance of a miter point in multiples of delta,
+                        sharper corners are squared
+    :param arc_tolerance: maximum chord error of round joins
+    :return: list of rings (counterclockwise outlines, clockwise holes)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> polygonOffset([(0, 0), (2, 0), (2, 2), (0, 2)], 0.25, join_type='round')
+    """
+    edges = _offsetEdges(shape, delta, join_type, miter_limit, arc_tolerance)
+    return _booleanOperation([edges], lambda w: w > 0)
+
+
+def inflatedUnion(shapes, delta, join_type='miter', miter_limit=2.0, arc_tolerance=0.005):
+    r"""Offset all shapes and merge them in a single operation
+
+    This is the typical operation to derive a courtyard from pads and the body outline.
+
+    :param shapes: list of shapes
+    :param delta: offset distance which is applied to every shape
+    :return: list of rings (counterclockwise outlines, clockwise holes)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> body = [(-1, -0.5), (1, -0.5), (1, 0.5), (-1, 0.5)]
+    >>> pads = [[(-1.5, -0.3), (-0.9, -0.3), (-0.9, 0.3), (-1.5, 0.3)],
+    ...         [(0.9, -0.3), (1.5, -0.3), (1.5, 0.3), (0.9, 0.3)]]
+    >>> inflatedUnion(pads + [body], 0.25)
+    """
+    edges = []
+    for shape in shapes:
+        edges.extend(_offsetEdges(shape, delta, join_type, miter_limit, arc_tolerance))
+    return _booleanOperation([edges], lambda w: w > 0)
+
+
+def groupRings(rings):
+    r"""Assign holes (clockwise rings) to the outline (counterclockwise ring) containing them
+
+    :param rings: list of rings as returned by the boolean operations
+    :return: list of tuples (outline, [holes])
+    """
+    outlines = []
+    holes = []
+    for ring in rings:
+        if ringArea(ring) > 0:
+            outlines.append(ring)
+        else:
+            holes.append(ring)
+
+    # smallest outline first, so nested outlines (islands inside holes) win
+    outlines.sort(key=ringArea)
+    result = [(outline, []) for outline in outlines]
+    indices = [_WindingIndex(_ringEdges([_toPointList(o)])) for o in outlines]
+
+    for hole in holes:
+        # any point on the hole is inside or on the border of its outline, use the midpoint
+        # of the first edge moved slightly into the hole
+        (x0, y0), (x1, y1) = _toPointList(hole[:2])
+        length = math.hypot(x1 - x0, y1 - y0)
+        px = (x0 + x1) / 2 + (y1 - y0) / length * _PROBE_DISTANCE
+        py = (y0 + y1) / 2 - (x1 - x0) / length * _PROBE_DISTANCE
+        for (outline, outline_holes), index in zip(result, indices):
+            if index.winding(px, py) > 0:
+                outline_holes.append(hole)
+                break
+
+    return result
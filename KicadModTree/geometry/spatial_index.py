@@ -0,0 +1,106 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import math
+
+# cells smaller than this (in mm) are not used, tiny items would otherwise create a huge grid
+_MIN_CELL_SIZE = 0.05
+
+
+class SpatialIndex(object):
+    r"""Uniform grid over axis aligned bounding boxes
+
+    Items are sorted into all grid cells their bounding box touches. A query only looks at the cells of the
+    requested area, and returns the items in insertion order, so results are deterministic.
+
+    :param cell_size: size of a grid cell in mm. If not given, the size of the first inserted item is used
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> index = SpatialIndex()
+    >>> index.insert('pad 1', (-0.5, 0.5, -0.5, 0.5))
+    >>> index.insert('pad 2', (2.04, 3.04, -0.5, 0.5))
+    >>> index.query(-1, 1, -1, 1)
+    ['pad 1']
+    """
+
+    def __init__(self, cell_size=None):
+        self._cell_size = cell_size
+        self._items = []
+        self._boxes = []
+        self._cells = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def _cellRange(self, x_min, x_max, y_min, y_max):
+        size = self._cell_size
+        return (int(math.floor(x_min / size)), int(math.floor(x_max / size)),
+                int(math.floor(y_min / size)), int(math.floor(y_max / size)))
+
+    def insert(self, item, bounding_box):
+        r"""Add an item
+
+        :param item: any object, returned by query()
+        :param bounding_box: (x_min, x_max, y_min, y_max) of the item
+        """
+        x_min, x_max, y_min, y_max = bounding_box
+        if self._cell_size is None:
+            self._cell_size = max(x_max - x_min, y_max - y_min, _MIN_CELL_SIZE)
+
+        index = len(self._items)
+        self._items.append(item)
+        self._boxes.append((x_min, x_max, y_min, y_max))
+
+        cx0, cx1, cy0, cy1 = self._cellRange(x_min, x_max, y_min, y_max)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._cells.setdefault((cx, cy), []).append(index)
+
+    def query(self, x_min, x_max, y_min, y_max):
+        r"""Get all items whose bounding box overlaps the given area (borders included)
+
+        :return: list of items, in the order they were inserted
+        """
+        if not self._items:
+            return []
+
+        cx0, cx1, cy0, cy1 = self._cellRange(x_min, x_max, y_min, y_max)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # the area covers more cells than there are filled ones
+            candidates = set()
+            for (cx, cy), indices in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    candidates.update(indices)
+        else:
+            candidates = set()
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    indices = self._cells.get((cx, cy))
+                    if indices:
+                        candidates.update(indices)
+
+        result = []
+        for index in sorted(candidates):
+            bx0, bx1, by0, by1 = self._boxes[index]
+            if bx0 <= x_max and bx1 >= x_min and by0 <= y_max and by1 >= y_min:
+                result.append(self._items[index])
+        return result
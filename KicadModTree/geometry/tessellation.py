@@ -0,0 +1,129 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Approximation of arcs, circles and ellipses by polylines
+
+The number of segments is chosen so the distance between a chord and the exact curve stays below the
+given tolerance. The cosine and sine values of the segment angles only depend on the number of segments
+and the covered angle, so they are calculated once and cached as unit circle tables. A curve then only
+needs one rotation, a scale and a translation of the table.
+
+Angles follow the convention of the ``Arc`` node: they are given in degrees, measured like
+``atan2(y, x)`` and an arc covers the angles from its start angle to start angle + angle.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> arcSegmentCount(1, 90, 0.01)
+6
+>>> len(tessellateCircle((0, 0), 1, tolerance=0.01))
+23
+"""
+
+from __future__ import division
+
+import math
+
+# the tables are small, but an unbounded cache could grow with arbitrary angles
+_MAX_TABLES = 1024
+
+_unit_tables = {}
+
+
+def _unitArcTable(count, angle):
+    # (cos, sin) of the count + 1 points of an arc starting at 0 degree
+    key = (count, angle)
+    table = _unit_tables.get(key)
+    if table is None:
+        if len(_unit_tables) >= _MAX_TABLES:
+            _unit_tables.clear()
+        step = math.radians(angle) / count
+        table = tuple((math.cos(i * step), math.sin(i * step)) for i in range(count + 1))
+        # the end point is exact, not the sum of count steps
+        table = table[:-1] + ((math.cos(math.radians(angle)), math.sin(math.radians(angle))),)
+        _unit_tables[key] = table
+    return table
+
+
+def arcSegmentCount(radius, angle, tolerance):
+    r"""Get the number of segments needed to approximate an arc
+
+    :param radius: radius of the arc
+    :param angle: angle covered by the arc (degree)
+    :param tolerance: maximum distance between the segments and the arc
+    :return: number of segments, at least 1
+    """
+    if radius <= tolerance:
+        return 1
+    step = 2 * math.acos(1 - tolerance / radius)
+    return max(1, int(math.ceil(math.radians(abs(angle)) / step)))
+
+
+def tessellateArc(center, radius, start_angle, angle, tolerance=0.01, count=None):
+    r"""Get the points of a polyline which approximates an arc
+
+    :param center: center of the arc
+    :param radius: radius of the arc
+    :param start_angle: angle of the start point (degree)
+    :param angle: angle covered by the arc (degree, can be negative)
+    :param tolerance: maximum distance between the polyline and the arc
+    :param count: number of segments, calculated from the tolerance if not given
+    :return: list of count + 1 (x, y) tuples, from the start to the end point
+    """
+    if count is None:
+        count = arcSegmentCount(radius, angle, tolerance)
+    cx, cy = float(center[0]), float(center[1])
+    a0 = math.radians(start_angle)
+    rc, rs = radius * math.cos(a0), radius * math.sin(a0)
+    return [(cx + rc * c - rs * s, cy + rs * c + rc * s) for c, s in _unitArcTable(count, angle)]
+
+
+def tessellateCircle(center, radius, tolerance=0.01, count=None):
+    r"""Get the points of a closed polygon which approximates a circle
+
+    :param center: center of the circle
+    :param radius: radius of the circle
+    :param tolerance: maximum distance between the polygon and the circle
+    :param count: number of segments, calculated from the tolerance if not given (at least 3)
+    :return: list of count (x, y) tuples, counterclockwise starting at 0 degree. The first point is not repeated.
+    """
+    if count is None:
+        count = max(3, arcSegmentCount(radius, 360, tolerance))
+    return tessellateArc(center, radius, 0, 360, count=count)[:-1]
+
+
+def tessellateEllipse(center, radius_x, radius_y, tolerance=0.01, count=None, rotation=0):
+    r"""Get the points of a closed polygon which approximates an ellipse
+
+    The segment count is chosen for the larger radius, which keeps the chord error below the tolerance.
+
+    :param center: center of the ellipse
+    :param radius_x: radius along the x axis (before rotation)
+    :param radius_y: radius along the y axis (before rotation)
+    :param tolerance: maximum distance between the polygon and the ellipse
+    :param count: number of segments, calculated from the tolerance if not given (at least 3)
+    :param rotation: rotation of the ellipse around its center (degree, same direction as the angles)
+    :return: list of count (x, y) tuples. The first point is not repeated.
+    """
+    if count is None:
+        count = max(3, arcSegmentCount(max(radius_x, radius_y), 360, tolerance))
+    cx, cy = float(center[0]), float(center[1])
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    points = []
+    for c, s in _unitArcTable(count, 360)[:-1]:
+        x, y = radius_x * c, radius_y * s
+        points.append((cx + x * cos_phi - y * sin_phi, cy + x * sin_phi + y * cos_phi))
+    return points
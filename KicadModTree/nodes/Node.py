@@ -16,6 +16,7 @@
 from copy import copy, deepcopy
 
 from KicadModTree.Vector import *
+from KicadModTree.util.profiler import instrument
 
 
 class MultipleParentsError(RuntimeError):
@@ -227,3 +228,6 @@ class Node(object):
             tree_str += '  '.join(child.getCompleteRenderTree(rendered_nodes).splitlines(True))
 
         return tree_str
+
+
+instrument(Node, 'getRealPosition', 'getRealPosition', category='transform')
@@ -16,6 +16,8 @@
 from KicadModTree.PolygonPoints import *
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.geometry.polygon_boolean import polygonUnion, polygonDifference, polygonIntersection, \
+    polygonOffset, groupRings
 
 
 class Polygon(Node):
@@ -80,3 +82,60 @@ class Polygon(Node):
         :param other: the other polygon
         """
         self.nodes.cut(other.nodes)
+
+    @staticmethod
+    def fromRings(rings, **kwargs):
+        r""" Create polygons from the result of a boolean operation
+
+        Holes are connected to their outline like it is done by cut.
+
+        :param rings: list of rings (counterclockwise outlines, clockwise holes)
+        :param \**kwargs: additional arguments for the created polygons (layer, width, ...)
+        :return: list of Polygon
+        """
+        polygons = []
+        for outline, holes in groupRings(rings):
+            polygon = Polygon(nodes=outline, **kwargs)
+            for hole in holes:
+                # cut walks the other polygon backwards, which results in a clockwise hole
+                polygon.nodes._bridge(PolygonPoints(nodes=reversed(hole)))
+            polygons.append(polygon)
+        return polygons
+
+    def _booleanResult(self, rings):
+        return Polygon.fromRings(rings, layer=self.layer, width=self.width)
+
+    def booleanUnion(self, *others):
+        r""" Union of this polygon with other polygons
+
+        The calculation is done in the local coordinate system of the polygons.
+
+        :param others: other polygons (Polygon, PolygonPoints or list of points)
+        :return: list of Polygon with the layer and width of this polygon
+        """
+        return self._booleanResult(polygonUnion(self.nodes, *others))
+
+    def booleanDifference(self, *others):
+        r""" Remove other polygons from this polygon
+
+        :param others: other polygons (Polygon, PolygonPoints or list of points)
+        :return: list of Polygon with the layer and width of this polygon
+        """
+        return self._booleanResult(polygonDifference(self.nodes, *others))
+
+    def booleanIntersection(self, *others):
+        r""" Intersection of this polygon with other polygons
+
+        :param others: other polygons (Polygon, PolygonPoints or list of points)
+        :return: list of Polygon with the layer and width of this polygon
+        """
+        return self._booleanResult(polygonIntersection(self.nodes, *others))
+
+    def offset(self, delta, **kwargs):
+        r""" Grow or shrink this polygon
+
+        :param delta: offset distance (negative values shrink the polygon)
+        :param \**kwargs: see KicadModTree.geometry.polygonOffset
+        :return: list of Polygon with the layer and width of this polygon
+        """
+        return self._booleanResult(polygonOffset(self.nodes, delta, **kwargs))
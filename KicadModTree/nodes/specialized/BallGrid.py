@@ -0,0 +1,236 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import itertools
+from string import ascii_uppercase
+
+from KicadModTree.Vector import *
+from KicadModTree.util.paramUtil import *
+from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.base.Pad import Pad
+
+# letters which are not used for BGA row names because they are easily confused (JEP95)
+_SKIPPED_ROW_LETTERS = 'IOQSXZ'
+
+
+class BallGrid(Node):
+    r"""Add the balls of a BGA or CSP package
+
+    The grid stores which balls are populated as a bitmap and creates the pads only when they are needed. The
+    KicadFileHandler writes the balls directly, so even packages with thousands of balls are fast to generate.
+    Balls are named by their row name followed by the column number, the first column is 1.
+
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *pitch* (``float``, ``Vector2D``) --
+          distance between the balls, in x and y direction
+        * *columns* (``int``) --
+          number of columns
+        * *rows* (``int``) --
+          number of rows
+        * *center* (``Vector2D``) --
+          center of the grid (default: [0, 0])
+        * *row_names* (``list(str)``) --
+          names of the rows from top to bottom (default: A, B, .. Y, AA, AB, .. without I, O, Q, S, X and Z)
+        * *row_skips* (``list(list(int, [int, int]))``) --
+          removed balls of every row, like in the bga yaml files. An int removes a column, a list [first, end]
+          removes the columns first to end - 1
+        * *depopulated* (``list(list(bool))``, ``numpy.ndarray``) --
+          rows x columns array which is true for the removed balls
+        * *type*, *shape*, *size*, *layers*, ... --
+          arguments of the pads, see Pad
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> BallGrid(pitch=0.8, columns=18, rows=18, row_skips=[[], [], [[4, 16]]],
+    ...          type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE, size=0.4, layers=Pad.LAYERS_SMT)
+    """
+
+    def __init__(self, **kwargs):
+        Node.__init__(self)
+        self._initGrid(**kwargs)
+        self._initRowNames(**kwargs)
+        self._initPopulation(**kwargs)
+
+        self.pad_kwargs = {k: v for k, v in kwargs.items() if k not in
+                           ('pitch', 'columns', 'rows', 'center', 'row_names', 'row_skips', 'depopulated',
+                            'number', 'at')}
+        # the pad of the first ball, also validates the pad arguments
+        self.prototype = Pad(number='', at=[0, 0], **self.pad_kwargs)
+        self.virtual_childs = None
+
+    def _initGrid(self, **kwargs):
+        if not kwargs.get('pitch'):
+            raise KeyError('pitch not declared (like "pitch=0.8")')
+        self.pitch = toVectorUseCopyIfNumber(kwargs.get('pitch'), low_limit=0)
+
+        if not kwargs.get('columns') or not kwargs.get('rows'):
+            raise KeyError('grid size not declared (like "columns=10, rows=10")')
+        self.columns = int(kwargs.get('columns'))
+        self.rows = int(kwargs.get('rows'))
+
+        self.center = Vector2D(kwargs.get('center', [0, 0]))
+
+        # same calculation as the pads of a manually created grid, to get exactly the same positions
+        x_left = self.center.x - self.pitch.x * ((self.columns - 1) / 2.0)
+        y_top = self.center.y - self.pitch.y * ((self.rows - 1) / 2.0)
+        self._column_x = [x_left + column * self.pitch.x for column in range(self.columns)]
+        self._row_y = [y_top + row * self.pitch.y for row in range(self.rows)]
+
+    def _initRowNames(self, **kwargs):
+        row_names = kwargs.get('row_names')
+        if row_names is None:
+            row_names = BallGrid.rowNames(self.rows)
+        if len(row_names) < self.rows:
+            raise ValueError('{} row names given for {} rows'.format(len(row_names), self.rows))
+
+        self.row_names = list(row_names[:self.rows])
+        self._row_index = {name: row for row, name in enumerate(self.row_names)}
+        if len(self._row_index) != self.rows:
+            raise ValueError('row names are not unique')
+
+    def _initPopulation(self, **kwargs):
+        # one byte per ball, 1 if the ball is populated
+        self.populated = bytearray([1]) * (self.rows * self.columns)
+
+        for row, skips in enumerate(kwargs.get('row_skips') or []):
+            if row >= self.rows:
+                break
+            for item in skips:
+                try:
+                    columns = range(*item)
+                except TypeError:
+                    columns = [item]
+                for column in columns:
+                    self._setBall(row, column - 1, 0)
+
+        depopulated = kwargs.get('depopulated')
+        if depopulated is not None:
+            if hasattr(depopulated, 'tolist'):
+                # numpy array
+                depopulated = depopulated.tolist()
+            if len(depopulated) != self.rows or any(len(r) != self.columns for r in depopulated):
+                raise ValueError('depopulated has to be an array of {} x {} values'.format(self.rows, self.columns))
+            for row, values in enumerate(depopulated):
+                for column, value in enumerate(values):
+                    if value:
+                        self.populated[row * self.columns + column] = 0
+
+    def _setBall(self, row, column, value):
+        if not 0 <= column < self.columns:
+            raise ValueError('column {} is outside of the grid'.format(column + 1))
+        self.populated[row * self.columns + column] = value
+
+    @staticmethod
+    def rowNames(count, skip=_SKIPPED_ROW_LETTERS):
+        r"""Get the default row names: A, B, .. Y, AA, AB, .. without easily confused letters
+
+        :param count: number of rows
+        :param skip: letters which are not used (default: 'IOQSXZ')
+        """
+        letters = [c for c in ascii_uppercase if c not in skip]
+        names = (''.join(p) for n in itertools.count(1) for p in itertools.product(letters, repeat=n))
+        return list(itertools.islice(names, count))
+
+    def _parseName(self, name):
+        digits = len(name) - len(name.rstrip('0123456789'))
+        if not digits:
+            raise KeyError(name)
+        row = self._row_index.get(name[:-digits])
+        column = int(name[-digits:]) - 1
+        if row is None or not 0 <= column < self.columns or name[-digits] == '0':
+            raise KeyError(name)
+        return row, column
+
+    def getBallCount(self):
+        r"""Get the number of populated balls"""
+        return sum(self.populated)
+
+    def hasBall(self, name):
+        r"""Check if a ball exists and is populated
+
+        :param name: name of the ball, like 'AB12'
+        """
+        try:
+            row, column = self._parseName(name)
+        except KeyError:
+            return False
+        return bool(self.populated[row * self.columns + column])
+
+    def getBallPosition(self, name):
+        r"""Get the position of a populated ball, relative to the parent node
+
+        :param name: name of the ball, like 'AB12'
+        :return: Vector2D
+        """
+        row, column = self._parseName(name)
+        if not self.populated[row * self.columns + column]:
+            raise KeyError('ball {} is depopulated'.format(name))
+        return Vector2D(self._column_x[column], self._row_y[row])
+
+    def iterBalls(self):
+        r"""Iterate over the populated balls, row by row
+
+        :return: tuples of name, x and y
+        """
+        columns = range(self.columns)
+        for row, row_name in enumerate(self.row_names):
+            start = row * self.columns
+            y = self._row_y[row]
+            for column in itertools.compress(columns, self.populated[start:start + self.columns]):
+                yield '{}{}'.format(row_name, column + 1), self._column_x[column], y
+
+    def getBallNames(self):
+        r"""Get the names of the populated balls, row by row"""
+        return [name for name, _, _ in self.iterBalls()]
+
+    def getVirtualChilds(self):
+        # pads are only created for code which needs them as nodes
+        if self.virtual_childs is None:
+            self.virtual_childs = []
+            for name, x, y in self.iterBalls():
+                pad = Pad(number=name, at=[x, y], **self.pad_kwargs)
+                pad._parent = self
+                self.virtual_childs.append(pad)
+        return self.virtual_childs
+
+    def serialize(self):
+        # the balls are written by the file handler
+        return [self]
+
+    def calculateBoundingBox(self):
+        populated_rows = [r for r in range(self.rows) if any(self.populated[r * self.columns:(r + 1) * self.columns])]
+        populated_columns = [c for c in range(self.columns) if any(self.populated[c::self.columns])]
+
+        min_x, min_y = 0, 0
+        max_x, max_y = 0, 0
+        if populated_rows:
+            size = self.prototype.size
+            min_x = min(min_x, self._column_x[populated_columns[0]] - size.x / 2)
+            max_x = max(max_x, self._column_x[populated_columns[-1]] + size.x / 2)
+            min_y = min(min_y, self._row_y[populated_rows[0]] - size.y / 2)
+            max_y = max(max_y, self._row_y[populated_rows[-1]] + size.y / 2)
+
+        return {'min': Vector2D(min_x, min_y), 'max': Vector2D(max_x, max_y)}
+
+    def _getRenderTreeText(self):
+        render_text = Node._getRenderTreeText(self)
+        render_text += " [{} x {}, {} balls]".format(self.columns, self.rows, self.getBallCount())
+        return render_text
@@ -24,6 +24,7 @@ from KicadModTree.nodes.base.Pad import *
 from KicadModTree.nodes.specialized.ChamferedPadGrid import *
 from KicadModTree.nodes.specialized.PadArray import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.profiler import instrument
 from math import sqrt, floor
 from copy import copy
 import traceback
@@ -557,3 +558,9 @@ class ExposedPad(Node):
 
     def getRoundRadius(self):
         return min(self.radius_ratio*min(self.size), self.maximum_radius)
+
+
+instrument(ExposedPad, 'getVirtualChilds', category='node')
+instrument(ExposedPad, '_ExposedPad__createMainPad', 'ExposedPad.__createMainPad', category='node')
+instrument(ExposedPad, '_ExposedPad__createVias', 'ExposedPad.__createVias', category='node')
+instrument(ExposedPad, '_ExposedPad__createPaste', 'ExposedPad.__createPaste', category='node')
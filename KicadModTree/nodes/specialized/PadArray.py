@@ -19,6 +19,7 @@
 from KicadModTree.nodes.base.Pad import *
 from KicadModTree.nodes.specialized.ChamferedPad import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.profiler import instrument
 
 from KicadModTree.util.paramUtil import *
 
@@ -276,3 +277,6 @@ class PadArray(Node):
 
     def getVirtualChilds(self):
         return self.virtual_childs
+
+
+instrument(PadArray, '_createPads', category='node')
@@ -17,6 +17,7 @@ import math
 
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.profiler import instrument
 
 
 class Rotation(Node):
@@ -60,3 +61,6 @@ class Rotation(Node):
         render_text += " [r: {r}]".format(r=self.rotation)
 
         return render_text
+
+
+instrument(Rotation, 'getRealPosition', 'getRealPosition', category='transform')
@@ -15,6 +15,7 @@
 
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
+from KicadModTree.util.profiler import instrument
 
 
 class Translation(Node):
@@ -58,3 +59,6 @@ class Translation(Node):
                                                   y=self.offset_y)
 
         return render_text
+
+
+instrument(Translation, 'getRealPosition', 'getRealPosition', category='transform')
@@ -25,3 +25,4 @@ from .PadArray import PadArray
 from .ExposedPad import ExposedPad
 from .ChamferedPad import ChamferedPad, CornerSelection
 from .ChamferedPadGrid import *
+from .BallGrid import BallGrid
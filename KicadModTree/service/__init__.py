@@ -0,0 +1,23 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import sys
+
+# the generator registrations are loaded with importlib.util.module_from_spec
+if sys.version_info < (3, 5):
+    raise ImportError("KicadModTree.service requires Python 3.5 or newer")
+
+from .registry import ServiceException, GeneratorRegistry  # NOQA
+from .server import GenerationService, createServer  # NOQA
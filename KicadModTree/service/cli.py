@@ -0,0 +1,67 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Command line interface of kmt-service
+
+Start the generation service with the generators of one or more registration files::
+
+    kmt-service --generators scripts/service_generators.py --port 8765 --jobs 4
+    curl -d '{"generator": "ipc_gullwing", "params": {"definition_file": "soic.yaml",
+                                                     "entry": "SOIC-8_3.9x4.9mm_P1.27mm"}}' localhost:8765/generate
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+
+from .registry import GeneratorRegistry
+from .server import GenerationService, createServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve footprint generators over HTTP on localhost.')
+    parser.add_argument('--generators', type=str, action='append', required=True, metavar='FILE',
+                        help='python file with a registerGenerators(registry) function (can be given multiple times)')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--max-queue', type=int, default=64, help='maximum number of waiting requests (default: 64)')
+    parser.add_argument('--timeout', type=float, default=60, help='maximum time of a single request (s)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not log the requests')
+    args = parser.parse_args(argv)
+
+    registry = GeneratorRegistry()
+    for path in args.generators:
+        registry.loadFile(path)
+
+    service = GenerationService(registry, jobs=args.jobs, max_queue=args.max_queue, timeout=args.timeout)
+    server = createServer(service, args.host, args.port, quiet=args.quiet)
+    print("serving {} generators on http://{}:{}".format(len(registry), *server.server_address[:2]))
+    sys.stdout.flush()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
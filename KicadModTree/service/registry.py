@@ -0,0 +1,90 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import collections
+import importlib.util
+import os
+
+
+class ServiceException(Exception):
+    pass
+
+
+_Generator = collections.namedtuple('_Generator', ['name', 'function', 'description'])
+
+
+class GeneratorRegistry(object):
+    r"""Generator functions the service can dispatch to
+
+    A generator function takes the parameters of a request (a dict) and returns a Footprint.
+
+    Registration files are python files with a function ``registerGenerators(registry)``, they are loaded with
+    ``loadFile``. This keeps the service independent of the scripts directory.
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> from KicadModTree.service import GeneratorRegistry
+    >>> def resistor(params):
+    ...     kicad_mod = Footprint(params['name'])
+    ...     return kicad_mod
+    ...
+    >>> registry = GeneratorRegistry()
+    >>> registry.register('resistor', resistor, 'an empty footprint')
+    """
+
+    def __init__(self):
+        self._generators = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._generators)
+
+    def register(self, name, function, description=''):
+        r"""Add a generator function
+
+        :param name: name used by requests
+        :param function: function(params) -> Footprint
+        :param description: short description shown in the list of generators
+        """
+        if name in self._generators:
+            raise ServiceException("generator registered twice: {}".format(name))
+        self._generators[name] = _Generator(name, function, description)
+
+    def get(self, name):
+        r"""Get the generator function of a name
+
+        :raises ServiceException: if there is no such generator
+        """
+        if name not in self._generators:
+            raise ServiceException("unknown generator: {}".format(name))
+        return self._generators[name].function
+
+    def describe(self):
+        r"""Get name and description of all generators"""
+        return [{'name': g.name, 'description': g.description} for g in self._generators.values()]
+
+    def loadFile(self, path):
+        r"""Load a registration file and call its ``registerGenerators(registry)``
+
+        :param path: path of the python file
+        """
+        path = os.path.abspath(path)
+        module_name = '_kmt_service_' + os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, 'registerGenerators'):
+            raise ServiceException("{} has no function registerGenerators(registry)".format(path))
+        module.registerGenerators(self)
@@ -0,0 +1,231 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Footprint generation service
+
+A long running process which keeps KicadModTree, the generator modules and their configuration loaded. Requests
+are JSON documents sent over HTTP to localhost:
+
+``POST /generate`` with ``{"generator": "ipc_gullwing", "params": {...}}``
+    returns ``{"name": ..., "kicad_mod": ..., "timing": {"queue_ms": ..., "generate_ms": ...,
+    "serialize_ms": ..., "total_ms": ...}}``
+``GET /generators``
+    returns the registered generators
+``GET /stats``
+    returns the number of requests, errors and the average timing
+
+Requests wait in a bounded queue for one of the worker processes. A request gets status 503 if the queue is full,
+and 504 if it takes longer than the timeout. The workers are forked after the registration files are loaded, so
+every worker starts with everything imported.
+"""
+
+from __future__ import division
+
+import json
+import multiprocessing
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from multiprocessing.pool import ThreadPool
+from socketserver import ThreadingMixIn
+
+from KicadModTree.KicadFileHandler import KicadFileHandler
+from .registry import ServiceException
+
+# registry of the worker processes, set by the pool initializer
+_worker_registry = None
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer, which is only available since Python 3.7
+    daemon_threads = True
+
+
+def _initWorker(registry):
+    global _worker_registry
+    _worker_registry = registry
+
+
+def _generate(registry, generator, params, submitted):
+    start = time.time()
+    try:
+        kicad_mod = registry.get(generator)(params)
+        generated = time.time()
+        text = KicadFileHandler(kicad_mod).serialize(timestamp=params.get('timestamp'))
+        serialized = time.time()
+    except ServiceException as e:
+        return {'error': str(e), 'status': 404}
+    except Exception:
+        return {'error': traceback.format_exc(), 'status': 500}
+
+    return {'name': kicad_mod.name, 'kicad_mod': text,
+            'timing': {'queue_ms': round((start - submitted) * 1000, 3),
+                       'generate_ms': round((generated - start) * 1000, 3),
+                       'serialize_ms': round((serialized - generated) * 1000, 3)}}
+
+
+def _generateInWorker(generator, params, submitted):
+    return _generate(_worker_registry, generator, params, submitted)
+
+
+class GenerationService(object):
+    r"""Queue and worker pool of the generation service
+
+    :param registry: GeneratorRegistry with all generator functions
+    :param jobs: number of worker processes (default: number of CPUs). 0 runs the generators in a thread of the
+                 service process, which is only useful for generators which can not be forked
+    :param max_queue: maximum number of waiting requests, further requests are rejected (default: 64)
+    :param timeout: maximum time of a single request in seconds, a slower request is answered with status 504. Its
+                    queue slot stays taken until the worker finished it (default: 60)
+
+    :Example:
+
+    >>> from KicadModTree.service import *
+    >>> registry = GeneratorRegistry()
+    >>> registry.loadFile('scripts/service_generators.py')
+    >>> service = GenerationService(registry, jobs=4)
+    >>> createServer(service, port=8765).serve_forever()
+    """
+
+    def __init__(self, registry, jobs=None, max_queue=64, timeout=60):
+        self.registry = registry
+        self.timeout = timeout
+
+        if jobs == 0:
+            self._pool = ThreadPool(1)
+            self._in_process = True
+        else:
+            # fork keeps generator functions usable which can not be pickled
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._pool = context.Pool(jobs, initializer=_initWorker, initargs=(registry,))
+            self._in_process = False
+
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'errors': 0, 'rejected': 0, 'total_ms': 0.0}
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def generate(self, generator, params=None):
+        r"""Generate a footprint
+
+        :param generator: name of the registered generator
+        :param params: parameters passed to the generator function
+        :return: dict with ``name``, ``kicad_mod`` and ``timing``, or ``error`` and ``status`` if it failed
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            return {'error': 'too many waiting requests', 'status': 503}
+
+        def release(_):
+            # also after a timeout, the slot is only free again when the worker finished the request
+            self._slots.release()
+
+        submitted = time.time()
+        pending = None
+        try:
+            if self._in_process:
+                pending = self._pool.apply_async(_generate, (self.registry, generator, params or {}, submitted),
+                                                 callback=release, error_callback=release)
+            else:
+                pending = self._pool.apply_async(_generateInWorker, (generator, params or {}, submitted),
+                                                 callback=release, error_callback=release)
+            result = pending.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            result = {'error': 'generation timed out after {} s'.format(self.timeout), 'status': 504}
+        except Exception as e:
+            if pending is None:
+                self._slots.release()
+            result = {'error': 'generation failed: {}'.format(str(e) or e.__class__.__name__), 'status': 500}
+
+        self._count('requests')
+        if 'error' in result:
+            self._count('errors')
+        else:
+            result['timing']['total_ms'] = round((time.time() - submitted) * 1000, 3)
+            self._count('total_ms', result['timing']['total_ms'])
+        return result
+
+    def stats(self):
+        r"""Get the number of handled requests and the average time of successful requests"""
+        with self._lock:
+            stats = dict(self._stats)
+        succeeded = stats['requests'] - stats['errors']
+        stats['average_ms'] = round(stats.pop('total_ms') / succeeded, 3) if succeeded else None
+        return stats
+
+    def shutdown(self):
+        r"""Stop the worker pool"""
+        self._pool.close()
+        self._pool.join()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    service = None
+    quiet = False
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/generators':
+            self._reply(200, {'generators': self.service.registry.describe()})
+        elif self.path == '/stats':
+            self._reply(200, self.service.stats())
+        else:
+            self._reply(404, {'error': 'unknown path: {}'.format(self.path)})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._reply(404, {'error': 'unknown path: {}'.format(self.path)})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+            generator, params = request['generator'], request.get('params', {})
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {'error': 'invalid request: {}'.format(e)})
+            return
+
+        result = self.service.generate(generator, params)
+        self._reply(result.pop('status', 200), result)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def createServer(service, host='127.0.0.1', port=8765, quiet=False):
+    r"""Create the HTTP server of a generation service
+
+    Every connection is handled in its own thread, the generation itself happens in the worker pool of the service.
+
+    :param service: the GenerationService
+    :param host: address to listen on (default: localhost only)
+    :param port: port to listen on, 0 selects a free port
+    :param quiet: do not log the requests
+    :return: ``http.server.HTTPServer`` with a thread per connection, call ``serve_forever()`` to start it
+    """
+    handler = type('RequestHandler', (_RequestHandler,), {'service': service, 'quiet': quiet})
+    return _ThreadingHTTPServer((host, port), handler)
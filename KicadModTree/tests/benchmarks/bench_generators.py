@@ -0,0 +1,84 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Benchmarks of the generator scripts and their drawing tools
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_generators.*'
+"""
+
+import functools
+import importlib.util
+import os
+import sys
+
+from KicadModTree import *
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+
+SCRIPTS_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts'))
+GULLWING_DIR = os.path.join(SCRIPTS_DIR, 'Packages', 'Package_Gullwing__QFP_SOIC_SO')
+
+
+@functools.lru_cache(maxsize=None)
+def _loadScript(path):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@functools.lru_cache(maxsize=None)
+def _drawingTools():
+    tools_dir = os.path.join(SCRIPTS_DIR, 'tools')
+    if tools_dir not in sys.path:
+        sys.path.append(tools_dir)
+    return _loadScript(os.path.join(tools_dir, 'drawing_tools.py'))
+
+
+def bench_gullwing_family():
+    # every size definition of the gullwing generator, without writing the files
+    gullwing = _loadScript(os.path.join(GULLWING_DIR, 'ipc_gullwing_generator.py'))
+    configuration = loadConfiguration(os.path.join(SCRIPTS_DIR, 'tools', 'global_config_files', 'config_KLCv3.0.yaml'),
+                                      os.path.join(SCRIPTS_DIR, 'Packages', 'package_config_KLCv3.yaml'))
+    generator = gullwing.Gullwing(configuration)
+
+    definitions_dir = os.path.join(GULLWING_DIR, 'size_definitions')
+    for filename in sorted(os.listdir(definitions_dir)):
+        definitions = loadYaml(os.path.join(definitions_dir, filename))
+        header = definitions.pop('FileHeader')
+        for device in definitions.values():
+            KicadFileHandler(generator.createFootprint(device, header)).serialize(timestamp=0)
+
+
+def bench_keepout_line_drawing():
+    # silk outline and dashed lines of a 2x40 pin header, drawn around the pads
+    tools = _drawingTools()
+    kicad_mod = Footprint("benchmark")
+    keepouts = []
+    for i in range(40):
+        for y in (0, 2.54):
+            keepouts += tools.addKeepoutRound(i * 2.54, y, 1.7, 1.7)
+
+    for y in (-1.33, 3.87, 1.27):
+        tools.addHLineWithKeepout(kicad_mod, -1.33, 100.9, y, 'F.SilkS', 0.12, keepouts)
+        tools.addHDLineWithKeepout(kicad_mod, -1.33, 100.9, y + 0.3, 'F.SilkS', 0.12, keepouts)
+    for i in range(40):
+        tools.addVLineWithKeepout(kicad_mod, i * 2.54 + 1.27, -1.33, 3.87, 'F.SilkS', 0.12, keepouts)
+        tools.addCircleWithKeepout(kicad_mod, i * 2.54, 1.27, 1.2, 'F.SilkS', 0.12, keepouts)
+
+
+BENCHMARKS = [
+    bench_gullwing_family,
+    bench_keepout_line_drawing
+]
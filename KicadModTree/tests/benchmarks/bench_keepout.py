@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+r"""Benchmarks for KicadModTree.geometry.keepout and KicadModTree.geometry.dashes
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_keepout.*'
+"""
+
+
+from KicadModTree.geometry.keepout import *
+from KicadModTree.geometry.dashes import *
+
+
+def _padRow(count, pitch=2.54):
+    # two rows of round pads, like a pin header
+    return [KeepoutCircle(i * pitch, y, 0.97) for i in range(count) for y in (0, pitch)]
+
+
+def _outline(count, pitch=2.54):
+    # a silk outline around the pads and some dashed lines through them
+    lines = []
+    for y in (-1.3, pitch + 1.3, 0.9, pitch - 0.9):
+        lines.append(((-1.3, y), (count * pitch, y)))
+    for i in range(count):
+        lines.append(((i * pitch + 1.27, -1.3), (i * pitch + 1.27, pitch + 1.3)))
+        lines.append(((i * pitch, -1.3), (i * pitch + 1.27, pitch + 1.3)))
+    return lines
+
+
+def bench_clip_segments_list():
+    keepouts = _padRow(100)
+    for start, end in _outline(100):
+        clipSegment(start, end, keepouts)
+
+
+def bench_clip_segments_index():
+    keepouts = KeepoutIndex(_padRow(100))
+    for start, end in _outline(100):
+        clipSegment(start, end, keepouts)
+
+
+def bench_clip_lines_batch():
+    clipLines(_outline(100), _padRow(100))
+
+
+def bench_clip_circles_index():
+    keepouts = KeepoutIndex(_padRow(100))
+    for i in range(100):
+        clipCircle((i * 2.54, 1.27), 1.5, keepouts)
+
+
+def bench_dash_lines_index():
+    keepouts = KeepoutIndex(_padRow(100))
+    for start, end in _outline(100):
+        dashSegment(start, end, 0.36, 0.36, keepouts)
+
+
+def bench_dash_circles_index():
+    keepouts = KeepoutIndex(_padRow(100))
+    for i in range(100):
+        dashCircle((i * 2.54, 1.27), 1.5, 0.36, 0.36, keepouts)
+
+
+BENCHMARKS = [
+    bench_clip_segments_list,
+    bench_clip_segments_index,
+    bench_clip_lines_batch,
+    bench_clip_circles_index,
+    bench_dash_lines_index,
+    bench_dash_circles_index
+]
@@ -0,0 +1,57 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Benchmarks for the creation and serialization of pad nodes
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_nodes.*'
+"""
+
+
+from KicadModTree import *
+
+
+def _serialize(*nodes):
+    kicad_mod = Footprint("benchmark")
+    kicad_mod.extend(nodes)
+    return KicadFileHandler(kicad_mod).serialize(timestamp=0)
+
+
+def bench_pad_array_1000_create():
+    PadArray(pincount=1000, x_spacing=0.5, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT,
+             size=[0.3, 1.5], layers=Pad.LAYERS_SMT, radius_ratio=0.25)
+
+
+def bench_pad_array_1000_serialize():
+    _serialize(PadArray(pincount=1000, x_spacing=0.5, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT,
+                        size=[0.3, 1.5], layers=Pad.LAYERS_SMT, radius_ratio=0.25))
+
+
+def bench_chamfered_pad_grid():
+    _serialize(ChamferedPadGrid(number=1, type=Pad.TYPE_SMT, center=[0, 0], size=[1, 1], pincount=[20, 20],
+                                grid=[1.5, 1.5], layers=['F.Paste'], chamfer_size=0.25,
+                                chamfer_selection=ChamferSelPadGrid(1)))
+
+
+def bench_exposed_pad_vias():
+    _serialize(ExposedPad(number=65, size=[7.15, 7.15], paste_layout=[4, 4], via_layout=[5, 5], via_drill=0.3,
+                          paste_avoid_via=True, paste_coverage=0.65, radius_ratio=0.25, maximum_radius=0.25))
+
+
+BENCHMARKS = [
+    bench_pad_array_1000_create,
+    bench_pad_array_1000_serialize,
+    bench_chamfered_pad_grid,
+    bench_exposed_pad_vias
+]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Benchmarks for KicadModTree.geometry.polygon_boolean
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_polygon_boolean.*'
+"""
+
+import math
+
+from KicadModTree.geometry.polygon_boolean import *
+
+
+def _circle(radius, count, x=0, y=0):
+    return [(x + radius * math.cos(2 * math.pi * i / count), y + radius * math.sin(2 * math.pi * i / count))
+            for i in range(count)]
+
+
+def _rect(x, y, w, h):
+    return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+
+
+def bench_union_pad_row():
+    pads = [_rect(i * 0.5, 0, 0.3, 1) for i in range(200)]
+    polygonUnion(*pads)
+
+
+def bench_courtyard_inflated_union():
+    pads = [_rect(i * 0.5, y, 0.3, 1) for i in range(100) for y in (0, 3)]
+    body = _rect(-0.5, 0.5, 50, 3)
+    inflatedUnion(pads + [body], 0.25)
+
+
+def bench_difference_high_vertex_count():
+    polygonDifference(_circle(10, 2000), _circle(3, 500), _circle(1, 200, x=6))
+
+
+def bench_intersection_high_vertex_count():
+    polygonIntersection(_circle(10, 2000), _circle(10, 2000, x=5))
+
+
+def bench_round_offset():
+    polygonOffset(_circle(10, 1000), 0.5, join_type='round')
+
+
+BENCHMARKS = [
+    bench_union_pad_row,
+    bench_courtyard_inflated_union,
+    bench_difference_high_vertex_count,
+    bench_intersection_high_vertex_count,
+    bench_round_offset
+]
@@ -0,0 +1,81 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Benchmarks for writing and parsing .kicad_mod files
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_serialization.*'
+"""
+
+import functools
+
+from KicadModTree import *
+from KicadModTree.util.kicad_util import lispTokenizer, parseLispString
+
+
+def _bgaFootprint(columns, rows, pitch):
+    kicad_mod = Footprint("BGA-{}".format(columns * rows))
+    kicad_mod.setDescription("BGA, {}x{} grid".format(columns, rows))
+    kicad_mod.append(RectLine(start=[-columns * pitch / 2, -rows * pitch / 2],
+                              end=[columns * pitch / 2, rows * pitch / 2], layer='F.Fab'))
+    return kicad_mod
+
+
+def _bgaPads(columns=50, rows=50, pitch=0.8):
+    # a BGA built from single pads, like the generators did before BallGrid
+    kicad_mod = _bgaFootprint(columns, rows, pitch)
+    for row, row_name in enumerate(BallGrid.rowNames(rows)):
+        for column in range(columns):
+            kicad_mod.append(Pad(number="{}{}".format(row_name, column + 1), type=Pad.TYPE_SMT,
+                                 shape=Pad.SHAPE_CIRCLE, size=[0.4, 0.4], layers=Pad.LAYERS_SMT,
+                                 at=[(column - (columns - 1) / 2) * pitch, (row - (rows - 1) / 2) * pitch]))
+    return kicad_mod
+
+
+def _bgaBallGrid(columns=50, rows=50, pitch=0.8):
+    # the same BGA as _bgaPads, built from a BallGrid node
+    kicad_mod = _bgaFootprint(columns, rows, pitch)
+    kicad_mod.append(BallGrid(pitch=pitch, columns=columns, rows=rows, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE,
+                              size=0.4, layers=Pad.LAYERS_SMT))
+    return kicad_mod
+
+
+@functools.lru_cache(maxsize=None)
+def _largeFile():
+    # about 200 kB of .kicad_mod
+    return KicadFileHandler(_bgaPads(100, 25)).serialize(timestamp=0)
+
+
+def bench_serialize_bga_2500_single_pads():
+    KicadFileHandler(_bgaPads()).serialize(timestamp=0)
+
+
+def bench_serialize_bga_2500_ball_grid():
+    KicadFileHandler(_bgaBallGrid()).serialize(timestamp=0)
+
+
+def bench_lisp_tokenizer_large_file():
+    lispTokenizer(_largeFile())
+
+
+def bench_parse_lisp_string_large_file():
+    parseLispString(_largeFile())
+
+
+BENCHMARKS = [
+    bench_serialize_bga_2500_single_pads,
+    bench_serialize_bga_2500_ball_grid,
+    bench_lisp_tokenizer_large_file,
+    bench_parse_lisp_string_large_file
+]
@@ -0,0 +1,60 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Benchmarks for KicadModTree.Vector
+
+Run with: python -m KicadModTree.tests.benchmarks -k 'bench_vector.*'
+"""
+
+
+from KicadModTree.Vector import *
+
+
+def bench_vector2d_construction():
+    for i in range(20000):
+        Vector2D(i, 0.5)
+        Vector2D([i, 0.5])
+        Vector2D({'x': i, 'y': 0.5})
+
+
+def bench_vector2d_arithmetic():
+    a = Vector2D(1.27, -2.54)
+    b = Vector2D(0.5, 0.25)
+    for i in range(20000):
+        c = (a + b) * 2 - b
+        c = c / 4 + [i, 1]
+        c.distance_to(a)
+
+
+def bench_vector2d_round_to():
+    points = [Vector2D(i * 0.0137, i * -0.0211) for i in range(10000)]
+    for p in points:
+        p.round_to(0.01)
+
+
+def bench_vector3d_arithmetic():
+    a = Vector3D(1.27, -2.54, 0.5)
+    b = Vector3D(0.5, 0.25, -1)
+    for i in range(20000):
+        c = (a + b) * 2 - b
+        c = -c / 4
+
+
+BENCHMARKS = [
+    bench_vector2d_construction,
+    bench_vector2d_arithmetic,
+    bench_vector2d_round_to,
+    bench_vector3d_arithmetic
+]
@@ -0,0 +1,147 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Run all benchmarks of KicadModTree.tests.benchmarks
+
+Every ``bench_*.py`` module of this package lists its benchmark functions in ``BENCHMARKS``. A benchmark is called
+once to warm up (caches, lazy imports), then timed ``repeat`` times, the best time is the result.
+
+Run with: python -m KicadModTree.tests.benchmarks [--output results.json] [--compare baseline.json]
+
+Compare mode reports every benchmark which is slower than the baseline by more than the threshold (default: 10%),
+and exits with status 1 if there is one.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import importlib
+import json
+import pkgutil
+import platform
+import statistics
+import sys
+import timeit
+
+PACKAGE = 'KicadModTree.tests.benchmarks'
+
+FORMAT_VERSION = 1
+
+
+def findBenchmarks(pattern=None):
+    r"""Get all benchmarks of the package
+
+    :param pattern: only benchmarks whose 'module.function' name matches this shell pattern (default: all)
+    :return: list of (name, function)
+    """
+    package = importlib.import_module(PACKAGE)
+    benchmarks = []
+    for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda m: m.name):
+        if not module_info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module('{}.{}'.format(PACKAGE, module_info.name))
+        for bench in getattr(module, 'BENCHMARKS', []):
+            name = '{}.{}'.format(module_info.name, bench.__name__)
+            if pattern is None or fnmatch.fnmatch(name, pattern):
+                benchmarks.append((name, bench))
+    return benchmarks
+
+
+def runBenchmarks(benchmarks, repeat=5, verbose=True):
+    r"""Time the benchmarks
+
+    :param benchmarks: list of (name, function)
+    :param repeat: number of timed runs of every benchmark
+    :param verbose: print every result
+    :return: the results as dict, like they are written to the JSON file
+    """
+    results = {}
+    for name, bench in benchmarks:
+        bench()
+        times = [t * 1000 for t in timeit.repeat(bench, number=1, repeat=repeat)]
+        results[name] = {'best_ms': min(times), 'median_ms': statistics.median(times), 'runs_ms': times}
+        if verbose:
+            print("{name:<60} {time:10.2f} ms".format(name=name, time=min(times)))
+
+    return {'version': FORMAT_VERSION,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'benchmarks': results}
+
+
+def compareResults(results, baseline, threshold=0.1):
+    r"""Compare results with a baseline
+
+    :param results: results of runBenchmarks
+    :param baseline: results of an earlier run
+    :param threshold: relative slow down which counts as regression (default: 0.1 = 10%)
+    :return: list of (name, baseline ms, current ms, ratio, regression) of the benchmarks in both results
+    """
+    comparison = []
+    for name, result in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['best_ms']
+        after = result['best_ms']
+        ratio = after / before if before > 0 else float('inf')
+        comparison.append((name, before, after, ratio, ratio > 1 + threshold))
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the KicadModTree benchmarks')
+    parser.add_argument('-o', '--output', type=str, default=None, help='write the results as JSON to this file')
+    parser.add_argument('-c', '--compare', type=str, default=None, help='compare with the results of this JSON file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='relative slow down reported as regression in compare mode (default: 0.1)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='timed runs of every benchmark (default: 5)')
+    parser.add_argument('-k', '--filter', type=str, default=None,
+                        help="only run benchmarks matching this pattern, like 'bench_nodes.*'")
+    args = parser.parse_args(argv)
+
+    benchmarks = findBenchmarks(args.filter)
+    if not benchmarks:
+        print("no benchmarks found")
+        return 1
+
+    results = runBenchmarks(benchmarks, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = 0
+        print()
+        print("{:<60} {:>10} {:>10} {:>8}".format('benchmark', 'baseline', 'current', 'ratio'))
+        for name, before, after, ratio, regression in compareResults(results, baseline, args.threshold):
+            regressions += regression
+            print("{:<60} {:8.2f}ms {:8.2f}ms {:7.2f}x{}".format(name, before, after, ratio,
+                                                                 '  REGRESSION' if regression else ''))
+        if regressions:
+            print("{} benchmarks are more than {:.0f}% slower".format(regressions, args.threshold * 100))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+if sys.version_info >= (3, 5):
+    from KicadModTree.build import *
+
+MANIFEST = """
+generators:
+  - cwd: good
+    script: generate.py
+    args: ['*.yaml', --flag]
+  - cwd: good
+    name: good/again
+    script: generate.py
+  - cwd: bad
+    script: generate.py
+"""
+
+GOOD_SCRIPT = """
+import sys
+with open('output.txt', 'w') as f:
+    f.write(' '.join(sys.argv[1:]))
+print('generated')
+"""
+
+BAD_SCRIPT = """
+raise RuntimeError('broken generator')
+"""
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "kmt-build needs Python 3.5 or newer")
+class BuildTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for directory, script in (('good', GOOD_SCRIPT), ('bad', BAD_SCRIPT)):
+            os.makedirs(os.path.join(self.tmp_dir, directory))
+            with open(os.path.join(self.tmp_dir, directory, 'generate.py'), 'w') as f:
+                f.write(script)
+        for name in ('b.yaml', 'a.yaml'):
+            open(os.path.join(self.tmp_dir, 'good', name), 'w').close()
+
+        self.manifest = os.path.join(self.tmp_dir, 'generators.yaml')
+        with open(self.manifest, 'w') as f:
+            f.write(MANIFEST)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def testManifest(self):
+        generators = loadManifest(self.manifest)
+        self.assertEqual([g.name for g in generators], ['good/generate', 'good/again', 'bad/generate'])
+        self.assertEqual(generators[0].cwd, os.path.join(self.tmp_dir, 'good'))
+        self.assertEqual(generators[0].commandLine('python'), ['python', 'generate.py', 'a.yaml', 'b.yaml', '--flag'])
+
+        self.assertEqual([g.name for g in filterGenerators(generators, ['good/*'])], ['good/generate', 'good/again'])
+        self.assertEqual(len(filterGenerators(generators, [])), 3)
+
+        self.assertRaises(ManifestException, Generator, self.tmp_dir)
+        with open(self.manifest, 'w') as f:
+            f.write(MANIFEST + "  - cwd: good\n    script: generate.py\n")
+        self.assertRaises(ManifestException, loadManifest, self.manifest)
+
+    def testBuild(self):
+        log_dir = os.path.join(self.tmp_dir, 'logs')
+        finished = []
+        results = buildLibrary(loadManifest(self.manifest), log_dir, jobs=2, callback=finished.append)
+
+        self.assertEqual([r.name for r in results], ['good/generate', 'good/again', 'bad/generate'])
+        self.assertEqual([r.success for r in results], [True, True, False])
+        self.assertEqual(len(finished), 3)
+
+        # generators run in their working directory
+        with open(os.path.join(self.tmp_dir, 'good', 'output.txt')) as f:
+            self.assertIn(f.read(), ['a.yaml b.yaml --flag', ''])
+        with open(results[2].log_file) as f:
+            self.assertIn('broken generator', f.read())
+
+        summary = formatSummary(results, 1.0)
+        self.assertIn('3 generators, 2 succeeded, 1 failed', summary)
+        self.assertIn('bad/generate', summary)
+
+        summary_file = os.path.join(self.tmp_dir, 'summary.json')
+        writeSummary(results, summary_file, 1.0)
+        with open(summary_file) as f:
+            data = json.load(f)
+        self.assertEqual([g['success'] for g in data['generators']], [True, True, False])
+
+    def testTimeout(self):
+        with open(os.path.join(self.tmp_dir, 'bad', 'generate.py'), 'w') as f:
+            f.write("import time\ntime.sleep(10)\n")
+        result = runGenerator(Generator(os.path.join(self.tmp_dir, 'bad'), script='generate.py'),
+                              self.tmp_dir, timeout=0.5)
+        self.assertFalse(result.success)
+        self.assertIn('timeout', result.error)
@@ -0,0 +1,153 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+if sys.version_info >= (3, 5):
+    from KicadModTree.build import *
+    from KicadModTree.build.golden import normalizedDigest, runGolden, compareGolden, main
+    from KicadModTree.build.moddiff import formatPrimitive
+
+MANIFEST = """
+generators:
+  - cwd: parts
+    script: generate.py
+"""
+
+SCRIPT = """
+import os
+from KicadModTree import *
+
+import settings
+
+if not os.path.isdir('Parts.pretty'):
+    os.makedirs('Parts.pretty')
+for pins in [2, 3]:
+    kicad_mod = Footprint('Part_{}'.format(pins))
+    kicad_mod.append(PadArray(pincount=pins, x_spacing=settings.PITCH, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                              size=[1, 1.5], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(RectLine(start=[-1, -1], end=[pins, 1], layer='F.Fab'))
+    KicadFileHandler(kicad_mod).writeFile('Parts.pretty/Part_{}.kicad_mod'.format(pins))
+"""
+
+OLD_MODULE = """(module Test (layer F.Cu) (tedit 5A000000)
+  (attr smd)
+  (fp_line (start 0 0) (end 1 0) (layer F.SilkS) (width 0.12))
+  (fp_circle (center 0 0) (end 1 0) (layer F.Fab) (width 0.1))
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Mask F.Paste))
+  (pad 2 smd rect (at 1 0) (size 1 1) (layers F.Cu F.Mask F.Paste))
+)"""
+
+NEW_MODULE = """(module Test (layer F.Cu) (tedit 5B000000)
+  (attr smd)
+  (fp_line (start 0 0.5) (end 1.0 0.5) (layer F.SilkS) (width 0.12))
+  (fp_text user %R (at 0 0) (layer F.Fab)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Mask F.Paste))
+  (pad 2 smd rect (at 1 0) (size 1.2 1) (layers F.Cu F.Mask F.Paste))
+)"""
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "kmt-golden needs Python 3.5 or newer")
+class GoldenTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.library_dir = os.path.join(self.tmp_dir, 'scripts')
+        os.makedirs(os.path.join(self.library_dir, 'parts'))
+        self.write('scripts/generators.yaml', MANIFEST)
+        self.write('scripts/parts/generate.py', SCRIPT)
+        self.write('scripts/parts/settings.py', "PITCH = 1.27\n")
+
+        self.manifest = os.path.join(self.library_dir, 'generators.yaml')
+        self.golden = os.path.join(self.tmp_dir, 'golden.json')
+        self.files = os.path.join(self.tmp_dir, 'golden_files')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(os.path.join(self.tmp_dir, path), 'w') as f:
+            f.write(content)
+
+    def testNormalizedDigest(self):
+        self.write('a.kicad_mod', OLD_MODULE)
+        self.write('b.kicad_mod', OLD_MODULE.replace('5A000000', '0').replace('\n', '\r\n'))
+        self.assertEqual(normalizedDigest(os.path.join(self.tmp_dir, 'a.kicad_mod')),
+                         normalizedDigest(os.path.join(self.tmp_dir, 'b.kicad_mod')))
+
+    def testRunIsReproducible(self):
+        first = runGolden(self.manifest, jobs=1)
+        second = runGolden(self.manifest, jobs=1)
+        self.assertEqual(first, second)
+
+        files = first['generators']['parts/generate']['files']
+        self.assertEqual(sorted(files), ['scripts/parts/Parts.pretty/Part_2.kicad_mod',
+                                         'scripts/parts/Parts.pretty/Part_3.kicad_mod'])
+        # the generators run in a copy, the library itself stays untouched
+        self.assertFalse(os.path.exists(os.path.join(self.library_dir, 'parts', 'Parts.pretty')))
+
+    def testCompare(self):
+        golden = runGolden(self.manifest, jobs=1)
+        self.write('scripts/parts/settings.py', "PITCH = 1.5\n")
+        current = runGolden(self.manifest, jobs=1)
+
+        differences = compareGolden(golden, current)
+        self.assertEqual([(d[1], os.path.basename(d[2])) for d in differences],
+                         [('changed', 'Part_2.kicad_mod'), ('changed', 'Part_3.kicad_mod')])
+
+        del current['generators']['parts/generate']['files']['scripts/parts/Parts.pretty/Part_3.kicad_mod']
+        current['generators']['parts/generate']['success'] = False
+        self.assertEqual([d[1] for d in compareGolden(golden, current)], ['failed', 'changed', 'removed'])
+
+    def testCommandLine(self):
+        stdout = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            self.assertEqual(main(['record', '--manifest', self.manifest, '--golden', self.golden,
+                                   '--files', self.files, '--jobs', '1']), 0)
+            self.assertEqual(main(['check', '--manifest', self.manifest, '--golden', self.golden, '--jobs', '1']), 0)
+
+            self.write('scripts/parts/settings.py', "PITCH = 1.5\n")
+            sys.stdout = io.StringIO()
+            self.assertEqual(main(['check', '--manifest', self.manifest, '--golden', self.golden,
+                                   '--files', self.files, '--jobs', '1']), 1)
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+
+        self.assertIn('Part_3.kicad_mod', output)
+        self.assertIn('> pad 2 smd rect (at 1.27 0)', output)
+        self.assertIn('moved by (0.23 0)', output)
+
+    def testSemanticDiff(self):
+        diff = diffKicadMod(OLD_MODULE, NEW_MODULE)
+        self.assertTrue(diff)
+        self.assertEqual(diff.header, [])
+        self.assertEqual([formatPrimitive(o) for o, _ in diff.changed],
+                         ['pad 2 smd rect (at 1 0) (size 1 1) (layers F.Cu F.Mask F.Paste)'])
+        self.assertEqual([formatPrimitive(o) for o, _ in diff.moved],
+                         ['fp_line F.SilkS (start 0 0) (end 1 0) (width 0.12)'])
+        self.assertEqual([p[0] for p in diff.removed], ['fp_circle'])
+        self.assertEqual([p[0] for p in diff.added], ['fp_text'])
+
+        self.assertFalse(diffKicadMod(OLD_MODULE, OLD_MODULE.replace('5A000000', '0')))
+        self.assertRaises(ValueError, diffKicadMod, '(footprint Test)', OLD_MODULE)
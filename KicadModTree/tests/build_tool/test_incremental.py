@@ -0,0 +1,208 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+if sys.version_info >= (3, 5):
+    from KicadModTree.build import *
+    from KicadModTree.build.cli import main
+
+MANIFEST = """
+generators:
+  - cwd: parts
+    script: generate.py
+    args: [parts.yaml]
+    select_option: --only
+    shared_entries: [FileHeader]
+"""
+
+SCRIPT = """
+import argparse
+import yaml
+import helper
+from KicadModTree.util.entry_tracking import generatingEntry
+
+parser = argparse.ArgumentParser()
+parser.add_argument('files', nargs='+')
+parser.add_argument('--only', default=None)
+args = parser.parse_args()
+
+only = set(args.only.split(',')) if args.only else None
+for path in args.files:
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    header = data.pop('FileHeader')
+    for name in data:
+        if only is not None and name not in only:
+            continue
+        generatingEntry(path, name)
+        with open(name + '.txt', 'w') as f:
+            f.write('{} {} {}'.format(header, data[name], helper.VERSION))
+"""
+
+PARTS = """
+FileHeader: header
+part_a: 1
+part_b: 2
+"""
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'scripts')
+
+QFP_MANIFEST = """
+generators:
+  - cwd: Packages/Package_Gullwing__QFP_SOIC_SO
+    script: ipc_gullwing_generator.py
+    args: [size_definitions/lqfp.yaml]
+    select_option: --only
+    shared_entries: [FileHeader]
+"""
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "kmt-build needs Python 3.5 or newer")
+class IncrementalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.parts_dir = os.path.join(self.tmp_dir, 'parts')
+        os.makedirs(self.parts_dir)
+        self.write('generators.yaml', MANIFEST)
+        self.write('parts/generate.py', SCRIPT)
+        self.write('parts/helper.py', "VERSION = 1\n")
+        self.write('parts/parts.yaml', PARTS)
+
+        self.manifest = os.path.join(self.tmp_dir, 'generators.yaml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(os.path.join(self.tmp_dir, path), 'w') as f:
+            f.write(content)
+
+    def build(self):
+        self.assertEqual(main(['--manifest', self.manifest, '--incremental',
+                               '--log-dir', os.path.join(self.tmp_dir, 'logs')]), 0)
+
+    def plan(self):
+        generator = loadManifest(self.manifest)[0]
+        return BuildState(generator.cwd).plan(generator)
+
+    def modificationTimes(self, directory):
+        # outputs are set back in time, so a rewritten file is noticed even on file systems with coarse timestamps
+        times = {}
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            os.utime(path, (time.time() - 100, time.time() - 100))
+            times[name] = os.path.getmtime(path)
+        return times
+
+    def rewritten(self, directory, times):
+        return sorted(n for n in os.listdir(directory) if times.get(n) != os.path.getmtime(os.path.join(directory, n)))
+
+    def testEntryDigests(self):
+        digests = entryDigests(os.path.join(self.parts_dir, 'parts.yaml'), ['FileHeader'])
+        self.assertEqual(sorted(digests), ['part_a', 'part_b'])
+
+        self.write('parts/parts.yaml', PARTS.replace('header', 'new header'))
+        changed = entryDigests(os.path.join(self.parts_dir, 'parts.yaml'), ['FileHeader'])
+        self.assertNotEqual(digests['part_a'], changed['part_a'])
+        self.assertNotEqual(digests['part_b'], changed['part_b'])
+
+    def testIncrementalBuild(self):
+        self.assertEqual(self.plan().mode, 'full')
+        self.build()
+        self.assertEqual(self.plan().mode, 'skip')
+
+        # the digests are stored next to the outputs
+        state = BuildState(self.parts_dir)
+        self.assertEqual(state.path, os.path.join(os.path.realpath(self.parts_dir), STATE_FILE))
+        footprints = state.generators['parts/generate']['footprints']
+        self.assertEqual(sorted(footprints), ['part_a.txt', 'part_b.txt'])
+        self.assertEqual(footprints['part_a.txt']['entry'], ['parts.yaml', 'part_a'])
+
+        # a single changed entry only rebuilds the footprints of this entry
+        times = self.modificationTimes(self.parts_dir)
+        self.write('parts/parts.yaml', PARTS.replace('part_b: 2', 'part_b: 3'))
+        plan = self.plan()
+        self.assertEqual(plan.mode, 'partial')
+        self.assertEqual(plan.args, ['parts.yaml', '--only', 'part_b'])
+        self.assertEqual(plan.footprints, ['part_b.txt'])
+        self.build()
+        self.assertEqual(self.plan().mode, 'skip')
+        self.assertEqual(self.rewritten(self.parts_dir, times), [STATE_FILE, 'part_b.txt', 'parts.yaml'])
+        with open(os.path.join(self.parts_dir, 'part_b.txt')) as f:
+            self.assertEqual(f.read(), 'header 3 1')
+
+        # new entries are built on their own
+        self.write('parts/parts.yaml', PARTS.replace('part_b: 2', 'part_b: 3') + "part_c: 4\n")
+        self.assertEqual(self.plan().args, ['parts.yaml', '--only', 'part_c'])
+        self.build()
+        self.assertEqual(self.plan().mode, 'skip')
+
+        # the shared header changes all footprints
+        self.write('parts/parts.yaml', PARTS.replace('header', 'new'))
+        self.assertEqual(self.plan().mode, 'full')
+        self.build()
+
+        # imported modules are tracked
+        self.write('parts/helper.py', "VERSION = 2\n")
+        self.assertEqual(self.plan().mode, 'full')
+        self.build()
+        self.assertEqual(self.plan().mode, 'skip')
+
+        # modified or removed outputs are generated again
+        os.remove(os.path.join(self.parts_dir, 'part_a.txt'))
+        plan = self.plan()
+        self.assertEqual(plan.mode, 'partial')
+        self.assertEqual(plan.args, ['parts.yaml', '--only', 'part_a'])
+
+    def testLQFPEntry(self):
+        # a copy of the gullwing generator with the LQFP definitions
+        scripts_dir = os.path.join(self.tmp_dir, 'scripts')
+        generator_dir = os.path.join(scripts_dir, 'Packages', 'Package_Gullwing__QFP_SOIC_SO')
+        shutil.copytree(os.path.join(SCRIPTS_DIR, 'tools'), os.path.join(scripts_dir, 'tools'))
+        os.makedirs(os.path.join(generator_dir, 'size_definitions'))
+        for name in ['package_config_KLCv3.yaml', 'ipc_definitions.yaml',
+                     'Package_Gullwing__QFP_SOIC_SO/ipc_gullwing_generator.py',
+                     'Package_Gullwing__QFP_SOIC_SO/size_definitions/lqfp.yaml']:
+            shutil.copy(os.path.join(SCRIPTS_DIR, 'Packages', name), os.path.join(scripts_dir, 'Packages', name))
+        self.manifest = os.path.join(scripts_dir, 'generators.yaml')
+        self.write('scripts/generators.yaml', QFP_MANIFEST)
+
+        self.build()
+        self.assertEqual(self.plan().mode, 'skip')
+        library_dir = os.path.join(generator_dir, 'Package_QFP.pretty')
+        times = self.modificationTimes(library_dir)
+        self.assertGreater(len(times), 10)
+
+        definitions = os.path.join(generator_dir, 'size_definitions', 'lqfp.yaml')
+        with open(definitions) as f:
+            content = f.read()
+        self.assertEqual(content.count('SOT358-1.pdf'), 1)
+        with open(definitions, 'w') as f:
+            f.write(content.replace('SOT358-1.pdf', 'SOT358-1.pdf#page=2'))
+
+        plan = self.plan()
+        self.assertEqual(plan.mode, 'partial')
+        self.assertEqual(plan.args, ['size_definitions/lqfp.yaml', '--only', 'LQFP-32_7x7mm_P0.8mm'])
+        self.assertEqual(plan.footprints, ['Package_QFP.pretty/LQFP-32_7x7mm_P0.8mm.kicad_mod'])
+        self.build()
+        self.assertEqual(self.rewritten(library_dir, times), ['LQFP-32_7x7mm_P0.8mm.kicad_mod'])
+        self.assertEqual(self.plan().mode, 'skip')
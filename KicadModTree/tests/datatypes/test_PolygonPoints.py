@@ -0,0 +1,63 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import random
+import unittest
+import warnings
+
+from KicadModTree.PolygonPoints import *
+from KicadModTree.PolygonPoints import _findNearestPointsSweep
+
+
+def _bruteForceNearestPoints(a, b):
+    min_distance = a[0].distance_to(b[0])
+    pi, pj = 0, 0
+    for i in range(len(a)):
+        for j in range(len(b)):
+            d = a[i].distance_to(b[j])
+            if d < min_distance:
+                pi, pj, min_distance = i, j, d
+    return (pi, pj)
+
+
+class PolygonPointsTests(unittest.TestCase):
+
+    def test_find_nearest_points(self):
+        rnd = random.Random(42)
+        for _ in range(20):
+            a = PolygonPoints(nodes=[(rnd.uniform(-10, 10), rnd.uniform(-10, 10)) for _ in range(50)])
+            b = PolygonPoints(nodes=[(rnd.uniform(-3, 3), rnd.uniform(-3, 3)) for _ in range(30)])
+            self.assertEqual(a.findNearestPoints(b), _bruteForceNearestPoints(a, b))
+
+    def test_find_nearest_points_sweep(self):
+        a = PolygonPoints(nodes=[(0, 0), (2, 0), (2, 2), (0, 2)])
+        b = PolygonPoints(nodes=[(1, 1.5), (1.5, 1.5), (1.5, 1), (1, 1)])
+        self.assertEqual(_findNearestPointsSweep(a, b), (2, 1))
+
+        # equal distances are resolved by the lowest index
+        c = PolygonPoints(nodes=[(0.5, 0.5)])
+        self.assertEqual(_findNearestPointsSweep(a, c), (0, 0))
+
+    def test_cut(self):
+        outer = PolygonPoints(nodes=[(0, 0), (10, 0), (10, 10), (0, 10)])
+        inner = PolygonPoints(nodes=[(2, 2), (4, 2), (4, 4), (2, 4)])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            outer.cut(inner)
+
+        expected = [(0, 0), (2, 2), (2, 4), (4, 4), (4, 2), (2, 2), (0, 0),
+                    (10, 0), (10, 10), (0, 10)]
+        self.assertEqual([(p.x, p.y) for p in outer], expected)
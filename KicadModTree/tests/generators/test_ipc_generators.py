@@ -0,0 +1,147 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+from KicadModTree.util.kicad_util import TIMESTAMP_ENVIRONMENT
+
+# the IPC generator scripts need Python 3, and they are loaded with importlib.util.module_from_spec which is only
+# available since Python 3.5
+SCRIPTS_AVAILABLE = sys.version_info >= (3, 5)
+if SCRIPTS_AVAILABLE:
+    import importlib.util
+
+SCRIPTS_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts'))
+GULLWING_DIR = os.path.join(SCRIPTS_DIR, 'Packages', 'Package_Gullwing__QFP_SOIC_SO')
+NO_LEAD_DIR = os.path.join(SCRIPTS_DIR, 'Packages', 'Package_NoLead__DFN_QFN_LGA_SON')
+
+_scripts = {}
+
+
+def loadScript(path):
+    if path not in _scripts:
+        spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[path] = module
+    return _scripts[path]
+
+
+def padNumbers(kicad_mod):
+    return set(re.findall(r'\(pad "?([^\s"]*)"? ', KicadFileHandler(kicad_mod).serialize(timestamp=0)))
+
+
+def readFiles(directory):
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            with open(os.path.join(root, name)) as f:
+                files[os.path.relpath(os.path.join(root, name), directory)] = f.read()
+    return files
+
+
+def loadDefinition(directory, filename, entry):
+    definitions = loadYaml(os.path.join(directory, 'size_definitions', filename))
+    return definitions[entry], definitions.get('FileHeader')
+
+
+@unittest.skipUnless(SCRIPTS_AVAILABLE, "the IPC generator scripts need Python 3.5 or newer")
+class IpcGeneratorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.configuration = loadConfiguration(
+            os.path.join(SCRIPTS_DIR, 'tools', 'global_config_files', 'config_KLCv3.0.yaml'),
+            os.path.join(SCRIPTS_DIR, 'Packages', 'package_config_KLCv3.yaml'))
+        self.gullwing = loadScript(os.path.join(GULLWING_DIR, 'ipc_gullwing_generator.py'))
+        self.no_lead = loadScript(os.path.join(NO_LEAD_DIR, 'ipc_noLead_generator.py'))
+
+        # the generators write into the current directory
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def testGenerateGullwing(self):
+        device, header = loadDefinition(GULLWING_DIR, 'soic.yaml', 'SOIC-8-1EP_3.9x4.9mm_P1.27mm_EP2.29x3.0mm')
+        configuration = dict(self.configuration)
+
+        kicad_mod = self.gullwing.generate(configuration, device, header, density='N')
+        self.assertIsInstance(kicad_mod, Footprint)
+        self.assertEqual(kicad_mod.name, 'SOIC-8-1EP_3.9x4.9mm_P1.27mm_EP2.29x3mm')
+        self.assertEqual(padNumbers(kicad_mod), {'', '1', '2', '3', '4', '5', '6', '7', '8', '9'})
+
+        vias = self.gullwing.generate(configuration, device, header, density='N', with_thermal_vias=True)
+        self.assertEqual(vias.name, 'SOIC-8-1EP_3.9x4.9mm_P1.27mm_EP2.29x3mm_ThermalVias')
+
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        self.assertEqual(configuration, self.configuration)
+
+    def testGenerateNoLead(self):
+        device, _ = loadDefinition(NO_LEAD_DIR, 'dfn.yaml', 'DFN-6-1EP_2x1.8mm_P0.5mm_EP1.2x1.6mm')
+        configuration = dict(self.configuration)
+
+        kicad_mod = self.no_lead.generate(configuration, device, 'DFN-6-1EP_2x1.8mm_P0.5mm_EP1.2x1.6mm', density='N')
+        self.assertIsInstance(kicad_mod, Footprint)
+        self.assertEqual(kicad_mod.name, 'DFN-6-1EP_2x1.8mm_P0.5mm_EP1.2x1.6mm')
+        self.assertEqual(padNumbers(kicad_mod), {'', '1', '2', '3', '4', '5', '6', '7'})
+
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        self.assertEqual(configuration, self.configuration)
+
+    def assertDensityVariants(self, single, variants):
+        # generateDensityVariants writes the same files as one run per density, every density into its own directory
+        os.environ[TIMESTAMP_ENVIRONMENT] = '0'
+        try:
+            for density in ('least', 'nominal', 'most'):
+                os.makedirs(os.path.join(self.tmp_dir, 'single', density))
+                os.chdir(os.path.join(self.tmp_dir, 'single', density))
+                single(density)
+
+            os.makedirs(os.path.join(self.tmp_dir, 'variants'))
+            os.chdir(os.path.join(self.tmp_dir, 'variants'))
+            variants(['L', 'N', 'M'])
+        finally:
+            del os.environ[TIMESTAMP_ENVIRONMENT]
+            os.chdir(self.tmp_dir)
+
+        single_files = readFiles(os.path.join(self.tmp_dir, 'single'))
+        self.assertEqual(len(set(single_files.values())), 6)
+        self.assertEqual(sorted(readFiles(os.path.join(self.tmp_dir, 'variants'))), sorted(single_files))
+        for name, content in readFiles(os.path.join(self.tmp_dir, 'variants')).items():
+            self.assertEqual(content, single_files[name], name)
+
+    def testGullwingDensityVariants(self):
+        device, header = loadDefinition(GULLWING_DIR, 'soic.yaml', 'SOIC-8-1EP_3.9x4.9mm_P1.27mm_EP2.29x3.0mm')
+        self.assertDensityVariants(
+            lambda density: self.gullwing.Gullwing(self.configuration, density).generateFootprint(device, header),
+            lambda densities: self.gullwing.Gullwing(self.configuration).generateDensityVariants(device, header,
+                                                                                                 densities))
+
+    def testNoLeadDensityVariants(self):
+        name = 'Texas_S-PDSO-N10_EP1.2x2.0mm'
+        device, _ = loadDefinition(NO_LEAD_DIR, 'dfn.yaml', name)
+        self.assertDensityVariants(
+            lambda density: self.no_lead.NoLead(self.configuration, density).generateFootprint(device, name),
+            lambda densities: self.no_lead.NoLead(self.configuration).generateDensityVariants(device, name, densities))
@@ -0,0 +1,161 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import unittest
+
+from KicadModTree.util.config_loader import loadYaml
+from .test_ipc_generators import SCRIPTS_AVAILABLE, SCRIPTS_DIR, loadScript
+
+if SCRIPTS_AVAILABLE:
+    calculators = loadScript(os.path.join(SCRIPTS_DIR, 'tools', 'ipc_pad_size_calculators.py'))
+    TolerancedSize = calculators.TolerancedSize
+    TolerancedSizeArray = calculators.TolerancedSizeArray
+
+DENSITIES = ['least', 'nominal', 'most']
+MANF_TOL = {'manufacturing_tolerance': 0.1, 'placement_tolerance': 0.05}
+
+# one entry per device, the last ones have asymmetric tolerances
+LEAD_WIDTH = ['0.31..0.51', '0.22+/-0.05', '0.25+0.05-0.03', '0.4...0.45...0.6']
+LEAD_OUTSIDE = ['5.8..6.2', '6.4+/-0.1', '4.9+0.2-0.1', '8.2...8.4...8.8']
+LEAD_LEN = ['0.4..1.27', '0.6+/-0.15', '0.5+0.1-0.05', '0.45...0.6...0.75']
+BODY_SIZE = ['3.9+/-0.1', '2..2.2', '3+0.15-0.05', '4.9...5...5.1']
+CENTER_POSITION = ['1.45+/-0.05', '0.9..1.0', '1.2+0.05-0.02', '2.1...2.15...2.2']
+
+
+@unittest.skipUnless(SCRIPTS_AVAILABLE, "the IPC generator scripts need Python 3.5 or newer")
+@unittest.skipUnless(SCRIPTS_AVAILABLE and calculators.NUMPY_AVAILABLE, "numpy is not installed")
+class IpcPadSizeCalculatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ipc_definitions = loadYaml(os.path.join(SCRIPTS_DIR, 'Packages', 'ipc_definitions.yaml'))
+
+    def assertSizesEqual(self, array, sizes):
+        self.assertEqual(len(array), len(sizes))
+        for index, size in enumerate(sizes):
+            for attribute in ('minimum', 'nominal', 'maximum', 'ipc_tol_RMS', 'minimum_RMS', 'maximum_RMS'):
+                self.assertAlmostEqual(getattr(array, attribute)[index], getattr(size, attribute), places=9,
+                                       msg='{} of device {}'.format(attribute, index))
+
+    def assertLimitsEqual(self, array_limits, scalar_limits):
+        # Gmin, Zmax and Xmax of every device
+        for values, expected in zip(array_limits, zip(*scalar_limits)):
+            self.assertEqual(len(values), len(expected))
+            for value, scalar in zip(values, expected):
+                self.assertAlmostEqual(value, scalar, places=9)
+
+    def sizes(self, specifiers):
+        return [TolerancedSize.fromString(s) for s in specifiers]
+
+    def testTolerances(self):
+        nominal = [1, 2, 3]
+        for tolerance in (0.1, [-0.1, 0.2], [0.1, 0.2], [0.2, -0.1]):
+            self.assertSizesEqual(TolerancedSizeArray(nominal=nominal, tolerance=tolerance),
+                                  [TolerancedSize(nominal=n, tolerance=tolerance) for n in nominal])
+
+        # with two devices, a pair is still a pair of tolerances
+        self.assertSizesEqual(TolerancedSizeArray(nominal=[1, 2], tolerance=[-0.1, 0.2]),
+                              [TolerancedSize(nominal=n, tolerance=[-0.1, 0.2]) for n in (1, 2)])
+        self.assertSizesEqual(TolerancedSizeArray(nominal=[1, 2], tolerance=[0.1, 0.2]),
+                              [TolerancedSize(nominal=n, tolerance=[0.1, 0.2]) for n in (1, 2)])
+
+        # one tolerance or one pair of tolerances per device
+        self.assertSizesEqual(TolerancedSizeArray(nominal=nominal, tolerance=[0.1, 0.2, 0.3]),
+                              [TolerancedSize(nominal=n, tolerance=t) for n, t in zip(nominal, [0.1, 0.2, 0.3])])
+        pairs = [[-0.1, 0.1], [0.2, -0.05], [0.1, 0.3]]
+        self.assertSizesEqual(TolerancedSizeArray(nominal=nominal, tolerance=list(zip(*pairs))),
+                              [TolerancedSize(nominal=n, tolerance=t) for n, t in zip(nominal, pairs)])
+
+        self.assertRaises(ValueError, TolerancedSizeArray, minimum=[1, 2], maximum=[1.1, 1.9])
+
+    def testArithmetic(self):
+        lead_outside, lead_len = self.sizes(LEAD_OUTSIDE), self.sizes(LEAD_LEN)
+        outside_array = TolerancedSizeArray.fromSizes(lead_outside)
+        len_array = TolerancedSizeArray.fromSizes(lead_len)
+
+        # every operation updates the RMS tolerance
+        self.assertSizesEqual(outside_array - len_array * 2, [o - l * 2 for o, l in zip(lead_outside, lead_len)])
+        self.assertSizesEqual(outside_array + len_array, [o + l for o, l in zip(lead_outside, lead_len)])
+        self.assertSizesEqual((outside_array - len_array * 2) / 2,
+                              [(o - l * 2) / 2 for o, l in zip(lead_outside, lead_len)])
+        self.assertSizesEqual(outside_array - lead_len[0], [o - lead_len[0] for o in lead_outside])
+        self.assertSizesEqual(outside_array + 0.5, [o + 0.5 for o in lead_outside])
+
+        self.assertSizesEqual(TolerancedSizeArray.fromYaml(LEAD_LEN), lead_len)
+        self.assertEqual(str(len_array[2]), str(lead_len[2]))
+
+    def testNumpyScalars(self):
+        import numpy
+
+        lead_outside = self.sizes(LEAD_OUTSIDE)
+        outside_array = TolerancedSizeArray.fromSizes(lead_outside)
+
+        # scalars of array calculations behave like int and float
+        for scalar in (numpy.float64(2), numpy.array(2.0), numpy.int64(2)):
+            self.assertSizesEqual(outside_array + scalar, [o + 2 for o in lead_outside])
+            self.assertSizesEqual(outside_array - scalar, [o - 2 for o in lead_outside])
+            self.assertSizesEqual(outside_array * scalar, [o * 2 for o in lead_outside])
+            self.assertSizesEqual(outside_array * 4 / scalar, [o * 4 / 2 for o in lead_outside])
+
+    def testGullWing(self):
+        lead_width, lead_outside, lead_len = self.sizes(LEAD_WIDTH), self.sizes(LEAD_OUTSIDE), self.sizes(LEAD_LEN)
+        ipc = self.ipc_definitions['ipc_spec_gw_large_pitch']
+
+        for density in DENSITIES:
+            for heel_reduction in (0, 0.05):
+                array_limits = calculators.ipc_gull_wing_array(
+                    ipc[density], ipc['round_base'], MANF_TOL, TolerancedSizeArray.fromSizes(lead_width),
+                    TolerancedSizeArray.fromSizes(lead_outside), lead_len=TolerancedSizeArray.fromSizes(lead_len),
+                    heel_reduction=heel_reduction)
+                scalar_limits = [calculators.ipc_gull_wing(ipc[density], ipc['round_base'], MANF_TOL, w, o,
+                                                           lead_len=l, heel_reduction=heel_reduction)
+                                 for w, o, l in zip(lead_width, lead_outside, lead_len)]
+                self.assertLimitsEqual(array_limits, scalar_limits)
+
+        # all densities in one call, one row per density
+        Gmin, Zmax, Xmax = calculators.ipc_gull_wing_array(
+            [ipc[density] for density in DENSITIES], ipc['round_base'], MANF_TOL,
+            TolerancedSizeArray.fromSizes(lead_width), TolerancedSizeArray.fromSizes(lead_outside),
+            lead_len=TolerancedSizeArray.fromSizes(lead_len))
+        self.assertEqual(Gmin.shape, (3, len(LEAD_WIDTH)))
+        for row, density in enumerate(DENSITIES):
+            scalar_limits = [calculators.ipc_gull_wing(ipc[density], ipc['round_base'], MANF_TOL, w, o, lead_len=l)
+                             for w, o, l in zip(lead_width, lead_outside, lead_len)]
+            self.assertLimitsEqual((Gmin[row], Zmax[row], Xmax[row]), scalar_limits)
+
+    def testBodyEdgeInside(self):
+        body_size, lead_width, lead_len = self.sizes(BODY_SIZE), self.sizes(LEAD_WIDTH), self.sizes(LEAD_LEN)
+        ipc = self.ipc_definitions['ipc_spec_flat_no_lead']
+
+        for density in DENSITIES:
+            array_limits = calculators.ipc_body_edge_inside_array(
+                ipc[density], ipc['round_base'], MANF_TOL, TolerancedSizeArray.fromSizes(body_size),
+                TolerancedSizeArray.fromSizes(lead_width), lead_len=TolerancedSizeArray.fromSizes(lead_len))
+            scalar_limits = [calculators.ipc_body_edge_inside(ipc[density], ipc['round_base'], MANF_TOL, b, w,
+                                                              lead_len=l)
+                             for b, w, l in zip(body_size, lead_width, lead_len)]
+            self.assertLimitsEqual(array_limits, scalar_limits)
+
+    def testPadCenterPlusSize(self):
+        center, lead_len, lead_width = self.sizes(CENTER_POSITION), self.sizes(LEAD_LEN), self.sizes(LEAD_WIDTH)
+        ipc = self.ipc_definitions['ipc_spec_flat_no_lead']
+
+        for density in DENSITIES:
+            array_limits = calculators.ipc_pad_center_plus_size_array(
+                ipc[density], ipc['round_base'], MANF_TOL, TolerancedSizeArray.fromSizes(center),
+                TolerancedSizeArray.fromSizes(lead_len), TolerancedSizeArray.fromSizes(lead_width))
+            scalar_limits = [calculators.ipc_pad_center_plus_size(ipc[density], ipc['round_base'], MANF_TOL, c, l, w)
+                             for c, l, w in zip(center, lead_len, lead_width)]
+            self.assertLimitsEqual(array_limits, scalar_limits)
@@ -0,0 +1,78 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree import *
+
+
+class DashTests(unittest.TestCase):
+
+    def test_dash_intervals(self):
+        self.assertEqual(dashIntervals(0, 5, 1, 1), [[0, 1], [2, 3], [4, 5]])
+        self.assertEqual(dashIntervals(0, 4.5, 1, 1), [[0, 1], [2, 3], [4, 4.5]])
+
+        # no zero length dash at the end
+        self.assertEqual(dashIntervals(0, 4, 1, 1), [[0, 1], [2, 3]])
+        self.assertEqual(dashIntervals(1, 1, 1, 1), [])
+
+        # positions are calculated, not accumulated
+        dashes = dashIntervals(0, 100, 0.36, 0.36)
+        self.assertEqual(len(dashes), 139)
+        self.assertAlmostEqual(dashes[-1][0], 138 * 0.72)
+
+        self.assertRaises(ValueError, dashIntervals, 0, 1, 0, 0)
+
+    def test_dash_segment(self):
+        keepouts = [KeepoutRect(2.5, 3.5, -1, 1)]
+        self.assertEqual(dashSegment((0, 0), (5, 0), 1, 1, keepouts),
+                         [((0, 0), (1, 0)), ((2, 0), (2.5, 0)), ((4, 0), (5, 0))])
+
+        # reversed diagonal line keeps its direction
+        dashes = dashSegment((3, 4), (0, 0), 1, 1.5)
+        self.assertEqual(len(dashes), 2)
+        self.assertAlmostEqual(dashes[0][0][0], 3)
+        self.assertAlmostEqual(dashes[0][1][0], 2.4)
+        self.assertAlmostEqual(dashes[1][1][1], 1.2)
+
+        self.assertEqual(dashSegment((1, 1), (1, 1), 1, 1), [])
+
+    def test_dash_arc(self):
+        # quarter circle with a radius of 2/pi, dashes of 10 degree
+        radius = 2 / math.pi
+        dashes = dashArc((0, 0), radius, 90, -90, radius * math.pi / 18, radius * math.pi / 18)
+        self.assertEqual(len(dashes), 5)
+        for i, (start, angle) in enumerate(dashes):
+            self.assertAlmostEqual(start, 90 - 20 * i)
+            self.assertAlmostEqual(angle, -10)
+
+    def test_dash_circle(self):
+        keepouts = [KeepoutCircle(1, 0, 0.5)]
+        dashes = dashCircle((0, 0), 1, math.pi / 8, math.pi / 8, keepouts)
+
+        # 8 dashes of 22.5 degree, the keepout removes the first one and cuts the last one
+        self.assertEqual(len(dashes), 7)
+        for i, (start, angle) in enumerate(dashes[:-1]):
+            self.assertAlmostEqual(start, 45 * (i + 1))
+            self.assertAlmostEqual(angle, 22.5)
+        self.assertAlmostEqual(dashes[-1][0], 315)
+        self.assertAlmostEqual(dashes[-1][0] + dashes[-1][1], 360 - math.degrees(2 * math.asin(0.25)))
+
+        # all dashes are outside of the keepout
+        for start, angle in dashes:
+            for a in (start, start + angle / 2, start + angle):
+                x, y = math.cos(math.radians(a)), math.sin(math.radians(a))
+                self.assertFalse(KeepoutCircle(1, 0, 0.5 - 1e-6).contains(x, y))
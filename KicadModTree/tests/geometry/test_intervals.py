@@ -0,0 +1,69 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import random
+import unittest
+
+from KicadModTree import *
+
+
+class IntervalTests(unittest.TestCase):
+
+    def test_merge(self):
+        self.assertEqual(mergeIntervals([(3, 4), (0, 1), (0.5, 2), (2, 2.5)]), [[0, 2.5], [3, 4]])
+        self.assertEqual(mergeIntervals([]), [])
+
+    def test_subtract(self):
+        self.assertEqual(subtractIntervals([[-3, 3]], [(-0.5, 0.5), (1.5, 2.5)]), [[-3, -0.5], [0.5, 1.5], [2.5, 3]])
+
+        # lines touching an interval, completely covered lines and zero length intervals
+        self.assertEqual(subtractIntervals([[0, 1], [2, 3]], [(1, 2)]), [[0, 1], [2, 3]])
+        self.assertEqual(subtractIntervals([[0, 1], [2, 3]], [(-1, 1.5)]), [[2, 3]])
+        self.assertEqual(subtractIntervals([[0, 1]], [(0.5, 0.5)]), [[0, 1]])
+
+    def test_subtract_random(self):
+        rnd = random.Random(42)
+        for _ in range(50):
+            lines = [sorted([rnd.uniform(0, 10), rnd.uniform(0, 10)]) for _ in range(rnd.randint(1, 6))]
+            intervals = [sorted([rnd.uniform(0, 10), rnd.uniform(0, 10)]) for _ in range(rnd.randint(0, 6))]
+            result = subtractIntervals(lines, intervals)
+
+            # sample the lines: points are visible if they are on a line and not in any interval
+            for x in [i * 0.0137 for i in range(731)]:
+                expected = any(s <= x <= e for s, e in lines) and not any(s <= x <= e for s, e in intervals)
+                visible = any(s <= x <= e for s, e in result)
+                if expected != visible:
+                    # sample hit a border
+                    borders = [v for interval in lines + intervals for v in interval]
+                    self.assertTrue(min(abs(x - b) for b in borders) < 1e-6)
+
+    def test_intersect(self):
+        self.assertEqual(intersectIntervals([[0, 1], [2, 3], [4, 5]], [(0.5, 2.5), (4.5, 6)]),
+                         [[0.5, 1], [2, 2.5], [4.5, 5]])
+
+        # touching and zero length intervals are ignored
+        self.assertEqual(intersectIntervals([[0, 1]], [(1, 2), (0.5, 0.5)]), [])
+        self.assertEqual(intersectIntervals([[0, 1]], []), [])
+
+    def test_clip_axis_lines(self):
+        keepouts = [KeepoutRect(-0.5, 0.5, -0.5, 0.5), KeepoutCircle(2, 0, 0.5), [4, 5, 1, -1]]
+        self.assertEqual(clipHorizontalLines([[-3, 6]], 0, keepouts), [[-3, -0.5], [0.5, 1.5], [2.5, 4], [5, 6]])
+        self.assertEqual(clipVerticalLines([[-3, 3]], 4.5, keepouts), [[-3, -1], [1, 3]])
+
+        # dashes
+        dashes = [[x, x + 0.3] for x in [-1.5 + 0.6 * i for i in range(5)]]
+        result = clipHorizontalLines(dashes, 0.4, keepouts)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[2][0], 0.5)
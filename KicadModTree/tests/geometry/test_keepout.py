@@ -0,0 +1,136 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree import *
+
+
+class KeepoutTests(unittest.TestCase):
+
+    def assertSegmentsAlmostEqual(self, result, expected):
+        self.assertEqual(len(result), len(expected))
+        for (r_start, r_end), (e_start, e_end) in zip(result, expected):
+            for r, e in zip(r_start + r_end, e_start + e_end):
+                self.assertAlmostEqual(r, e)
+
+    def test_clip_segment(self):
+        keepouts = [KeepoutRect(-0.5, 0.5, -0.5, 0.5), KeepoutCircle(2, 0, 0.5)]
+        self.assertSegmentsAlmostEqual(clipSegment((-3, 0), (3, 0), keepouts),
+                                       [((-3, 0), (-0.5, 0)), ((0.5, 0), (1.5, 0)), ((2.5, 0), (3, 0))])
+
+        # direction of the line is kept
+        self.assertSegmentsAlmostEqual(clipSegment((3, 0), (1, 0), keepouts), [((3, 0), (2.5, 0)), ((1.5, 0), (1, 0))])
+
+        # diagonal lines through and touching the corner of the rectangle
+        self.assertSegmentsAlmostEqual(clipSegment((0, -0.8), (0.8, 0), keepouts),
+                                       [((0, -0.8), (0.3, -0.5)), ((0.5, -0.3), (0.8, 0))])
+        self.assertSegmentsAlmostEqual(clipSegment((0, -1), (1, 0), keepouts), [((0, -1), (1, 0))])
+
+        # completely covered and untouched lines
+        self.assertEqual(clipSegment((-0.2, 0), (0.2, 0), keepouts), [])
+        self.assertSegmentsAlmostEqual(clipSegment((-3, 1), (3, 1), keepouts), [((-3, 1), (3, 1))])
+
+    def test_legacy_keepouts(self):
+        self.assertSegmentsAlmostEqual(clipSegment((0, 0), (0, 3), [[1, -1, 2, 1]]),
+                                       [((0, 0), (0, 1)), ((0, 2), (0, 3))])
+
+    def test_clip_circle(self):
+        rect = KeepoutRect(-0.5, 0.5, -0.5, 0.5)
+        self.assertEqual(clipCircle((0, 0), 1, [rect]), [(0, 360)])
+        self.assertEqual(clipCircle((0, 0), 0.3, [rect]), [])
+
+        arcs = clipCircle((0, 0), 0.6, [rect])
+        self.assertEqual(len(arcs), 4)
+        for start, angle in arcs:
+            self.assertAlmostEqual(angle, 180 - 2 * math.degrees(math.asin(0.5 / 0.6)))
+
+        # a keepout on the start point of the circle, the pieces at 0 degree are joined
+        arcs = clipCircle((0, 0), 1, [KeepoutCircle(1, 0, 0.1)])
+        self.assertEqual(len(arcs), 1)
+        self.assertAlmostEqual(arcs[0][1], 360 - 2 * math.degrees(2 * math.asin(0.05)))
+
+    def test_clip_arc(self):
+        keepouts = [KeepoutCircle(1, 0, 0.2)]
+        self.assertEqual(clipArc((0, 0), 1, 90, -45, keepouts), [(90, -45)])
+
+        arcs = clipArc((0, 0), 1, 90, -180, keepouts)
+        self.assertEqual(len(arcs), 2)
+        self.assertAlmostEqual(arcs[0][0], 90)
+        self.assertAlmostEqual(arcs[1][0] + arcs[1][1], -90)
+        self.assertAlmostEqual(arcs[0][1] + arcs[1][1], -180 + 2 * math.degrees(2 * math.asin(0.1)))
+
+    def test_short_fragments(self):
+        rect = KeepoutRect(-0.5, 0.5, -0.5, 0.5)
+
+        # clipped pieces shorter than 0.1 mm are dropped, short lines which are not clipped are kept
+        self.assertSegmentsAlmostEqual(clipSegment((-0.55, 0), (3, 0), [rect]), [((0.5, 0), (3, 0))])
+        self.assertSegmentsAlmostEqual(clipSegment((2, 2), (2.05, 2), [rect]), [((2, 2), (2.05, 2))])
+
+        self.assertEqual(clipArc((0, 0), 1, 14, -28, [KeepoutCircle(1, 0, 0.2)]), [])
+        self.assertEqual(clipArc((0, 0), 1, 1, 2, []), [(1, 2)])
+        self.assertEqual(clipCircle((0, 0), 0.502, [rect]), [])
+
+    def test_round_rect(self):
+        oval = KeepoutRoundRect(-1, 1, -0.5, 0.5, radius=0.5)
+        self.assertTrue(oval.contains(0.9, 0))
+        self.assertFalse(oval.contains(0.95, 0.45))
+        self.assertEqual(oval.hlineInterval(0.8), None)
+        self.assertEqual(oval.hlineInterval(0), (-1, 1))
+        start, end = oval.hlineInterval(0.4)
+        self.assertAlmostEqual(end, 0.5 + 0.3)
+        self.assertAlmostEqual(oval.vlineInterval(0.9)[1], math.sqrt(0.25 - 0.16))
+
+        # diagonal line only touching the rectangular bounding box
+        self.assertSegmentsAlmostEqual(clipSegment((0.8, 0.6), (1.1, 0.3), [oval]), [((0.8, 0.6), (1.1, 0.3))])
+        self.assertSegmentsAlmostEqual(clipSegment((-2, 0), (2, 0), [oval]), [((-2, 0), (-1, 0)), ((1, 0), (2, 0))])
+
+        # circle around the oval crossing the straight sides and the rounded ends
+        arcs = clipCircle((0, 0), 0.6, [oval])
+        self.assertEqual(len(arcs), 2)
+        for start, angle in arcs:
+            self.assertAlmostEqual(angle, 180 - 2 * math.degrees(math.asin(0.5 / 0.6)))
+        arcs = clipCircle((0.5, 0), 0.5, [oval])
+        self.assertEqual(arcs, [])
+
+    def test_border(self):
+        # lines on the border of a keepout only touch it
+        rect = KeepoutRect(-0.5, 0.5, -0.5, 0.5)
+        self.assertEqual(clipHorizontalLines([[-1, 1]], 0.5, [rect]), [[-1, 1]])
+        self.assertEqual(clipVerticalLines([[-1, 1]], -0.5, [rect]), [[-1, 1]])
+        self.assertSegmentsAlmostEqual(clipSegment((0.5, -1), (0.5, 1), [rect]), [((0.5, -1), (0.5, 1))])
+        self.assertTrue(rect.contains(0.5, 0.5))
+
+    def test_keepout_index(self):
+        pads = [KeepoutCircle(x * 2.54, 0, 1) for x in range(40)] + [[-1, 100, 5, 6]]
+        index = KeepoutIndex(pads)
+        self.assertEqual(len(index), 41)
+        self.assertEqual(len(index.query(-0.5, 0.5, -0.5, 0.5)), 1)
+        self.assertTrue(index.contains(2.54, 0.9))
+        self.assertFalse(index.contains(1.27, 0))
+
+        lines = [((-2, y), (100, y)) for y in (-0.9, 0, 0.9, 5.5)] + [((50.8, -2), (50.8, 8)), ((0, 1.5), (10, -1.5))]
+        self.assertEqual(clipLines(lines, index), clipLines(lines, pads))
+        for (start, end), expected in zip(lines, clipLines(lines, pads)):
+            self.assertSegmentsAlmostEqual(clipSegment(start, end, index), expected)
+
+    def test_clip_lines(self):
+        keepouts = [KeepoutRect(-0.5, 0.5, -0.5, 0.5)]
+        result = clipLines([((-1, 0), (1, 0)), ((1, 0), (-1, 0)), ((0, 1), (0, -1)), ((0, 0.8), (1, 0.8))], keepouts)
+        self.assertEqual(result, [[((-1, 0), (-0.5, 0)), ((0.5, 0), (1, 0))],
+                                  [((1, 0), (0.5, 0)), ((-0.5, 0), (-1, 0))],
+                                  [((0, 1), (0, 0.5)), ((0, -0.5), (0, -1))],
+                                  [((0, 0.8), (1, 0.8))]])
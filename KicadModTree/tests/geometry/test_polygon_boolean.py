@@ -0,0 +1,105 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree import *
+
+
+def square(x, y, size):
+    return [(x, y), (x + size, y), (x + size, y + size), (x, y + size)]
+
+
+def totalArea(rings):
+    return sum(ringArea(r) for r in rings)
+
+
+class PolygonBooleanTests(unittest.TestCase):
+
+    def test_union(self):
+        result = polygonUnion(square(0, 0, 2), square(1, 1, 2))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0]), 8)
+        self.assertAlmostEqual(totalArea(result), 7)
+
+        # shapes sharing an edge are merged, the shared edge is removed
+        result = polygonUnion(square(0, 0, 1), square(1, 0, 1))
+        self.assertEqual([(p.x, p.y) for p in result[0]], [(0, 0), (2, 0), (2, 1), (0, 1)])
+
+        # shapes only touching at a corner stay separate
+        self.assertEqual(len(polygonUnion(square(0, 0, 1), square(1, 1, 1))), 2)
+
+    def test_union_orientation(self):
+        clockwise = list(reversed(square(1, 1, 2)))
+        self.assertAlmostEqual(totalArea(polygonUnion(square(0, 0, 2), clockwise)), 7)
+
+    def test_intersection(self):
+        result = polygonIntersection(square(0, 0, 2), square(1, 1, 2))
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(totalArea(result), 1)
+        self.assertEqual(polygonIntersection(square(0, 0, 1), square(2, 2, 1)), [])
+
+    def test_difference(self):
+        result = polygonDifference(square(0, 0, 4), square(1, 1, 2))
+        self.assertEqual(len(result), 2)
+        self.assertAlmostEqual(totalArea(result), 12)
+
+        grouped = groupRings(result)
+        self.assertEqual(len(grouped), 1)
+        self.assertAlmostEqual(ringArea(grouped[0][0]), 16)
+        self.assertAlmostEqual(ringArea(grouped[0][1][0]), -4)
+
+        # the result can be used as input again
+        result = polygonDifference(result, square(0, 0, 4))
+        self.assertEqual(result, [])
+
+    def test_offset(self):
+        result = polygonOffset(square(0, 0, 2), 0.25)
+        self.assertEqual([(p.x, p.y) for p in result[0]],
+                         [(-0.25, -0.25), (2.25, -0.25), (2.25, 2.25), (-0.25, 2.25)])
+
+        result = polygonOffset(square(0, 0, 2), -0.25)
+        self.assertAlmostEqual(totalArea(result), 1.5**2)
+
+        result = polygonOffset(square(0, 0, 2), 0.25, join_type='round', arc_tolerance=0.0001)
+        self.assertAlmostEqual(totalArea(result), 4 + 4 * 2 * 0.25 + math.pi * 0.25**2, places=3)
+
+        # shrinking the arms of a L shape to nothing
+        l_shape = [(0, 0), (3, 0), (3, 1), (1, 1), (1, 3), (0, 3)]
+        self.assertAlmostEqual(totalArea(polygonOffset(l_shape, -0.2)), 2.6 * 0.6 + 0.6 * 2)
+        self.assertEqual(polygonOffset(l_shape, -0.6), [])
+
+        with self.assertRaises(ValueError):
+            polygonOffset(l_shape, 0.1, join_type='invalid')
+
+    def test_inflated_union(self):
+        body = [(-1, -0.5), (1, -0.5), (1, 0.5), (-1, 0.5)]
+        pads = [square(-1.5, -0.3, 0.6), square(0.9, -0.3, 0.6)]
+        result = inflatedUnion(pads + [body], 0.25)
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(totalArea(result), 2.5 * 1.5 + 2 * 0.5 * 1.1)
+
+    def test_polygon_node(self):
+        outer = Polygon(nodes=square(0, 0, 4), layer='F.Cu', width=0)
+        result = outer.booleanDifference(square(1, 1, 2))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].layer, 'F.Cu')
+        self.assertEqual([(p.x, p.y) for p in result[0].nodes],
+                         [(0, 0), (1, 1), (1, 3), (3, 3), (3, 1), (1, 1), (0, 0), (4, 0), (4, 4), (0, 4)])
+
+        self.assertEqual(len(outer.booleanUnion(Polygon(nodes=square(5, 5, 1)))), 2)
+        self.assertEqual(len(outer.booleanIntersection(square(3, 3, 2))), 1)
+        self.assertEqual(len(outer.offset(1)[0].nodes), 4)
@@ -0,0 +1,52 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import random
+import unittest
+
+from KicadModTree import *
+
+
+class SpatialIndexTests(unittest.TestCase):
+
+    def test_query(self):
+        index = SpatialIndex(cell_size=1)
+        index.insert('a', (-0.5, 0.5, -0.5, 0.5))
+        index.insert('b', (2, 3, -0.5, 0.5))
+        index.insert('c', (-10, 10, 5, 6))
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.query(-1, 1, -1, 1), ['a'])
+        self.assertEqual(index.query(0.5, 2, 0, 0), ['a', 'b'])
+        self.assertEqual(index.query(7, 7, 5.5, 5.5), ['c'])
+        self.assertEqual(index.query(-100, 100, -100, 100), ['a', 'b', 'c'])
+        self.assertEqual(index.query(5, 6, -1, 1), [])
+
+    def test_random(self):
+        rnd = random.Random(1)
+        boxes = []
+        index = SpatialIndex()
+        for i in range(200):
+            x, y = rnd.uniform(-20, 20), rnd.uniform(-20, 20)
+            w, h = rnd.uniform(0, 3), rnd.uniform(0, 3)
+            boxes.append((x, x + w, y, y + h))
+            index.insert(i, boxes[-1])
+
+        for _ in range(100):
+            x, y = rnd.uniform(-25, 25), rnd.uniform(-25, 25)
+            area = (x, x + rnd.uniform(0, 10), y, y + rnd.uniform(0, 10))
+            expected = [i for i, b in enumerate(boxes)
+                        if b[0] <= area[1] and b[1] >= area[0] and b[2] <= area[3] and b[3] >= area[2]]
+            self.assertEqual(index.query(*area), expected)
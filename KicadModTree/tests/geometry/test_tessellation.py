@@ -0,0 +1,62 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import math
+import unittest
+
+from KicadModTree import *
+
+
+class TessellationTests(unittest.TestCase):
+
+    def test_segment_count(self):
+        self.assertEqual(arcSegmentCount(1, 90, 0.01), 6)
+        self.assertEqual(arcSegmentCount(1, -90, 0.01), 6)
+        self.assertEqual(arcSegmentCount(0.005, 360, 0.01), 1)
+
+        # the chord error stays below the tolerance
+        for radius, angle, tolerance in [(1, 90, 0.01), (10, 360, 0.005), (0.3, 45, 0.001)]:
+            count = arcSegmentCount(radius, angle, tolerance)
+            self.assertLessEqual(radius * (1 - math.cos(math.radians(angle / count) / 2)), tolerance)
+
+    def test_arc(self):
+        points = tessellateArc((1, 2), 2, 90, -180, count=4)
+        self.assertEqual(len(points), 5)
+        for (x, y), (ex, ey) in zip(points, [(1, 4), (1 + math.sqrt(2), 2 + math.sqrt(2)), (3, 2),
+                                             (1 + math.sqrt(2), 2 - math.sqrt(2)), (1, 0)]):
+            self.assertAlmostEqual(x, ex)
+            self.assertAlmostEqual(y, ey)
+
+        # all points are on the arc
+        for x, y in tessellateArc((0, 0), 3, 10, 100, tolerance=0.001):
+            self.assertAlmostEqual(math.hypot(x, y), 3)
+
+    def test_circle(self):
+        points = tessellateCircle((0, 0), 1, count=4)
+        self.assertEqual(len(points), 4)
+        self.assertAlmostEqual(ringArea(points), 2)
+
+        points = tessellateCircle((0, 0), 1, tolerance=0.0001)
+        self.assertAlmostEqual(ringArea(points), math.pi, places=3)
+
+    def test_ellipse(self):
+        points = tessellateEllipse((1, 1), 2, 1, tolerance=0.0001)
+        self.assertAlmostEqual(ringArea(points), 2 * math.pi, places=3)
+        for x, y in points:
+            self.assertAlmostEqual(((x - 1) / 2) ** 2 + (y - 1) ** 2, 1)
+
+        points = tessellateEllipse((0, 0), 2, 1, count=4, rotation=90)
+        self.assertAlmostEqual(points[0][0], 0)
+        self.assertAlmostEqual(points[0][1], 2)
@@ -16,3 +16,7 @@
 from .test_simple_footprints import SimpleFootprintTests
 from .test_kicad5_padshapes import Kicad5PadsTests
 from .test_exposed_pad import ExposedPadTests
+from .test_silk_clipper import SilkClipperTests
+from .test_mod_argparser import ModArgparserTests
+from .test_footprint_template import FootprintTemplateTests
+from .test_ball_grid import BallGridTests
@@ -0,0 +1,111 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+RESULT_BALL_GRID = """(module BGA-4 (layer F.Cu) (tedit 0)
+  (attr smd)
+  (pad A1 smd circle (at -0.4 -0.4) (size 0.4 0.4) (layers F.Cu F.Mask F.Paste))
+  (pad A2 smd circle (at 0.4 -0.4) (size 0.4 0.4) (layers F.Cu F.Mask F.Paste))
+  (pad B2 smd circle (at 0.4 0.4) (size 0.4 0.4) (layers F.Cu F.Mask F.Paste))
+)"""
+
+PAD_ARGUMENTS = {'type': Pad.TYPE_SMT, 'shape': Pad.SHAPE_ROUNDRECT, 'size': [0.3, 0.3], 'layers': Pad.LAYERS_SMT,
+                 'radius_ratio': 0.25}
+
+
+class BallGridTests(unittest.TestCase):
+
+    def createXilinxGrid(self):
+        # row_skips of Xilinx_CPG238 in bga_xilinx.yml
+        return BallGrid(pitch=0.5, columns=19, rows=19,
+                        row_skips=[[], [], [], [[4, 17]], [[4, 17]], [[4, 17]], [[4, 7], [14, 17]],
+                                   [[4, 7], [14, 17]], [[4, 7], [14, 17]], [[4, 7], [9, 12], [14, 17]],
+                                   [[4, 7], [14, 17]], [[4, 7], [14, 17]], [[4, 7], [14, 17]], [[4, 17]],
+                                   [[4, 17]], [[4, 17]], [], [], []],
+                        **PAD_ARGUMENTS)
+
+    def testSerialize(self):
+        kicad_mod = Footprint("BGA-4")
+        kicad_mod.setAttribute('smd')
+        kicad_mod.append(BallGrid(pitch=0.8, columns=2, rows=2, row_skips=[[], [1]], type=Pad.TYPE_SMT,
+                                  shape=Pad.SHAPE_CIRCLE, size=0.4, layers=Pad.LAYERS_SMT))
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_BALL_GRID)
+
+    def testSerializeEqualsPads(self):
+        grid = self.createXilinxGrid()
+        grid_mod = Footprint("CPG238")
+        translation = Translation(1, -2)
+        translation.append(grid)
+        grid_mod.append(translation)
+
+        pad_mod = Footprint("CPG238")
+        translation = Translation(1, -2)
+        pad_mod.append(translation)
+        for pad in grid.getVirtualChilds():
+            translation.append(Pad(number=pad.number, at=pad.at, **PAD_ARGUMENTS))
+
+        self.assertEqual(KicadFileHandler(grid_mod).serialize(timestamp=0),
+                         KicadFileHandler(pad_mod).serialize(timestamp=0))
+
+    def testBalls(self):
+        grid = self.createXilinxGrid()
+        self.assertEqual(grid.getBallCount(), 238)
+        self.assertEqual(len(grid.getBallNames()), 238)
+        self.assertEqual(grid.getBallNames()[:3], ['A1', 'A2', 'A3'])
+        self.assertEqual(grid.row_names[-1], 'W')
+
+        self.assertTrue(grid.hasBall('D3'))
+        self.assertFalse(grid.hasBall('D4'))
+        self.assertFalse(grid.hasBall('K10'))
+        self.assertTrue(grid.hasBall('K12'))
+        self.assertFalse(grid.hasBall('A20'))
+        self.assertFalse(grid.hasBall('A0'))
+        self.assertFalse(grid.hasBall('I1'))
+
+        self.assertEqual(grid.getBallPosition('A1'), Vector2D(-4.5, -4.5))
+        self.assertEqual(grid.getBallPosition('W19'), Vector2D(4.5, 4.5))
+        self.assertRaises(KeyError, grid.getBallPosition, 'D4')
+
+        bounding_box = grid.calculateBoundingBox()
+        self.assertEqual(bounding_box['min'], Vector2D(-4.65, -4.65))
+        self.assertEqual(bounding_box['max'], Vector2D(4.65, 4.65))
+
+    def testRowNames(self):
+        names = BallGrid.rowNames(22)
+        self.assertEqual(names[:3], ['A', 'B', 'C'])
+        self.assertEqual(names[19:], ['Y', 'AA', 'AB'])
+
+    @unittest.skipIf(not NUMPY_AVAILABLE, "numpy is not installed")
+    def testDepopulated(self):
+        depopulated = numpy.zeros((5, 6), dtype=bool)
+        depopulated[1:4, 1:5] = True
+        grid = BallGrid(pitch=[1, 0.8], columns=6, rows=5, depopulated=depopulated, row_skips=[[6]],
+                        **PAD_ARGUMENTS)
+
+        self.assertEqual(grid.getBallCount(), 30 - 12 - 1)
+        self.assertEqual(grid.getBallNames()[5:9], ['B1', 'B6', 'C1', 'C6'])
+        self.assertEqual(grid.getBallPosition('E6'), Vector2D(2.5, 1.6))
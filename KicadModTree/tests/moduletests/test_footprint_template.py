@@ -0,0 +1,124 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+
+
+RESULT_TEMPLATE_3_PINS = """(module Conn_1x03 (layer F.Cu) (tedit 0)
+  (descr "Connector, 3 pins")
+  (attr virtual)
+  (fp_text reference REF** (at 1.25 -2) (layer F.SilkS)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_text value Conn_1x03 (at 1.25 2) (layer F.Fab)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_line (start -1 -1) (end -1 1) (layer F.Fab) (width 0.1))
+  (fp_line (start -1 1) (end 3.5 1) (layer F.Fab) (width 0.1))
+  (fp_line (start 3.5 1) (end 3.5 -1) (layer F.Fab) (width 0.1))
+  (fp_line (start 3.5 -1) (end -1 -1) (layer F.Fab) (width 0.1))
+  (fp_line (start -1.5 1.5) (end -0.5 1.5) (layer F.SilkS) (width 0.12))
+  (pad 1 thru_hole rect (at 0 0) (size 0.8 1.3) (drill 0.5) (layers *.Cu *.Mask))
+  (pad 2 thru_hole oval (at 1.25 0) (size 0.8 1.3) (drill 0.5) (layers *.Cu *.Mask))
+  (pad 3 thru_hole oval (at 2.5 0) (size 0.8 1.3) (drill 0.5) (layers *.Cu *.Mask))
+  (model Conn_1x03.wrl
+    (at (xyz 0 0 0))
+    (scale (xyz 1 1 1))
+    (rotate (xyz 0 0 0))
+  )
+)"""
+
+
+def _addTexts(kicad_mod, center, name):
+    kicad_mod.append(Text(type='reference', text='REF**', at=[center, -2], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text=name, at=[center, 2], layer='F.Fab'))
+
+
+class FootprintTemplateTests(unittest.TestCase):
+
+    def createTemplate(self):
+        pins = TemplateVariable('pins')
+        name = TemplateCall('Conn_1x{:02d}'.format, pins)
+        right = (pins - 1) * 1.25
+
+        template = FootprintTemplate(name, description=TemplateCall('Connector, {} pins'.format, pins),
+                                     attribute='virtual')
+        template.append(Model, filename=TemplateCall('{}.wrl'.format, name))
+        template.append(PadArray, pincount=pins, x_spacing=1.25, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL,
+                        size=[0.8, 1.3], drill=0.5, layers=Pad.LAYERS_THT, tht_pad1_shape=Pad.SHAPE_RECT)
+        template.append(RectLine, start=[-1, -1], end=[right + 1, 1], layer='F.Fab')
+        template.append(Line, start=[-1.5, 1.5], end=[-0.5, 1.5], layer='F.SilkS', width=0.12)
+        template.append(_addTexts, TEMPLATE_TARGET, right / 2, name)
+        return template
+
+    def testSerialize(self):
+        template = self.createTemplate()
+        self.assertEqual(template.serialize({'pins': 3}, timestamp=0), RESULT_TEMPLATE_3_PINS)
+
+    def testWriteFile(self):
+        template = self.createTemplate()
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'Conn_1x03.kicad_mod')
+            template.writeFile(filename, {'pins': 3}, timestamp=0)
+            with io.open(filename, 'r', newline='') as f:
+                self.assertEqual(f.read(), RESULT_TEMPLATE_3_PINS)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def testSerializeEqualsInstance(self):
+        template = self.createTemplate()
+        for pins in [1, 2, 7, 3]:
+            kicad_mod = template.instantiate({'pins': pins})
+            self.assertEqual(kicad_mod.name, 'Conn_1x{:02d}'.format(pins))
+            self.assertEqual(template.serialize({'pins': pins}, timestamp=42),
+                             KicadFileHandler(kicad_mod).serialize(timestamp=42))
+
+    def testInvariantNodesAreSerializedOnce(self):
+        created = []
+
+        def createLine(**kwargs):
+            created.append(kwargs)
+            return Line(**kwargs)
+
+        pins = TemplateVariable('pins')
+        template = FootprintTemplate('Test')
+        template.append(createLine, start=[0, 0], end=[1, 0], layer='F.Fab')
+        template.append(createLine, start=[0, 0], end=[pins, 0], layer='F.Fab')
+
+        for n in range(5):
+            template.serialize({'pins': n})
+        self.assertEqual(len(created), 1 + 5)
+
+    def testExpressions(self):
+        pins = TemplateVariable('pins')
+        self.assertEqual(evaluateTemplateValue((pins - 1) * 1.25, {'pins': 5}), 5.0)
+        self.assertEqual(evaluateTemplateValue(-pins / 2 + 10, {'pins': 4}), 8.0)
+        self.assertEqual(evaluateTemplateValue(2 ** pins % 5, {'pins': 3}), 3)
+        self.assertEqual(evaluateTemplateValue(round(pins / 0.25) * 0.25, {'pins': 0.6}), 0.5)
+        self.assertEqual(evaluateTemplateValue(abs(1 - pins), {'pins': 3}), 2)
+        self.assertEqual(evaluateTemplateValue({'x': [pins, (1, pins)]}, {'pins': 2}), {'x': [2, (1, 2)]})
+        self.assertEqual(evaluateTemplateValue(TemplateCall(max, pins, 3), {'pins': 2}), 3)
+
+        self.assertTrue(containsTemplateExpression([{'y': 1, 'x': pins}]))
+        self.assertFalse(containsTemplateExpression([{'y': 1, 'x': 2}, 'pins']))
+
+        self.assertRaises(KeyError, evaluateTemplateValue, pins + 1, {'n': 1})
@@ -0,0 +1,104 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from KicadModTree import *
+
+
+try:
+    from StringIO import StringIO  # print writes byte strings on Python 2
+except ImportError:
+    from io import StringIO
+
+
+@contextlib.contextmanager
+def captureStdout():
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        yield output
+    finally:
+        sys.stdout = stdout
+
+
+PARTS_CSV = """name, pincount, pitch
+part_1, 1, 2.54
+part_2, 2,
+part_3, 3, 1.27
+broken, 0, 1
+"""
+
+PARTS_YML = """
+yml_part:
+  pincount: 4
+  pitch: 2.0
+"""
+
+
+def footprintFunction(args):
+    if args['pincount'] == 0:
+        raise RuntimeError('no pins')
+    print("footprint {name} {pincount} {pitch}".format(**args))
+
+
+class ModArgparserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.tmp_dir, 'parts.csv')
+        with open(self.csv_file, 'w') as f:
+            f.write(PARTS_CSV)
+        self.yml_file = os.path.join(self.tmp_dir, 'parts.yml')
+        with open(self.yml_file, 'w') as f:
+            f.write(PARTS_YML)
+
+        self.parser = ModArgparser(footprintFunction)
+        self.parser.add_parameter("name", type=str, required=True)
+        self.parser.add_parameter("pincount", type=int, required=True)
+        self.parser.add_parameter("pitch", type=float, required=False, default=2.54)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_parser(self, argv):
+        with captureStdout() as output:
+            self.parser.run(argv)
+        return [line for line in output.getvalue().splitlines() if line.startswith('footprint')]
+
+    def testOnly(self):
+        self.assertEqual(self.run_parser([self.csv_file, self.yml_file, '--only', 'part_2,yml_part']),
+                         ['footprint part_2 2 2.54', 'footprint yml_part 4 2.0'])
+
+    @unittest.skipIf(sys.version_info < (3, 4), "--jobs is ignored before Python 3.4")
+    def testJobs(self):
+        with captureStdout() as output:
+            with self.assertRaises(SystemExit):
+                self.parser.run([self.csv_file, self.yml_file, '--jobs', '2'])
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line for line in lines if line.startswith('footprint')],
+                         ['footprint part_1 1 2.54', 'footprint part_2 2 2.54', 'footprint part_3 3 1.27',
+                          'footprint yml_part 4 2.0'])
+        self.assertIn('ERROR: broken failed', lines)
+        self.assertIn('1 footprints failed', lines)
+
+        # messages of every footprint are kept together
+        self.assertEqual(lines.index('  - generate part_3.kicad_mod') + 1, lines.index('footprint part_3 3 1.27'))
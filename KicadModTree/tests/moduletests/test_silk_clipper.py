@@ -0,0 +1,71 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+RESULT_SILK_CLIPPER = """(module test (layer F.Cu) (tedit 0)
+  (fp_arc (start 5 0) (end 4.24 0.795236) (angle 92.595771) (layer F.SilkS) (width 0.12))
+  (fp_arc (start 5 0) (end 5.76 -0.795236) (angle 92.595771) (layer F.SilkS) (width 0.12))
+  (fp_line (start -3 -0.5) (end 8 -0.5) (layer F.Fab) (width 0.1))
+  (fp_line (start 4 0) (end 6 0) (layer B.SilkS) (width 0.12))
+  (fp_line (start -3 0.5) (end -1.156547 0.5) (layer F.SilkS) (width 0.12))
+  (fp_line (start 1.156547 0.5) (end 4.24 0.5) (layer F.SilkS) (width 0.12))
+  (fp_line (start 5.76 0.5) (end 8 0.5) (layer F.SilkS) (width 0.12))
+  (fp_line (start -2 -2) (end -2 1.1) (layer F.SilkS) (width 0.12))
+  (fp_line (start -2 1.1) (end -0.614492 1.1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 0.614492 1.1) (end 2 1.1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 1.1) (end 2 -2) (layer F.SilkS) (width 0.12))
+  (fp_line (start 2 -2) (end -2 -2) (layer F.SilkS) (width 0.12))
+  (pad 1 thru_hole circle (at 0 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+  (pad 2 smd rect (at 5 0 90) (size 2 1) (layers F.Cu F.Mask F.Paste))
+)"""
+
+
+class SilkClipperTests(unittest.TestCase):
+
+    def testSilkClipper(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[5, 0], size=[2, 1], rotation=90, layers=Pad.LAYERS_SMT))
+
+        kicad_mod.append(Line(start=[-3, 0.5], end=[8, 0.5], layer='F.SilkS'))
+        kicad_mod.append(Line(start=[-3, -0.5], end=[8, -0.5], layer='F.Fab'))
+        kicad_mod.append(RectLine(start=[-2, -2], end=[2, 1.1], layer='F.SilkS'))
+        translation = Translation(5, 0)
+        translation.append(Circle(center=[0, 0], radius=1.1, layer='F.SilkS'))
+        kicad_mod.append(translation)
+
+        # pad 2 is not on the bottom side
+        kicad_mod.append(Arc(center=[0, 0], start=[1.2, 0], angle=90, layer='B.SilkS'))
+        kicad_mod.append(Line(start=[4, 0], end=[6, 0], layer='B.SilkS'))
+
+        self.assertEqual(SilkClipper(kicad_mod, clearance=0.2).clip(), 4)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_SILK_CLIPPER)
+
+    def testUntouched(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT, radius_ratio=0.25,
+                             at=[0, 0], size=[1, 1], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(RectLine(start=[-1, -1], end=[1, 1], layer='F.SilkS'))
+
+        self.assertEqual(SilkClipper(kicad_mod, clearance=0.2).clip(), 0)
+        self.assertEqual(len(kicad_mod.getNormalChilds()), 2)
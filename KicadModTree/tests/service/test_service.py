@@ -0,0 +1,137 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from KicadModTree import *
+
+if sys.version_info >= (3, 5):
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+
+    from KicadModTree.service import *
+
+REGISTRATION = """
+import time
+
+from KicadModTree import *
+
+def resistor(params):
+    kicad_mod = Footprint('R_{}'.format(params['size']))
+    kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[-1, 0], size=[1, 1],
+                         layers=Pad.LAYERS_SMT))
+    return kicad_mod
+
+def broken(params):
+    raise RuntimeError('broken generator')
+
+def slow(params):
+    time.sleep(params['seconds'])
+    return resistor({'size': 'slow'})
+
+def registerGenerators(registry):
+    registry.register('resistor', resistor, 'a single pad')
+    registry.register('broken', broken)
+    registry.register('slow', slow)
+"""
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "kmt-service needs Python 3.5 or newer")
+class ServiceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registration = os.path.join(self.tmp_dir, 'generators.py')
+        with open(self.registration, 'w') as f:
+            f.write(REGISTRATION)
+
+        self.registry = GeneratorRegistry()
+        self.registry.loadFile(self.registration)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def testRegistry(self):
+        self.assertEqual([g['name'] for g in self.registry.describe()], ['resistor', 'broken', 'slow'])
+        self.assertRaises(ServiceException, self.registry.register, 'resistor', None)
+        self.assertRaises(ServiceException, self.registry.get, 'unknown')
+
+    def testService(self):
+        for jobs in (0, 2):
+            service = GenerationService(self.registry, jobs=jobs)
+            try:
+                result = service.generate('resistor', {'size': '0603', 'timestamp': 0})
+                self.assertEqual(result['name'], 'R_0603')
+                self.assertTrue(result['kicad_mod'].startswith('(module R_0603 (layer F.Cu) (tedit 0)'))
+                self.assertIn('(pad 1 smd rect', result['kicad_mod'])
+                self.assertEqual(sorted(result['timing']), ['generate_ms', 'queue_ms', 'serialize_ms', 'total_ms'])
+
+                result = service.generate('broken')
+                self.assertEqual(result['status'], 500)
+                self.assertIn('broken generator', result['error'])
+                self.assertEqual(service.generate('unknown')['status'], 404)
+
+                stats = service.stats()
+                self.assertEqual((stats['requests'], stats['errors']), (3, 2))
+            finally:
+                service.shutdown()
+
+    def testTimeout(self):
+        for jobs in (0, 1):
+            service = GenerationService(self.registry, jobs=jobs, max_queue=1, timeout=0.1)
+            try:
+                result = service.generate('slow', {'seconds': 1})
+                self.assertEqual(result, {'error': 'generation timed out after 0.1 s', 'status': 504})
+
+                # the worker is still busy with the slow request, which keeps its queue slot
+                self.assertEqual(service.generate('resistor', {'size': '0603'})['status'], 503)
+
+                deadline = time.time() + 10
+                while service.generate('resistor', {'size': '0603'}).get('status') == 503:
+                    self.assertLess(time.time(), deadline)
+                    time.sleep(0.05)
+            finally:
+                service.shutdown()
+
+    def testServer(self):
+        service = GenerationService(self.registry, jobs=0)
+        server = createServer(service, port=0, quiet=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        try:
+            with urlopen(url + '/generators') as response:
+                self.assertEqual(len(json.loads(response.read().decode('utf-8'))['generators']), 3)
+
+            request = json.dumps({'generator': 'resistor', 'params': {'size': '0402'}}).encode('utf-8')
+            with urlopen(url + '/generate', request) as response:
+                self.assertEqual(json.loads(response.read().decode('utf-8'))['name'], 'R_0402')
+
+            with self.assertRaises(HTTPError) as context:
+                urlopen(url + '/generate', b'no json')
+            self.assertEqual(context.exception.code, 400)
+            context.exception.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            service.shutdown()
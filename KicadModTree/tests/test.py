@@ -22,6 +22,12 @@ sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../..
 from nodes import *  # NOQA
 from datatypes import *  # NOQA
 from moduletests import *  # NOQA
+from geometry import *  # NOQA
+from build_tool import *  # NOQA
+from util import *  # NOQA
+from service import *  # NOQA
+from validation import *  # NOQA
+from generators import *  # NOQA
 
 
 def run_tests():
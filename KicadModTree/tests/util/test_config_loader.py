@@ -0,0 +1,81 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration, clearConfigCache
+
+GLOBAL_CONFIG = """
+silk_line_width: 0.12
+fab_line_width: 0.1
+pads: [1, 2, 3]
+"""
+
+SERIES_CONFIG = """
+fab_line_width: 0.15
+"""
+
+
+class ConfigLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.global_config = os.path.join(self.tmp_dir, 'global.yaml')
+        self.series_config = os.path.join(self.tmp_dir, 'series.yaml')
+        self.write(self.global_config, GLOBAL_CONFIG)
+        self.write(self.series_config, SERIES_CONFIG)
+        clearConfigCache()
+
+    def tearDown(self):
+        clearConfigCache()
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def testLoadYaml(self):
+        document = loadYaml(self.global_config)
+        self.assertEqual(document, {'silk_line_width': 0.12, 'fab_line_width': 0.1, 'pads': [1, 2, 3]})
+
+        # every call returns an independent copy
+        document['pads'].append(4)
+        self.assertEqual(loadYaml(self.global_config)['pads'], [1, 2, 3])
+
+        # changed files are loaded again
+        self.write(self.global_config, GLOBAL_CONFIG + "extra: 1\n")
+        os.utime(self.global_config, (0, 1))
+        self.assertEqual(loadYaml(self.global_config)['extra'], 1)
+
+    def testLoadConfiguration(self):
+        configuration = loadConfiguration(self.global_config, self.series_config)
+        self.assertEqual(configuration['silk_line_width'], 0.12)
+        self.assertEqual(configuration['fab_line_width'], 0.15)
+
+    def testDiskCache(self):
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.assertEqual(loadYaml(self.series_config, cache_dir), {'fab_line_width': 0.15})
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        # a new process only finds the disk cache, the file itself is not parsed again
+        clearConfigCache()
+        with open(os.path.join(cache_dir, os.listdir(cache_dir)[0]), 'rb') as f:
+            payload = f.read()
+        self.assertEqual(loadYaml(self.series_config, cache_dir), {'fab_line_width': 0.15})
+        with open(os.path.join(cache_dir, os.listdir(cache_dir)[0]), 'rb') as f:
+            self.assertEqual(f.read(), payload)
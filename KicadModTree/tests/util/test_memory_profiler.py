@@ -0,0 +1,137 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import gc
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import weakref
+
+from KicadModTree import *
+from KicadModTree.util import memory_profiler
+from KicadModTree.util.memory_profiler import MemoryProfiler, getMemoryProfiler
+
+
+def createFootprint(name):
+    kicad_mod = Footprint(name)
+    translation = Translation(1, 2)
+    translation.append(PadArray(pincount=20, x_spacing=0.5, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                                size=[0.3, 1], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(translation)
+    kicad_mod.append(ExposedPad(number=21, size=[3, 3], paste_layout=[2, 2], via_layout=[3, 3]))
+    kicad_mod.append(BallGrid(pitch=0.5, columns=4, rows=4, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CIRCLE,
+                              size=0.3, layers=Pad.LAYERS_SMT))
+    kicad_mod.append(RectLine(start=[-6, -3], end=[6, 3], layer='F.Fab'))
+    return kicad_mod
+
+
+class MemoryProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeFootprint(self, name):
+        kicad_mod = createFootprint(name)
+        KicadFileHandler(kicad_mod).writeFile(os.path.join(self.directory, name + '.kicad_mod'))
+        return kicad_mod
+
+    def testTreeIsFreedAfterWriteFile(self):
+        kicad_mod = self.writeFootprint('freed')
+        # no list comprehensions, their variable would keep a node alive on Python 2
+        references = [weakref.ref(kicad_mod)]
+        references.extend(weakref.ref(node) for node in kicad_mod.getAllChilds())
+        references.extend(weakref.ref(node) for child in kicad_mod.getAllChilds() for node in child.getAllChilds())
+        del kicad_mod
+
+        gc.collect()
+        self.assertEqual([r() for r in references if r() is not None], [])
+
+    @unittest.skipUnless(memory_profiler.TRACEMALLOC_AVAILABLE, "tracemalloc is not available")
+    def testReport(self):
+        with MemoryProfiler() as profiler:
+            self.assertIs(getMemoryProfiler(), profiler)
+            for n in range(3):
+                self.writeFootprint('footprint_{}'.format(n))
+        self.assertIsNone(getMemoryProfiler())
+
+        self.assertEqual([e['name'] for e in profiler.footprints], ['footprint_0', 'footprint_1', 'footprint_2'])
+        self.assertTrue(all(e['peak_bytes'] > 0 and e['freed'] for e in profiler.footprints))
+        self.assertGreater(profiler.peak, 0)
+
+        node_types = {row['name']: row for row in profiler.getNodeTypes()}
+        self.assertEqual(node_types['Translation']['created'], 3)
+        self.assertEqual(node_types['BallGrid']['created'], 3)
+        self.assertGreaterEqual(node_types['Pad']['created'], 60)
+        self.assertGreater(node_types['Pad']['allocated_bytes'], 0)
+        self.assertEqual(node_types['Pad']['alive'], 0)
+
+        filename = os.path.join(self.directory, 'memory.json')
+        profiler.writeJson(filename)
+        with open(filename) as f:
+            report = json.load(f)
+        self.assertEqual(len(report['footprints']), 3)
+        self.assertEqual(report['leaked'], [])
+        self.assertIn('footprint_2', profiler.formatReport())
+
+    @unittest.skipUnless(memory_profiler.TRACEMALLOC_AVAILABLE, "tracemalloc is not available")
+    def testPeakPerFootprint(self):
+        def measure():
+            with MemoryProfiler(node_types=False) as profiler:
+                for name, pincount in (('large', 400), ('small', 4), ('medium', 100)):
+                    kicad_mod = Footprint(name)
+                    kicad_mod.append(PadArray(pincount=pincount, x_spacing=0.5, type=Pad.TYPE_SMT,
+                                              shape=Pad.SHAPE_RECT, size=[0.3, 1], layers=Pad.LAYERS_SMT))
+                    KicadFileHandler(kicad_mod).writeFile(os.path.join(self.directory, name + '.kicad_mod'))
+                    del kicad_mod
+            return dict((entry['name'], entry['peak_bytes']) for entry in profiler.footprints)
+
+        reset_peak = memory_profiler._RESET_PEAK
+        for available in (reset_peak, False):
+            memory_profiler._RESET_PEAK = available
+            try:
+                peaks = measure()
+            finally:
+                memory_profiler._RESET_PEAK = reset_peak
+            self.assertGreater(peaks['large'], peaks['medium'])
+            self.assertGreater(peaks['medium'], peaks['small'])
+            self.assertGreater(peaks['small'], 0)
+
+    @unittest.skipUnless(memory_profiler.TRACEMALLOC_AVAILABLE, "tracemalloc is not available")
+    def testLeakCheck(self):
+        kept = []
+        with MemoryProfiler(node_types=False) as profiler:
+            for n in range(4):
+                kicad_mod = self.writeFootprint('footprint_{}'.format(n))
+                if n % 2:
+                    kept.append(kicad_mod)
+            del kicad_mod
+
+        self.assertEqual(profiler.getLeakedFootprints(), ['footprint_1', 'footprint_3'])
+        self.assertEqual(profiler.getNodeTypes(), [])
+        self.assertIn('still alive', profiler.formatReport())
+
+    @unittest.skipUnless(memory_profiler.TRACEMALLOC_AVAILABLE, "tracemalloc is not available")
+    def testWrappersAreRemoved(self):
+        constructor = Pad.__init__
+        write_file = KicadFileHandler.writeFile
+        with MemoryProfiler():
+            self.assertIsNot(Pad.__init__, constructor)
+        self.assertIs(Pad.__init__, constructor)
+        self.assertIs(KicadFileHandler.writeFile, write_file)
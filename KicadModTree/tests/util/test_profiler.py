@@ -0,0 +1,102 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.profiler import Profiler, getProfiler, profilePhase
+
+
+def createFootprint():
+    kicad_mod = Footprint("profiled")
+    translation = Translation(1, 2)
+    translation.append(PadArray(pincount=20, x_spacing=0.5, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                                size=[0.3, 1], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(translation)
+    kicad_mod.append(ExposedPad(number=21, size=[3, 3], paste_layout=[2, 2], via_layout=[3, 3]))
+    kicad_mod.append(RectLine(start=[-6, -3], end=[6, 3], layer='F.Fab'))
+    return kicad_mod
+
+
+class ProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testSummary(self):
+        with Profiler() as profiler:
+            with profilePhase('profiled', 'footprint'):
+                kicad_mod = createFootprint()
+                KicadFileHandler(kicad_mod).writeFile(os.path.join(self.directory, 'profiled.kicad_mod'))
+
+        rows = {(row['category'], row['name']): row for row in profiler.getSummary()}
+        self.assertEqual(rows[('node', 'Translation')]['calls'], 1)
+        self.assertEqual(rows[('node', 'ExposedPad')]['calls'], 1)
+        self.assertGreaterEqual(rows[('node', 'Pad')]['calls'], 20)
+        self.assertEqual(rows[('node', 'RectLine')]['calls'], 1)
+        self.assertIn(('node', 'PadArray._createPads'), rows)
+        self.assertIn(('node', 'ExposedPad.__createVias'), rows)
+        self.assertIn(('transform', 'getRealPosition'), rows)
+        self.assertIn(('serialization', 'KicadFileHandler.serialize'), rows)
+        self.assertEqual(rows[('file write', 'FileHandler.writeFile')]['calls'], 1)
+
+        footprint = rows[('footprint', 'profiled')]
+        self.assertEqual(footprint['calls'], 1)
+        self.assertGreaterEqual(footprint['total_ms'], rows[('file write', 'FileHandler.writeFile')]['total_ms'])
+        self.assertLessEqual(footprint['self_ms'], footprint['total_ms'])
+
+    def testExport(self):
+        with Profiler() as profiler:
+            KicadFileHandler(createFootprint()).serialize()
+
+        trace_file = os.path.join(self.directory, 'trace.json')
+        profiler.writeChromeTrace(trace_file)
+        with open(trace_file) as f:
+            events = json.load(f)['traceEvents']
+        serialize = [e for e in events if e['name'] == 'KicadFileHandler.serialize']
+        self.assertEqual(len(serialize), 1)
+        self.assertEqual(serialize[0]['ph'], 'X')
+        self.assertEqual(serialize[0]['args']['footprint'], 'profiled')
+
+        csv_file = os.path.join(self.directory, 'summary.csv')
+        profiler.writeCsv(csv_file)
+        with open(csv_file) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), len(profiler.getSummary()))
+        self.assertIn('self_ms', rows[0])
+
+    def testDisabled(self):
+        original_serialize = KicadFileHandler.__dict__['serialize']
+        original_init = Pad.__dict__['__init__']
+
+        with Profiler():
+            self.assertIsNotNone(getProfiler())
+            self.assertIsNot(KicadFileHandler.__dict__['serialize'], original_serialize)
+            self.assertRaises(RuntimeError, Profiler().start)
+
+        # without a running profiler the original functions are used
+        self.assertIsNone(getProfiler())
+        self.assertIs(KicadFileHandler.__dict__['serialize'], original_serialize)
+        self.assertIs(Pad.__dict__['__init__'], original_init)
+        with profilePhase('nothing'):
+            pass
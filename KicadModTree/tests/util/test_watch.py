@@ -0,0 +1,95 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from KicadModTree.util.watch import changedEntries, EntryWatcher
+
+
+try:
+    from StringIO import StringIO  # print writes byte strings on Python 2
+except ImportError:
+    from io import StringIO
+
+
+@contextlib.contextmanager
+def captureStdout():
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        yield output
+    finally:
+        sys.stdout = stdout
+
+
+DEFINITIONS = """
+FileHeader: {library: Package_SO}
+part_a: {pins: 8}
+part_b: {pins: 14}
+"""
+
+
+class WatchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'parts.yaml')
+        self.write(DEFINITIONS, 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, content, mtime):
+        with open(self.path, 'w') as f:
+            f.write(content)
+        os.utime(self.path, (mtime, mtime))
+
+    def testChangedEntries(self):
+        old = {'header': 1, 'a': 1, 'b': 2}
+        # dicts are only ordered since Python 3.7
+        self.assertEqual(sorted(changedEntries(old, {'header': 1, 'a': 1, 'b': 3, 'c': 4}, ['header'])), ['b', 'c'])
+        self.assertEqual(sorted(changedEntries(old, {'header': 2, 'a': 1, 'b': 2}, ['header'])), ['a', 'b'])
+        self.assertEqual(changedEntries(None, {'a': 1}), ['a'])
+
+    def testWatcher(self):
+        calls = []
+
+        def regenerate(filepath, document, names):
+            document.pop('FileHeader')  # modifying the document must not disturb the watcher
+            calls.append((filepath, names))
+
+        with captureStdout() as output:
+            watcher = EntryWatcher([self.path], regenerate, shared_entries=['FileHeader'])
+            self.assertEqual(watcher.poll(), 0)
+
+            self.write(DEFINITIONS.replace('pins: 14', 'pins: 16'), 2)
+            self.assertEqual(watcher.poll(), 1)
+            self.assertEqual(calls, [(self.path, ['part_b'])])
+
+            # invalid files are skipped, the next valid version is compared against the last valid one
+            self.write(DEFINITIONS + "part_c: [", 3)
+            self.assertEqual(watcher.poll(), 0)
+            self.write(DEFINITIONS.replace('pins: 14', 'pins: 16') + "part_c: {pins: 4}\n", 4)
+            self.assertEqual(watcher.poll(), 1)
+            self.assertEqual(calls[-1], (self.path, ['part_c']))
+
+            self.write(DEFINITIONS.replace('Package_SO', 'Package_SSOP'), 5)
+            self.assertEqual(watcher.poll(), 2)
+            self.assertIn("removed entries are not deleted: part_c", output.getvalue())
@@ -0,0 +1,160 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from KicadModTree import *
+from KicadModTree.util.kicad_util import lispTokenizer, parseLispString
+from KicadModTree.validation import *
+
+
+def createFootprint(name='valid', silk=True, courtyard=True):
+    kicad_mod = Footprint(name)
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text=name, at=[0, 3], layer='F.Fab'))
+    kicad_mod.append(PadArray(pincount=3, x_spacing=1.27, center=[0, 0], type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                              size=[0.6, 1.5], layers=Pad.LAYERS_SMT))
+    kicad_mod.append(RectLine(start=[-2.5, -1.5], end=[2.5, 1.5], layer='F.Fab'))
+    if silk:
+        kicad_mod.append(PolygoneLine(nodes=[[-2.5, -1.8], [-1.6, -1.8], [-1.6, -2.2]], layer='F.SilkS'))
+        kicad_mod.append(Line(start=[-2.5, 1.8], end=[2.5, 1.8], layer='F.SilkS'))
+    if courtyard:
+        kicad_mod.append(RectLine(start=[-3, -2.5], end=[3, 2.5], layer='F.CrtYd'))
+    return kicad_mod
+
+
+def ruleNames(violations):
+    return sorted(v.rule for v in violations)
+
+
+class ValidationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeFootprint(self, kicad_mod):
+        filename = os.path.join(self.directory, kicad_mod.name + '.kicad_mod')
+        KicadFileHandler(kicad_mod).writeFile(filename, timestamp=0)
+        return filename
+
+    def testTokenizer(self):
+        self.assertEqual(lispTokenizer('(pad "" np_thru_hole (at 0 0))'),
+                         ['(', 'pad', '', 'np_thru_hole', '(', 'at', '0', '0', ')', ')'])
+        self.assertEqual(parseLispString('(fp_text user "a \\"b\\" (c)" (at 1 2))'),
+                         ['fp_text', 'user', 'a "b" (c)', ['at', '1', '2']])
+        self.assertRaises(RuntimeError, parseLispString, '(fp_text user "abc)')
+        self.assertRaises(RuntimeError, parseLispString, '(module a')
+
+    def testParseFootprint(self):
+        kicad_mod = createFootprint()
+        kicad_mod.append(Pad(number='', type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=[0, 1.5], size=0.5,
+                             drill=0.5, layers=Pad.LAYERS_NPTH))
+        kicad_mod.append(Circle(center=[0, 0], radius=1, layer='F.Fab'))
+        with open(self.writeFootprint(kicad_mod)) as f:
+            footprint = parseFootprint(f.read())
+
+        self.assertEqual(footprint.name, 'valid')
+        self.assertEqual([pad.number for pad in footprint.pads], ['1', '2', '3', ''])
+        self.assertEqual([text.type for text in footprint.texts], ['reference', 'value'])
+        circle = [g for g in footprint.graphics if g.kind == 'fp_circle'][0]
+        self.assertGreater(len(circle.segments), 8)
+        self.assertAlmostEqual(circle.boundingBox()[1], 1, places=2)
+        self.assertRaises(ValueError, parseFootprint, '(footprint a)')
+
+    def testValidFootprint(self):
+        self.assertEqual(validateFootprint(createFootprint()), [])
+
+    def testPadOneMarker(self):
+        violations = validateFootprint(createFootprint(silk=False), [PadOneMarkerRule()])
+        self.assertEqual(ruleNames(violations), ['pad1_marker'])
+        self.assertEqual(violations[0].position, (-1.27, 0))
+
+    def testCourtyard(self):
+        self.assertEqual([v.message for v in validateFootprint(createFootprint(courtyard=False), [CourtyardRule()])],
+                         ['no courtyard on F.CrtYd'])
+
+        kicad_mod = createFootprint()
+        kicad_mod.append(Pad(number=4, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[2.9, 0], size=[0.6, 1.5],
+                             layers=Pad.LAYERS_SMT))
+        violations = validateFootprint(kicad_mod, [CourtyardRule()])
+        self.assertEqual([v.message for v in violations], ['pad 4 is outside of the courtyard on F.CrtYd'])
+
+        # pads which are only on the back side belong to the front courtyard if there is no back courtyard
+        kicad_mod = createFootprint()
+        kicad_mod.append(Pad(number=4, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0], size=[0.6, 0.6],
+                             layers=['B.Cu', 'B.Mask']))
+        self.assertEqual(validateFootprint(kicad_mod, [CourtyardRule()]), [])
+
+        kicad_mod = createFootprint(courtyard=False)
+        kicad_mod.setAttribute('virtual')
+        self.assertEqual(validateFootprint(kicad_mod, [CourtyardRule()]), [])
+
+    def testSilkClearance(self):
+        kicad_mod = createFootprint()
+        kicad_mod.append(Line(start=[-2.5, 0.85], end=[2.5, 0.85], layer='F.SilkS'))
+        violations = validateFootprint(kicad_mod, [SilkClearanceRule()])
+        self.assertEqual([v.message for v in violations], ['fp_line on F.SilkS is 0.04 mm from pad 1 (minimum 0.2)'])
+        self.assertEqual(validateFootprint(kicad_mod, [SilkClearanceRule(clearance=0.02)]), [])
+
+    def testLineWidthAndTextSize(self):
+        kicad_mod = createFootprint()
+        kicad_mod.append(Line(start=[-2.5, 2], end=[2.5, 2], layer='F.Fab', width=0.3))
+        kicad_mod.append(Text(type='user', text='small', at=[0, 0], layer='F.Fab', size=[0.2, 0.2]))
+        kicad_mod.append(Text(type='user', text='thick', at=[0, 0], layer='F.Fab', thickness=0.4))
+        violations = validateFootprint(kicad_mod, [LineWidthRule(), TextSizeRule()])
+        self.assertEqual([v.message for v in violations], [
+            'fp_line on F.Fab has width 0.3 instead of 0.1',
+            'user text small has size 0.2 x 0.2 (allowed 0.25 to 2)',
+            'user text thick has thickness 0.4 for size 1'])
+
+    def testValidateLibrary(self):
+        filenames = [self.writeFootprint(createFootprint('footprint_{}'.format(n), silk=n % 3 != 0))
+                     for n in range(10)]
+        with open(os.path.join(self.directory, 'broken.kicad_mod'), 'w') as f:
+            f.write('(module broken (pad "1" smd rect (at 0 0)')
+        filenames = list(findFootprintFiles([self.directory]))
+        self.assertEqual(len(filenames), 11)
+
+        serial = [result.asDict() for result in validateLibrary(filenames, jobs=1, chunk_size=3)]
+        parallel = [result.asDict() for result in validateLibrary(filenames, jobs=2, chunk_size=3)]
+        self.assertEqual(serial, parallel)
+        self.assertEqual([r['path'] for r in parallel], filenames)
+        self.assertIsNotNone(parallel[0]['error'])
+
+        trees = [createFootprint('tree', silk=False), createFootprint('tree')]
+        self.assertEqual([r.success for r in validateLibrary(trees, jobs=2)], [False, True])
+
+    def testReport(self):
+        filenames = [self.writeFootprint(createFootprint('footprint_{}'.format(n), silk=n != 1)) for n in range(3)]
+        report = ValidationReport()
+        for result in validateLibrary(filenames, jobs=1):
+            report.add(result)
+        self.assertFalse(report.success)
+        self.assertIn('3 footprints checked, 1 with violations', report.formatSummary())
+
+        filename = os.path.join(self.directory, 'validation.json')
+        report.writeJson(filename)
+        with open(filename) as f:
+            data = json.load(f)
+        self.assertEqual((data['checked'], data['failed'], data['violations']), (3, 1, {'pad1_marker': 1}))
+        self.assertEqual(data['footprints'][0]['name'], 'footprint_1')
+        self.assertEqual(data['footprints'][0]['violations'][0]['rule'], 'pad1_marker')
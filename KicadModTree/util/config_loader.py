@@ -0,0 +1,146 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Cached loading of yaml configuration files
+
+Generators load the same documents (KLC configuration, series configuration, IPC definitions) over and over.
+Parsed documents are kept in memory per path, modification time and size, so loading a file a second time only
+costs a ``stat``. Optionally the parsed documents are also stored in a cache directory, which makes them cache
+hits for the next process too.
+
+libyaml's ``CSafeLoader`` is used if pyyaml was built with it.
+
+Every call returns its own copy of the document, callers are free to modify it.
+
+:Example:
+
+>>> from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+>>> configuration = loadConfiguration('../tools/global_config_files/config_KLCv3.0.yaml',
+...                                   'package_config_KLCv3.yaml')
+>>> ipc_definitions = loadYaml('ipc_definitions.yaml')
+"""
+
+import hashlib
+import os
+import pickle
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+    YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    YAML_AVAILABLE = False
+    YAML_LOADER = None
+
+# the disk cache is used if this environment variable names a directory
+CACHE_DIR_ENVIRONMENT = 'KICADMODTREE_CONFIG_CACHE'
+
+# realpath -> ((realpath, mtime, size), pickled document). The pickle is also used to hand out independent copies
+_memory_cache = {}
+
+# os.replace is not available on Python 2, os.rename only replaces existing files on POSIX systems
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _fileKey(path):
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    # st_mtime_ns is not available on Python 2
+    return (real_path, getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+
+
+def _cacheFile(cache_dir, key):
+    name = hashlib.sha256(repr(key + (YAML_LOADER.__name__, yaml.__version__)).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, name + '.pickle')
+
+
+def _readCacheFile(path):
+    try:
+        with open(path, 'rb') as stream:
+            return stream.read()
+    except (IOError, OSError):
+        return None
+
+
+def _writeCacheFile(path, payload):
+    # write to a temporary file first, parallel generators must never see a partial file
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(tmp_path, 'wb') as stream:
+            stream.write(payload)
+        _replace(tmp_path, path)
+    except (IOError, OSError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def loadYaml(path, cache_dir=None):
+    r"""Load a yaml file, using the cache if possible
+
+    :param path: path of the yaml file
+    :param cache_dir: directory of the disk cache
+        (default: the directory given by the ``KICADMODTREE_CONFIG_CACHE`` environment variable, None disables it)
+    :return: the parsed document
+    :raises yaml.YAMLError: if the file is not valid yaml
+    """
+    if not YAML_AVAILABLE:
+        raise ImportError("pyyaml is required to load configuration files")
+
+    key = _fileKey(path)
+    cached_key, payload = _memory_cache.get(key[0], (None, None))
+    if cached_key != key:
+        payload = None
+
+    if payload is None:
+        cache_dir = cache_dir if cache_dir is not None else os.environ.get(CACHE_DIR_ENVIRONMENT)
+        cache_file = _cacheFile(cache_dir, key) if cache_dir else None
+        if cache_file is not None:
+            payload = _readCacheFile(cache_file)
+
+        if payload is None:
+            with open(key[0], 'rb') as stream:
+                document = yaml.load(stream, Loader=YAML_LOADER)
+            payload = pickle.dumps(document, pickle.HIGHEST_PROTOCOL)
+            if cache_file is not None:
+                if not os.path.isdir(cache_dir):
+                    try:
+                        os.makedirs(cache_dir)
+                    except OSError:
+                        # parallel generators may create it at the same time
+                        if not os.path.isdir(cache_dir):
+                            raise
+                _writeCacheFile(cache_file, payload)
+
+        _memory_cache[key[0]] = (key, payload)
+
+    return pickle.loads(payload)
+
+
+def loadConfiguration(*paths, **kwargs):
+    r"""Load multiple yaml files and merge their top level entries. Later files override earlier ones
+
+    :param paths: paths of the yaml files, like the global configuration followed by the series configuration
+    :param cache_dir: directory of the disk cache (see loadYaml)
+    :return: dict with the merged entries
+    """
+    configuration = {}
+    for path in paths:
+        configuration.update(loadYaml(path, kwargs.get('cache_dir')) or {})
+    return configuration
+
+
+def clearConfigCache():
+    r"""Forget all documents of the in-memory cache. The disk cache is not touched"""
+    _memory_cache.clear()
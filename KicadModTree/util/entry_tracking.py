@@ -0,0 +1,49 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Attribution of written footprints to the parameter sets they are generated from
+
+Generators which create their footprints from the entries of yaml files announce the entry they are working on.
+``KicadModTree.build.track`` listens to the announcements and stores the inputs of every footprint on its own,
+so incremental builds only regenerate the footprints of changed entries. Without a listener nothing happens.
+
+:Example:
+
+>>> from KicadModTree.util.entry_tracking import generatingEntry
+>>> for name in parameter_sets:
+...     generatingEntry('size_definitions/qfp.yaml', name)
+...     generateFootprint(parameter_sets[name])
+"""
+
+_listener = None
+
+
+def setEntryListener(listener):
+    r"""Set the function which is called with the yaml file and the entry name of every announcement
+
+    :param listener: function(filepath, name), or None to remove the listener
+    """
+    global _listener
+    _listener = listener
+
+
+def generatingEntry(filepath, name):
+    r"""Announce that the following footprints are generated from an entry of a yaml file
+
+    :param filepath: path of the yaml file
+    :param name: name of the top level entry
+    """
+    if _listener is not None:
+        _listener(filepath, name)
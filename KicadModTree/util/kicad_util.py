@@ -13,6 +13,7 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import os
 import time
 import re
 
@@ -37,53 +38,22 @@ def lispString(string):
     return string
 
 
-def lispTokenizer(input):
-    '''
-    Convert a string of characters into a list of tokens.
-    '''
-    input = input.replace('(', ' ( ').replace(')', ' ) ')
-
-    # split input, including whitespaces
-    base_tokens = re.split(r'(\s+)', input)
-
-    tokens = []
-    in_string = False
-
-    for token in base_tokens:
-        if not in_string and token.isspace():
-            continue
-
-        if len(token) == 0:
-            continue
-
-        if token[0] == '"':
-            if in_string:
-                tokens[-1] += token[1:]
-                in_string = False
-            else:
-                tokens.append(token[1:])
-                in_string = True
-
-        elif token[-1] == '"':
-            if in_string:
-                tokens[-1] += token[:-1]
-                in_string = False
-            else:
-                tokens.append(token[:-1])
-                in_string = True
+# brackets, quoted strings (with escaped quotation marks), everything else up to the next whitespace or bracket, and
+# a quotation mark which is not closed
+_LISP_TOKEN = re.compile(r'[()]|"(?:[^"\\]|\\.)*"|[^\s()"]+|"')
 
-        else:
-            if in_string:
-                tokens[-1] += token
-            else:
-                tokens.append(token)
 
-    if in_string:
+def _unquote(token):
+    if len(token) == 1:
         raise RuntimeError("missing closing quotation mark")
+    return token[1:-1].replace('\\"', '"')
 
-    # TOOD: remove invalid spaces from quotation (when having brackets inside)
 
-    return tokens
+def lispTokenizer(input):
+    '''
+    Convert a string of characters into a list of tokens.
+    '''
+    return [_unquote(token) if token[0] == '"' else token for token in _LISP_TOKEN.findall(input)]
 
 
 def parseLispString(input):
@@ -91,19 +61,24 @@ def parseLispString(input):
     current_node = syntax_tree
     scope = [syntax_tree]
 
-    for token in lispTokenizer(input):
-        if token == "(":
-            scope.append([])
-            current_node.append(scope[-1])
-            current_node = scope[-1]
+    for token in _LISP_TOKEN.findall(input):
+        first = token[0]
+        if first == "(":
+            current_node = []
+            scope[-1].append(current_node)
+            scope.append(current_node)
 
-        elif token == ")":
+        elif first == ")":
             if len(scope) <= 1:
                 raise RuntimeError("missing opening brackets")
 
             scope.pop()
             current_node = scope[-1]
 
+        elif first == '"':
+            # quoted strings are always values, even if they look like brackets
+            current_node.append(_unquote(token))
+
         else:
             current_node.append(token)
 
@@ -194,8 +169,12 @@ def parseTimestamp(timestamp):
     return time.time()  # TOOD
 
 
+# if set, this timestamp (seconds since epoch) is written into all footprints, for reproducible output
+TIMESTAMP_ENVIRONMENT = 'KICADMODTREE_TIMESTAMP'
+
+
 def formatTimestamp(timestamp=None):
     if timestamp is None:
-        timestamp = time.time()
+        timestamp = os.environ.get(TIMESTAMP_ENVIRONMENT) or time.time()
 
     return "{timestamp:X}".format(timestamp=int(timestamp))
@@ -0,0 +1,339 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Memory usage of footprint generation, measured with tracemalloc
+
+Every written footprint ends a measurement: its peak is the highest traced memory since the previous footprint was
+written, its retained memory the growth of the traced memory compared with the previous footprint. A script whose
+footprints are freed has a retained memory around zero, a script which keeps them alive grows with every footprint.
+
+Before Python 3.9, tracemalloc can not reset its peak: the peak of a footprint which stays below the highest
+earlier peak is then the highest memory seen when nodes are created or footprints are written.
+
+The constructors of all nodes are measured per node type. When the profiler is stopped, the garbage collector is run
+and every footprint which is still alive is reported as leaked.
+
+Set the environment variable ``KICADMODTREE_MEMORY_PROFILE`` to a file name to profile a whole script, the report
+is written as JSON when the script exits. The profiler is started by ``ModArgparser.run`` and the IPC generators,
+other scripts call ``startFromEnvironment()``. Every process started with the variable, like the generators of
+``kmt-build``, writes its own report: ``{pid}`` in the name is replaced by the process id::
+
+    KICADMODTREE_MEMORY_PROFILE=memory.json python ipc_gullwing_generator.py size_definitions/*.yaml
+
+:Example:
+
+>>> from KicadModTree import *
+>>> from KicadModTree.util.memory_profiler import MemoryProfiler
+>>> with MemoryProfiler() as profiler:
+...     generateFootprints()
+>>> print(profiler.formatReport())
+>>> profiler.writeJson('memory.json')
+"""
+
+import atexit
+import functools
+import gc
+import io
+import json
+import os
+import sys
+import threading
+import weakref
+
+try:
+    import tracemalloc
+    TRACEMALLOC_AVAILABLE = True
+except ImportError:
+    TRACEMALLOC_AVAILABLE = False
+
+from KicadModTree.util.profiler import _nodeClasses
+
+MEMORY_PROFILE_ENVIRONMENT = 'KICADMODTREE_MEMORY_PROFILE'
+
+# tracemalloc.reset_peak is only available since Python 3.9
+_RESET_PEAK = TRACEMALLOC_AVAILABLE and hasattr(tracemalloc, 'reset_peak')
+
+# the running memory profiler
+_active = None
+
+
+def getMemoryProfiler():
+    r"""Get the running memory profiler, or None"""
+    return _active
+
+
+class MemoryProfiler(object):
+    r"""Record the memory used per footprint and per node type
+
+    Only footprints and nodes of the thread which started the profiler are recorded, and only one memory profiler
+    can run at a time.
+
+    :param node_types: measure the constructors of all node types (default: True)
+    :param frames: number of frames of the tracemalloc tracebacks, if tracemalloc is not already tracing (default: 1)
+    """
+
+    def __init__(self, node_types=True, frames=1):
+        self.node_types = node_types
+        self.frames = frames
+
+        self.footprints = []
+        self.peak = 0
+        self._nodes = {}
+        self._alive = {}
+        self._stack = []
+        self._references = []
+        self._installed = []
+        self._tracing = False
+        self._thread = None
+        self._start = 0
+        self._previous = 0
+        self._traced_peak = 0
+        self._sampled_peak = 0
+
+    def start(self):
+        r"""Start tracemalloc and install the measuring wrappers"""
+        global _active
+        if not TRACEMALLOC_AVAILABLE:
+            raise ImportError("tracemalloc is required for memory profiling (Python 3.4 or newer)")
+        if _active is not None:
+            raise RuntimeError('another memory profiler is already running')
+
+        from KicadModTree.FileHandler import FileHandler
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._tracing = True
+
+        self._install(FileHandler, 'writeFile', self._wrapWriteFile)
+        if self.node_types:
+            for cls in _nodeClasses():
+                if '__init__' in cls.__dict__:
+                    self._install(cls, '__init__', self._wrapConstructor)
+
+        self._thread = threading.get_ident()
+        self._resetPeak()
+        _active = self
+
+    def stop(self):
+        r"""Put the original functions back, run the garbage collector and check which footprints are still alive"""
+        global _active
+        if _active is not self:
+            return
+
+        for owner, attribute, original in reversed(self._installed):
+            setattr(owner, attribute, original)
+        self._installed = []
+        _active = None
+
+        self.peak = max(self.peak, self._currentPeak()[1] - self._start)
+
+        gc.collect()
+        for entry, reference in self._references:
+            entry['freed'] = reference() is None
+        self._references = []
+        if self.node_types:
+            self._alive = self._countNodes()
+
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _install(self, owner, attribute, wrap):
+        original = owner.__dict__[attribute]
+        setattr(owner, attribute, wrap(original))
+        self._installed.append((owner, attribute, original))
+
+    def _recording(self):
+        return _active is self and threading.get_ident() == self._thread
+
+    def _wrapWriteFile(self, function):
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(handler, *args, **kwargs):
+            result = function(handler, *args, **kwargs)
+            if profiler._recording():
+                profiler._footprintWritten(handler.kicad_mod)
+            return result
+
+        return wrapper
+
+    def _resetPeak(self):
+        # starts a new measurement
+        if _RESET_PEAK:
+            tracemalloc.reset_peak()
+        current, self._traced_peak = tracemalloc.get_traced_memory()
+        self._start = self._previous = self._sampled_peak = current
+
+    def _currentPeak(self):
+        # (current, peak) of the traced memory since the measurement started
+        current, peak = tracemalloc.get_traced_memory()
+        if _RESET_PEAK or peak > self._traced_peak:
+            return current, peak
+        # without reset_peak, the peak is the one since tracing started. Unless it grew since the measurement
+        # started, the highest traced memory seen by the wrappers is used
+        return current, max(self._sampled_peak, current)
+
+    def _footprintWritten(self, kicad_mod):
+        current, peak = self._currentPeak()
+        entry = {'name': kicad_mod.name, 'peak_bytes': max(0, peak - self._start),
+                 'retained_bytes': current - self._previous, 'freed': None}
+        self.footprints.append(entry)
+        self._references.append((entry, weakref.ref(kicad_mod)))
+        self.peak = max(self.peak, peak - self._start)
+
+        # the next footprint starts now
+        self._resetPeak()
+
+    def _wrapConstructor(self, function):
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(node, *args, **kwargs):
+            # constructors of base classes are part of the constructor of the node
+            if not profiler._recording() or (profiler._stack and profiler._stack[-1][0] is node):
+                return function(node, *args, **kwargs)
+
+            frame = [node, 0]
+            profiler._stack.append(frame)
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                return function(node, *args, **kwargs)
+            finally:
+                after = tracemalloc.get_traced_memory()[0]
+                profiler._sampled_peak = max(profiler._sampled_peak, after)
+                allocated = after - before
+                profiler._stack.pop()
+                if profiler._stack:
+                    profiler._stack[-1][1] += allocated
+
+                stats = profiler._nodes.get(type(node).__name__)
+                if stats is None:
+                    stats = profiler._nodes[type(node).__name__] = [0, 0, 0]
+                stats[0] += 1
+                stats[1] += allocated - frame[1]
+                stats[2] = max(stats[2], allocated)
+
+        return wrapper
+
+    @staticmethod
+    def _countNodes():
+        from KicadModTree.nodes.Node import Node
+
+        counts = {}
+        for obj in gc.get_objects():
+            if isinstance(obj, Node):
+                name = type(obj).__name__
+                counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def getNodeTypes(self):
+        r"""Get the memory used per node type, sorted by the allocated memory
+
+        :return: list of dicts with name, created, allocated_bytes (by the constructors, without nested nodes),
+                 max_bytes (largest constructor, with nested nodes), alive (instances after the profiler was stopped)
+                 and retained_bytes (alive instances times the average allocated memory)
+        """
+        rows = []
+        for name, (created, allocated, maximum) in self._nodes.items():
+            alive = self._alive.get(name, 0)
+            rows.append({'name': name, 'created': created, 'allocated_bytes': allocated, 'max_bytes': maximum,
+                         'alive': alive, 'retained_bytes': alive * allocated // created if created else 0})
+        rows.sort(key=lambda row: -row['allocated_bytes'])
+        return rows
+
+    def getLeakedFootprints(self):
+        r"""Get the names of the footprints which were still alive after the profiler was stopped"""
+        return [entry['name'] for entry in self.footprints if entry['freed'] is False]
+
+    def getReport(self):
+        r"""Get the whole report as dict, like it is written by writeJson"""
+        return {'peak_bytes': self.peak,
+                'retained_bytes': sum(entry['retained_bytes'] for entry in self.footprints),
+                'footprints': self.footprints,
+                'node_types': self.getNodeTypes(),
+                'leaked': self.getLeakedFootprints()}
+
+    def writeJson(self, filename):
+        r"""Write the report as JSON
+
+        :param filename: path of the output file
+        """
+        with io.open(filename, 'w', newline='\n') as f:
+            json.dump(self.getReport(), f, indent=1)
+
+    def formatReport(self, limit=10):
+        r"""Get a human readable summary of the report
+
+        :param limit: number of footprints and node types which are listed
+        """
+        def kib(value):
+            return '{:10.1f} KiB'.format(value / 1024)
+
+        retained = sum(e['retained_bytes'] for e in self.footprints)
+        lines = ["{} footprints, peak {}, retained {}".format(
+            len(self.footprints), kib(self.peak).strip(), kib(retained).strip())]
+
+        if self.footprints:
+            lines.append("Largest footprints:")
+            lines.append("  {:>14} {:>14}  {}".format('peak', 'retained', 'footprint'))
+            for entry in sorted(self.footprints, key=lambda e: -e['peak_bytes'])[:limit]:
+                lines.append("  {} {}  {}".format(
+                    kib(entry['peak_bytes']), kib(entry['retained_bytes']), entry['name']))
+
+        node_types = self.getNodeTypes()
+        if node_types:
+            lines.append("Node types:")
+            lines.append("  {:>8} {:>14} {:>8}  {}".format('created', 'allocated', 'alive', 'node type'))
+            for row in node_types[:limit]:
+                lines.append("  {:>8} {} {:>8}  {}".format(
+                    row['created'], kib(row['allocated_bytes']), row['alive'], row['name']))
+
+        leaked = self.getLeakedFootprints()
+        if leaked:
+            lines.append("{} footprints are still alive after they were written: {}".format(
+                len(leaked), ', '.join(leaked[:limit]) + (', ...' if len(leaked) > limit else '')))
+        return '\n'.join(lines)
+
+
+def _writeEnvironmentReport(profiler, filename):
+    profiler.stop()
+    profiler.writeJson(filename)
+    sys.stderr.write(profiler.formatReport() + '\n')
+
+
+def startFromEnvironment():
+    r"""Profile the whole process if ``KICADMODTREE_MEMORY_PROFILE`` is set, the report is written at exit
+
+    :return: the started MemoryProfiler, or None
+    """
+    filename = os.environ.get(MEMORY_PROFILE_ENVIRONMENT)
+    if not filename or _active is not None:
+        return None
+    if not TRACEMALLOC_AVAILABLE:
+        sys.stderr.write("{} is ignored, tracemalloc is not available\n".format(MEMORY_PROFILE_ENVIRONMENT))
+        return None
+
+    profiler = MemoryProfiler()
+    profiler.start()
+    atexit.register(_writeEnvironmentReport, profiler, os.path.abspath(filename.replace('{pid}', str(os.getpid()))))
+    return profiler
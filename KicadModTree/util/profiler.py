@@ -0,0 +1,350 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Opt-in profiling of footprint generation
+
+Modules declare the functions worth timing with ``instrument``. Nothing is changed until a Profiler is started: it
+replaces the instrumented functions by timing wrappers, and puts the original functions back when it is stopped. So
+there is no overhead at all while no profiler is running.
+
+Every call of an instrumented function is recorded with its duration, the time spent outside of other instrumented
+calls (self time) and the number of memory blocks it left allocated. The constructors of all nodes are timed per
+node type. The calls can be exported as Chrome trace events (open them in ``chrome://tracing`` or Perfetto) and as a
+CSV summary.
+
+:Example:
+
+>>> from KicadModTree import *
+>>> from KicadModTree.util.profiler import Profiler
+>>> with Profiler() as profiler:
+...     kicad_mod = Footprint('example_footprint')
+...     kicad_mod.append(PadArray(pincount=100, x_spacing=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+...                               size=[0.5, 1], layers=Pad.LAYERS_SMT))
+...     KicadFileHandler(kicad_mod).writeFile('example_footprint.kicad_mod')
+>>> profiler.writeChromeTrace('trace.json')
+>>> profiler.writeCsv('summary.csv')
+"""
+
+import contextlib
+import csv
+import functools
+import io
+import json
+import os
+import sys
+from timeit import default_timer
+
+try:
+    from threading import get_ident
+except ImportError:
+    # Python 2
+    from thread import get_ident
+
+# (owner, attribute, name, category, args) of all instrumented functions
+_hooks = []
+
+# the running profiler
+_active = None
+
+
+def instrument(owner, attribute, name=None, category='phase', args=None):
+    r"""Declare a function which is timed while a profiler is running
+
+    Recursive calls of a function are recorded only once, as part of the outermost call.
+
+    :param owner: class or module of the function
+    :param attribute: name of the function
+    :param name: name of the recorded phase, or a function which gets the arguments of the call and returns the name
+                 (default: 'Owner.attribute')
+    :param category: category of the phase, like 'serialization'
+    :param args: function which gets the arguments of the call and returns a dict which is added to the trace event
+
+    :Example:
+
+    >>> instrument(KicadFileHandler, 'serialize', category='serialization',
+    ...            args=lambda self, **kwargs: {'footprint': self.kicad_mod.name})
+    """
+    if name is None:
+        name = '{}.{}'.format(owner.__name__, attribute)
+    _hooks.append((owner, attribute, name, category, args))
+
+
+def _now():
+    # nanoseconds of a monotonic clock (time.perf_counter_ns is only available since Python 3.7)
+    return int(default_timer() * 1e9)
+
+
+class _NoPhase(object):
+    # phase which is returned while no profiler is running (contextlib.nullcontext needs Python 3.7)
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_no_phase = _NoPhase()
+
+
+def getProfiler():
+    r"""Get the running profiler, or None"""
+    return _active
+
+
+def profilePhase(name, category='phase', **args):
+    r"""Record a block of code as phase of the running profiler, does nothing if no profiler is running
+
+    :param name: name of the phase
+    :param category: category of the phase
+    :param args: values which are added to the trace event
+
+    :Example:
+
+    >>> from KicadModTree.util.profiler import profilePhase
+    >>> with profilePhase(fp_name, 'footprint'):
+    ...     generateFootprint(fp_name, params)
+    """
+    if _active is None:
+        return _no_phase
+    return _active.phase(name, category, **args)
+
+
+def _nodeName(self, *args, **kwargs):
+    return type(self).__name__
+
+
+def _nodeClasses():
+    from KicadModTree.nodes.Node import Node
+
+    classes = []
+    pending = [Node]
+    while pending:
+        cls = pending.pop()
+        if cls not in classes:
+            classes.append(cls)
+            pending.extend(cls.__subclasses__())
+    return classes
+
+
+class _Frame(object):
+    __slots__ = ('key', 'args', 'start', 'blocks', 'children')
+
+    def __init__(self, key, args, start, blocks):
+        self.key = key
+        self.args = args
+        self.start = start
+        self.blocks = blocks
+        self.children = 0
+
+
+class Profiler(object):
+    r"""Record the time spent in the instrumented functions
+
+    Only calls of the thread which started the profiler are recorded, and only one profiler can run at a time.
+
+    :param node_types: time the constructor of every node type (default: True)
+    :param allocations: count the allocated memory blocks of every call, needs Python 3.4 or newer (default: True)
+    :param trace: keep every call for the Chrome trace, otherwise only the summary is recorded (default: True)
+
+    :Example:
+
+    >>> from KicadModTree.util.profiler import Profiler
+    >>> profiler = Profiler()
+    >>> profiler.start()
+    >>> generateFootprints()
+    >>> profiler.stop()
+    >>> for row in profiler.getSummary():
+    ...     print(row['category'], row['name'], row['total_ms'])
+    """
+
+    def __init__(self, node_types=True, allocations=True, trace=True):
+        self.node_types = node_types
+        self.allocations = allocations and hasattr(sys, 'getallocatedblocks')
+        self.trace = trace
+
+        self.events = []
+        self._summary = {}
+        self._stack = []
+        self._open = {}
+        self._installed = []
+        self._thread = None
+        self._origin = None
+
+    def start(self):
+        r"""Install the timing wrappers"""
+        global _active
+        if _active is not None:
+            raise RuntimeError('another profiler is already running')
+
+        hooks = list(_hooks)
+        if self.node_types:
+            hooks.extend((cls, '__init__', _nodeName, 'node', None) for cls in _nodeClasses()
+                         if '__init__' in cls.__dict__)
+
+        for owner, attribute, name, category, args in hooks:
+            original = owner.__dict__.get(attribute)
+            if original is None or any(o is owner and a == attribute for o, a, _ in self._installed):
+                continue
+            setattr(owner, attribute, self._wrap(original, name, category, args))
+            self._installed.append((owner, attribute, original))
+
+        self._thread = get_ident()
+        self._origin = _now()
+        _active = self
+
+    def stop(self):
+        r"""Put the original functions back"""
+        global _active
+        if _active is not self:
+            return
+
+        for owner, attribute, original in reversed(self._installed):
+            setattr(owner, attribute, original)
+        self._installed = []
+        _active = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _wrap(self, function, name, category, args):
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*call_args, **call_kwargs):
+            if _active is not profiler or get_ident() != profiler._thread:
+                return function(*call_args, **call_kwargs)
+
+            key = (category, name(*call_args, **call_kwargs) if callable(name) else name)
+            if key in profiler._open:
+                return function(*call_args, **call_kwargs)
+
+            profiler._begin(key, args(*call_args, **call_kwargs) if args is not None else None)
+            try:
+                return function(*call_args, **call_kwargs)
+            finally:
+                profiler._end()
+
+        return wrapper
+
+    def _begin(self, key, args):
+        self._open[key] = self._open.get(key, 0) + 1
+        blocks = sys.getallocatedblocks() if self.allocations else 0
+        self._stack.append(_Frame(key, args, _now(), blocks))
+
+    def _end(self):
+        end = _now()
+        frame = self._stack.pop()
+        blocks = sys.getallocatedblocks() - frame.blocks if self.allocations else 0
+
+        duration = end - frame.start
+        if self._stack:
+            self._stack[-1].children += duration
+
+        self._open[frame.key] -= 1
+        if not self._open[frame.key]:
+            del self._open[frame.key]
+
+        summary = self._summary.get(frame.key)
+        if summary is None:
+            summary = self._summary[frame.key] = [0, 0, 0, 0, 0]
+        summary[0] += 1
+        summary[1] += duration
+        summary[2] += duration - frame.children
+        summary[3] = max(summary[3], duration)
+        summary[4] += blocks
+
+        if self.trace:
+            self.events.append((frame.key, frame.start - self._origin, duration, blocks, frame.args))
+
+    @contextlib.contextmanager
+    def phase(self, name, category='phase', **args):
+        r"""Record a block of code as phase
+
+        :param name: name of the phase
+        :param category: category of the phase
+        :param args: values which are added to the trace event
+        """
+        if get_ident() != self._thread:
+            yield
+            return
+
+        self._begin((category, name), args or None)
+        try:
+            yield
+        finally:
+            self._end()
+
+    def getSummary(self):
+        r"""Get the recorded phases, sorted by category and total time
+
+        :return: list of dicts with category, name, calls, total_ms, self_ms, max_ms and blocks (the number of memory
+                 blocks which were still allocated after the calls)
+        """
+        rows = []
+        for (category, name), (calls, total, self_time, maximum, blocks) in self._summary.items():
+            rows.append({'category': category, 'name': name, 'calls': calls,
+                         'total_ms': total / 1e6, 'self_ms': self_time / 1e6, 'max_ms': maximum / 1e6,
+                         'blocks': blocks})
+        rows.sort(key=lambda row: (row['category'], -row['total_ms']))
+        return rows
+
+    def getChromeTrace(self):
+        r"""Get the recorded calls in the Chrome trace event format"""
+        pid = os.getpid()
+        events = []
+        for (category, name), start, duration, blocks, args in self.events:
+            event_args = {'blocks': blocks}
+            if args:
+                event_args.update(args)
+            events.append({'name': str(name), 'cat': category, 'ph': 'X', 'ts': start / 1e3, 'dur': duration / 1e3,
+                           'pid': pid, 'tid': 1, 'args': event_args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def writeChromeTrace(self, filename):
+        r"""Write the recorded calls as Chrome trace event JSON
+
+        :param filename: path of the output file
+        """
+        output = json.dumps(self.getChromeTrace())
+
+        # convert to unicode if running python2
+        if sys.version_info[0] == 2:
+            output = output.decode('utf-8')
+
+        with io.open(filename, 'w', newline='\n') as f:
+            f.write(output)
+
+    def writeCsv(self, filename):
+        r"""Write the summary as CSV
+
+        :param filename: path of the output file
+        """
+        fields = ['category', 'name', 'calls', 'total_ms', 'self_ms', 'max_ms', 'blocks']
+        if sys.version_info[0] == 2:
+            # the csv module of python2 writes byte strings
+            stream = open(filename, 'wb')
+        else:
+            stream = io.open(filename, 'w', newline='')
+
+        with stream as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in self.getSummary():
+                row.update({k: round(row[k], 4) for k in ('total_ms', 'self_ms', 'max_ms')})
+                writer.writerow(row)
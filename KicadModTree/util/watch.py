@@ -0,0 +1,153 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Watch definition files and regenerate only the entries which changed
+
+Used by the ``--watch`` option of generators: the generator stays in memory with its configuration loaded, and
+every saved change of a definition file only regenerates the footprints whose entries were modified or added.
+"""
+
+from __future__ import print_function
+
+import copy
+import os
+import sys
+import time
+import traceback
+
+from KicadModTree.util.config_loader import loadYaml
+
+
+def changedEntries(old, new, shared_entries=()):
+    r"""Get the top level entries of a document which are new or different
+
+    :param old: previous version of the document (dict)
+    :param new: current version of the document (dict)
+    :param shared_entries: entries used by all other entries, if one of them changed all entries are returned
+    :return: list of entry names, in the order of the new document
+
+    :Example:
+
+    >>> from KicadModTree.util.watch import changedEntries
+    >>> changedEntries({'a': 1, 'b': 2}, {'a': 1, 'b': 3, 'c': 4})
+    ['b', 'c']
+    """
+    old = old or {}
+    entries = [name for name in new if name not in shared_entries]
+    if any(old.get(name) != new.get(name) for name in shared_entries):
+        return entries
+    return [name for name in entries if name not in old or old[name] != new[name]]
+
+
+def _fileStamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # st_mtime_ns is not available on Python 2
+    return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+
+
+class EntryWatcher(object):
+    r"""Poll files and call a function with the entries which changed since the last version
+
+    The files are loaded once when the watcher is created, this version is the base of the first comparison.
+    Files which can not be loaded (for example while an editor is still writing them) are skipped until the next
+    successful load.
+
+    :param files: paths of the watched files
+    :param callback: function called as ``callback(filepath, document, names)`` with the changed entry names
+    :param interval: time between two polls in seconds (default: 0.2)
+    :param shared_entries: entries used by all other entries (see changedEntries)
+    :param load: function which loads a file into a dict of entries (default: loadYaml)
+
+    :Example:
+
+    >>> from KicadModTree.util.watch import EntryWatcher
+    >>> def regenerate(filepath, document, names):
+    ...     for name in names:
+    ...         print("generate {}".format(name))
+    ...
+    >>> EntryWatcher(['size_definitions/qfn.yaml'], regenerate).run()
+    """
+
+    def __init__(self, files, callback, interval=0.2, shared_entries=(), load=loadYaml):
+        self.files = list(files)
+        self.callback = callback
+        self.interval = interval
+        self.shared_entries = list(shared_entries)
+        self.load = load
+
+        self._stamps = {}
+        self._documents = {}
+        for path in self.files:
+            self._stamps[path] = _fileStamp(path)
+            self._documents[path] = self._load(path)
+
+    def _load(self, path):
+        try:
+            return self.load(path)
+        except Exception as e:
+            print("could not load {}: {}".format(path, e))
+            return None
+
+    def poll(self):
+        r"""Check all files once and regenerate the changed entries
+
+        :return: number of entries passed to the callback
+        """
+        count = 0
+        for path in self.files:
+            stamp = _fileStamp(path)
+            if stamp is None or stamp == self._stamps[path]:
+                continue
+            self._stamps[path] = stamp
+
+            document = self._load(path)
+            if not isinstance(document, dict):
+                continue
+
+            names = changedEntries(self._documents[path], document, self.shared_entries)
+            removed = [name for name in (self._documents[path] or {}) if name not in document]
+            self._documents[path] = document
+            if removed:
+                print("{}: removed entries are not deleted: {}".format(path, ', '.join(str(n) for n in removed)))
+            if not names:
+                continue
+
+            start = time.time()
+            try:
+                # the callback gets its own copy, generators often modify the document
+                self.callback(path, copy.deepcopy(document), names)
+            except Exception:
+                traceback.print_exc()
+            print("{}: regenerated {} entries in {:.0f} ms".format(path, len(names), (time.time() - start) * 1000))
+            sys.stdout.flush()
+            count += len(names)
+        return count
+
+    def run(self, stop=None):
+        r"""Poll until interrupted with Ctrl+C
+
+        :param stop: optional function, polling ends as soon as it returns True
+        """
+        print("watching {} files, press Ctrl+C to stop".format(len(self.files)))
+        sys.stdout.flush()
+        try:
+            while stop is None or not stop():
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,19 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from .footprint import PadData, GraphicData, TextData, FootprintData, parseFootprint, footprintData
+from .rules import Violation, Rule, PadOneMarkerRule, CourtyardRule, SilkClearanceRule, LineWidthRule, TextSizeRule, \
+    RULES, defaultRules
+from .validator import FootprintResult, ValidationReport, validateFootprint, validateLibrary, findFootprintFiles
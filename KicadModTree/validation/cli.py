@@ -0,0 +1,71 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Command line interface of kmt-validate
+
+Check generated footprints, directories are searched for .kicad_mod files::
+
+    kmt-validate Package_SO.pretty Package_QFP.pretty --jobs 8 --report validation.json
+    kmt-validate footprints/ --rule courtyard --rule silk_clearance --clearance 0.15
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+
+from .rules import RULES, SilkClearanceRule
+from .validator import ValidationReport, validateLibrary, findFootprintFiles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check footprints against KLC style rules.')
+    parser.add_argument('paths', metavar='path', type=str, nargs='+',
+                        help='.kicad_mod files or directories containing them')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--rule', type=str, action='append', default=[], choices=sorted(RULES),
+                        help='only check this rule (can be given multiple times, default: all rules)')
+    parser.add_argument('--clearance', type=float, default=0.2,
+                        help='minimum distance between silkscreen and pads (default: 0.2)')
+    parser.add_argument('--report', type=str, default=None, help='write the results as json file')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every violation')
+    args = parser.parse_args(argv)
+
+    rules = []
+    for name in args.rule or sorted(RULES):
+        rules.append(SilkClearanceRule(args.clearance) if RULES[name] is SilkClearanceRule else RULES[name]())
+
+    report = ValidationReport(rules)
+    start = time.time()
+    for result in validateLibrary(findFootprintFiles(args.paths), rules, args.jobs):
+        report.add(result)
+        if result.error is not None:
+            print("[ ERROR] {}: {}".format(result.path, result.error))
+        elif args.verbose:
+            for violation in result.violations:
+                print("[{:>6}] {:<50} {}".format(violation.rule, result.name, violation.message))
+
+    print(report.formatSummary())
+    print("{:.1f} s".format(time.time() - start))
+    if args.report:
+        report.writeJson(args.report)
+
+    return 0 if report.success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Flat description of a footprint, as it is checked by the validation rules
+
+Files and footprint trees are both turned into a FootprintData: trees are serialized with the KicadFileHandler first,
+so the rules check exactly what would be written to the file. All coordinates are footprint coordinates, arcs and
+circles are replaced by line segments.
+"""
+
+from __future__ import division
+
+import math
+
+from KicadModTree.util.kicad_util import parseLispString
+from KicadModTree.geometry.tessellation import tessellateArc, tessellateCircle
+
+# maximum distance between tessellated arcs and circles and the real ones (mm)
+ARC_TOLERANCE = 0.005
+
+
+class PadData(object):
+    r"""A pad of a footprint
+
+    :param number: pad number (a string, empty for mechanical pads)
+    :param type: 'smd', 'thru_hole', 'np_thru_hole' or 'connect'
+    :param shape: 'rect', 'circle', 'oval', 'roundrect', 'trapezoid' or 'custom'
+    :param x: x position
+    :param y: y position
+    :param rotation: rotation in degree, counterclockwise like in KiCad
+    :param width: size in x direction, before rotation
+    :param height: size in y direction, before rotation
+    :param layers: list of layer names
+    :param radius_ratio: corner radius of roundrect pads, relative to the smaller side
+    """
+
+    def __init__(self, number, type, shape, x, y, rotation, width, height, layers, radius_ratio=0):
+        self.number = number
+        self.type = type
+        self.shape = shape
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self.width = width
+        self.height = height
+        self.layers = layers
+        self.radius_ratio = radius_ratio
+
+    def shapeCore(self):
+        r"""Get the pad as rounded rectangle: (half width, half height, radius) of the pad, without rotation
+
+        Every supported shape is a rectangle whose border is inflated by a radius: rectangles have radius 0, circles
+        are a point, ovals a line.
+        """
+        half_width, half_height = self.width / 2, self.height / 2
+        if self.shape == 'circle':
+            return 0, 0, half_width
+        if self.shape == 'oval':
+            radius = min(half_width, half_height)
+            return half_width - radius, half_height - radius, radius
+        if self.shape == 'roundrect':
+            radius = min(self.width, self.height) * self.radius_ratio
+            return half_width - radius, half_height - radius, radius
+        return half_width, half_height, 0
+
+    def toLocal(self, x, y):
+        r"""Get footprint coordinates relative to the center of the pad, without the rotation of the pad"""
+        dx, dy = x - self.x, y - self.y
+        if not self.rotation:
+            return dx, dy
+        angle = math.radians(self.rotation)
+        cos, sin = math.cos(angle), math.sin(angle)
+        return dx * cos - dy * sin, dx * sin + dy * cos
+
+    def boundingBox(self):
+        r"""Get (x_min, x_max, y_min, y_max) of the pad"""
+        if self.rotation % 180 == 0 or self.shape == 'circle':
+            half_width, half_height = self.width / 2, self.height / 2
+        elif self.rotation % 90 == 0:
+            half_width, half_height = self.height / 2, self.width / 2
+        else:
+            angle = math.radians(self.rotation)
+            cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+            half_width = (self.width * cos + self.height * sin) / 2
+            half_height = (self.width * sin + self.height * cos) / 2
+        return self.x - half_width, self.x + half_width, self.y - half_height, self.y + half_height
+
+    def isOnSide(self, side):
+        r"""Check if the pad has copper or solder mask on a side ('F' or 'B')"""
+        return any(layer.split('.')[0] in (side, '*') and layer.endswith(('.Cu', '.Mask')) for layer in self.layers)
+
+    def __repr__(self):
+        return "PadData({}, {} {}, at {:g} {:g})".format(self.number, self.type, self.shape, self.x, self.y)
+
+
+class GraphicData(object):
+    r"""A line, arc, circle or polygon of a footprint
+
+    :param kind: 'fp_line', 'fp_arc', 'fp_circle' or 'fp_poly'
+    :param layer: layer name
+    :param width: line width
+    :param segments: list of (x0, y0, x1, y1) line segments
+    """
+
+    def __init__(self, kind, layer, width, segments):
+        self.kind = kind
+        self.layer = layer
+        self.width = width
+        self.segments = segments
+
+    def boundingBox(self):
+        r"""Get (x_min, x_max, y_min, y_max) of the segments, without the line width"""
+        xs = [v for s in self.segments for v in (s[0], s[2])]
+        ys = [v for s in self.segments for v in (s[1], s[3])]
+        return min(xs), max(xs), min(ys), max(ys)
+
+    def __repr__(self):
+        return "GraphicData({} {}, {} segments)".format(self.kind, self.layer, len(self.segments))
+
+
+class TextData(object):
+    r"""A text of a footprint
+
+    :param type: 'reference', 'value' or 'user'
+    :param text: the text
+    :param x: x position
+    :param y: y position
+    :param layer: layer name
+    :param width: character width
+    :param height: character height
+    :param thickness: line thickness
+    """
+
+    def __init__(self, type, text, x, y, layer, width, height, thickness):
+        self.type = type
+        self.text = text
+        self.x = x
+        self.y = y
+        self.layer = layer
+        self.width = width
+        self.height = height
+        self.thickness = thickness
+
+    def __repr__(self):
+        return "TextData({} {})".format(self.type, self.text)
+
+
+class FootprintData(object):
+    r"""Pads, graphic items and texts of a footprint
+
+    :param name: name of the footprint
+    :param attributes: list of the module attributes, like ['smd']
+    :param pads: list of PadData
+    :param graphics: list of GraphicData
+    :param texts: list of TextData
+    """
+
+    def __init__(self, name, attributes=None, pads=None, graphics=None, texts=None):
+        self.name = name
+        self.attributes = attributes or []
+        self.pads = pads or []
+        self.graphics = graphics or []
+        self.texts = texts or []
+
+    def graphicsOnLayer(self, *layers):
+        r"""Get the graphic items of some layers"""
+        return [g for g in self.graphics if g.layer in layers]
+
+    def __repr__(self):
+        return "FootprintData({}, {} pads, {} graphics, {} texts)".format(
+            self.name, len(self.pads), len(self.graphics), len(self.texts))
+
+
+def _items(sexpr):
+    # attributes of an item, by name. The first one wins
+    items = {}
+    for item in sexpr:
+        if isinstance(item, list) and item and item[0] not in items:
+            items[item[0]] = item
+    return items
+
+
+def _point(item):
+    return float(item[1]), float(item[2])
+
+
+def _pathSegments(points, closed):
+    segments = [(points[i][0], points[i][1], points[i + 1][0], points[i + 1][1]) for i in range(len(points) - 1)]
+    if closed and len(points) > 2:
+        segments.append((points[-1][0], points[-1][1], points[0][0], points[0][1]))
+    return segments
+
+
+def _parseGraphic(sexpr):
+    items = _items(sexpr)
+    kind = sexpr[0]
+    width = float(items['width'][1]) if 'width' in items else 0
+
+    if kind == 'fp_line':
+        start, end = _point(items['start']), _point(items['end'])
+        segments = [start + end]
+    elif kind == 'fp_circle':
+        center, end = _point(items['center']), _point(items['end'])
+        radius = math.hypot(end[0] - center[0], end[1] - center[1])
+        segments = _pathSegments(tessellateCircle(center, radius, ARC_TOLERANCE), True)
+    elif kind == 'fp_arc':
+        center, start = _point(items['start']), _point(items['end'])
+        radius = math.hypot(start[0] - center[0], start[1] - center[1])
+        start_angle = math.degrees(math.atan2(start[1] - center[1], start[0] - center[0]))
+        points = tessellateArc(center, radius, start_angle, float(items['angle'][1]), ARC_TOLERANCE)
+        segments = _pathSegments(points, False)
+    else:
+        points = [_point(p) for p in items['pts'][1:] if isinstance(p, list) and p[0] == 'xy']
+        segments = _pathSegments(points, True)
+
+    return GraphicData(kind, items['layer'][1], width, segments)
+
+
+def _parsePad(sexpr):
+    items = _items(sexpr[4:])
+    at = items['at']
+    size = items['size']
+    return PadData(sexpr[1], sexpr[2], sexpr[3], float(at[1]), float(at[2]), float(at[3]) if len(at) > 3 else 0,
+                   float(size[1]), float(size[2]), items['layers'][1:] if 'layers' in items else [],
+                   float(items['roundrect_rratio'][1]) if 'roundrect_rratio' in items else 0)
+
+
+def _parseText(sexpr):
+    items = _items(sexpr[3:])
+    font = _items(items['effects'][1:]).get('font', [])
+    font = _items(font[1:])
+    size = font.get('size', ['size', 0, 0])
+    thickness = font.get('thickness', ['thickness', 0])
+    x, y = _point(items['at'])
+    return TextData(sexpr[1], sexpr[2], x, y, items['layer'][1], float(size[2]), float(size[1]), float(thickness[1]))
+
+
+def parseFootprint(text):
+    r"""Get the FootprintData of a .kicad_mod file
+
+    :param text: content of the file
+    :raises ValueError: if the text is not a footprint
+    """
+    try:
+        module = parseLispString(text)
+    except RuntimeError as e:
+        raise ValueError(str(e))
+    if not module or module[0] != 'module':
+        raise ValueError("not a .kicad_mod file")
+
+    footprint = FootprintData(module[1])
+    for item in module[2:]:
+        if not isinstance(item, list) or not item:
+            continue
+        try:
+            if item[0] == 'pad':
+                footprint.pads.append(_parsePad(item))
+            elif item[0] in ('fp_line', 'fp_arc', 'fp_circle', 'fp_poly'):
+                footprint.graphics.append(_parseGraphic(item))
+            elif item[0] == 'fp_text':
+                footprint.texts.append(_parseText(item))
+            elif item[0] == 'attr':
+                footprint.attributes.extend(item[1:])
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError("invalid {} in {}: {}".format(item[0], footprint.name, e))
+    return footprint
+
+
+def footprintData(footprint):
+    r"""Get the FootprintData of a footprint tree, like it would be written by the KicadFileHandler"""
+    from KicadModTree.KicadFileHandler import KicadFileHandler
+
+    return parseFootprint(KicadFileHandler(footprint).serialize(timestamp=0))
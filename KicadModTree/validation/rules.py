@@ -0,0 +1,399 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Rules checked by the validator
+
+A rule is an object with a unique ``name`` and a ``check(footprint)`` method, which gets a FootprintData and returns
+(or yields) Violations. Rules are sent to the worker processes of the validator, so they have to be picklable: a
+class defined at module level whose attributes are plain values. Subclass Rule to add own checks:
+
+.. code-block:: python
+
+    class DescriptionRule(Rule):
+        name = 'description'
+        description = 'footprints need a description'
+
+        def check(self, footprint):
+            if not footprint.attributes:
+                yield Violation(self.name, 'no attributes')
+"""
+
+from __future__ import division
+
+import math
+from bisect import bisect_right
+
+from KicadModTree.KicadFileHandler import DEFAULT_LAYER_WIDTH
+from KicadModTree.geometry.spatial_index import SpatialIndex
+
+# differences smaller than this are rounding errors of the file format (mm)
+TOLERANCE = 0.001
+
+
+class Violation(object):
+    r"""A rule which is not fulfilled by a footprint
+
+    :param rule: name of the rule
+    :param message: description of the problem
+    :param position: (x, y) where the problem is, or None
+    """
+
+    def __init__(self, rule, message, position=None):
+        self.rule = rule
+        self.message = message
+        self.position = position
+
+    def asDict(self):
+        return {'rule': self.rule, 'message': self.message,
+                'position': [round(v, 4) for v in self.position] if self.position is not None else None}
+
+    def __eq__(self, other):
+        return isinstance(other, Violation) and self.asDict() == other.asDict()
+
+    def __repr__(self):
+        return "Violation({}: {})".format(self.rule, self.message)
+
+
+class Rule(object):
+    r"""Base class of the rules"""
+
+    name = None
+    description = None
+
+    def check(self, footprint):
+        r"""Check a footprint
+
+        :param footprint: FootprintData
+        :return: iterable of Violation
+        """
+        raise NotImplementedError()
+
+
+def _pointSegmentDistance(px, py, x0, y0, x1, y1):
+    dx, dy = x1 - x0, y1 - y0
+    length = dx * dx + dy * dy
+    t = 0 if length == 0 else max(0, min(1, ((px - x0) * dx + (py - y0) * dy) / length))
+    return math.hypot(px - x0 - t * dx, py - y0 - t * dy)
+
+
+def _pointBoxDistance(px, py, half_width, half_height):
+    return math.hypot(max(abs(px) - half_width, 0), max(abs(py) - half_height, 0))
+
+
+def _segmentHitsBox(x0, y0, x1, y1, half_width, half_height):
+    # Liang-Barsky clipping of the segment at the box around the origin
+    t0, t1 = 0, 1
+    dx, dy = x1 - x0, y1 - y0
+    for p, q in ((-dx, x0 + half_width), (dx, half_width - x0), (-dy, y0 + half_height), (dy, half_height - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return False
+    return True
+
+
+def padDistance(pad, segment):
+    r"""Get the distance between the border of a pad and a line segment, 0 if they overlap
+
+    Trapezoid and custom pads are handled as rectangles of their size.
+
+    :param pad: PadData
+    :param segment: (x0, y0, x1, y1)
+    """
+    half_width, half_height, radius = pad.shapeCore()
+    x0, y0 = pad.toLocal(segment[0], segment[1])
+    x1, y1 = pad.toLocal(segment[2], segment[3])
+
+    if _segmentHitsBox(x0, y0, x1, y1, half_width, half_height):
+        return 0
+
+    distance = min(_pointBoxDistance(x0, y0, half_width, half_height),
+                   _pointBoxDistance(x1, y1, half_width, half_height))
+    for cx in (-half_width, half_width):
+        for cy in (-half_height, half_height):
+            distance = min(distance, _pointSegmentDistance(cx, cy, x0, y0, x1, y1))
+    return max(0, distance - radius)
+
+
+def _padOutline(pad):
+    # points on the border of the pad, in footprint coordinates
+    half_width, half_height, radius = pad.shapeCore()
+    directions = [(math.cos(a * math.pi / 4), math.sin(a * math.pi / 4)) for a in range(8)] if radius else [(0, 0)]
+
+    angle = math.radians(pad.rotation)
+    cos, sin = math.cos(angle), math.sin(angle)
+    points = []
+    for cx in (-half_width, half_width) if half_width else (0,):
+        for cy in (-half_height, half_height) if half_height else (0,):
+            for dx, dy in directions:
+                # only the directions pointing away from the core
+                if dx * cx < 0 or dy * cy < 0:
+                    continue
+                x, y = cx + radius * dx, cy + radius * dy
+                points.append((pad.x + x * cos + y * sin, pad.y - x * sin + y * cos))
+    return points
+
+
+class _OutlineIndex(object):
+    # segments of an outline sorted into horizontal bands. A ray in +x direction from a point only crosses
+    # segments of the band containing the point
+
+    def __init__(self, segments):
+        y_min = min(min(s[1], s[3]) for s in segments)
+        y_max = max(max(s[1], s[3]) for s in segments)
+        band_count = max(1, min(len(segments) // 2, 1024))
+        height = (y_max - y_min) / band_count or 1.
+
+        self.bounds = [y_min + height * (i + 1) for i in range(band_count - 1)]
+        self.bands = [[] for i in range(band_count)]
+        for s in segments:
+            first = bisect_right(self.bounds, min(s[1], s[3]))
+            last = bisect_right(self.bounds, max(s[1], s[3]))
+            for band in range(first, last + 1):
+                self.bands[band].append(s)
+
+    def contains(self, x, y):
+        # even-odd rule, because the direction of the segments is arbitrary. Points on the outline are inside
+        crossings = 0
+        for x0, y0, x1, y1 in self.bands[bisect_right(self.bounds, y)]:
+            if (min(x0, x1) - TOLERANCE <= x <= max(x0, x1) + TOLERANCE and
+                    min(y0, y1) - TOLERANCE <= y <= max(y0, y1) + TOLERANCE and
+                    _pointSegmentDistance(x, y, x0, y0, x1, y1) <= TOLERANCE):
+                return True
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                crossings += 1
+        return crossings % 2 == 1
+
+
+def _padIndex(pads):
+    index = SpatialIndex()
+    for pad in pads:
+        index.insert(pad, pad.boundingBox())
+    return index
+
+
+def _expand(bounding_box, distance):
+    x_min, x_max, y_min, y_max = bounding_box
+    return x_min - distance, x_max + distance, y_min - distance, y_max + distance
+
+
+def _segmentBox(segment):
+    return (min(segment[0], segment[2]), max(segment[0], segment[2]),
+            min(segment[1], segment[3]), max(segment[1], segment[3]))
+
+
+def _format(value):
+    return '{:g}'.format(round(value, 4))
+
+
+class PadOneMarkerRule(Rule):
+    r"""Footprints with three or more pads need a pin 1 marker on the silkscreen
+
+    A marker is the end of a silkscreen line (or a point of an arc or circle) close to pad 1, which is closer to pad 1
+    than to any other pad. Outlines which are symmetric to pad 1 and the other corner pads are no marker.
+
+    :param max_distance: maximum distance between the marker and pad 1 (default: 2.0)
+    :param min_pads: only footprints with at least this number of numbered pads are checked (default: 3)
+    """
+
+    name = 'pad1_marker'
+    description = 'pin 1 is marked on the silkscreen'
+
+    def __init__(self, max_distance=2.0, min_pads=3):
+        self.max_distance = max_distance
+        self.min_pads = min_pads
+
+    def check(self, footprint):
+        pads = [pad for pad in footprint.pads if pad.number and pad.type != 'np_thru_hole']
+        first = [pad for pad in pads if pad.number == '1']
+        if len(pads) < self.min_pads or not first:
+            return []
+
+        index = _padIndex(pads)
+        for graphic in footprint.graphicsOnLayer('F.SilkS', 'B.SilkS'):
+            for segment in graphic.segments:
+                for x, y in ((segment[0], segment[1]), (segment[2], segment[3])):
+                    point = (x, y, x, y)
+                    distance = min(padDistance(pad, point) for pad in first)
+                    if distance > self.max_distance:
+                        continue
+                    near = index.query(*_expand(point, distance + TOLERANCE))
+                    if all(padDistance(pad, point) > distance + TOLERANCE for pad in near if pad.number != '1'):
+                        return []
+
+        return [Violation(self.name, 'no silkscreen marker next to pad 1', (first[0].x, first[0].y))]
+
+
+class CourtyardRule(Rule):
+    r"""All pads are inside the courtyard of their side
+
+    Pads of both sides (like through hole pads) belong to the front side. Pads which are only on the back side (like
+    thermal vias) belong to the back courtyard if there is one, otherwise to the front courtyard.
+    """
+
+    name = 'courtyard'
+    description = 'the courtyard encloses all pads'
+
+    def check(self, footprint):
+        if 'virtual' in footprint.attributes:
+            return []
+
+        back = [s for g in footprint.graphicsOnLayer('B.CrtYd') for s in g.segments]
+        violations = []
+        for side in ('F', 'B'):
+            if side == 'F':
+                pads = [pad for pad in footprint.pads if pad.isOnSide('F') or (pad.isOnSide('B') and not back)]
+            else:
+                pads = [pad for pad in footprint.pads if pad.isOnSide('B') and not pad.isOnSide('F')]
+            if not pads or (side == 'B' and not back):
+                continue
+
+            layer = '{}.CrtYd'.format(side)
+            segments = back if side == 'B' else [s for g in footprint.graphicsOnLayer(layer) for s in g.segments]
+            if not segments:
+                violations.append(Violation(self.name, 'no courtyard on {}'.format(layer)))
+                continue
+
+            courtyard = _OutlineIndex(segments)
+            index = SpatialIndex()
+            for segment in segments:
+                index.insert(segment, _segmentBox(segment))
+
+            for pad in pads:
+                if index.query(*pad.boundingBox()):
+                    outside = [p for p in _padOutline(pad) if not courtyard.contains(*p)]
+                else:
+                    # the courtyard does not cross the pad, so the whole pad is on the same side as its center
+                    outside = [] if courtyard.contains(pad.x, pad.y) else [(pad.x, pad.y)]
+                if outside:
+                    violations.append(Violation(self.name, 'pad {} is outside of the courtyard on {}'.format(
+                        pad.number or '""', layer), outside[0]))
+        return violations
+
+
+class SilkClearanceRule(Rule):
+    r"""Silkscreen keeps a minimum distance to the copper and solder mask pads of its side
+
+    The distance is measured between the edge of the silkscreen line and the pad.
+
+    :param clearance: minimum distance (default: 0.2)
+    """
+
+    name = 'silk_clearance'
+    description = 'silkscreen keeps a clearance to the pads'
+
+    def __init__(self, clearance=0.2):
+        self.clearance = clearance
+
+    def check(self, footprint):
+        violations = []
+        for side in ('F', 'B'):
+            graphics = footprint.graphicsOnLayer('{}.SilkS'.format(side))
+            if not graphics:
+                continue
+            index = _padIndex([pad for pad in footprint.pads if pad.isOnSide(side)])
+
+            for graphic in graphics:
+                closest = None
+                for segment in graphic.segments:
+                    reach = self.clearance + graphic.width / 2
+                    for pad in index.query(*_expand(_segmentBox(segment), reach)):
+                        distance = padDistance(pad, segment) - graphic.width / 2
+                        if distance < self.clearance - TOLERANCE and (closest is None or distance < closest[0]):
+                            closest = (distance, pad, segment)
+                if closest is not None:
+                    distance, pad, segment = closest
+                    violations.append(Violation(self.name, '{} on {} is {} mm from pad {} (minimum {})'.format(
+                        graphic.kind, graphic.layer, _format(max(distance, 0)), pad.number or '""',
+                        _format(self.clearance)), (segment[0], segment[1])))
+        return violations
+
+
+class LineWidthRule(Rule):
+    r"""Lines have the default width of their layer
+
+    Filled polygons (width 0) are not checked.
+
+    :param widths: dict from layer to width (default: DEFAULT_LAYER_WIDTH of the KicadFileHandler)
+    """
+
+    name = 'line_width'
+    description = 'lines have the width of their layer'
+
+    def __init__(self, widths=None):
+        self.widths = dict(widths if widths is not None else DEFAULT_LAYER_WIDTH)
+
+    def check(self, footprint):
+        violations = []
+        for graphic in footprint.graphics:
+            expected = self.widths.get(graphic.layer)
+            if expected is None or (graphic.kind == 'fp_poly' and graphic.width == 0):
+                continue
+            if abs(graphic.width - expected) > TOLERANCE:
+                segment = graphic.segments[0]
+                violations.append(Violation(self.name, '{} on {} has width {} instead of {}'.format(
+                    graphic.kind, graphic.layer, _format(graphic.width), _format(expected)),
+                    (segment[0], segment[1])))
+        return violations
+
+
+class TextSizeRule(Rule):
+    r"""Texts have a readable size and a line thickness proportional to it
+
+    :param min_size: minimum width and height of the characters (default: 0.25)
+    :param max_size: maximum width and height of the characters (default: 2.0)
+    :param min_ratio: minimum thickness relative to the height (default: 0.1)
+    :param max_ratio: maximum thickness relative to the height (default: 0.2)
+    """
+
+    name = 'text_size'
+    description = 'texts have a readable size and thickness'
+
+    def __init__(self, min_size=0.25, max_size=2.0, min_ratio=0.1, max_ratio=0.2):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+
+    def check(self, footprint):
+        violations = []
+        for text in footprint.texts:
+            name = '{} text {}'.format(text.type, text.text)
+            if not all(self.min_size - TOLERANCE <= size <= self.max_size + TOLERANCE
+                       for size in (text.width, text.height)):
+                violations.append(Violation(self.name, '{} has size {} x {} (allowed {} to {})'.format(
+                    name, _format(text.width), _format(text.height), _format(self.min_size),
+                    _format(self.max_size)), (text.x, text.y)))
+            elif not (self.min_ratio * text.height - TOLERANCE <= text.thickness <=
+                      self.max_ratio * text.height + TOLERANCE):
+                violations.append(Violation(self.name, '{} has thickness {} for size {}'.format(
+                    name, _format(text.thickness), _format(text.height)), (text.x, text.y)))
+        return violations
+
+
+# rules which are checked if no other rules are given, by name
+RULES = {rule.name: rule for rule in [PadOneMarkerRule, CourtyardRule, SilkClearanceRule, LineWidthRule, TextSizeRule]}
+
+
+def defaultRules():
+    r"""Get an instance of every built-in rule, with the default settings"""
+    return [RULES[name]() for name in sorted(RULES)]
@@ -0,0 +1,233 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+r"""Check footprints against the validation rules in parallel
+
+Footprints are streamed through a process pool in chunks: files are read and parsed by the workers, and only a
+bounded number of chunks is pending at any time, so libraries of any size are checked with constant memory. The
+results are returned in the order of the input.
+
+:Example:
+
+>>> from KicadModTree.validation import *
+>>> report = ValidationReport()
+>>> for result in validateLibrary(findFootprintFiles(['Package_SO.pretty']), jobs=8):
+...     report.add(result)
+>>> report.writeJson('validation.json')
+"""
+
+import collections
+import io
+import json
+import multiprocessing
+import os
+import sys
+
+from KicadModTree.nodes.Node import Node
+from .footprint import FootprintData, parseFootprint, footprintData
+from .rules import defaultRules
+
+FORMAT_VERSION = 1
+
+# rules of the worker process
+_worker_rules = None
+
+
+class FootprintResult(object):
+    r"""Violations of a single footprint
+
+    :param path: file of the footprint, None for footprint trees
+    :param name: name of the footprint
+    :param violations: list of Violation
+    :param error: description of the problem if the footprint could not be checked
+    """
+
+    def __init__(self, path, name, violations, error=None):
+        self.path = path
+        self.name = name
+        self.violations = violations
+        self.error = error
+
+    @property
+    def success(self):
+        return not self.violations and self.error is None
+
+    def asDict(self):
+        return {'path': self.path, 'name': self.name, 'error': self.error,
+                'violations': [v.asDict() for v in self.violations]}
+
+
+def validateFootprint(footprint, rules=None):
+    r"""Check a single footprint
+
+    :param footprint: FootprintData, footprint tree or content of a .kicad_mod file
+    :param rules: list of rules (default: all built-in rules)
+    :return: list of Violation
+    """
+    if isinstance(footprint, Node):
+        footprint = footprintData(footprint)
+    elif not isinstance(footprint, FootprintData):
+        footprint = parseFootprint(footprint)
+
+    violations = []
+    for rule in rules if rules is not None else defaultRules():
+        violations.extend(rule.check(footprint))
+    return violations
+
+
+def _validateItem(item, rules):
+    path, text = item
+    name = None
+    try:
+        if text is None:
+            with io.open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        footprint = parseFootprint(text)
+        name = footprint.name
+        return FootprintResult(path, name, validateFootprint(footprint, rules))
+    except (IOError, OSError, ValueError) as e:
+        return FootprintResult(path, name, [], str(e))
+
+
+def _initWorker(rules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _validateChunk(chunk):
+    return [_validateItem(item, _worker_rules) for item in chunk]
+
+
+def findFootprintFiles(paths):
+    r"""Get the .kicad_mod files of files and directories, directories are searched recursively
+
+    :param paths: list of files and directories
+    :return: generator of paths, sorted per directory
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.kicad_mod'):
+                    yield os.path.join(root, name)
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        if isinstance(item, Node):
+            # trees are serialized here, only text is sent to the workers
+            from KicadModTree.KicadFileHandler import KicadFileHandler
+            chunk.append((None, KicadFileHandler(item).serialize(timestamp=0)))
+        else:
+            chunk.append((item, None))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validateLibrary(items, rules=None, jobs=None, chunk_size=32):
+    r"""Check many footprints in parallel
+
+    :param items: iterable of .kicad_mod file paths or footprint trees, consumed while the results are produced
+    :param rules: list of rules (default: all built-in rules)
+    :param jobs: number of worker processes (default: number of CPUs), 1 checks in this process
+    :param chunk_size: number of footprints sent to a worker at once
+    :return: generator of FootprintResult, in the order of the items
+    """
+    rules = rules if rules is not None else defaultRules()
+    jobs = jobs or multiprocessing.cpu_count()
+
+    if jobs <= 1:
+        for chunk in _chunks(items, chunk_size):
+            for item in chunk:
+                yield _validateItem(item, rules)
+        return
+
+    pool = multiprocessing.Pool(jobs, initializer=_initWorker, initargs=(rules,))
+    try:
+        pending = collections.deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.apply_async(_validateChunk, (chunk,)))
+            while len(pending) > 2 * jobs or (pending and pending[0].ready()):
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+    finally:
+        # all results are collected, or the caller stopped early
+        pool.terminate()
+        pool.join()
+
+
+class ValidationReport(object):
+    r"""Summary of the results of a validation
+
+    Only footprints with violations or errors are kept, all others are counted.
+
+    :param rules: list of the checked rules
+    """
+
+    def __init__(self, rules=None):
+        self.rules = [rule.name for rule in (rules if rules is not None else defaultRules())]
+        self.checked = 0
+        self.results = []
+        self.counts = collections.Counter()
+
+    def add(self, result):
+        r"""Add a FootprintResult"""
+        self.checked += 1
+        if not result.success:
+            self.results.append(result)
+            self.counts.update(v.rule for v in result.violations)
+            if result.error is not None:
+                self.counts['error'] += 1
+
+    @property
+    def success(self):
+        return not self.results
+
+    def asDict(self):
+        return {'version': FORMAT_VERSION, 'rules': self.rules, 'checked': self.checked,
+                'failed': len(self.results), 'violations': dict(self.counts),
+                'footprints': [r.asDict() for r in self.results]}
+
+    def writeJson(self, filename):
+        r"""Write the report as JSON
+
+        :param filename: path of the output file
+        """
+        # the separators of Python 2 leave trailing whitespace when indenting
+        output = json.dumps(self.asDict(), indent=1, sort_keys=True, separators=(',', ': '))
+
+        # convert to unicode if running python2
+        if sys.version_info[0] == 2:
+            output = output.decode('utf-8')
+
+        with io.open(filename, 'w', newline='\n') as f:
+            f.write(output)
+
+    def formatSummary(self):
+        r"""Get a human readable summary of the report"""
+        lines = ["{} footprints checked, {} with violations".format(self.checked, len(self.results))]
+        for rule, count in sorted(self.counts.items()):
+            lines.append("  {:<20} {:>8}".format(rule, count))
+        return '\n'.join(lines)
@@ -38,6 +38,12 @@ unit_tests() {
     python "$KICADMODTREE_DIR/tests/test.py"
 }
 
+benchmarks() {
+    echo ''
+    echo '[!] Running benchmarks'
+    python -m KicadModTree.tests.benchmarks "${@:2}"
+}
+
 py_test_coverage() {
     echo '[!] Running python test coverage'
     PYTHONPATH=`pwd` python -m nose2 -C --coverage "$KICADMODTREE_DIR" --coverage-report term-missing -s "$KICADMODTREE_DIR/tests"
@@ -64,6 +70,7 @@ Commands
     flake8_check         - flake8 validation
     unit_tests           - Run unit tests
     py_test_coverage     - Unit test coverage
+    benchmarks           - Run the benchmarks (options: see python -m KicadModTree.tests.benchmarks --help)
     tests                - Run all tests
     update_packages      - Check & update production dependency changes
     update_dev_packages  - Check & update development and production dependency changes
@@ -74,7 +81,7 @@ Commands
 #    && help "action not found" \
 #    || $ACTION
 if [ -n "$(type -t $ACTION)" ] && [ "$(type -t $ACTION)" = function ]; then
-     $ACTION
+     $ACTION "$@"
  else
      help "action not found"
 fi
@@ -65,21 +65,24 @@ if pad_size[1] == pad_size[0]:
 
 
 
-def generate_one_footprint(pins, configuration):
-    mpn = part_code.format(n=pins)
+def create_template(configuration):
+    # all pin count dependent values are expressions of the template variable
+    pins = TemplateVariable('pins')
+    mpn = TemplateCall(part_code.format, n=pins)
 
     # handle arguments
     orientation_str = configuration['orientation_options'][orientation]
-    footprint_name = configuration['fp_name_format_string'].format(man=manufacturer,
+    footprint_name = TemplateCall(configuration['fp_name_format_string'].format, man=manufacturer,
         series=series,
         mpn=mpn, num_rows=number_of_rows, pins_per_row=pins, mounting_pad = "",
         pitch=pitch, orientation=orientation_str)
 
-    kicad_mod = Footprint(footprint_name)
-    kicad_mod.setDescription("Molex {:s}, {:s}, {:d} Pins per row ({:s}), generated with kicad-footprint-generator".format(series_long, mpn, pins_per_row, datasheet))
-    kicad_mod.setTags(configuration['keyword_fp_string'].format(series=series,
-        orientation=orientation_str, man=manufacturer,
-        entry=configuration['entry_direction'][orientation]))
+    template = FootprintTemplate(footprint_name,
+        description=TemplateCall("Molex {:s}, {:s}, {:d} Pins per row ({:s}), generated with kicad-footprint-generator".format,
+            series_long, mpn, pins, datasheet),
+        tags=configuration['keyword_fp_string'].format(series=series,
+            orientation=orientation_str, man=manufacturer,
+            entry=configuration['entry_direction'][orientation]))
 
     A = (pins - 1) * pitch
     B = A + 1.8
@@ -116,18 +119,18 @@ def generate_one_footprint(pins, configuration):
     else:
         optional_pad_params['tht_pad1_shape'] = Pad.SHAPE_ROUNDRECT
 
-    kicad_mod.append(PadArray(start=[0,0], pincount=pins, x_spacing=pitch,
+    template.append(PadArray, start=[0,0], pincount=pins, x_spacing=pitch,
         type=Pad.TYPE_THT, shape=pad_shape, size=pad_size, drill=drill,
         layers=Pad.LAYERS_THT,
-        **optional_pad_params))
+        **optional_pad_params)
 
     # outline on Fab
-    kicad_mod.append(RectLine(start=[x1,y1],end=[x2,y2],
-        layer='F.Fab', width=configuration['fab_line_width']))
+    template.append(RectLine, start=[x1,y1],end=[x2,y2],
+        layer='F.Fab', width=configuration['fab_line_width'])
 
     # outline on SilkScreen
-    kicad_mod.append(RectLine(start=[x1,y1],end=[x2,y2],offset=off,
-        layer='F.SilkS', width=configuration['silk_line_width']))
+    template.append(RectLine, start=[x1,y1],end=[x2,y2],offset=off,
+        layer='F.SilkS', width=configuration['silk_line_width'])
 
     inline = [
     {'x': A/2,'y': y2 - T},
@@ -140,18 +143,18 @@ def generate_one_footprint(pins, configuration):
     {'x': A/2,'y': y1 + T},
     ]
 
-    kicad_mod.append(PolygoneLine(polygone=inline,
-        layer='F.SilkS', width=configuration['silk_line_width']))
-    kicad_mod.append(PolygoneLine(polygone=inline, x_mirror=A/2,
-        layer='F.SilkS', width=configuration['silk_line_width']))
+    template.append(PolygoneLine, polygone=inline,
+        layer='F.SilkS', width=configuration['silk_line_width'])
+    template.append(PolygoneLine, polygone=inline, x_mirror=A/2,
+        layer='F.SilkS', width=configuration['silk_line_width'])
 
     #pin-1 mark
 
     L = 1
-    kicad_mod.append(Line(start=[x1-0.4,y2+0.4], end=[x1-0.4,y2+0.4-L],
-        layer='F.SilkS', width=configuration['silk_line_width']))
-    kicad_mod.append(Line(start=[x1-0.4,y2+0.4], end=[x1-0.4+L,y2+0.4],
-        layer='F.SilkS', width=configuration['silk_line_width']))
+    template.append(Line, start=[x1-0.4,y2+0.4], end=[x1-0.4,y2+0.4-L],
+        layer='F.SilkS', width=configuration['silk_line_width'])
+    template.append(Line, start=[x1-0.4,y2+0.4], end=[x1-0.4+L,y2+0.4],
+        layer='F.SilkS', width=configuration['silk_line_width'])
 
     sl=1
     pin = [
@@ -159,8 +162,8 @@ def generate_one_footprint(pins, configuration):
         {'y': body_edge['bottom'] - sl/sqrt(2), 'x': 0},
         {'y': body_edge['bottom'], 'x': sl/2}
     ]
-    kicad_mod.append(PolygoneLine(polygone=pin,
-        width=configuration['fab_line_width'], layer='F.Fab'))
+    template.append(PolygoneLine, polygone=pin,
+        width=configuration['fab_line_width'], layer='F.Fab')
 
     ########################### CrtYd #################################
     cx1 = roundToBase(bounding_box['left']-configuration['courtyard_offset']['connector'], configuration['courtyard_grid'])
@@ -169,12 +172,12 @@ def generate_one_footprint(pins, configuration):
     cx2 = roundToBase(bounding_box['right']+configuration['courtyard_offset']['connector'], configuration['courtyard_grid'])
     cy2 = roundToBase(bounding_box['bottom'] + configuration['courtyard_offset']['connector'], configuration['courtyard_grid'])
 
-    kicad_mod.append(RectLine(
+    template.append(RectLine,
         start=[cx1, cy1], end=[cx2, cy2],
-        layer='F.CrtYd', width=configuration['courtyard_line_width']))
+        layer='F.CrtYd', width=configuration['courtyard_line_width'])
 
     ######################### Text Fields ###############################
-    addTextFields(kicad_mod=kicad_mod, configuration=configuration, body_edges=body_edge,
+    template.append(addTextFields, kicad_mod=TEMPLATE_TARGET, configuration=configuration, body_edges=body_edge,
         courtyard={'top':cy1, 'bottom':cy2},
         fp_name=footprint_name, text_y_inside_position='top')
 
@@ -182,17 +185,24 @@ def generate_one_footprint(pins, configuration):
     model3d_path_prefix = configuration.get('3d_model_prefix','${KISYS3DMOD}/')
 
     lib_name = configuration['lib_name_format_string'].format(series=series, man=manufacturer)
-    model_name = '{model3d_path_prefix:s}{lib_name:s}.3dshapes/{fp_name:s}.wrl'.format(
+    model_name = TemplateCall('{model3d_path_prefix:s}{lib_name:s}.3dshapes/{fp_name:s}.wrl'.format,
         model3d_path_prefix=model3d_path_prefix, lib_name=lib_name, fp_name=footprint_name)
-    kicad_mod.append(Model(filename=model_name))
+    template.append(Model, filename=model_name)
+
+    return template, footprint_name, lib_name
+
+def generate_footprints(pins_per_row_range, configuration):
+    template, footprint_name, lib_name = create_template(configuration)
 
     output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
     if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
         os.makedirs(output_dir)
-    filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=footprint_name)
 
-    file_handler = KicadFileHandler(kicad_mod)
-    file_handler.writeFile(filename)
+    for pins in pins_per_row_range:
+        values = {'pins': pins}
+        filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir,
+            fp_name=evaluateTemplateValue(footprint_name, values))
+        template.writeFile(filename, values)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='use confing .yaml files to create footprints.')
@@ -215,5 +225,4 @@ if __name__ == "__main__":
 
     configuration['kicad4_compatible'] = args.kicad4_compatible
 
-    for pins_per_row in pins_per_row_range:
-        generate_one_footprint(pins_per_row, configuration)
+    generate_footprints(pins_per_row_range, configuration)
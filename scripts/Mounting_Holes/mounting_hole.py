@@ -10,6 +10,8 @@ sys.path.append(os.path.join(sys.path[0], "..", ".."))  # load parent path of Ki
 
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
+from KicadModTree.util.config_loader import loadYaml
+from KicadModTree.util.watch import EntryWatcher
 
 
 # https://stackoverflow.com/questions/4265546/python-round-to-nearest-05
@@ -149,15 +151,19 @@ def create_footprint(name, **kwargs):
     file_handler.writeFile('{name}.kicad_mod'.format(name=name))
 
 
+def execute_yml_entries(filepath, yaml_parsed, names=None):
+    for footprint in yaml_parsed:
+        if names is None or footprint in names:
+            print("generate {name}.kicad_mod".format(name=footprint))
+            create_footprint(footprint, **yaml_parsed.get(footprint))
+
+
 def parse_and_execute_yml_file(filepath):
-    with open(filepath, 'r') as stream:
-        try:
-            yaml_parsed = yaml.safe_load(stream)
-            for footprint in yaml_parsed:
-                print("generate {name}.kicad_mod".format(name=footprint))
-                create_footprint(footprint, **yaml_parsed.get(footprint))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        yaml_parsed = loadYaml(filepath)
+        execute_yml_entries(filepath, yaml_parsed)
+    except yaml.YAMLError as exc:
+        print(exc)
 
 
 if __name__ == "__main__":
@@ -165,7 +171,11 @@ if __name__ == "__main__":
     parser.add_argument('files', metavar='file', type=str, nargs='+',
                         help='yml-files to parse')
     #parser.add_argument('-v', '--verbose', help='show more information when creating footprint', action='store_true')
+    parser.add_argument('--watch', action='store_true', help='watch the files and regenerate the footprints of changed entries')
     # TODO: allow writing into sub file
     args = parser.parse_args()
     for filepath in args.files:
         parse_and_execute_yml_file(filepath)
+
+    if args.watch:
+        EntryWatcher(args.files, execute_yml_entries).run()
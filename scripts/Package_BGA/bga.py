@@ -11,11 +11,11 @@ sys.path.append(os.path.join(sys.path[0], "..", ".."))
 
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
+from KicadModTree.util.config_loader import loadYaml
+from KicadModTree.util.watch import EntryWatcher
 sys.path.append(os.path.join(sys.path[0], "..", "tools"))  # load parent path of tools
 
 from KicadModTree import *
-import itertools
-from string import ascii_uppercase
 
 def generateFootprint(config, fp_params, fp_id):
     print('Building footprint for parameter set: {}'.format(fp_id))
@@ -153,28 +153,13 @@ def generateFootprint(config, fp_params, fp_id):
                           layer="F.SilkS", width=wSilkS))
 
     # Pads
-    balls = layoutX * layoutY
-    if rowSkips == []:
-        for _ in range(layoutY):
-            rowSkips.append([])
-    for rowNum, row in zip(range(layoutY), rowNames):
-        rowSet = set(range(1, layoutX + 1))
-        for item in rowSkips[rowNum]:
-            try:
-                # If item is a range, remove that range
-                rowSet -= set(range(*item))
-                balls -= item[1] - item[0]
-            except TypeError:
-                # If item is an int, remove that int
-                rowSet -= {item}
-                balls -= 1
-        for col in rowSet:
-            f.append(Pad(number="{}{}".format(row, col), type=Pad.TYPE_SMT,
-                         shape=padShape,
-                         at=[xPadLeft + (col-1) * pitch_x, yPadTop + rowNum * pitch_y],
-                         size=[fp_params["pad_diameter"], fp_params["pad_diameter"]],
-                         layers=Pad.LAYERS_SMT, 
-                         radius_ratio=config['round_rect_radius_ratio']))
+    balls = BallGrid(pitch=[pitch_x, pitch_y], columns=layoutX, rows=layoutY, center=[xCenter, yCenter],
+                     row_names=rowNames, row_skips=rowSkips,
+                     type=Pad.TYPE_SMT, shape=padShape,
+                     size=[fp_params["pad_diameter"], fp_params["pad_diameter"]],
+                     layers=Pad.LAYERS_SMT,
+                     radius_ratio=config['round_rect_radius_ratio'])
+    f.append(balls)
 
     # If this looks like a CSP footprint, use the CSP 3dshapes library
     package_type = 'CSP' if 'BGA' not in fp_id and 'CSP' in fp_id else 'BGA'
@@ -182,7 +167,7 @@ def generateFootprint(config, fp_params, fp_id):
     f.append(Model(filename="{}Package_{}.3dshapes/{}.wrl".format(
                   config['3d_model_prefix'], package_type, fp_id)))
 
-    f.setTags("{} {} {}{}".format(package_type, balls, pitch_string, additionalTag))
+    f.setTags("{} {} {}{}".format(package_type, balls.getBallCount(), pitch_string, additionalTag))
 
     output_dir = 'Package_{lib_name:s}.pretty/'.format(lib_name=package_type)
     if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
@@ -192,17 +177,13 @@ def generateFootprint(config, fp_params, fp_id):
     file_handler = KicadFileHandler(f)
     file_handler.writeFile(filename)
 
-def rowNameGenerator(seq):
-    for n in itertools.count(1):
-        for s in itertools.product(seq, repeat = n):
-            yield ''.join(s)
-
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='use confing .yaml files to create footprints.')
     parser.add_argument('files', metavar='file', type=str, nargs='+',
                         help='list of files holding information about what devices should be created.')
     parser.add_argument('--global_config', type=str, nargs='?', help='the config file defining how the footprint will look like. (KLC)', default='../tools/global_config_files/config_KLCv3.0.yaml')
     # parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../package_config_KLCv3.yaml')
+    parser.add_argument('--watch', action='store_true', help='watch the files and regenerate the footprints of changed parameter sets')
 
     args = parser.parse_args()
     
@@ -219,14 +200,19 @@ if __name__ == '__main__':
             # print(exc)
     
     # generate dict of A, B .. Y, Z, AA, AB .. CY less easily-confused letters
-    row_names_list = [x for x in ascii_uppercase if x not in ["I", "O", "Q", "S", "X", "Z"]]
-    configuration.update({'row_names': list(itertools.islice(rowNameGenerator(row_names_list), 80))})
+    configuration.update({'row_names': BallGrid.rowNames(80)})
 
-    for filepath in args.files:
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+    def generateEntries(filepath, cmd_file, names=None):
         for pkg in cmd_file:
-            generateFootprint(configuration, cmd_file[pkg], pkg)
+            if names is None or pkg in names:
+                generateFootprint(configuration, cmd_file[pkg], pkg)
+
+    for filepath in args.files:
+        try:
+            cmd_file = loadYaml(filepath)
+        except yaml.YAMLError as exc:
+            print(exc)
+        generateEntries(filepath, cmd_file)
+
+    if args.watch:
+        EntryWatcher(args.files, generateEntries).run()
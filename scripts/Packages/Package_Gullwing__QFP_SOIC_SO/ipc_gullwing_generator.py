@@ -6,18 +6,25 @@ import argparse
 import yaml
 import math
 
-sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path of KicadModTree
+script_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(script_dir, "..", "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
-sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+from KicadModTree.util.entry_tracking import generatingEntry
+from KicadModTree.util.memory_profiler import startFromEnvironment
+from KicadModTree.util.watch import EntryWatcher
+sys.path.append(os.path.join(script_dir, "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
 from ipc_pad_size_calculators import *
 from quad_dual_pad_border import add_dual_or_quad_pad_border
 from drawing_tools import nearestSilkPointOnOrthogonalLine
 
 ipc_density = 'nominal'
-ipc_doc_file = '../ipc_definitions.yaml'
+ipc_doc_file = os.path.join(script_dir, '..', 'ipc_definitions.yaml')
+
+ipc_densities = {'L': 'least', 'N': 'nominal', 'M': 'most'}
 
 DEFAULT_PASTE_COVERAGE = 0.65
 DEFAULT_VIA_PASTE_CLEARANCE = 0.15
@@ -27,17 +34,18 @@ def roundToBase(value, base):
     return round(value/base) * base
 
 class Gullwing():
-    def __init__(self, configuration):
-        self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-
-                self.configuration['min_ep_to_pad_clearance'] = 0.2
-                if 'ipc_generic_rules' in self.ipc_defintions:
-                    self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
-            except yaml.YAMLError as exc:
-                print(exc)
+    def __init__(self, configuration, density=ipc_density, ipc_doc=ipc_doc_file):
+        # the configuration is copied, the generator adds values from the ipc document to it
+        self.configuration = dict(configuration)
+        self.ipc_density = ipc_densities.get(density, density)
+        try:
+            self.ipc_defintions = loadYaml(ipc_doc)
+
+            self.configuration['min_ep_to_pad_clearance'] = 0.2
+            if 'ipc_generic_rules' in self.ipc_defintions:
+                self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
+        except yaml.YAMLError as exc:
+            print(exc)
 
     def calcPadDetails(self, device_dimensions, EP_size, ipc_data, ipc_round_base):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -71,7 +79,7 @@ class Gullwing():
                 heel_reduction=device_dimensions.get('heel_reduction', 0)
                 )
 
-        min_ep_to_pad_clearance = configuration['min_ep_to_pad_clearance']
+        min_ep_to_pad_clearance = self.configuration['min_ep_to_pad_clearance']
 
         heel_reduction_max = 0
 
@@ -128,34 +136,52 @@ class Gullwing():
 
         return dimensions
 
+    def createFootprint(self, device_params, header, with_thermal_vias=False):
+        dimensions = Gullwing.deviceDimensions(device_params)
+
+        if with_thermal_vias and not (dimensions['has_EP'] and 'thermal_vias' in device_params):
+            raise ValueError("The device has no exposed pad with thermal vias")
+
+        return self.__createFootprintVariant(device_params, header, dimensions, with_thermal_vias)
+
     def generateFootprint(self, device_params, header):
         dimensions = Gullwing.deviceDimensions(device_params)
+        lib_name = self.configuration['lib_name_format_string'].format(category=header['library_Suffix'])
 
         if dimensions['has_EP'] and 'thermal_vias' in device_params:
-            self.__createFootprintVariant(device_params, header, dimensions, True)
+            writeFootprint(self.__createFootprintVariant(device_params, header, dimensions, True), lib_name)
 
-        self.__createFootprintVariant(device_params, header, dimensions, False)
+        writeFootprint(self.__createFootprintVariant(device_params, header, dimensions, False), lib_name)
 
-    def __createFootprintVariant(self, device_params, header, dimensions, with_thermal_vias):
-        fab_line_width = self.configuration.get('fab_line_width', 0.1)
-        silk_line_width = self.configuration.get('silk_line_width', 0.12)
+    def generateDensityVariants(self, device_params, header, densities):
+        # the device is parsed once, only pads, silk screen, courtyard and text positions are calculated per density.
+        # every density is written to its own directory, the footprints keep the names of single density runs
+        dimensions = Gullwing.deviceDimensions(device_params)
+        device = self.__deviceData(device_params, header, dimensions)
 
-        lib_name = self.configuration['lib_name_format_string'].format(category=header['library_Suffix'])
+        for density in densities:
+            density = ipc_densities.get(density, density)
+            if dimensions['has_EP'] and 'thermal_vias' in device_params:
+                writeFootprint(self.__createFootprintVariant(device_params, header, dimensions, True, density, device),
+                               device['lib_name'], density)
+
+            writeFootprint(self.__createFootprintVariant(device_params, header, dimensions, False, density, device),
+                           device['lib_name'], density)
+
+    def __deviceData(self, device_params, header, dimensions):
+        # everything which does not depend on the IPC density
+        device = {}
+        device['lib_name'] = self.configuration['lib_name_format_string'].format(category=header['library_Suffix'])
 
-        size_x = dimensions['body_size_x'].nominal
-        size_y = dimensions['body_size_y'].nominal
+        device['size_x'] = size_x = dimensions['body_size_x'].nominal
+        device['size_y'] = size_y = dimensions['body_size_y'].nominal
 
-        pincount = device_params['num_pins_x']*2 + device_params['num_pins_y']*2
+        device['pincount'] = device_params['num_pins_x']*2 + device_params['num_pins_y']*2
 
         ipc_reference = 'ipc_spec_gw_large_pitch' if device_params['pitch'] >= 0.625 else 'ipc_spec_gw_small_pitch'
         if device_params.get('force_small_pitch_ipc_definition', False):
             ipc_reference = 'ipc_spec_gw_small_pitch'
-
-        used_density = device_params.get('ipc_density', ipc_density)
-        ipc_data_set = self.ipc_defintions[ipc_reference][used_density]
-        ipc_round_base = self.ipc_defintions[ipc_reference]['round_base']
-
-        pitch = device_params['pitch']
+        device['ipc_reference'] = ipc_reference
 
         name_format = self.configuration['fp_name_format_string_no_trailing_zero']
         EP_size = {'x':0, 'y':0}
@@ -176,12 +202,74 @@ class Gullwing():
             if 'EP_mask_x' in dimensions:
                 name_format = self.configuration['fp_name_EP_custom_mask_format_string_no_trailing_zero']
                 EP_mask_size = {'x':dimensions['EP_mask_x'].nominal, 'y':dimensions['EP_mask_y'].nominal}
-        EP_size = Vector2D(EP_size)
-
-        pad_details = self.calcPadDetails(dimensions, EP_size, ipc_data_set, ipc_round_base)
 
         if 'custom_name_format' in device_params:
             name_format = device_params['custom_name_format']
+        device['name_format'] = name_format
+        device['EP_size'] = EP_size
+        device['EP_mask_size'] = EP_mask_size
+
+        device['description'] = "{manufacturer} {mpn} {package}, {pincount} Pin ({datasheet}), generated with kicad-footprint-generator {scriptname}"\
+            .format(
+                manufacturer = device_params.get('manufacturer',''),
+                package = header['device_type'],
+                mpn = device_params.get('part_number',''),
+                pincount = device['pincount'],
+                datasheet = device_params['size_source'],
+                scriptname = os.path.basename(__file__).replace("  ", " ")
+                ).lstrip()
+
+        device['tags'] = self.configuration['keyword_fp_string']\
+            .format(
+                man=device_params.get('manufacturer',''),
+                package=header['device_type'],
+                category=header['library_Suffix']
+            ).lstrip()
+
+        body_edge = {
+            'left': -dimensions['body_size_x'].nominal/2,
+            'right': dimensions['body_size_x'].nominal/2,
+            'top': -dimensions['body_size_y'].nominal/2,
+            'bottom': dimensions['body_size_y'].nominal/2
+            }
+        device['body_edge'] = body_edge
+
+        fab_bevel_size = min(self.configuration['fab_bevel_size_absolute'], self.configuration['fab_bevel_size_relative']*min(size_x, size_y))
+
+        device['poly_fab'] = [
+            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
+            {'x': body_edge['right'], 'y': body_edge['top']},
+            {'x': body_edge['right'], 'y': body_edge['bottom']},
+            {'x': body_edge['left'], 'y': body_edge['bottom']},
+            {'x': body_edge['left'], 'y': body_edge['top']+fab_bevel_size},
+            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
+        ]
+
+        return device
+
+    def __createFootprintVariant(self, device_params, header, dimensions, with_thermal_vias, density=None, device=None):
+        if device is None:
+            device = self.__deviceData(device_params, header, dimensions)
+
+        lib_name = device['lib_name']
+
+        size_x = device['size_x']
+        size_y = device['size_y']
+
+        pincount = device['pincount']
+        ipc_reference = device['ipc_reference']
+
+        used_density = device_params.get('ipc_density', density or self.ipc_density)
+        ipc_data_set = self.ipc_defintions[ipc_reference][used_density]
+        ipc_round_base = self.ipc_defintions[ipc_reference]['round_base']
+
+        pitch = device_params['pitch']
+
+        name_format = device['name_format']
+        EP_size = Vector2D(device['EP_size'])
+        EP_mask_size = dict(device['EP_mask_size'])
+
+        pad_details = self.calcPadDetails(dimensions, EP_size, ipc_data_set, ipc_round_base)
 
         suffix = device_params.get('suffix', '').format(pad_x=pad_details['left']['size'][0],
             pad_y=pad_details['left']['size'][1])
@@ -232,30 +320,15 @@ class Gullwing():
         kicad_mod = Footprint(fp_name)
 
                 # init kicad footprint
-        kicad_mod.setDescription(
-            "{manufacturer} {mpn} {package}, {pincount} Pin ({datasheet}), generated with kicad-footprint-generator {scriptname}"\
-            .format(
-                manufacturer = device_params.get('manufacturer',''),
-                package = header['device_type'],
-                mpn = device_params.get('part_number',''),
-                pincount = pincount,
-                datasheet = device_params['size_source'],
-                scriptname = os.path.basename(__file__).replace("  ", " ")
-                ).lstrip())
-
-        kicad_mod.setTags(self.configuration['keyword_fp_string']\
-            .format(
-                man=device_params.get('manufacturer',''),
-                package=header['device_type'],
-                category=header['library_Suffix']
-            ).lstrip())
+        kicad_mod.setDescription(device['description'])
+        kicad_mod.setTags(device['tags'])
         kicad_mod.setAttribute('smd')
 
         pad_shape_details = {}
         pad_shape_details['shape'] = Pad.SHAPE_ROUNDRECT
-        pad_shape_details['radius_ratio'] = configuration.get('round_rect_radius_ratio', 0)
-        if 'round_rect_max_radius' in configuration:
-            pad_shape_details['maximum_radius'] = configuration['round_rect_max_radius']
+        pad_shape_details['radius_ratio'] = self.configuration.get('round_rect_radius_ratio', 0)
+        if 'round_rect_max_radius' in self.configuration:
+            pad_shape_details['maximum_radius'] = self.configuration['round_rect_max_radius']
 
         EP_round_radius = 0
         if dimensions['has_EP']:
@@ -292,14 +365,9 @@ class Gullwing():
             kicad_mod.append(EP)
             EP_round_radius = EP.getRoundRadius()
 
-        pad_radius = add_dual_or_quad_pad_border(kicad_mod, configuration, pad_details, device_params)
+        pad_radius = add_dual_or_quad_pad_border(kicad_mod, self.configuration, pad_details, device_params)
 
-        body_edge = {
-            'left': -dimensions['body_size_x'].nominal/2,
-            'right': dimensions['body_size_x'].nominal/2,
-            'top': -dimensions['body_size_y'].nominal/2,
-            'bottom': dimensions['body_size_y'].nominal/2
-            }
+        body_edge = device['body_edge']
 
         bounding_box = {
             'left': pad_details['left']['center'][0] - pad_details['left']['size'][0]/2,
@@ -326,8 +394,8 @@ class Gullwing():
         pad_width = pad_details['top']['size'][0]
 
         # ############################ SilkS ##################################
-        silk_pad_offset = configuration['silk_pad_clearance'] + configuration['silk_line_width']/2
-        silk_offset = configuration['silk_fab_offset']
+        silk_pad_offset = self.configuration['silk_pad_clearance'] + self.configuration['silk_line_width']/2
+        silk_offset = self.configuration['silk_fab_offset']
 
         right_pads_silk_bottom = (device_params['num_pins_y']-1)*device_params['pitch']/2\
             +pad_details['right']['size'][1]/2+silk_pad_offset
@@ -347,7 +415,7 @@ class Gullwing():
         silk_right = min(body_edge['right']+silk_pad_offset, silk_right)
 
 
-        min_lenght = configuration.get('silk_line_lenght_min', 0)
+        min_lenght = self.configuration.get('silk_line_lenght_min', 0)
         silk_corner_bottom_right = Vector2D(silk_right, silk_bottom)
 
         silk_point_bottom_inside = nearestSilkPointOnOrthogonalLine(
@@ -427,75 +495,64 @@ class Gullwing():
         if len(poly_bottom_right) > 1 and silk_corner_bottom_right is not None:
             kicad_mod.append(PolygoneLine(
                 polygone=poly_bottom_right,
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS"))
             kicad_mod.append(PolygoneLine(
                 polygone=poly_bottom_right,
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS", x_mirror=0))
             kicad_mod.append(PolygoneLine(
                 polygone=poly_bottom_right,
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS", y_mirror=0))
 
             if device_params['num_pins_y'] > 0:
                 if len(poly_bottom_right)>2:
                     kicad_mod.append(PolygoneLine(
                         polygone=poly_bottom_right,
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS", y_mirror=0, x_mirror=0))
                     kicad_mod.append(Line(
                         start={'x': -silk_right, 'y': -right_pads_silk_bottom},
                         end={'x': bounding_box['left'], 'y': -right_pads_silk_bottom},
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS"))
                 elif silk_corner_bottom_right['y'] >= right_pads_silk_bottom and silk_point_bottom_inside is not None:
                     kicad_mod.append(Line(
                         start=-silk_point_bottom_inside,
                         end={'x': bounding_box['left'], 'y': -silk_point_bottom_inside['y']},
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS"))
             else:
                 if len(poly_bottom_right)>2:
                     poly_bottom_right[0]['x']=bottom_pads_silk_right
                     kicad_mod.append(PolygoneLine(
                         polygone=poly_bottom_right,
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS", y_mirror=0, x_mirror=0))
                     kicad_mod.append(Line(
                         start={'x': -bottom_pads_silk_right, 'y': -silk_corner_bottom_right['y']},
                         end={'x': -bottom_pads_silk_right, 'y': bounding_box['top']},
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS"))
                 elif silk_corner_bottom_right['x'] >= bottom_pads_silk_right and silk_point_right_inside is not None:
                     kicad_mod.append(Line(
                         start=-silk_point_right_inside,
                         end={'x': -silk_point_right_inside['x'], 'y': bounding_box['top']},
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS"))
 
         # # ######################## Fabrication Layer ###########################
 
-        fab_bevel_size = min(configuration['fab_bevel_size_absolute'], configuration['fab_bevel_size_relative']*min(size_x, size_y))
-
-        poly_fab = [
-            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
-            {'x': body_edge['right'], 'y': body_edge['top']},
-            {'x': body_edge['right'], 'y': body_edge['bottom']},
-            {'x': body_edge['left'], 'y': body_edge['bottom']},
-            {'x': body_edge['left'], 'y': body_edge['top']+fab_bevel_size},
-            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
-        ]
-
         kicad_mod.append(PolygoneLine(
-            polygone=poly_fab,
-            width=configuration['fab_line_width'],
+            polygone=device['poly_fab'],
+            width=self.configuration['fab_line_width'],
             layer="F.Fab"))
 
         # # ############################ CrtYd ##################################
 
         off = ipc_data_set['courtyard']
-        grid = configuration['courtyard_grid']
+        grid = self.configuration['courtyard_grid']
 
         if device_params['num_pins_y'] == 0 or device_params['num_pins_x'] == 0:
             cy1=roundToBase(bounding_box['top']-off, grid)
@@ -509,7 +566,7 @@ class Gullwing():
                     'x':roundToBase(bounding_box['right']+off, grid),
                     'y':roundToBase(bounding_box['bottom']+off, grid)
                     },
-                width=configuration['courtyard_line_width'],
+                width=self.configuration['courtyard_line_width'],
                 layer='F.CrtYd'))
 
         else:
@@ -538,33 +595,49 @@ class Gullwing():
                 {'x':cx3, 'y':0}
             ]
             kicad_mod.append(PolygoneLine(polygone=crty_poly_tl,
-                layer='F.CrtYd', width=configuration['courtyard_line_width']))
+                layer='F.CrtYd', width=self.configuration['courtyard_line_width']))
             kicad_mod.append(PolygoneLine(polygone=crty_poly_tl,
-                layer='F.CrtYd', width=configuration['courtyard_line_width'],
+                layer='F.CrtYd', width=self.configuration['courtyard_line_width'],
                 x_mirror=0))
             kicad_mod.append(PolygoneLine(polygone=crty_poly_tl,
-                layer='F.CrtYd', width=configuration['courtyard_line_width'],
+                layer='F.CrtYd', width=self.configuration['courtyard_line_width'],
                 y_mirror=0))
             kicad_mod.append(PolygoneLine(polygone=crty_poly_tl,
-                layer='F.CrtYd', width=configuration['courtyard_line_width'],
+                layer='F.CrtYd', width=self.configuration['courtyard_line_width'],
                 x_mirror=0, y_mirror=0))
 
         # ######################### Text Fields ###############################
 
-        addTextFields(kicad_mod=kicad_mod, configuration=configuration, body_edges=body_edge,
+        addTextFields(kicad_mod=kicad_mod, configuration=self.configuration, body_edges=body_edge,
             courtyard={'top': cy1, 'bottom': -cy1}, fp_name=fp_name, text_y_inside_position='center')
 
         ##################### Output and 3d model ############################
 
         kicad_mod.append(Model(filename=model_name))
 
-        output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
-        if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-            os.makedirs(output_dir)
-        filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=fp_name)
+        return kicad_mod
 
-        file_handler = KicadFileHandler(kicad_mod)
-        file_handler.writeFile(filename)
+def writeFootprint(kicad_mod, lib_name, base_dir=''):
+    output_dir = os.path.join(base_dir, '{lib_name:s}.pretty/'.format(lib_name=lib_name))
+    if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
+        os.makedirs(output_dir)
+    filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=kicad_mod.name)
+
+    file_handler = KicadFileHandler(kicad_mod)
+    file_handler.writeFile(filename)
+
+def generate(configuration, device_params, header, density=ipc_density, ipc_doc=ipc_doc_file, with_thermal_vias=False):
+    r"""Create a single footprint without writing it
+
+    :param configuration: global and series configuration (it is not modified)
+    :param device_params: parameter set of the device (one entry of a size definition file)
+    :param header: FileHeader of the size definition file
+    :param density: IPC density level ('least', 'nominal', 'most' or 'L', 'N', 'M')
+    :param ipc_doc: path of the IPC definition document
+    :param with_thermal_vias: create the variant with thermal vias of the exposed pad
+    :return: the Footprint
+    """
+    return Gullwing(configuration, density, ipc_doc).createFootprint(device_params, header, with_thermal_vias)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='use confing .yaml files to create footprints.')
@@ -573,46 +646,49 @@ if __name__ == "__main__":
     parser.add_argument('--global_config', type=str, nargs='?', help='the config file defining how the footprint will look like. (KLC)', default='../../tools/global_config_files/config_KLCv3.0.yaml')
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../package_config_KLCv3.yaml')
     parser.add_argument('--density', type=str, nargs='?', help='Density level (L,N,M)', default='N')
+    parser.add_argument('--densities', type=str, nargs='?', help='comma separated list of density levels (L,N,M) created in one pass, every level is written to its own directory', default=None)
     parser.add_argument('--ipc_doc', type=str, nargs='?', help='IPC definition document', default='../ipc_definitions.yaml')
     parser.add_argument('--force_rectangle_pads', action='store_true', help='Force the generation of rectangle pads instead of rounded rectangle')
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
+    parser.add_argument('--only', type=str, nargs='?', help='comma separated list of the parameter sets to generate (default: all)', default=None)
+    parser.add_argument('--watch', action='store_true', help='watch the files and regenerate the footprints of changed parameter sets')
     args = parser.parse_args()
+    startFromEnvironment()
 
-    if args.density == 'L':
-        ipc_density = 'least'
-    elif args.density == 'M':
-        ipc_density = 'most'
-
-    ipc_doc_file = args.ipc_doc
-
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadConfiguration(args.global_config, args.series_config)
+    except yaml.YAMLError as exc:
+        print(exc)
 
     if args.force_rectangle_pads or args.kicad4_compatible:
         configuration['round_rect_max_radius'] = None
         configuration['round_rect_radius_ratio'] = 0
 
     configuration['kicad4_compatible'] = args.kicad4_compatible
+    only = set(args.only.split(',')) if args.only else None
+    densities = args.densities.split(',') if args.densities else None
 
-    for filepath in args.files:
-        gw = Gullwing(configuration)
+    gw = Gullwing(configuration, args.density, args.ipc_doc)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+    def generateEntries(filepath, cmd_file, names=None):
         header = cmd_file.pop('FileHeader')
 
         for pkg in cmd_file:
+            if (only is not None and pkg not in only) or (names is not None and pkg not in names):
+                continue
+            generatingEntry(filepath, pkg)
             print("generating part for parameter set {}".format(pkg))
-            gw.generateFootprint(cmd_file[pkg], header)
+            if densities:
+                gw.generateDensityVariants(cmd_file[pkg], header, densities)
+            else:
+                gw.generateFootprint(cmd_file[pkg], header)
+
+    for filepath in args.files:
+        try:
+            cmd_file = loadYaml(filepath)
+        except yaml.YAMLError as exc:
+            print(exc)
+        generateEntries(filepath, cmd_file)
+
+    if args.watch:
+        EntryWatcher(args.files, generateEntries, shared_entries=['FileHeader']).run()
@@ -8,17 +8,25 @@ import math
 from math import sqrt
 import warnings
 
-sys.path.append(os.path.join(sys.path[0], "..", "..", ".."))  # load parent path of KicadModTree
+script_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(script_dir, "..", "..", ".."))  # load parent path of KicadModTree
 
 from KicadModTree import *  # NOQA
 from KicadModTree.nodes.base.Pad import Pad  # NOQA
-sys.path.append(os.path.join(sys.path[0], "..", "..", "tools"))  # load parent path of tools
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+from KicadModTree.util.entry_tracking import generatingEntry
+from KicadModTree.util.memory_profiler import startFromEnvironment
+from KicadModTree.util.watch import EntryWatcher
+sys.path.append(os.path.join(script_dir, "..", "..", "tools"))  # load parent path of tools
 from footprint_text_fields import addTextFields
 from ipc_pad_size_calculators import *
 from quad_dual_pad_border import add_dual_or_quad_pad_border
 
 ipc_density = 'nominal'
-ipc_doc_file = '../ipc_definitions.yaml'
+ipc_doc_file = os.path.join(script_dir, '..', 'ipc_definitions.yaml')
+
+ipc_densities = {'L': 'least', 'N': 'nominal', 'M': 'most'}
+
 category = 'NoLead'
 default_library = 'Package_DFN_QFN'
 
@@ -34,17 +42,18 @@ def roundToBase(value, base):
     return round(value/base) * base
 
 class NoLead():
-    def __init__(self, configuration):
-        self.configuration = configuration
-        with open(ipc_doc_file, 'r') as ipc_stream:
-            try:
-                self.ipc_defintions = yaml.safe_load(ipc_stream)
-
-                self.configuration['min_ep_to_pad_clearance'] = 0.2
-                if 'ipc_generic_rules' in self.ipc_defintions:
-                    self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
-            except yaml.YAMLError as exc:
-                print(exc)
+    def __init__(self, configuration, density=ipc_density, ipc_doc=ipc_doc_file):
+        # the configuration is copied, the generator adds values from the ipc document to it
+        self.configuration = dict(configuration)
+        self.ipc_density = ipc_densities.get(density, density)
+        try:
+            self.ipc_defintions = loadYaml(ipc_doc)
+
+            self.configuration['min_ep_to_pad_clearance'] = 0.2
+            if 'ipc_generic_rules' in self.ipc_defintions:
+                self.configuration['min_ep_to_pad_clearance'] = self.ipc_defintions['ipc_generic_rules'].get('min_ep_to_pad_clearance', 0.2)
+        except yaml.YAMLError as exc:
+            print(exc)
 
     def calcPadDetails(self, device_dimensions, EP_size, ipc_data, ipc_round_base):
         # Zmax = Lmin + 2JT + √(CL^2 + F^2 + P^2)
@@ -96,7 +105,7 @@ class NoLead():
                     pull_back=pull_back
                     )
 
-        min_ep_to_pad_clearance = configuration['min_ep_to_pad_clearance']
+        min_ep_to_pad_clearance = self.configuration['min_ep_to_pad_clearance']
 
         heel_reduction_max = 0
 
@@ -178,34 +187,55 @@ class NoLead():
 
         return dimensions
 
+    def createFootprint(self, device_params, fp_id=None, with_thermal_vias=False):
+        device_dimensions = NoLead.deviceDimensions(device_params, fp_id)
+
+        if with_thermal_vias and not (device_dimensions['has_EP'] and 'thermal_vias' in device_params):
+            raise ValueError("The device has no exposed pad with thermal vias")
+
+        return self.__createFootprintVariant(device_params, device_dimensions, with_thermal_vias)
+
     def generateFootprint(self, device_params, fp_id):
         print('Building footprint for parameter set: {}'.format(fp_id))
         device_dimensions = NoLead.deviceDimensions(device_params, fp_id)
+        lib_name = device_params.get('library', default_library)
 
         if device_dimensions['has_EP'] and 'thermal_vias' in device_params:
-            self.__createFootprintVariant(device_params, device_dimensions, True)
+            writeFootprint(self.__createFootprintVariant(device_params, device_dimensions, True), lib_name)
+
+        writeFootprint(self.__createFootprintVariant(device_params, device_dimensions, False), lib_name)
+
+    def generateDensityVariants(self, device_params, fp_id, densities):
+        # the device is parsed once, only pads, silk screen, courtyard and text positions are calculated per density.
+        # every density is written to its own directory, the footprints keep the names of single density runs
+        print('Building footprint for parameter set: {}'.format(fp_id))
+        device_dimensions = NoLead.deviceDimensions(device_params, fp_id)
+        device = self.__deviceData(device_params, device_dimensions)
 
-        self.__createFootprintVariant(device_params, device_dimensions, False)
+        for density in densities:
+            density = ipc_densities.get(density, density)
+            if device_dimensions['has_EP'] and 'thermal_vias' in device_params:
+                writeFootprint(self.__createFootprintVariant(device_params, device_dimensions, True, density, device),
+                               device['lib_name'], density)
 
-    def __createFootprintVariant(self, device_params, device_dimensions, with_thermal_vias):
-        fab_line_width = self.configuration.get('fab_line_width', 0.1)
-        silk_line_width = self.configuration.get('silk_line_width', 0.12)
+            writeFootprint(self.__createFootprintVariant(device_params, device_dimensions, False, density, device),
+                           device['lib_name'], density)
 
-        lib_name = device_params.get('library', default_library)
+    def __deviceData(self, device_params, device_dimensions):
+        # everything which does not depend on the IPC density
+        device = {}
+        device['lib_name'] = device_params.get('library', default_library)
 
-        pincount = device_params['num_pins_x']*2 + device_params['num_pins_y']*2
+        device['pincount'] = pincount = device_params['num_pins_x']*2 + device_params['num_pins_y']*2
 
         default_ipc_config = 'qfn_pull_back' if 'lead_to_edge' in device_params else 'qfn'
         if device_params.get('ipc_class', default_ipc_config) == 'qfn_pull_back':
-            ipc_reference = 'ipc_spec_flat_no_lead_pull_back'
+            device['ipc_reference'] = 'ipc_spec_flat_no_lead_pull_back'
         else:
-            ipc_reference = 'ipc_spec_flat_no_lead'
-
-        used_density = device_params.get('ipc_density', ipc_density)
-        ipc_data_set = self.ipc_defintions[ipc_reference][used_density]
-        ipc_round_base = self.ipc_defintions[ipc_reference]['round_base']
+            device['ipc_reference'] = 'ipc_spec_flat_no_lead'
 
         layout = ''
+        EP_center = None
         if device_dimensions['has_EP']:
             name_format = self.configuration['fp_name_EP_format_string_no_trailing_zero']
             if 'EP_size_x_overwrite' in device_params:
@@ -235,6 +265,69 @@ class NoLead():
         if 'custom_name_format' in device_params:
             name_format = device_params['custom_name_format']
 
+        device['layout'] = layout
+        device['name_format'] = name_format
+        device['EP_size'] = EP_size
+        device['EP_center'] = EP_center
+
+        device['size_x'] = size_x = device_dimensions['body_size_x'].nominal
+        device['size_y'] = size_y = device_dimensions['body_size_y'].nominal
+
+        device['description'] = "{manufacturer} {mpn} {package}, {pincount} Pin ({datasheet}), generated with kicad-footprint-generator {scriptname}"\
+            .format(
+                manufacturer = device_params.get('manufacturer',''),
+                package = device_params['device_type'],
+                mpn = device_params.get('part_number',''),
+                pincount = pincount,
+                datasheet = device_params['size_source'],
+                scriptname = os.path.basename(__file__).replace("  ", " ")
+                ).lstrip()
+
+        device['tags'] = self.configuration['keyword_fp_string']\
+            .format(
+                man=device_params.get('manufacturer',''),
+                package=device_params['device_type'],
+                category=category
+            ).lstrip()
+
+        body_edge = {
+            'left': -size_x/2,
+            'right': size_x/2,
+            'top': -size_y/2,
+            'bottom': size_y/2
+            }
+        device['body_edge'] = body_edge
+
+        fab_bevel_size = min(self.configuration['fab_bevel_size_absolute'], self.configuration['fab_bevel_size_relative']*min(size_x, size_y))
+
+        device['poly_fab'] = [
+            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
+            {'x': body_edge['right'], 'y': body_edge['top']},
+            {'x': body_edge['right'], 'y': body_edge['bottom']},
+            {'x': body_edge['left'], 'y': body_edge['bottom']},
+            {'x': body_edge['left'], 'y': body_edge['top']+fab_bevel_size},
+            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
+        ]
+
+        return device
+
+    def __createFootprintVariant(self, device_params, device_dimensions, with_thermal_vias, density=None, device=None):
+        if device is None:
+            device = self.__deviceData(device_params, device_dimensions)
+
+        lib_name = device['lib_name']
+        pincount = device['pincount']
+        ipc_reference = device['ipc_reference']
+
+        used_density = device_params.get('ipc_density', density or self.ipc_density)
+        ipc_data_set = self.ipc_defintions[ipc_reference][used_density]
+        ipc_round_base = self.ipc_defintions[ipc_reference]['round_base']
+
+        layout = device['layout']
+        name_format = device['name_format']
+        EP_size = dict(device['EP_size'])
+        EP_center = device['EP_center']
+
         pad_details = self.calcPadDetails(device_dimensions, EP_size, ipc_data_set, ipc_round_base)
 
 
@@ -248,8 +341,8 @@ class NoLead():
 
         model3d_path_prefix = self.configuration.get('3d_model_prefix','${KISYS3DMOD}')
 
-        size_x = device_dimensions['body_size_x'].nominal
-        size_y = device_dimensions['body_size_y'].nominal
+        size_x = device['size_x']
+        size_y = device['size_y']
 
         fp_name = name_format.format(
             man=device_params.get('manufacturer',''),
@@ -300,30 +393,15 @@ class NoLead():
         kicad_mod = Footprint(fp_name)
 
                 # init kicad footprint
-        kicad_mod.setDescription(
-            "{manufacturer} {mpn} {package}, {pincount} Pin ({datasheet}), generated with kicad-footprint-generator {scriptname}"\
-            .format(
-                manufacturer = device_params.get('manufacturer',''),
-                package = device_params['device_type'],
-                mpn = device_params.get('part_number',''),
-                pincount = pincount,
-                datasheet = device_params['size_source'],
-                scriptname = os.path.basename(__file__).replace("  ", " ")
-                ).lstrip())
-
-        kicad_mod.setTags(self.configuration['keyword_fp_string']\
-            .format(
-                man=device_params.get('manufacturer',''),
-                package=device_params['device_type'],
-                category=category
-            ).lstrip())
+        kicad_mod.setDescription(device['description'])
+        kicad_mod.setTags(device['tags'])
         kicad_mod.setAttribute('smd')
 
         pad_shape_details = {}
         pad_shape_details['shape'] = Pad.SHAPE_ROUNDRECT
-        pad_shape_details['radius_ratio'] = configuration.get('round_rect_radius_ratio', 0)
-        if 'round_rect_max_radius' in configuration:
-            pad_shape_details['maximum_radius'] = configuration['round_rect_max_radius']
+        pad_shape_details['radius_ratio'] = self.configuration.get('round_rect_radius_ratio', 0)
+        if 'round_rect_max_radius' in self.configuration:
+            pad_shape_details['maximum_radius'] = self.configuration['round_rect_max_radius']
 
         if device_dimensions['has_EP']:
             if with_thermal_vias:
@@ -345,7 +423,7 @@ class NoLead():
                     via_paste_clarance=thermals.get('paste_via_clearance', DEFAULT_VIA_PASTE_CLEARANCE),
                     min_annular_ring=thermals.get('min_annular_ring', DEFAULT_MIN_ANNULAR_RING),
                     bottom_pad_min_size=thermals.get('bottom_min_size', 0),
-                    kicad4_compatible=args.kicad4_compatible,
+                    kicad4_compatible=self.configuration.get('kicad4_compatible', False),
                     **pad_shape_details
                     ))
             else:
@@ -354,18 +432,13 @@ class NoLead():
                     at=EP_center,
                     paste_layout=device_params.get('EP_num_paste_pads', 1),
                     paste_coverage=device_params.get('EP_paste_coverage', DEFAULT_PASTE_COVERAGE),
-                    kicad4_compatible=args.kicad4_compatible,
+                    kicad4_compatible=self.configuration.get('kicad4_compatible', False),
                     **pad_shape_details
                     ))
 
-        add_dual_or_quad_pad_border(kicad_mod, configuration, pad_details, device_params)
+        add_dual_or_quad_pad_border(kicad_mod, self.configuration, pad_details, device_params)
 
-        body_edge = {
-            'left': -size_x/2,
-            'right': size_x/2,
-            'top': -size_y/2,
-            'bottom': size_y/2
-            }
+        body_edge = device['body_edge']
 
         bounding_box = body_edge.copy()
 
@@ -391,22 +464,22 @@ class NoLead():
 
         # ############################ SilkS ##################################
 
-        silk_pad_offset = configuration['silk_pad_clearance'] + configuration['silk_line_width']/2
-        silk_offset = configuration['silk_fab_offset']
+        silk_pad_offset = self.configuration['silk_pad_clearance'] + self.configuration['silk_line_width']/2
+        silk_offset = self.configuration['silk_fab_offset']
         if device_params['num_pins_x'] == 0:
             kicad_mod.append(Line(
                 start={'x':0,
                     'y':body_edge['top']-silk_offset},
                 end={'x':body_edge['right'],
                     'y':body_edge['top']-silk_offset},
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS"))
             kicad_mod.append(Line(
                 start={'x':body_edge['left'],
                     'y':body_edge['bottom']+silk_offset},
                 end={'x':body_edge['right'],
                     'y':body_edge['bottom']+silk_offset},
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS", y_mirror=0))
         elif device_params['num_pins_y'] == 0:
             kicad_mod.append(Line(
@@ -414,14 +487,14 @@ class NoLead():
                     'x':body_edge['left']-silk_offset},
                 end={'y':body_edge['bottom'],
                     'x':body_edge['left']-silk_offset},
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS"))
             kicad_mod.append(Line(
                 start={'y':body_edge['top'],
                     'x':body_edge['right']+silk_offset},
                 end={'y':body_edge['bottom'],
                     'x':body_edge['right']+silk_offset},
-                width=configuration['silk_line_width'],
+                width=self.configuration['silk_line_width'],
                 layer="F.SilkS", x_mirror=0))
         else:
             sx1 = -(device_dimensions['pitch']*(device_params['num_pins_x']-1)/2.0
@@ -442,45 +515,34 @@ class NoLead():
             if len(poly_silk) > 1:
                 kicad_mod.append(PolygoneLine(
                     polygone=poly_silk,
-                    width=configuration['silk_line_width'],
+                    width=self.configuration['silk_line_width'],
                     layer="F.SilkS", x_mirror=0))
                 kicad_mod.append(PolygoneLine(
                     polygone=poly_silk,
-                    width=configuration['silk_line_width'],
+                    width=self.configuration['silk_line_width'],
                     layer="F.SilkS", y_mirror=0))
                 kicad_mod.append(PolygoneLine(
                     polygone=poly_silk,
-                    width=configuration['silk_line_width'],
+                    width=self.configuration['silk_line_width'],
                     layer="F.SilkS", x_mirror=0, y_mirror=0))
                 if len(poly_silk) > 2:
                     kicad_mod.append(Line(
                         start={'x': sx1, 'y': body_edge['top']-silk_offset},
                         end={'x': body_edge['left']-silk_offset, 'y': body_edge['top']-silk_offset},
-                        width=configuration['silk_line_width'],
+                        width=self.configuration['silk_line_width'],
                         layer="F.SilkS"))
 
         # # ######################## Fabrication Layer ###########################
 
-        fab_bevel_size = min(configuration['fab_bevel_size_absolute'], configuration['fab_bevel_size_relative']*min(size_x, size_y))
-
-        poly_fab = [
-            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
-            {'x': body_edge['right'], 'y': body_edge['top']},
-            {'x': body_edge['right'], 'y': body_edge['bottom']},
-            {'x': body_edge['left'], 'y': body_edge['bottom']},
-            {'x': body_edge['left'], 'y': body_edge['top']+fab_bevel_size},
-            {'x': body_edge['left']+fab_bevel_size, 'y': body_edge['top']},
-        ]
-
         kicad_mod.append(PolygoneLine(
-            polygone=poly_fab,
-            width=configuration['fab_line_width'],
+            polygone=device['poly_fab'],
+            width=self.configuration['fab_line_width'],
             layer="F.Fab"))
 
         # # ############################ CrtYd ##################################
 
         off = ipc_data_set['courtyard']
-        grid = configuration['courtyard_grid']
+        grid = self.configuration['courtyard_grid']
 
         cy1=roundToBase(bounding_box['top']-off, grid)
 
@@ -493,25 +555,41 @@ class NoLead():
                 'x':roundToBase(bounding_box['right']+off, grid),
                 'y':roundToBase(bounding_box['bottom']+off, grid)
                 },
-            width=configuration['courtyard_line_width'],
+            width=self.configuration['courtyard_line_width'],
             layer='F.CrtYd'))
 
         # ######################### Text Fields ###############################
 
-        addTextFields(kicad_mod=kicad_mod, configuration=configuration, body_edges=body_edge,
+        addTextFields(kicad_mod=kicad_mod, configuration=self.configuration, body_edges=body_edge,
             courtyard={'top': cy1, 'bottom': -cy1}, fp_name=fp_name, text_y_inside_position='center')
 
         ##################### Output and 3d model ############################
 
         kicad_mod.append(Model(filename=model_name))
 
-        output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
-        if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-            os.makedirs(output_dir)
-        filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=fp_name)
+        return kicad_mod
+
+def writeFootprint(kicad_mod, lib_name, base_dir=''):
+    output_dir = os.path.join(base_dir, '{lib_name:s}.pretty/'.format(lib_name=lib_name))
+    if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
+        os.makedirs(output_dir)
+    filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=kicad_mod.name)
 
-        file_handler = KicadFileHandler(kicad_mod)
-        file_handler.writeFile(filename)
+    file_handler = KicadFileHandler(kicad_mod)
+    file_handler.writeFile(filename)
+
+def generate(configuration, device_params, fp_id=None, density=ipc_density, ipc_doc=ipc_doc_file, with_thermal_vias=False):
+    r"""Create a single footprint without writing it
+
+    :param configuration: global and series configuration (it is not modified)
+    :param device_params: parameter set of the device (one entry of a size definition file)
+    :param fp_id: name of the parameter set, used in messages
+    :param density: IPC density level ('least', 'nominal', 'most' or 'L', 'N', 'M')
+    :param ipc_doc: path of the IPC definition document
+    :param with_thermal_vias: create the variant with thermal vias of the exposed pad
+    :return: the Footprint
+    """
+    return NoLead(configuration, density, ipc_doc).createFootprint(device_params, fp_id, with_thermal_vias)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='use confing .yaml files to create footprints.')
@@ -520,47 +598,50 @@ if __name__ == "__main__":
     parser.add_argument('--global_config', type=str, nargs='?', help='the config file defining how the footprint will look like. (KLC)', default='../../tools/global_config_files/config_KLCv3.0.yaml')
     parser.add_argument('--series_config', type=str, nargs='?', help='the config file defining series parameters.', default='../package_config_KLCv3.yaml')
     parser.add_argument('--density', type=str, nargs='?', help='Density level (L,N,M)', default='N')
+    parser.add_argument('--densities', type=str, nargs='?', help='comma separated list of density levels (L,N,M) created in one pass, every level is written to its own directory', default=None)
     parser.add_argument('--ipc_doc', type=str, nargs='?', help='IPC definition document', default='../ipc_definitions.yaml')
     parser.add_argument('--force_rectangle_pads', action='store_true', help='Force the generation of rectangle pads instead of rounded rectangle')
     parser.add_argument('--kicad4_compatible', action='store_true', help='Create footprints kicad 4 compatible')
+    parser.add_argument('--only', type=str, nargs='?', help='comma separated list of the parameter sets to generate (default: all)', default=None)
+    parser.add_argument('--watch', action='store_true', help='watch the files and regenerate the footprints of changed parameter sets')
     parser.add_argument('-v', '--verbose', action='count', help='set debug level')
     args = parser.parse_args()
-
-    if args.density == 'L':
-        ipc_density = 'least'
-    elif args.density == 'M':
-        ipc_density = 'most'
+    startFromEnvironment()
 
     if args.verbose:
         DEBUG_LEVEL = args.verbose
 
-    ipc_doc_file = args.ipc_doc
-
-    with open(args.global_config, 'r') as config_stream:
-        try:
-            configuration = yaml.safe_load(config_stream)
-        except yaml.YAMLError as exc:
-            print(exc)
-
-    with open(args.series_config, 'r') as config_stream:
-        try:
-            configuration.update(yaml.safe_load(config_stream))
-        except yaml.YAMLError as exc:
-            print(exc)
+    try:
+        configuration = loadConfiguration(args.global_config, args.series_config)
+    except yaml.YAMLError as exc:
+        print(exc)
 
     if args.force_rectangle_pads or args.kicad4_compatible:
         configuration['round_rect_max_radius'] = None
         configuration['round_rect_radius_ratio'] = 0
 
     configuration['kicad4_compatible'] = args.kicad4_compatible
+    only = set(args.only.split(',')) if args.only else None
+    densities = args.densities.split(',') if args.densities else None
 
-    for filepath in args.files:
-        no_lead = NoLead(configuration)
+    no_lead = NoLead(configuration, args.density, args.ipc_doc)
 
-        with open(filepath, 'r') as command_stream:
-            try:
-                cmd_file = yaml.safe_load(command_stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+    def generateEntries(filepath, cmd_file, names=None):
         for pkg in cmd_file:
-            no_lead.generateFootprint(cmd_file[pkg], pkg)
+            if (only is not None and pkg not in only) or (names is not None and pkg not in names):
+                continue
+            generatingEntry(filepath, pkg)
+            if densities:
+                no_lead.generateDensityVariants(cmd_file[pkg], pkg, densities)
+            else:
+                no_lead.generateFootprint(cmd_file[pkg], pkg)
+
+    for filepath in args.files:
+        try:
+            cmd_file = loadYaml(filepath)
+        except yaml.YAMLError as exc:
+            print(exc)
+        generateEntries(filepath, cmd_file)
+
+    if args.watch:
+        EntryWatcher(args.files, generateEntries).run()
@@ -267,7 +267,7 @@ def qfn(args):
 
     output_dir = '{lib_name:s}.pretty/'.format(lib_name=lib_name)
     if not os.path.isdir(output_dir): #returns false if path does not yet exist!! (Does not check path validity)
-        os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)  # other workers of --jobs may create it at the same time
     filename =  '{outdir:s}{fp_name:s}.kicad_mod'.format(outdir=output_dir, fp_name=footprint_name)
 
     file_handler = KicadFileHandler(f)
@@ -42,93 +42,39 @@ def addKeepoutRect(x, y, w, h):
   return [[x - w / 2, x + w / 2, y - h / 2, y + h / 2]]
 
 
-# returns a series of rectangle that lie around the circular pad around (x,y) with radius w=h
-# if w!=h, addKeepoutRect() is called
+# returns a single keepout for the round pad around (x,y): a circle with radius w/2=h/2 or,
+# if w!=h, an oval (rectangle with rounded ends)
 def addKeepoutRound(x,y, w,h):
     if w!=h:
-        return addKeepoutRect(x,y,w,h)
+        return [KeepoutRoundRect(x - w / 2, x + w / 2, y - h / 2, y + h / 2, radius=min(w, h) / 2)]
     else:
-        res=[]
-        Nrects=4
-        r=max(h,w)/2
-        yysum=0
-        for ya in frange(0,r,r/Nrects):
-            a=math.fabs(math.asin(ya/r)/math.pi*180)
-            yy=math.fabs(r*math.sin(a/180.0*math.pi))
-            xx=math.fabs(r*math.cos(a/180.0*math.pi))
-            if (xx>0):
-                res.append([x - xx-0.015, x + xx+0.015, y-yy-r/Nrects-0.015, y-yy+.015])
-                res.append([x - xx-0.015, x + xx+0.015, y+yy-0.015, y+yy+r/Nrects+0.015])
-            yysum=yysum+yy
-        return res
+        return [KeepoutCircle(x, y, w / 2)]
 
 
 
 def applyKeepouts(lines_in, y, xi, yi, keepouts):
-    #print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines=lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi+0] <= y) and (y <= ko[yi+1]):
-                #print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] >= ko[xi+0]) and (l[1] <= ko[xi+1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        #print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi+0]) and (l[0] <= ko[xi+1]) and (l[1] > ko[xi+1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] <= ko[xi+1]) and (l[1] >= ko[xi+0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        #print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi+0]) and (l[1] > ko[xi+1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi+0]])
-                        lines.append([ko[xi+1], l[1]])
-                        #print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                    #else:
-                        #print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
+    if xi == 0:
+        return clipHorizontalLines(lines_in, y, keepouts)
+    else:
+        return clipVerticalLines(lines_in, y, keepouts)
 
 
 
 #split a vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addHLineWithKeepout(kicad_mod, x0, x1, y,layer, width, keepouts=[], roun=0.001):
     #print("addHLineWithKeepout",y)
-    linesout = applyKeepouts([[min(x0,x1), max(x0,x1)]], y, 0,2,keepouts)
+    linesout = clipHorizontalLines([[min(x0,x1), max(x0,x1)]], y, keepouts)
     for l in linesout:
         kicad_mod.append(Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)], layer=layer, width=width))
 
 # split a vertical line into dashes, so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addHDLineWithKeepout(kicad_mod, x0, dx, x1, y, layer, width, keepouts=[], roun=0.001):
     #print("addHDLineWithKeepout",y)
-    x=min(x0,x1)
-    lines=[]
-    on=True
-    while (x+dx)<=max(x0,x1):
-        if (on):
-            lines.append([x,x+dx])
-        x=x+dx
-        on=not on
-    if (x<max(x0,x1)) and on:
-        lines.append([x, max(x0,x1)])
+    lines = dashIntervals(min(x0, x1), max(x0, x1), dx, dx)
     if len(lines)<=0:
         return
 
-    linesout = applyKeepouts(lines, y, 0, 2, keepouts)
+    linesout = clipHorizontalLines(lines, y, keepouts)
 
     for l in linesout:
         kicad_mod.append(Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)],layer=layer, width=width))
@@ -138,26 +84,16 @@ def addHDLineWithKeepout(kicad_mod, x0, dx, x1, y, layer, width, keepouts=[], ro
 #split a vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addVLineWithKeepout(kicad_mod, x, y0, y1,layer, width, keepouts=[], roun=0.001):
     #print("addVLineWithKeepout",x)
-    linesout = applyKeepouts([[min(y0,y1), max(y0,y1)]], x, 2, 0, keepouts)
+    linesout = clipVerticalLines([[min(y0,y1), max(y0,y1)]], x, keepouts)
     for l in linesout:
         kicad_mod.append(Line(start=[roundG(x, roun), roundG(l[0], roun)], end=[roundG(x, roun), roundG(l[1], roun)], layer=layer, width=width))
 
 # split a vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addVDLineWithKeepout(kicad_mod, x, y0, dy, y1, layer, width, keepouts=[], roun=0.001):
     #print("addVDLineWithKeepout",x)
-    y=min(y0,y1)
-    lines=[]
-
-    on=True
-    while (y+dy)<=max(y0,y1):
-        if (on):
-            lines.append([y,y+dy])
-        y=y+dy
-        on=not on
-    if (y<max(y0,y1)) and on:
-        lines.append([y, max(y0,y1)])
-
-    linesout = applyKeepouts(lines, x, 2, 0, keepouts)
+    lines = dashIntervals(min(y0, y1), max(y0, y1), dy, dy)
+
+    linesout = clipVerticalLines(lines, x, keepouts)
     for l in linesout:
         kicad_mod.append(Line(start=[roundG(x, roun), roundG(l[0], roun)], end=[roundG(x, roun), roundG(l[1], roun)], layer=layer, width=width))
 
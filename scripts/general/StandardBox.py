@@ -474,7 +474,7 @@ class StandardBox(Node):
                     px1 = 10000000.0
                     px2 = 10000000.0
                     foundPad = False
-                    for n in self.pad:
+                    for n in self._padsNear(x1_t, x2_t, y1_t, y1_t):
                         n_min_x = n.at.x - (n.size.x / 2.0)
                         n_min_y = n.at.y - (n.size.y / 2.0)
                         n_max_x = n_min_x + n.size.x
@@ -629,7 +629,7 @@ class StandardBox(Node):
                     py2 = 10000000.0
                     foundPad = False
 
-                    for n in self.pad:
+                    for n in self._padsNear(x1_t, x1_t, y1_t, y2_t):
                         n_min_x = n.at.x - (n.size.x / 2.0)
                         n_min_y = n.at.y - (n.size.y / 2.0)
                         n_max_x = n_min_x + n.size.x
@@ -747,7 +747,7 @@ class StandardBox(Node):
                     py2 = 10000000.0
                     foundPad = False
 
-                    for n in self.pad:
+                    for n in self._padsNear(x1_t, x2_t, y1_t, y1_t):
                         n_min_x = n.at.x - (n.size.x / 2.0)
                         n_min_y = n.at.y - (n.size.y / 2.0)
                         n_max_x = n_min_x + n.size.x
@@ -918,7 +918,7 @@ class StandardBox(Node):
                     py2 = 10000000.0
                     foundPad = False
 
-                    for n in self.pad:
+                    for n in self._padsNear(x1_t, x1_t, y1_t, y2_t):
                         n_min_x = n.at.x - (n.size.x / 2.0)
                         n_min_y = n.at.y - (n.size.y / 2.0)
                         n_max_x = n_min_x + n.size.x
@@ -1049,3 +1049,17 @@ class StandardBox(Node):
                         self.footprint.append(new_pad)
                         self.pad.append(new_pad)
             #
+        #
+        # Index the pads, the silk and courtyard lines only check the pads near them
+        #
+        self.pad_index = SpatialIndex()
+        for n in self.pad:
+            dd = max(0.26, n.solder_mask_margin)
+            self.pad_index.insert(n, (n.at.x - (n.size.x / 2.0) - dd, n.at.x + (n.size.x / 2.0) + dd,
+                                      n.at.y - (n.size.y / 2.0) - dd, n.at.y + (n.size.y / 2.0) + dd))
+
+    def _padsNear(self, x1, x2, y1, y2):
+        #
+        # Pads (including a clearance of up to 0.26 mm or their solder mask margin) touching the given area
+        #
+        return self.pad_index.query(min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+# Generators of the footprint generation service (see KicadModTree.service)
+#
+#   python -m KicadModTree.service --generators scripts/service_generators.py
+#
+# Every generator takes either the parameters of a device (like one entry of a size definition file):
+#   {"device": {...}, "header": {"library_Suffix": "SO"}}
+# or the name of an entry of a size definition file of the generator:
+#   {"definition_file": "soic.yaml", "entry": "SOIC-8_3.9x4.9mm_P1.27mm"}
+# Optional parameters: "density" (L, N, M) and "thermal_vias" (true: variant with thermal vias)
+
+import os
+import importlib.util
+
+from KicadModTree.util.config_loader import loadYaml, loadConfiguration
+
+scripts_dir = os.path.dirname(os.path.realpath(__file__))
+global_config = os.path.join(scripts_dir, 'tools', 'global_config_files', 'config_KLCv3.0.yaml')
+package_config = os.path.join(scripts_dir, 'Packages', 'package_config_KLCv3.yaml')
+
+
+def loadScript(path):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def deviceParameters(params, definition_dir):
+    if 'device' in params:
+        return params['device'], params.get('header', {})
+    definitions = loadYaml(os.path.join(definition_dir, params['definition_file']))
+    return definitions[params['entry']], definitions.get('FileHeader', {})
+
+
+def registerGenerators(registry):
+    gullwing_dir = os.path.join(scripts_dir, 'Packages', 'Package_Gullwing__QFP_SOIC_SO')
+    gullwing = loadScript(os.path.join(gullwing_dir, 'ipc_gullwing_generator.py'))
+
+    def generateGullwing(params):
+        device, header = deviceParameters(params, os.path.join(gullwing_dir, 'size_definitions'))
+        return gullwing.generate(loadConfiguration(global_config, package_config), device, header,
+                                 density=params.get('density', 'N'),
+                                 with_thermal_vias=params.get('thermal_vias', False))
+
+    no_lead_dir = os.path.join(scripts_dir, 'Packages', 'Package_NoLead__DFN_QFN_LGA_SON')
+    no_lead = loadScript(os.path.join(no_lead_dir, 'ipc_noLead_generator.py'))
+
+    def generateNoLead(params):
+        device, _ = deviceParameters(params, os.path.join(no_lead_dir, 'size_definitions'))
+        return no_lead.generate(loadConfiguration(global_config, package_config), device, params.get('entry'),
+                                density=params.get('density', 'N'),
+                                with_thermal_vias=params.get('thermal_vias', False))
+
+    registry.register('ipc_gullwing', generateGullwing, 'QFP, SOIC, SO and other gullwing packages')
+    registry.register('ipc_noLead', generateNoLead, 'DFN, QFN, LGA and SON packages')
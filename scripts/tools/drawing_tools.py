@@ -55,78 +55,25 @@ def addKeepoutRect(x, y, w, h):
     return [[x - w / 2, x + w / 2, y - h / 2, y + h / 2]]
 
 
-# returns a series of rectangle that lie around the circular pad around (x,y) with radius w=h
-# if w!=h, addKeepoutRect() is called
+# returns a single keepout for the round pad around (x,y): a circle with radius w/2=h/2 or,
+# if w!=h, an oval (rectangle with rounded ends)
 def addKeepoutRound(x, y, w, h):
     if w != h:
-        return addKeepoutRect(x, y, w, h)
+        return [KeepoutRoundRect(x - w / 2, x + w / 2, y - h / 2, y + h / 2, radius=min(w, h) / 2)]
     else:
-        res = []
-        Nrects = 16
-        r = max(h, w) / 2
-        yysum = 0
-        for ya in frange(0, r, r / Nrects):
-            a = math.fabs(math.asin(ya / r) / math.pi * 180)
-            yy = math.fabs(r * math.sin(a / 180.0 * math.pi))
-            xx = math.fabs(r * math.cos(a / 180.0 * math.pi))
-            if (xx > 0):
-                res.append([x - xx - 0.015, x + xx + 0.015, y - yy - r / Nrects - 0.015, y - yy + .015])
-                res.append([x - xx - 0.015, x + xx + 0.015, y + yy - 0.015, y + yy + r / Nrects + 0.015])
-            yysum = yysum + yy
-        return res
+        return [KeepoutCircle(x, y, w / 2)]
 
 # internal method for keepout-processing
 def applyKeepouts(lines_in, y, xi, yi, keepouts):
-    # print("  applyKeepouts(\n  lines_in=", lines_in, "  \n  y=", y, "   \n  xi=", xi, "   yi=", yi, "   \n  keepouts=", keepouts, ")")
-    lines = lines_in
-    changes = True
-    while (changes):
-        changes = False
-        for ko in keepouts:
-            ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-            if (ko[yi + 0] <= y) and (y <= ko[yi + 1]):
-                # print("    INY: koy=", [ko[yi + 0], ko[yi + 1]], "  y=", y, "):             kox=", [ko[xi + 0], ko[xi + 1]])
-                for li in reversed(range(0, len(lines))):
-                    l = lines[li]
-                    if (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (l[1] >= ko[xi + 0]) and (
-                                l[1] <= ko[xi + 1]):  # Line completely inside -> remove
-                        lines.pop(li)
-                        # print("      H1: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, ")")
-                        changes = True
-                    elif (l[0] >= ko[xi + 0]) and (l[0] <= ko[xi + 1]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts inside, but ends outside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H2: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [ko[xi+1], l[1]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (l[1] <= ko[xi + 1]) and (
-                                l[1] >= ko[
-                                    xi + 0]):  # Line starts outside, but ends inside -> remove and add shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        # print("      H3: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]])
-                        changes = True
-                    elif (l[0] < ko[xi + 0]) and (
-                                l[1] > ko[
-                                    xi + 1]):  # Line starts outside, and ends outside -> remove and add 2 shortened
-                        lines.pop(li)
-                        lines.append([l[0], ko[xi + 0]])
-                        lines.append([ko[xi + 1], l[1]])
-                        # print("      H4: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ", [l[0], ko[xi+0]], [ko[xi+1], l[1]])
-                        changes = True
-                        # else:
-                        # print("      USE: ko=", [ko[xi+0],ko[xi+1]], "  li=", li, "   l=", l, "): ")
-        if changes:
-            break
-
-    return lines
+    if xi == 0:
+        return clipHorizontalLines(lines_in, y, keepouts)
+    else:
+        return clipVerticalLines(lines_in, y, keepouts)
 
 # gives True if the given point (x,y) is contained in any keepout
 def containedInAnyKeepout(x,y, keepouts):
     for ko in keepouts:
-        ko = [min(ko[0], ko[1]), max(ko[0], ko[1]), min(ko[2], ko[3]), max(ko[2], ko[3])]
-        if x>=ko[0] and x<=ko[1] and y>=ko[2] and y<=ko[3]:
+        if toKeepout(ko).contains(x, y):
             #print("HIT!")
             return True
     #print("NO HIT ",x,y)
@@ -135,9 +82,14 @@ def containedInAnyKeepout(x,y, keepouts):
 # draws the keepouts
 def debug_draw_keepouts(kicad_modg, keepouts):
     for ko in keepouts:
-        kicad_modg.append(RectLine(start=[ko[0],ko[2]],
-                                  end=[ko[1],ko[3]],
-                                  layer='F.Mask', width=0.01))
+        ko = toKeepout(ko)
+        if isinstance(ko, KeepoutCircle):
+            kicad_modg.append(Circle(center=[ko.x, ko.y], radius=ko.radius, layer='F.Mask', width=0.01))
+        else:
+            x_min, x_max, y_min, y_max = ko.boundingBox()
+            kicad_modg.append(RectLine(start=[x_min, y_min],
+                                      end=[x_max, y_max],
+                                      layer='F.Mask', width=0.01))
 
 # split a horizontal line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.001, dashed=False):
@@ -145,145 +97,77 @@ def addHLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.
         addHDLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts, roun)
     else:
         # print("addHLineWithKeepout",y)
-        linesout = applyKeepouts([[min(x0, x1), max(x0, x1)]], y, 0, 2, keepouts)
+        linesout = clipHorizontalLines([[min(x0, x1), max(x0, x1)]], y, keepouts)
         for l in linesout:
             kicad_mod.append(
                 Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)], layer=layer,width=width))
 
 # draw a circle minding the keepouts
 def addCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
-    dalpha = 2 * 3.1415 / (360)
-    a = 0
-    start=0
-    startx=x + radius * math.sin(0)
-    starty=y + radius * math.cos(0)
-    hasToDraw=False
-    noneUsed=True
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            startx=x1; starty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-
-        a = a + dalpha
-    if noneUsed:
+    arcs = clipCircle([x, y], radius, keepouts)
+    if len(arcs) == 1 and arcs[0][1] >= 360:
         kicad_mod.append(
             Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+    else:
+        addClippedArcs(kicad_mod, x, y, radius, arcs, layer, width, roun)
+
+# internal method to draw the visible pieces returned by clipArc()/clipCircle()
+def addClippedArcs(kicad_mod, x, y, radius, arcs, layer, width, roun=0.001):
+    for start_angle, angle in arcs:
+        startx = x + radius * math.cos(math.radians(start_angle))
+        starty = y + radius * math.sin(math.radians(start_angle))
+        kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)],
+                             angle=angle, layer=layer, width=width))
 
 # draw an arc
 def addArcByAngles(kicad_mod, x, y, radius, angle_start, angle_end, layer, width, roun=0.001):
-    startx = x + radius * math.sin(angle_start/180*3.1415)
-    starty = y + radius * math.cos(angle_start/180*3.1415)
+    startx = x + radius * math.sin(math.radians(angle_start))
+    starty = y + radius * math.cos(math.radians(angle_start))
     kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=-(angle_end-angle_start), layer=layer, width=width))
 
 # draw an arc minding the keepouts
 def addArcByAnglesWithKeepout(kicad_mod, x, y, radius, angle_start, angle_end, layer, width, keepouts=[], roun=0.001):
-    startx = x + radius * math.sin(angle_start/180*3.1415)
-    starty = y + radius * math.cos(angle_start/180*3.1415)
+    startx = x + radius * math.sin(math.radians(angle_start))
+    starty = y + radius * math.cos(math.radians(angle_start))
     addArcWithKeepout(kicad_mod, x, y, startx, starty, -(angle_end-angle_start), layer, width, keepouts, roun)
 
 # draw an arc minding the keepouts
 def addArcWithKeepout(kicad_mod, x, y, startx, starty, angle, layer, width, keepouts=[], roun=0.001):
-    dalpha = angle/180*3.1415 / (360)
-    radius=math.sqrt(sqr(x-startx)+sqr(y-starty));
-    a = math.asin((startx-x)/radius)
-    if starty<0:
-        a=a+3.1415/2
-    astart=a;
-    aend=astart+angle/180*3.1415
-    start=astart
-    #print(radius, astart/3.1415*180, aend/3.1415*180)
-    istartx=x + radius * math.sin(a)
-    istarty=y + radius * math.cos(a)
-    hasToDraw=False
-    noneUsed=True
-    while a < aend:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-
-        if containedInAnyKeepout(x1,y1, keepouts):
-            if hasToDraw and math.fabs(a-start)>0:
-                #print('DRAW ',x1,y1)
-                kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
-            hasToDraw = False
-            istartx=x1; istarty=y1; start=a
-            noneUsed = False
-        else:
-            hasToDraw = True
-        #print(a, dalpha, hasToDraw, noneUsed)
-        a = a + dalpha
-    if noneUsed:
+    radius = math.sqrt(sqr(x - startx) + sqr(y - starty))
+    start_angle = math.degrees(math.atan2(starty - y, startx - x))
+    arcs = clipArc([x, y], radius, start_angle, angle, keepouts)
+    if len(arcs) == 1 and abs(arcs[0][1]) >= abs(angle):
         kicad_mod.append(
             Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(startx, roun), roundG(starty, roun)], angle=angle, layer=layer, width=width))
-    elif hasToDraw and math.fabs(a - start) > 0:
-        kicad_mod.append( Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(istartx, roun), roundG(istarty, roun)], angle=-1*(a - start)/3.1415*180, layer=layer, width=width))
+    else:
+        addClippedArcs(kicad_mod, x, y, radius, arcs, layer, width, roun)
 
 # draw an ellipse with one axis along x-axis and one axis along y-axis and given width/height
 def addEllipse(kicad_mod, x, y, w, h, layer, width, roun=0.001):
     factor=h/w
     alpha=math.atan(h/w)*2
     radius=w/2/math.sin(alpha)
-    addArcByAngles(kicad_mod=kicad_mod, x=x, y=y+radius*math.cos(alpha), radius=radius, angle_start=180-alpha/3.1415*180, angle_end=180+alpha/3.1415*180, layer=layer, width=width, roun=roun);
-    addArcByAngles(kicad_mod=kicad_mod, x=x, y=y-radius*math.cos(alpha), radius=radius, angle_start=alpha/3.1415*180, angle_end=-alpha/3.1415*180, layer=layer, width=width, roun=roun);
+    addArcByAngles(kicad_mod=kicad_mod, x=x, y=y+radius*math.cos(alpha), radius=radius, angle_start=180-math.degrees(alpha), angle_end=180+math.degrees(alpha), layer=layer, width=width, roun=roun);
+    addArcByAngles(kicad_mod=kicad_mod, x=x, y=y-radius*math.cos(alpha), radius=radius, angle_start=math.degrees(alpha), angle_end=-math.degrees(alpha), layer=layer, width=width, roun=roun);
 
 # draw an ellipse with one axis along x-axis and one axis along y-axis and given width/height
 def addEllipseWithKeepout(kicad_mod, x, y, w, h, layer, width, keepouts=[], roun=0.001):
     factor=h/w
     alpha=math.atan(h/w)*2
     radius=w/2/math.sin(alpha)
-    addArcByAnglesWithKeepout(kicad_mod=kicad_mod, x=x, y=y+radius*math.cos(alpha), radius=radius, angle_start=180-alpha/3.1415*180, angle_end=180+alpha/3.1415*180, keepouts=keepouts, layer=layer, width=width, roun=roun);
-    addArcByAnglesWithKeepout(kicad_mod=kicad_mod, x=x, y=y-radius*math.cos(alpha), radius=radius, angle_start=alpha/3.1415*180, angle_end=-alpha/3.1415*180, keepouts=keepouts, layer=layer, width=width, roun=roun);
+    addArcByAnglesWithKeepout(kicad_mod=kicad_mod, x=x, y=y+radius*math.cos(alpha), radius=radius, angle_start=180-math.degrees(alpha), angle_end=180+math.degrees(alpha), keepouts=keepouts, layer=layer, width=width, roun=roun);
+    addArcByAnglesWithKeepout(kicad_mod=kicad_mod, x=x, y=y-radius*math.cos(alpha), radius=radius, angle_start=math.degrees(alpha), angle_end=-math.degrees(alpha), keepouts=keepouts, layer=layer, width=width, roun=roun);
 
-# split a circle so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
+# split a dashed circle so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts=[], roun=0.001):
-    dalpha = 2 * 3.1415 / (2 * 3.1415 * radius / (6 * width))
-    a = 0
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-        x2 = x + radius * math.sin(a + dalpha / 2)
-        y2 = y + radius * math.cos(a + dalpha / 2)
-        ok=True
-        aa=a
-        while aa<a+dalpha and ok:
-            xx = x + radius * math.sin(aa)
-            yy = y + radius * math.cos(aa)
-            if containedInAnyKeepout(xx, yy, keepouts):
-                ok=False
-            aa=aa+dalpha/20
-        if ok: kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
-                             angle=-1*dalpha / 2 / 3.1415 * 180, layer=layer, width=width))
-        a = a + dalpha
+    # dashes run clockwise, starting at the bottom of the circle
+    addClippedArcs(kicad_mod, x, y, radius, dashArc([x, y], radius, 90, -360, 3 * width, 3 * width, keepouts),
+                   layer, width, roun)
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addLineWithKeepout(kicad_mod, x1, y1, x2,y2, layer, width, keepouts=[], roun=0.001):
-    dx=(x2-x1)/200
-    dy=(y2-y1)/200
-    x=x1; y=y1
-    xs=x1; ys=y1;
-    hasToDraw=not containedInAnyKeepout(x, y, keepouts)
-    didDrawAny=False
-    for n in range(0,200):
-        if containedInAnyKeepout(x+dx, y+dy, keepouts):
-            if hasToDraw:
-                didDrawAny=True
-                kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x, roun), roundG(y, roun)], layer=layer, width=width))
-            xs=x+2*dx; ys=y+2*dy; hasToDraw=False
-        else:
-            hasToDraw = True
-
-        x=x+dx; y=y+dy
-    if hasToDraw and ((xs!=x2 and ys!=y2) or (not didDrawAny)):
-        kicad_mod.append(Line(start=[roundG(xs, roun), roundG(ys, roun)], end=[roundG(x2, roun), roundG(y2, roun)], layer=layer, width=width))
+    for start, end in clipSegment([x1, y1], [x2, y2], keepouts):
+        kicad_mod.append(Line(start=[roundG(start[0], roun), roundG(start[1], roun)], end=[roundG(end[0], roun), roundG(end[1], roun)], layer=layer, width=width))
 
 
 # split an arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
@@ -296,29 +180,20 @@ def addPolyLineWithKeepout(kicad_mod, poly, layer, width, keepouts=[], roun=0.00
 
 # add a dashed circle
 def addDCircle(kicad_mod, x, y, radius, layer, width, roun=0.001):
-    dalpha = 2 * 3.1415 / (2 * 3.1415 * radius / (6 * width))
-    a = 0
-    while a < 2 * 3.1415:
-        x1 = x + radius * math.sin(a)
-        y1 = y + radius * math.cos(a)
-        x2 = x + radius * math.sin(a + dalpha / 2)
-        y2 = y + radius * math.cos(a + dalpha / 2)
-        kicad_mod.append(Arc(center=[roundG(x, roun), roundG(y, roun)], start=[roundG(x1, roun), roundG(y1, roun)],
-                             angle=dalpha / 2 / 3.1415 + 180, layer=layer, width=width))
-        a = a + dalpha
+    addDCircleWithKeepout(kicad_mod, x, y, radius, layer, width, [], roun)
 
 # draw a circle with a screw slit under 45 degrees
 def addSlitScrew(kicad_mod, x, y, radius, layer, width, roun=0.001):
     kicad_mod.append(Circle(center=[roundG(x, roun), roundG(y, roun)], radius=radius, layer=layer, width=width))
     da = 5
-    dx1 = 0.99 * radius * math.sin((135 - da) / 180 * 3.1415)
-    dy1 = 0.99 * radius * math.cos((135 - da) / 180 * 3.1415)
-    dx2 = 0.99 * radius * math.sin((135 + da) / 180 * 3.1415)
-    dy2 = 0.99 * radius * math.cos((135 + da) / 180 * 3.1415)
-    dx3 = 0.99 * radius * math.sin((315 - da) / 180 * 3.1415)
-    dy3 = 0.99 * radius * math.cos((315 - da) / 180 * 3.1415)
-    dx4 = 0.99 * radius * math.sin((315 + da) / 180 * 3.1415)
-    dy4 = 0.99 * radius * math.cos((315 + da) / 180 * 3.1415)
+    dx1 = 0.99 * radius * math.sin(math.radians(135 - da))
+    dy1 = 0.99 * radius * math.cos(math.radians(135 - da))
+    dx2 = 0.99 * radius * math.sin(math.radians(135 + da))
+    dy2 = 0.99 * radius * math.cos(math.radians(135 + da))
+    dx3 = 0.99 * radius * math.sin(math.radians(315 - da))
+    dy3 = 0.99 * radius * math.cos(math.radians(315 - da))
+    dx4 = 0.99 * radius * math.sin(math.radians(315 + da))
+    dy4 = 0.99 * radius * math.cos(math.radians(315 + da))
     # print(x,y,dx1,dy1,dx4,dy4)
     kicad_mod.append(Line(start=[roundG(x + dx1, roun), roundG(y + dy1, roun)],
                           end=[roundG(x + dx4, roun), roundG(y + dy4, roun)], layer=layer, width=width))
@@ -329,14 +204,14 @@ def addSlitScrew(kicad_mod, x, y, radius, layer, width, roun=0.001):
 def addSlitScrewWithKeepouts(kicad_mod, x, y, radius, layer, width, keepouts, roun=0.001):
     addCircleWithKeepout(kicad_mod, x, y, radius, layer, width, keepouts, roun)
     da = 5
-    dx1 = 0.99 * radius * math.sin((135 - da) / 180 * 3.1415)
-    dy1 = 0.99 * radius * math.cos((135 - da) / 180 * 3.1415)
-    dx2 = 0.99 * radius * math.sin((135 + da) / 180 * 3.1415)
-    dy2 = 0.99 * radius * math.cos((135 + da) / 180 * 3.1415)
-    dx3 = 0.99 * radius * math.sin((315 - da) / 180 * 3.1415)
-    dy3 = 0.99 * radius * math.cos((315 - da) / 180 * 3.1415)
-    dx4 = 0.99 * radius * math.sin((315 + da) / 180 * 3.1415)
-    dy4 = 0.99 * radius * math.cos((315 + da) / 180 * 3.1415)
+    dx1 = 0.99 * radius * math.sin(math.radians(135 - da))
+    dy1 = 0.99 * radius * math.cos(math.radians(135 - da))
+    dx2 = 0.99 * radius * math.sin(math.radians(135 + da))
+    dy2 = 0.99 * radius * math.cos(math.radians(135 + da))
+    dx3 = 0.99 * radius * math.sin(math.radians(315 - da))
+    dy3 = 0.99 * radius * math.cos(math.radians(315 - da))
+    dx4 = 0.99 * radius * math.sin(math.radians(315 + da))
+    dy4 = 0.99 * radius * math.cos(math.radians(315 + da))
     # print(x,y,dx1,dy1,dx4,dy4)
     addLineWithKeepout(kicad_mod,x + dx1, y + dy1, x + dx4, y + dy4, layer, width, keepouts)
     addLineWithKeepout(kicad_mod, x + dx2, y + dy2, x + dx3, y + dy3, layer, width, keepouts)
@@ -395,7 +270,7 @@ def addVLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.
         addVDLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts, roun)
     else:
         # print("addVLineWithKeepout",x)
-        linesout = applyKeepouts([[min(y0, y1), max(y0, y1)]], x, 2, 0, keepouts)
+        linesout = clipVerticalLines([[min(y0, y1), max(y0, y1)]], x, keepouts)
         for l in linesout:
             kicad_mod.append(
                 Line(start=[roundG(x, roun), roundG(l[0], roun)], end=[roundG(x, roun), roundG(l[1], roun)], layer=layer,
@@ -403,19 +278,23 @@ def addVLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.
 
 # split a dashed horizontal line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addHDLineWithKeepout(kicad_mod, x0, x1, y, layer, width, keepouts=[], roun=0.001):
-    dx=3*width
-    x=min(x0,x1)
-    while x<max(x0,x1):
-        addHLineWithKeepout(kicad_mod, x,min(x+dx,x1), y, layer, width, keepouts, roun)
-        x=x+dx*2
+    lines = dashIntervals(min(x0, x1), max(x0, x1), 3 * width, 3 * width)
+    for l in clipHorizontalLines(lines, y, keepouts):
+        kicad_mod.append(
+            Line(start=[roundG(l[0], roun), roundG(y, roun)], end=[roundG(l[1], roun), roundG(y, roun)], layer=layer,width=width))
 
 # split a dashed vertical line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
 def addVDLineWithKeepout(kicad_mod, x, y0, y1, layer, width, keepouts=[], roun=0.001):
-    dy = 3 * width
-    y = min(y0, y1)
-    while y < max(y0, y1):
-        addVLineWithKeepout(kicad_mod, x, y, min(y1,y+dy), layer, width, keepouts, roun)
-        y = y + dy * 2
+    lines = dashIntervals(min(y0, y1), max(y0, y1), 3 * width, 3 * width)
+    for l in clipVerticalLines(lines, x, keepouts):
+        kicad_mod.append(
+            Line(start=[roundG(x, roun), roundG(l[0], roun)], end=[roundG(x, roun), roundG(l[1], roun)], layer=layer,
+                 width=width))
+
+# split a dashed arbitrary line so it does not interfere with keepout areas defined as [[x0,x1,y0,y1], ...]
+def addDLineWithKeepout(kicad_mod, x1, y1, x2, y2, layer, width, keepouts=[], roun=0.001):
+    for start, end in dashSegment([x1, y1], [x2, y2], 3 * width, 3 * width, keepouts):
+        kicad_mod.append(Line(start=[roundG(start[0], roun), roundG(start[1], roun)], end=[roundG(end[0], roun), roundG(end[1], roun)], layer=layer, width=width))
 
 
 
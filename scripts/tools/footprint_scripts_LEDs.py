@@ -193,7 +193,7 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         kicad_modg.append(Circle(center=[0, 0], radius=d2_fab / 2, layer='F.Fab', width=lw_fab))
         xmark = d2_fab / 2
         ymark = math.sqrt(d_fab * d_fab / 4 - xmark * xmark)
-        alpha = 360 - 2 * math.atan(ymark / xmark) / 3.1415 * 180
+        alpha = 360 - 2 * math.atan(ymark / xmark) * 180 / math.pi
         kicad_modg.append(Arc(center=[0, 0], start=[-xmark, -ymark], angle=alpha, layer='F.Fab', width=lw_fab))
         kicad_modg.append(Line(start=[-xmark, -ymark], end=[-xmark, ymark], angle=alpha, layer='F.Fab', width=lw_fab))
     if type == "round_simple":
@@ -212,7 +212,7 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         ystart = 0
         xstart = math.sqrt(r * r - ystart * ystart)
         ycenter = h / 2 - r
-        alpha = 180 - 2 * math.atan(math.fabs(ycenter) / xstart) / 3.1415 * 180
+        alpha = 180 - 2 * math.atan(math.fabs(ycenter) / xstart) * 180 / math.pi
         kicad_modg.append(Arc(center=[0, -ycenter], start=[-xstart, ystart], angle=alpha, layer='F.Fab', width=lw_fab))
         kicad_modg.append(Arc(center=[0, ycenter], start=[-xstart, -ystart], angle=-alpha, layer='F.Fab', width=lw_fab))
     
@@ -239,8 +239,8 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         ymark = math.sqrt(d_slk * d_slk / 4 - xmark * xmark)
         ypad = pady / 2 + slk_offset + lw_slk
         xpad = math.sqrt(d_slk * d_slk / 4 - ypad * ypad)
-        alphamark = math.atan(ymark / xmark) / 3.1415 * 180
-        alphapad = math.atan(ypad / xpad) / 3.1415 * 180
+        alphamark = math.atan(ymark / xmark) * 180 / math.pi
+        alphapad = math.atan(ypad / xpad) * 180 / math.pi
         alpha = 180 - alphamark
         if containedInAnyKeepout(xmark, 0.1, keepouts) or containedInAnyKeepout(d_fab / 2, 0.1, keepouts):
             alpha = alpha - alphapad
@@ -250,7 +250,7 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         
         ypad = pady / 2 + slk_offset + lw_slk
         xpad = math.sqrt(d2_fab * d2_fab / 4 - ypad * ypad)
-        alphapad = math.atan(ypad / xpad) / 3.1415 * 180
+        alphapad = math.atan(ypad / xpad) * 180 / math.pi
         
         alpha = 180
         if containedInAnyKeepout(d2_fab / 2, 0.1, keepouts) or containedInAnyKeepout(-d2_fab / 2, 0.1, keepouts):
@@ -270,7 +270,7 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
             xpad = math.sqrt(r * r / 4 - ypad * ypad)
             xpads.append(xpad)
             ypads.append(ypad)
-            alphapad = math.atan(ypad / xpad) / 3.1415 * 180
+            alphapad = math.atan(ypad / xpad) * 180 / math.pi
             
             alpha = 180
             if containedInAnyKeepout(r / 2, 0.1, keepouts) or containedInAnyKeepout(-r / 2, 0.1, keepouts):
@@ -295,7 +295,7 @@ def makeLEDRadial(rm, w, h, ddrill, win=0, rin=0, pins=2, type="round", x_3d=[0,
         ystart = 0
         xstart = math.sqrt(r * r - ystart * ystart)
         ycenter = h_slk / 2 - r
-        alpha = 180 - 2 * math.atan(math.fabs(ycenter) / xstart) / 3.1415 * 180
+        alpha = 180 - 2 * math.atan(math.fabs(ycenter) / xstart) * 180 / math.pi
         kicad_modg.append(
             Arc(center=[0, -ycenter], start=[-xstart, ystart], angle=alpha, layer='F.SilkS', width=lw_slk))
         kicad_modg.append(
@@ -660,7 +660,7 @@ def makeCrystalHC49Vert(footprint_name, pins, rm, pad_size, ddrill, pack_width,
         l_crt = min(-pad[0]/2, l_fab) - crt_offset
         w_crt = max(rm+pad[0], w_fab)+2*slk_offset
         incomplete_slk = True
-        angle_slk=math.acos((pad[1]/2+slk_offset)/(h_slk/2))/3.1415*180
+        angle_slk=math.acos((pad[1]/2+slk_offset)/(h_slk/2))*180/math.pi
     
     print(fpname)
     
@@ -790,11 +790,11 @@ def makeCrystalRoundVert(footprint_name, rm, pad_size, ddrill, pack_diameter,
     elif d_slk * d_slk / 4 >= rm * rm / 4:
         st_slk = -max(math.sqrt(d_slk * d_slk / 4 - rm * rm / 4), pad[1] / 2 + slk_offset)
         alpha_slk = 2 * (
-        90 - math.fabs(180 / 3.1415 * math.atan(math.fabs(st_slk - centerpos[1]) / math.fabs(sl_slk - centerpos[0]))))
+        90 - math.fabs(180 / math.pi * math.atan(math.fabs(st_slk - centerpos[1]) / math.fabs(sl_slk - centerpos[0]))))
     else:
         st_slk = -pad[1] / 2 - slk_offset
         alpha_slk = 2 * (
-        90 - math.fabs(180 / 3.1415 * math.atan(math.fabs(st_slk - centerpos[1]) / math.fabs(sl_slk - centerpos[0]))))
+        90 - math.fabs(180 / math.pi * math.atan(math.fabs(st_slk - centerpos[1]) / math.fabs(sl_slk - centerpos[0]))))
     
     d_crt = max(rm + pad[0], d_slk) + 2 * crt_offset
     cl_crt = cl_fab
@@ -1,7 +1,14 @@
 from __future__ import division
 import math
+import numbers
 import re
 
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 def roundToBase(value, base):
     return round(value/base) * base
 
@@ -312,3 +319,244 @@ def ipc_pad_center_plus_size(ipc_data, ipc_round_base, manf_tol,
     Xmax = roundToBase(Xmax, ipc_round_base['side'])
 
     return Gmin, Zmax, Xmax
+
+# Array versions of the calculators.
+#
+# They take columns of dimensions (one element per device) and return columns of Gmin, Zmax and Xmax, which makes
+# parameter studies and the generation of whole families a single call. The results are the same as the ones of the
+# scalar functions above, element by element.
+#
+# ipc_data can also be a list of density sets (for example [ipc['least'], ipc['nominal'], ipc['most']]), then the
+# results get an additional first axis with one row per density.
+
+def roundToBaseArray(value, base):
+    # numpy.round also rounds half to even, like round()
+    return numpy.round(value/base) * base
+
+class TolerancedSizeArray():
+    def __init__(self, minimum=None, nominal=None, maximum=None, tolerance=None, unit=None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the array calculators")
+
+        if nominal is not None:
+            nominal = numpy.asarray(nominal, dtype=float)
+        else:
+            if minimum is None or maximum is None:
+                raise KeyError("Either nominal or minimum and maximum must be given")
+            nominal = (numpy.asarray(minimum, dtype=float) + numpy.asarray(maximum, dtype=float))/2
+
+        if minimum is not None and maximum is not None:
+            minimum = numpy.asarray(minimum, dtype=float)
+            maximum = numpy.asarray(maximum, dtype=float)
+        elif tolerance is not None:
+            tolerance = numpy.asarray(tolerance, dtype=float)
+            if tolerance.ndim > 0 and len(tolerance) == 2:
+                # a pair of tolerances (for all devices, or one row per device), like in TolerancedSize
+                first, second = tolerance[0], tolerance[1]
+                minimum = numpy.where(first < 0, nominal + first,
+                                      numpy.where(second < 0, nominal + second, nominal - first))
+                maximum = numpy.where(first < 0, nominal + second,
+                                      numpy.where(second < 0, nominal + first, nominal + second))
+            else:
+                # a symmetric tolerance, for all devices or one per device
+                minimum = nominal - tolerance
+                maximum = nominal + tolerance
+        else:
+            minimum = nominal
+            maximum = nominal
+
+        if numpy.any(maximum < minimum):
+            raise ValueError("Maximum is smaller than minimum (first at index {}). Tolerance ranges given wrong or "
+                             "parameters confused.".format(int(numpy.argmax(maximum < minimum))))
+
+        self.minimum = TolerancedSize.to_metric(minimum, unit)
+        self.nominal = TolerancedSize.to_metric(nominal, unit)
+        self.maximum = TolerancedSize.to_metric(maximum, unit)
+
+        self.ipc_tol = self.maximum - self.minimum
+        self.ipc_tol_RMS = self.ipc_tol
+        self.maximum_RMS = self.maximum
+        self.minimum_RMS = self.minimum
+
+    @staticmethod
+    def fromSizes(sizes):
+        # the RMS values are copied, sizes which are results of calculations keep their RMS tolerance
+        sizes = list(sizes)
+        result = TolerancedSizeArray(
+            minimum=[s.minimum for s in sizes],
+            nominal=[s.nominal for s in sizes],
+            maximum=[s.maximum for s in sizes]
+            )
+        result.ipc_tol_RMS = numpy.array([s.ipc_tol_RMS for s in sizes], dtype=float)
+        result.maximum_RMS = numpy.array([s.maximum_RMS for s in sizes], dtype=float)
+        result.minimum_RMS = numpy.array([s.minimum_RMS for s in sizes], dtype=float)
+        return result
+
+    @staticmethod
+    def fromYaml(entries, base_name=None, unit=None):
+        return TolerancedSizeArray.fromSizes(
+            TolerancedSize.fromYaml(entry, base_name=base_name, unit=unit) for entry in entries)
+
+    def __len__(self):
+        return len(self.nominal)
+
+    def __getitem__(self, index):
+        # a single device as TolerancedSize
+        result = TolerancedSize(minimum=float(self.minimum[index]), nominal=float(self.nominal[index]),
+                                maximum=float(self.maximum[index]))
+        result.ipc_tol_RMS = float(self.ipc_tol_RMS[index])
+        result.maximum_RMS = float(self.maximum_RMS[index])
+        result.minimum_RMS = float(self.minimum_RMS[index])
+        return result
+
+    def updateRMS(self, tolerances):
+        ipc_tol_RMS = 0
+        for t in tolerances:
+            ipc_tol_RMS = ipc_tol_RMS + numpy.square(t)
+
+        ipc_tol_RMS = numpy.sqrt(ipc_tol_RMS)
+        too_large = ipc_tol_RMS > self.ipc_tol
+        if numpy.any(too_large):
+            wrong = too_large & (roundToBaseArray(ipc_tol_RMS, 1e-6) > roundToBaseArray(self.ipc_tol, 1e-6))
+            if numpy.any(wrong):
+                index = int(numpy.argmax(wrong))
+                raise ValueError(
+                    "RMS tolerance larger than normal tolerance. Did you give the wrong tolerances?\n"
+                    "index: {} tol(RMS): {} tol: {}".format(index, ipc_tol_RMS[index], self.ipc_tol[index]))
+            # the discrepancy most likely comes from floating point errors. Ignore it.
+            ipc_tol_RMS = numpy.where(too_large, self.ipc_tol, ipc_tol_RMS)
+
+        self.ipc_tol_RMS = ipc_tol_RMS
+        self.maximum_RMS = self.maximum - (self.ipc_tol - self.ipc_tol_RMS)/2
+        self.minimum_RMS = self.minimum + (self.ipc_tol - self.ipc_tol_RMS)/2
+
+    @staticmethod
+    def _isScalar(other):
+        # numpy.float64 and 0-d arrays are what array calculations produce
+        return isinstance(other, numbers.Real) or (isinstance(other, numpy.ndarray) and other.ndim == 0)
+
+    @staticmethod
+    def _asArray(other):
+        if isinstance(other, TolerancedSize):
+            return TolerancedSizeArray.fromSizes([other])
+        return other
+
+    def __add__(self, other):
+        other = TolerancedSizeArray._asArray(other)
+        if TolerancedSizeArray._isScalar(other):
+            return TolerancedSizeArray(
+                minimum = self.minimum + other,
+                maximum = self.maximum + other
+                )
+
+        result = TolerancedSizeArray(
+            minimum = self.minimum + other.minimum,
+            maximum = self.maximum + other.maximum
+            )
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __sub__(self, other):
+        other = TolerancedSizeArray._asArray(other)
+        if TolerancedSizeArray._isScalar(other):
+            return TolerancedSizeArray(
+                minimum = self.minimum - other,
+                maximum = self.maximum - other
+                )
+
+        result = TolerancedSizeArray(
+            minimum = self.minimum - other.maximum,
+            maximum = self.maximum - other.minimum
+            )
+        result.updateRMS([self.ipc_tol_RMS, other.ipc_tol_RMS])
+        return result
+
+    def __mul__(self, other):
+        if not TolerancedSizeArray._isScalar(other):
+            raise NotImplementedError("Only multiplication with int and float is implemented right now.")
+        result = TolerancedSizeArray(
+            minimum = self.minimum*other,
+            maximum = self.maximum*other
+            )
+        result.updateRMS([self.ipc_tol_RMS*math.sqrt(other)])
+        return result
+
+    def __truediv__(self, other):
+        if not TolerancedSizeArray._isScalar(other):
+            raise NotImplementedError("Only division by int and float is implemented right now.")
+        result = TolerancedSizeArray(
+            minimum = self.minimum/other,
+            maximum = self.maximum/other
+            )
+        result.updateRMS([self.ipc_tol_RMS/math.sqrt(other)])
+        return result
+
+    def __str__(self):
+        return 'nom: {}, min: {}, max: {}  | min_rms: {}, max_rms: {}'.format(self.nominal, self.minimum, self.maximum, self.minimum_RMS, self.maximum_RMS)
+
+def _ipcColumn(ipc_data, key):
+    # a list of density sets becomes a column, which broadcasts against the device axis
+    if isinstance(ipc_data, dict):
+        return ipc_data[key]
+    return numpy.array([d[key] for d in ipc_data], dtype=float)[:, numpy.newaxis]
+
+def _ipcPadLimits(ipc_data, ipc_round_base, manf_tol, S, lead_outside, lead_width, heel_reduction=0):
+    F = manf_tol.get('manufacturing_tolerance', 0.1)
+    P = manf_tol.get('placement_tolerance', 0.05)
+
+    Gmin = S.maximum_RMS - 2*_ipcColumn(ipc_data, 'heel') + 2*numpy.asarray(heel_reduction) - numpy.sqrt(S.ipc_tol_RMS**2 + F**2 + P**2)
+
+    Zmax = lead_outside.minimum_RMS + 2*_ipcColumn(ipc_data, 'toe') + numpy.sqrt(lead_outside.ipc_tol_RMS**2 + F**2 + P**2)
+    Xmax = lead_width.minimum_RMS + 2*_ipcColumn(ipc_data, 'side') + numpy.sqrt(lead_width.ipc_tol_RMS**2 + F**2 + P**2)
+
+    Zmax = roundToBaseArray(Zmax, ipc_round_base['toe'])
+    Gmin = roundToBaseArray(Gmin, ipc_round_base['heel'])
+    Xmax = roundToBaseArray(Xmax, ipc_round_base['side'])
+
+    return Gmin, Zmax, Xmax
+
+def ipc_body_edge_inside_array(ipc_data, ipc_round_base, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, heel_reduction=0):
+    pull_back = TolerancedSizeArray(nominal=numpy.zeros(len(body_size)))
+
+    return ipc_body_edge_inside_pull_back_array(
+                ipc_data, ipc_round_base, manf_tol, body_size, lead_width,
+                lead_len=lead_len, lead_inside=lead_inside, pull_back=pull_back,
+                heel_reduction=heel_reduction
+                )
+
+def ipc_body_edge_inside_pull_back_array(ipc_data, ipc_round_base, manf_tol, body_size, lead_width,
+        lead_len=None, lead_inside=None, body_to_inside_lead_edge=None, pull_back=None, lead_outside=None, heel_reduction=0):
+    if lead_outside is None:
+        if pull_back is None:
+            raise KeyError("Either lead outside or pull back distance must be given")
+        lead_outside = body_size - pull_back*2
+
+    if lead_inside is not None:
+        S = lead_inside
+    elif lead_len is not None:
+        S = lead_outside - lead_len*2
+    elif body_to_inside_lead_edge is not None:
+        S = body_size - body_to_inside_lead_edge*2
+    else:
+        raise KeyError("either lead inside distance, lead to body edge or lead lenght must be given")
+
+    return _ipcPadLimits(ipc_data, ipc_round_base, manf_tol, S, lead_outside, lead_width, heel_reduction)
+
+def ipc_gull_wing_array(ipc_data, ipc_round_base, manf_tol, lead_width, lead_outside,
+        lead_len=None, lead_inside=None, heel_reduction=0):
+    if lead_inside is not None:
+        S = lead_inside
+    elif lead_len is not None:
+        S = lead_outside - lead_len*2
+    else:
+        raise KeyError("either lead inside distance or lead lenght must be given")
+
+    return _ipcPadLimits(ipc_data, ipc_round_base, manf_tol, S, lead_outside, lead_width, heel_reduction)
+
+def ipc_pad_center_plus_size_array(ipc_data, ipc_round_base, manf_tol,
+        center_position, lead_length, lead_width):
+    S = center_position*2 - lead_length
+    lead_outside = center_position*2 + lead_length
+
+    return _ipcPadLimits(ipc_data, ipc_round_base, manf_tol, S, lead_outside, lead_width)
@@ -28,6 +28,12 @@ setup(
     },
     packages=find_packages('.', exclude=["*tests*", "*examples*"]),
     test_suite='tests',
+    entry_points={
+        'console_scripts': ['kmt-build = KicadModTree.build.cli:main',
+                            'kmt-service = KicadModTree.service.cli:main',
+                            'kmt-golden = KicadModTree.build.golden:main',
+                            'kmt-validate = KicadModTree.validation.cli:main']
+    },
 
     classifiers=[
         'Development Status :: 5 - Production/Stable',